@@ -0,0 +1,266 @@
+"""Admission control for LLM requests.
+
+Every request to the model goes through ``ainvoke_admitted()``, so a busy hour
+queues requests here instead of sending them all to the provider and getting
+a storm of 429/529 answers that slows every conversation at once.
+
+- At most ``settings.llm_max_concurrency`` requests are in flight.
+- A token-per-minute budget (``settings.llm_tokens_per_minute``) is charged
+  with an estimate of the prompt when a request is admitted and corrected with
+  the reported usage when it returns.
+- Waiting requests are admitted by priority: follow-up questions first, then
+  analysis, then drafting and judging; in arrival order within a priority.
+- A request that waits longer than ``settings.llm_queue_notice_after`` seconds
+  reports its queue position to the callback in ``queue_notice``; the bot
+  shows it in the thread.
+
+Queue depth, in-flight requests and time spent waiting are exported in
+``metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from agent.utils import ensure_str_content, estimate_tokens
+from config import settings
+from metrics import LLM_IN_FLIGHT, LLM_QUEUE_DEPTH, LLM_QUEUE_DURATION
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import BaseMessage
+    from langchain_core.runnables import Runnable
+
+logger = logging.getLogger(__name__)
+
+# Lower values are admitted first; nodes not listed get DEFAULT_PRIORITY
+PRIORITIES: dict[str, int] = {"ask_question": 0, "analyze": 1}
+DEFAULT_PRIORITY = 2
+
+# Called with the queue position of a request that has waited too long
+queue_notice: ContextVar[Callable[[int], Awaitable[None]] | None] = ContextVar(
+    "queue_notice", default=None
+)
+
+_admission: AdmissionController | None = None
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class Ticket:
+    """An admitted request; ``settle()`` corrects its token charge once usage is known."""
+
+    def __init__(self, controller: AdmissionController, tokens: int) -> None:
+        self._controller = controller
+        self._tokens = tokens
+
+    def settle(self, tokens: int) -> None:
+        """Charge ``tokens`` actually used instead of the estimate made at admission."""
+        self._controller._charge(tokens - self._tokens)
+        self._tokens = tokens
+
+
+class AdmissionController:
+    """Priority queue in front of the model with a concurrency cap and a token budget.
+
+    Args:
+        max_concurrency: Requests allowed in flight at once.
+        tokens_per_minute: Token budget refilled continuously; ``0`` disables it.
+        notice_after: Seconds a request waits before its position is reported.
+        clock: Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+        *,
+        notice_after: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._capacity = float(tokens_per_minute)
+        self._rate = tokens_per_minute / 60.0
+        self._notice_after = notice_after
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._in_flight = 0
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def depth(self) -> int:
+        """Requests waiting for admission."""
+        return sum(1 for waiter in self._waiters if not waiter.future.done())
+
+    @asynccontextmanager
+    async def admit(self, priority: int, tokens: int, node: str = "none") -> AsyncIterator[Ticket]:
+        """Wait until a request of ``tokens`` estimated tokens may run, and hold its slot.
+
+        Args:
+            priority: Lower values are admitted first.
+            tokens: Estimated tokens charged to the budget now.
+            node: Graph node making the request, for the wait-time metric.
+        """
+        start = self._clock()
+        waiter = _Waiter(
+            priority, next(self._seq), tokens, asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            await self._wait(waiter)
+        LLM_QUEUE_DURATION.observe(self._clock() - start, node=node)
+        try:
+            yield Ticket(self, tokens)
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+
+    async def _wait(self, waiter: _Waiter) -> None:
+        notify = queue_notice.get()
+        try:
+            if notify is not None:
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), self._notice_after)
+                except TimeoutError:
+                    try:
+                        await notify(self._position(waiter))
+                    except Exception:
+                        logger.exception("Failed to report LLM queue position")
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller gave up: hand the slot on
+                self._in_flight -= 1
+            else:
+                waiter.future.cancel()
+            self._dispatch()
+            raise
+
+    def _position(self, waiter: _Waiter) -> int:
+        return 1 + sum(1 for other in self._waiters if other < waiter and not other.future.done())
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while a slot and enough budget are free."""
+        while self._waiters and self._in_flight < self._max_concurrency:
+            head = self._waiters[0]
+            if head.future.done():
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._budget_delay(head.tokens)
+            if delay > 0:
+                self._schedule(delay)
+                break
+            heapq.heappop(self._waiters)
+            self._charge(head.tokens)
+            self._in_flight += 1
+            head.future.set_result(None)
+        LLM_QUEUE_DEPTH.set(self.depth)
+        LLM_IN_FLIGHT.set(self._in_flight)
+
+    def _budget_delay(self, tokens: int) -> float:
+        """Return seconds until the budget covers ``tokens`` (capped at a full budget)."""
+        if not self._rate:
+            return 0.0
+        self._refill()
+        missing = min(tokens, self._capacity) - self._tokens
+        return max(0.0, missing / self._rate)
+
+    def _charge(self, tokens: int) -> None:
+        if self._rate:
+            self._refill()
+            self._tokens -= tokens
+            if tokens < 0:
+                # Usage came in under the estimate: waiters may fit now
+                self._dispatch()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if now > self._updated:
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+    def _schedule(self, delay: float) -> None:
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+
+def prompt_tokens(messages: list[BaseMessage]) -> int:
+    """Estimate the prompt tokens of ``messages``, counted as the context builder counts them."""
+    return estimate_tokens("".join(ensure_str_content(message.content) for message in messages))
+
+
+def used_tokens(response: BaseMessage) -> int | None:
+    """Tokens of ``response`` that count against the budget, if usage was reported.
+
+    Prompt cache reads are left out; the provider does not count them toward
+    input rate limits.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return None
+    cache_read = usage.get("input_token_details", {}).get("cache_read", 0)
+    return usage.get("input_tokens", 0) - cache_read + usage.get("output_tokens", 0)
+
+
+async def ainvoke_admitted(
+    node: str, llm: BaseChatModel | Runnable, messages: list[BaseMessage]
+) -> BaseMessage:
+    """Invoke ``llm`` once the admission controller lets the request through.
+
+    Args:
+        node: Graph node making the call; sets the priority (see ``PRIORITIES``).
+        llm: Chat model (possibly with tools bound) to call.
+        messages: Request messages.
+
+    Returns:
+        The model's response.
+    """
+    priority = PRIORITIES.get(node, DEFAULT_PRIORITY)
+    async with get_admission().admit(priority, prompt_tokens(messages), node) as ticket:
+        response = await llm.ainvoke(messages)
+        used = used_tokens(response)
+        if used is not None:
+            ticket.settle(used)
+        return response
+
+
+def get_admission() -> AdmissionController:
+    """Return the shared admission controller, creating it from settings on first use."""
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController(
+            settings.llm_max_concurrency,
+            settings.llm_tokens_per_minute,
+            notice_after=settings.llm_queue_notice_after,
+        )
+    return _admission
+
+
+def set_admission(controller: AdmissionController | None) -> None:
+    """Replace the shared controller, or ``None`` to build a fresh one from settings."""
+    global _admission
+    _admission = controller
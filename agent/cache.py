@@ -0,0 +1,314 @@
+"""Content-addressed cache of LLM responses.
+
+Identical prompts come up often: the judge prompt for an unchanged draft,
+re-analysis after a retried turn, replayed test conversations. Nodes call
+``cached_ainvoke()`` instead of ``llm.ainvoke()``; a response is reused when
+the model, ``max_tokens``, bound tools, system prompt and prompt all match.
+
+- Keys are SHA-256 digests of ``(model, max_tokens, tools hash, system hash,
+  prompt hash)``. The tools hash covers the arguments bound to the model,
+  such as the tool schema a structured call forces. Prompt text is hashed
+  without its ``cache_control`` markers, so the key depends only on what the
+  model reads.
+- An in-memory LRU sits in front of a SQLite file. Entries expire after
+  ``ttl`` seconds, and the file is trimmed back under ``max_bytes`` by
+  evicting the least recently used rows.
+- Caching is opt-in per node (``settings.llm_cache_nodes``). Nodes whose
+  replies should vary between calls, like ``ask_question``, stay out.
+- Hits and misses are counted per node and logged with each lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.runnables import Runnable, RunnableBinding
+
+from agent.admission import ainvoke_admitted
+from agent.utils import ensure_str_content, is_json_response
+from config import settings
+from metrics import LLM_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+_cache: ResponseCache | None = None
+_override: ResponseCache | None = None
+
+
+class ResponseCache:
+    """LLM responses keyed by prompt digest, in memory and optionally on disk.
+
+    Lookups and writes that reach SQLite block; ``cached_ainvoke`` runs them in
+    a worker thread. Memory hits never leave the event loop.
+
+    Args:
+        path: SQLite file, or ``""`` to keep the cache in memory only.
+        memory_entries: Responses held in the in-memory LRU.
+        max_bytes: Size cap of the response text stored on disk.
+        ttl: Seconds a response stays valid.
+        clock: Wall-clock time source.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        *,
+        memory_entries: int = 256,
+        max_bytes: int = 50_000_000,
+        ttl: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._memory_entries = memory_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._clock = clock
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    @property
+    def persistent(self) -> bool:
+        return bool(self._path)
+
+    @staticmethod
+    def key(model: str, max_tokens: int | None, system: str, prompt: str, tools: str = "") -> str:
+        """Return the cache key for one request."""
+        parts = [model, max_tokens, _digest(tools), _digest(system), _digest(prompt)]
+        return _digest(json.dumps(parts))
+
+    def get_memory(self, key: str) -> str | None:
+        """Return a fresh in-memory response for ``key``, or ``None``."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry[0] >= self._ttl:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    def get(self, key: str) -> str | None:
+        """Return a fresh response for ``key`` from memory or disk, or ``None``."""
+        text = self.get_memory(key)
+        if text is not None or not self._path:
+            return text
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT text, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                if now - row[1] >= self._ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._remember(key, row[1], row[0])
+        return row[0]
+
+    def put(self, key: str, node: str, text: str) -> None:
+        """Store a response, evicting expired and least recently used entries."""
+        now = self._clock()
+        self._remember(key, now, text)
+        if not self._path:
+            return
+        size = len(text.encode())
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO responses (key, node, text, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET text = excluded.text, "
+                    "size = excluded.size, created_at = excluded.created_at, "
+                    "accessed_at = excluded.accessed_at",
+                    (key, node, text, size, now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self._ttl,))
+                self._trim(conn)
+
+    def record(self, node: str, hit: bool) -> None:
+        """Count a lookup for ``node`` and log the running totals."""
+        (self.hits if hit else self.misses)[node] += 1
+        LLM_CACHE_LOOKUPS.inc(node=node, result="hit" if hit else "miss")
+        logger.info(
+            "%s response cache %s (hits=%d misses=%d)",
+            node,
+            "hit" if hit else "miss",
+            self.hits[node],
+            self.misses[node],
+        )
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "node TEXT NOT NULL, "
+                "text TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def _trim(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        freed = 0
+        stale: list[str] = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            stale.append(key)
+            freed += size
+            if total - freed <= self._max_bytes:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+        logger.info("Evicted %d cached responses (%d bytes)", len(stale), freed)
+
+    def _remember(self, key: str, created_at: float, text: str) -> None:
+        self._memory[key] = (created_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+
+def parses_as_json(text: str) -> bool:
+    """``cacheable`` predicate for nodes that expect a JSON response."""
+    # The node parses the response again and reports failures itself
+    return is_json_response(text)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _message_text(message: BaseMessage) -> str:
+    # cache_control markers and other block metadata do not change the answer
+    return ensure_str_content(message.content)
+
+
+def response_text(response: BaseMessage) -> str:
+    """Return the text of a response; a tool call is rendered as its JSON arguments."""
+    tool_calls = getattr(response, "tool_calls", None)
+    if tool_calls:
+        return json.dumps(tool_calls[0]["args"], ensure_ascii=False)
+    return ensure_str_content(response.content)
+
+
+def request_key(llm: BaseChatModel | Runnable, messages: list[BaseMessage]) -> str:
+    """Return the cache key for sending ``messages`` to ``llm``."""
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", None) or llm._llm_type
+    system = json.dumps([_message_text(m) for m in messages if isinstance(m, SystemMessage)])
+    prompt = json.dumps(
+        [[m.type, _message_text(m)] for m in messages if not isinstance(m, SystemMessage)]
+    )
+    # Tools and tool_choice bound with bind_tools() shape the answer like the prompt does
+    tools = ""
+    if isinstance(llm, RunnableBinding):
+        tools = json.dumps(llm.kwargs, sort_keys=True, default=str)
+    return ResponseCache.key(str(model), getattr(llm, "max_tokens", None), system, prompt, tools)
+
+
+async def cached_ainvoke(
+    node: str,
+    llm: BaseChatModel | Runnable,
+    messages: list[BaseMessage],
+    *,
+    cacheable: Callable[[str], bool] | None = None,
+) -> BaseMessage:
+    """Invoke ``llm`` unless an identical request was answered before.
+
+    Requests that reach the model go through ``agent.admission``.
+
+    Args:
+        node: Graph node making the call; caching applies only to nodes listed
+            in ``settings.llm_cache_nodes``.
+        llm: Chat model (possibly with tools bound) to call on a miss.
+        messages: Request messages.
+        cacheable: Predicate on the response text; responses failing it (for
+            example unparseable JSON) are not stored, so a retry calls the
+            model again.
+
+    Returns:
+        The model's response, or an ``AIMessage`` with the cached text. Tool
+        calls are cached as their JSON arguments and come back as text.
+    """
+    cache = get_response_cache()
+    if cache is None or node not in settings.llm_cache_nodes:
+        return await ainvoke_admitted(node, llm, messages)
+
+    key = request_key(llm, messages)
+    text = cache.get_memory(key)
+    if text is None and cache.persistent:
+        text = await asyncio.to_thread(cache.get, key)
+    cache.record(node, hit=text is not None)
+    if text is not None:
+        return AIMessage(content=text)
+
+    response = await ainvoke_admitted(node, llm, messages)
+    text = response_text(response)
+    if text and (cacheable is None or cacheable(text)):
+        if cache.persistent:
+            await asyncio.to_thread(cache.put, key, node, text)
+        else:
+            cache.put(key, node, text)
+    return response
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the shared cache, or ``None`` if no node has caching enabled."""
+    global _cache
+    if _override is not None:
+        return _override
+    if not settings.llm_cache_nodes:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(
+            settings.llm_cache_db_path,
+            memory_entries=settings.llm_cache_memory_entries,
+            max_bytes=settings.llm_cache_max_bytes,
+            ttl=settings.llm_cache_ttl,
+        )
+    return _cache
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Inject the cache used by every node, or ``None`` to restore the default."""
+    global _override
+    _override = cache
+
+
+def close_response_cache() -> None:
+    """Close the shared cache's database connection."""
+    global _cache
+    if _cache is not None:
+        cache, _cache = _cache, None
+        cache.close()
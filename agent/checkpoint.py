@@ -0,0 +1,134 @@
+"""LangGraph checkpointers holding the conversation state of issue threads.
+
+The graph is compiled with the saver from ``get_checkpointer()`` and run with
+``durability="exit"``, so a turn sends only the new user message and writes a
+single checkpoint when the run ends.
+
+- Without ``session_db_path`` the saver is langgraph's ``InMemorySaver``,
+  which stores each channel as its own blob and only writes the channels a
+  turn changed.
+- With ``session_db_path`` it is ``AsyncSqliteSaver`` from
+  ``langgraph-checkpoint-sqlite``, next to the sessions in the same file, so
+  checkpoints survive restarts and are shared by cluster workers. It stores
+  the whole state, the full message list included, in every checkpoint, so
+  a turn's write grows with the thread: unlike the memory saver it does not
+  persist deltas, and at 1000 messages a turn is slightly slower than the
+  whole-state session writes checkpointing replaced (see
+  ``benchmarks/checkpoint_state.py``).
+
+A turn forks from the checkpoint its session committed (see ``bot.events``),
+so a superseded or failed run leaves no trace: its checkpoint is never
+committed and ``prune()`` drops it with every older one once the next turn
+commits. Only the latest checkpoint of a thread is kept.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from config import settings
+
+Saver = InMemorySaver | AsyncSqliteSaver
+
+_checkpointer: Saver | None = None
+
+
+def thread_config(thread_id: int, checkpoint_id: str | None = None) -> RunnableConfig:
+    """Build the run config of a thread, forking from ``checkpoint_id`` if given."""
+    configurable: dict[str, Any] = {"thread_id": str(thread_id)}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+async def prune(saver: Saver, thread_id: str) -> str | None:
+    """Keep only the thread's latest checkpoint and return its id.
+
+    Args:
+        saver: Checkpointer holding the thread.
+        thread_id: Thread whose older checkpoints are dropped.
+
+    Returns:
+        The kept checkpoint id, or ``None`` if the thread has none.
+    """
+    if isinstance(saver, AsyncSqliteSaver):
+        return await _prune_sqlite(saver, thread_id)
+    return _prune_memory(saver, thread_id)
+
+
+def _prune_memory(saver: InMemorySaver, thread_id: str) -> str | None:
+    namespaces = saver.storage.get(thread_id, {})
+    checkpoints = namespaces.get("", {})
+    if not checkpoints:
+        return None
+    checkpoint_id = max(checkpoints)
+    kept = checkpoints[checkpoint_id]
+    versions = saver.serde.loads_typed(kept[0])["channel_versions"]
+    # Every blob was written by a checkpoint that references it, so the dropped
+    # checkpoints name every blob that may go
+    for checkpoint_ns, dropped in namespaces.items():
+        for cid, (checkpoint, _, _) in dropped.items():
+            if checkpoint_ns == "" and cid == checkpoint_id:
+                continue
+            for channel, version in saver.serde.loads_typed(checkpoint)["channel_versions"].items():
+                if checkpoint_ns != "" or versions.get(channel) != version:
+                    saver.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+            saver.writes.pop((thread_id, checkpoint_ns, cid), None)
+    namespaces.clear()
+    namespaces[""] = {checkpoint_id: kept}
+    return checkpoint_id
+
+
+async def _prune_sqlite(saver: AsyncSqliteSaver, thread_id: str) -> str | None:
+    await saver.setup()
+    async with saver.lock:
+        async with saver.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = '' "
+            "ORDER BY checkpoint_id DESC LIMIT 1",
+            (thread_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        checkpoint_id = row[0]
+        for table in ("checkpoints", "writes"):
+            await saver.conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? "
+                "AND NOT (checkpoint_ns = '' AND checkpoint_id = ?)",
+                (thread_id, checkpoint_id),
+            )
+        await saver.conn.commit()
+    return checkpoint_id
+
+
+def get_checkpointer() -> Saver:
+    """Return the shared checkpointer: SQLite with ``settings.session_db_path``, else memory.
+
+    Must first be called on the event loop the bot runs on, which the SQLite
+    saver binds to.
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        if settings.session_db_path:
+            # The connection starts on first use, in AsyncSqliteSaver.setup()
+            _checkpointer = AsyncSqliteSaver(aiosqlite.connect(settings.session_db_path))
+        else:
+            _checkpointer = InMemorySaver()
+    return _checkpointer
+
+
+def set_checkpointer(saver: Saver | None) -> None:
+    """Replace the shared checkpointer, or ``None`` to build a fresh one from settings."""
+    global _checkpointer
+    _checkpointer = saver
+
+
+async def aclose_checkpointer() -> None:
+    """Close the shared checkpointer's database connection on shutdown."""
+    if isinstance(_checkpointer, AsyncSqliteSaver) and _checkpointer.is_setup:
+        await _checkpointer.conn.close()
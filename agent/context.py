@@ -0,0 +1,140 @@
+"""Token-budgeted conversation context for the agent prompts.
+
+Nodes render the thread through ``build_context`` instead of joining every
+message, so a prompt stays within a per-node token budget however long the
+thread grows. The first message (the user's original report) and the latest
+turns are kept verbatim; the turns in between are replaced by the cached
+``conversation_summary`` when there is one, or by a short digest of what the
+user said in them. Token counts are local estimates from
+``agent.utils.estimate_tokens`` and are cached per message.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from agent.state import Message
+from agent.utils import estimate_tokens
+
+CLIP_MARKER = " …(생략)"
+SUMMARY_LABEL = "[이전 대화 요약]"
+
+# Share of the budget the summary of omitted turns may take
+_SUMMARY_SHARE = 4
+# Tokens a single omitted user message may take in the digest
+_DIGEST_ITEM_TOKENS = 40
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s|\n")
+
+
+@lru_cache(maxsize=4096)
+def clip_tokens(text: str, max_tokens: int) -> tuple[str, int]:
+    """Cut ``text`` to at most ``max_tokens`` estimated tokens.
+
+    Args:
+        text: The text to clip.
+        max_tokens: Token limit, including the clip marker.
+
+    Returns:
+        The (possibly clipped) text and its estimated token count.
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text, tokens
+    limit = max(max_tokens - estimate_tokens(CLIP_MARKER), 0)
+    end = len(text) * limit // tokens
+    while end > 0 and estimate_tokens(text[:end]) > limit:
+        end -= max(1, end // 20)
+    clipped = text[: max(end, 0)].rstrip() + CLIP_MARKER
+    return clipped, estimate_tokens(clipped)
+
+
+@lru_cache(maxsize=4096)
+def _render(role: str, content: str, max_tokens: int) -> tuple[str, int]:
+    """Render one message as a transcript line and count its tokens."""
+    prefix = f"[{role}]: "
+    prefix_tokens = estimate_tokens(prefix)
+    body, tokens = clip_tokens(content, max(max_tokens - prefix_tokens, 1))
+    # The newline joining transcript lines counts as one token
+    return prefix + body, prefix_tokens + tokens + 1
+
+
+def _digest(omitted: list[Message], budget: int) -> str:
+    """Summarize omitted turns by the first sentence of each user message, newest first."""
+    items: list[str] = []
+    used = 0
+    for message in reversed(omitted):
+        if message["role"] != "user":
+            continue
+        first = _SENTENCE_END.split(message["content"].strip(), maxsplit=1)[0]
+        item, tokens = clip_tokens(first, _DIGEST_ITEM_TOKENS)
+        if used + tokens + 1 > budget:
+            break
+        items.append(item)
+        used += tokens + 1
+    return " / ".join(reversed(items))
+
+
+def _summary_line(summary: str, omitted: list[Message], budget: int) -> str:
+    """Stand in for ``omitted`` with the cached summary, or a digest of the user turns."""
+    head = f"{SUMMARY_LABEL}: "
+    budget -= estimate_tokens(head) + 1
+    if summary:
+        body, _ = clip_tokens(summary, max(budget, 1))
+    else:
+        note = f"중간 대화 {len(omitted)}개 생략."
+        digest = _digest(omitted, budget - estimate_tokens(note) - 1)
+        body = f"{note} 사용자 발언: {digest}" if digest else note
+    return head + body
+
+
+def build_context(
+    messages: list[Message],
+    budget: int,
+    summary: str = "",
+    message_tokens: int = 0,
+) -> str:
+    """Render messages as a transcript of at most ``budget`` estimated tokens.
+
+    Args:
+        messages: Conversation messages, oldest first.
+        budget: Token budget of the rendered transcript.
+        summary: Cached summary of the conversation, used in place of the
+            turns that do not fit.
+        message_tokens: Tokens a single message may take before it is clipped
+            (0 uses a third of ``budget``).
+
+    Returns:
+        ``[role]: content`` lines: the first message, a summary of the omitted
+        turns if any, then the latest turns that fit. Empty for no messages.
+    """
+    if not messages:
+        return ""
+    cap = min(message_tokens or budget, budget // 3) or 1
+    first, first_tokens = _render(messages[0]["role"], messages[0]["content"], cap)
+    remaining = budget - first_tokens
+
+    # Newest turns first, so the work is bounded by the window, not the thread
+    tail: list[tuple[str, int]] = []
+    used = 0
+    start = len(messages)
+    while start > 1:
+        line, tokens = _render(messages[start - 1]["role"], messages[start - 1]["content"], cap)
+        if used + tokens > remaining:
+            break
+        tail.append((line, tokens))
+        used += tokens
+        start -= 1
+
+    lines = [first]
+    if start > 1:
+        # Turns were left out: give back the oldest kept ones until a summary fits
+        summary_budget = budget // _SUMMARY_SHARE
+        while len(tail) > 1 and used + summary_budget > remaining:
+            used -= tail.pop()[1]
+            start += 1
+        lines.append(
+            _summary_line(summary, messages[1:start], min(summary_budget, remaining - used))
+        )
+    lines.extend(line for line, _ in reversed(tail))
+    return "\n".join(lines)
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from agent.nodes.analyze import analyze
 from agent.nodes.ask import ask_question
 from agent.nodes.check import check_completeness
+from agent.nodes.classify import classify_turn
 from agent.nodes.draft import generate_draft
+from agent.nodes.duplicates import find_duplicates
 from agent.state import IssueState
+from metrics import timed_node
+
+
+def _route_after_classify(state: IssueState) -> str:
+    """Route the turn by the pre-check classification, skipping analyze when possible."""
+    turn_type = state.get("turn_type", "content")
+    if turn_type in ("confirm", "cancel", "duplicate"):
+        return END
+    if turn_type == "ack":
+        # A pending draft was answered in classify_turn; otherwise ask again
+        has_draft = state.get("draft_title") and state.get("draft_body")
+        return END if has_draft else "check_completeness"
+    return "analyze"
 
 
 def _route_after_check(state: IssueState) -> str:
@@ -16,23 +32,35 @@ def _route_after_check(state: IssueState) -> str:
     if status == "confirmed":
         return END
     if status == "sufficient":
-        return "generate_draft"
+        return "find_duplicates"
     return "ask_question"
 
 
-def create_graph() -> CompiledStateGraph:
-    """Build and compile the issue-creation LangGraph."""
+def create_graph(checkpointer: BaseCheckpointSaver | None = None) -> CompiledStateGraph:
+    """Build and compile the issue-creation LangGraph.
+
+    Every node is wrapped by ``metrics.timed_node`` so its latency is exported.
+
+    Args:
+        checkpointer: Saver keeping each thread's state between turns (see
+            ``agent.checkpoint``). Runs then take a ``thread_id`` config and
+            only the new input; without one the caller passes the whole state.
+    """
     graph = StateGraph(IssueState)
 
-    graph.add_node("analyze", analyze)
-    graph.add_node("check_completeness", check_completeness)
-    graph.add_node("ask_question", ask_question)
-    graph.add_node("generate_draft", generate_draft)
+    graph.add_node("classify_turn", timed_node("classify_turn", classify_turn))
+    graph.add_node("analyze", timed_node("analyze", analyze))
+    graph.add_node("check_completeness", timed_node("check_completeness", check_completeness))
+    graph.add_node("ask_question", timed_node("ask_question", ask_question))
+    graph.add_node("find_duplicates", timed_node("find_duplicates", find_duplicates))
+    graph.add_node("generate_draft", timed_node("generate_draft", generate_draft))
 
-    graph.set_entry_point("analyze")
+    graph.set_entry_point("classify_turn")
+    graph.add_conditional_edges("classify_turn", _route_after_classify)
     graph.add_edge("analyze", "check_completeness")
     graph.add_conditional_edges("check_completeness", _route_after_check)
+    graph.add_edge("find_duplicates", "generate_draft")
     graph.add_edge("ask_question", END)
     graph.add_edge("generate_draft", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
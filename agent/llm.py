@@ -0,0 +1,207 @@
+"""Process-wide LLM client shared by all agent nodes.
+
+Nodes call ``get_llm_for()`` instead of constructing ``ChatAnthropic``
+themselves, so every call reuses one pooled HTTP client and its kept-alive
+connections. Each call has its own model tier in settings: a small, fast model
+for analysis and follow-up questions, the large one for drafting and judging.
+Answers of a small model that fail validation are retried on the larger model
+returned by ``get_escalation_llm()``.
+
+Tests inject a fake model with ``set_llm()``. The bot builds the models ahead
+of the first conversation with ``warm_llm()`` and closes the pool on shutdown
+with ``aclose_llm()``.
+
+Messages built with ``system_message()`` and ``prompt_message()`` mark the
+system prompt and the static instructions of a template as cacheable prefixes,
+so repeated calls only pay full price for the per-turn part of the prompt.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import cached_property
+
+import anthropic
+import httpx
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from config import settings
+from metrics import LLM_TOKENS
+
+logger = logging.getLogger(__name__)
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+_http_client: httpx.AsyncClient | None = None
+_models: dict[tuple[str, int], BaseChatModel] = {}
+_override: BaseChatModel | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=settings.llm_http2,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout, connect=10.0),
+        )
+    return _http_client
+
+
+class PooledChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose async API client sends through the shared HTTP pool."""
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncClient:
+        return anthropic.AsyncClient(**self._client_params, http_client=_get_http_client())
+
+
+def get_llm(model: str | None = None, max_tokens: int | None = None) -> BaseChatModel:
+    """Return the shared chat model for ``model``/``max_tokens``.
+
+    Args:
+        model: Model name. Defaults to ``settings.llm_model``.
+        max_tokens: Response token limit. Defaults to ``settings.llm_max_tokens``.
+
+    Returns:
+        A cached chat model, or the model injected with ``set_llm()``.
+    """
+    if _override is not None:
+        return _override
+
+    key = (model or settings.llm_model, max_tokens or settings.llm_max_tokens)
+    llm = _models.get(key)
+    if llm is None:
+        llm = _models[key] = PooledChatAnthropic(
+            model=key[0],
+            max_tokens=key[1],
+            api_key=settings.anthropic_api_key,
+            default_request_timeout=settings.llm_timeout,
+        )
+    return llm
+
+
+def model_for(call: str) -> tuple[str, int]:
+    """Return the ``(model, max_tokens)`` configured for an LLM call.
+
+    Args:
+        call: ``"analyze"``, ``"ask_question"``, ``"generate_draft"`` or
+            ``"judge"``. Other calls use ``settings.llm_model``.
+
+    Returns:
+        The call's tier from settings, with empty values filled from
+        ``settings.llm_model`` and ``settings.llm_max_tokens``.
+    """
+    model, max_tokens = {
+        "analyze": (settings.llm_analyze_model, settings.llm_analyze_max_tokens),
+        "ask_question": (settings.llm_ask_model, settings.llm_ask_max_tokens),
+        "generate_draft": (settings.llm_draft_model, settings.llm_draft_max_tokens),
+        "judge": (settings.llm_judge_model, settings.llm_judge_max_tokens),
+    }.get(call, ("", 0))
+    return model or settings.llm_model, max_tokens or settings.llm_max_tokens
+
+
+def get_llm_for(call: str) -> BaseChatModel:
+    """Return the shared chat model of ``call``'s tier (see ``model_for()``)."""
+    return get_llm(*model_for(call))
+
+
+def get_escalation_llm(call: str) -> BaseChatModel | None:
+    """Return the model that retries ``call`` when its answer fails validation.
+
+    Returns:
+        ``None`` if escalation is disabled, ``call`` already runs on the
+        escalation model, or a model was injected with ``set_llm()`` (it
+        serves every tier, so there is nothing larger to escalate to).
+    """
+    if not settings.llm_escalate or _override is not None:
+        return None
+    model, max_tokens = model_for(call)
+    escalation_model = settings.llm_escalation_model or settings.llm_model
+    if escalation_model == model:
+        return None
+    return get_llm(escalation_model, max(max_tokens, settings.llm_max_tokens))
+
+
+def warm_llm() -> None:
+    """Build the models of every call tier, and their API client, before the first request.
+
+    Constructing the models and the Anthropic client otherwise lands on the
+    first conversation's turn. Does nothing for a model injected with
+    ``set_llm()``.
+    """
+    for call in ("analyze", "ask_question", "generate_draft", "judge"):
+        for llm in (get_llm_for(call), get_escalation_llm(call)):
+            if isinstance(llm, PooledChatAnthropic):
+                llm._async_client  # noqa: B018 - cached on first access
+
+
+def set_llm(llm: BaseChatModel | None) -> None:
+    """Inject a chat model used by every node, or ``None`` to restore the default."""
+    global _override
+    _override = llm
+
+
+async def aclose_llm() -> None:
+    """Close the shared HTTP pool and drop cached models."""
+    global _http_client
+    _models.clear()
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+        logger.info("Closed shared LLM HTTP client")
+
+
+def system_message(text: str) -> SystemMessage:
+    """Build a system message whose whole content is a cacheable prefix."""
+    return SystemMessage(content=[{"type": "text", "text": text, "cache_control": _CACHE_CONTROL}])
+
+
+def prompt_message(instructions: str, turn_input: str) -> HumanMessage:
+    """Build a user message with cacheable static instructions before the per-turn input.
+
+    Args:
+        instructions: Template text that is identical on every call.
+        turn_input: Text rendered from the current state.
+
+    Returns:
+        A message whose cache breakpoint sits at the end of ``instructions``.
+    """
+    return HumanMessage(
+        content=[
+            {"type": "text", "text": instructions, "cache_control": _CACHE_CONTROL},
+            {"type": "text", "text": turn_input},
+        ]
+    )
+
+
+def log_usage(node: str, response: BaseMessage) -> None:
+    """Log and record token usage, including prompt cache reads and writes, for one LLM call."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    details = usage.get("input_token_details", {})
+    cache_read = details.get("cache_read", 0)
+    for kind, tokens in (
+        ("input", usage.get("input_tokens", 0)),
+        ("output", usage.get("output_tokens", 0)),
+        ("cache_read", cache_read),
+        ("cache_creation", details.get("cache_creation", 0)),
+    ):
+        LLM_TOKENS.observe(tokens, call=node, kind=kind)
+    logger.info(
+        "%s usage: input=%d output=%d cache_read=%d cache_creation=%d cache_hit=%s",
+        node,
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        cache_read,
+        details.get("cache_creation", 0),
+        cache_read > 0,
+    )
@@ -1,68 +1,108 @@
 from __future__ import annotations
 
+import json
 import logging
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
-
-from agent.prompts.analyze import get_analyze_prompt
+from agent.context import build_context, clip_tokens
+from agent.llm import get_escalation_llm, get_llm_for, prompt_message, system_message
+from agent.prompts.analyze import (
+    ANALYZE_INSTRUCTIONS,
+    INCREMENTAL_ANALYZE_INSTRUCTIONS,
+    get_analyze_input,
+    get_incremental_analyze_input,
+)
 from agent.prompts.system import SYSTEM_PROMPT
+from agent.schemas import ISSUE_FIELD_KEYS, IncrementalAnalysis, IssueFields
 from agent.state import IssueState
-from agent.utils import ensure_str_content, parse_json_response, truncate_message
+from agent.structured import ainvoke_structured
 from config import settings
 
 logger = logging.getLogger(__name__)
 
-_FIELD_KEYS = [
-    "issue_title",
-    "issue_description",
-    "issue_type",
-    "affected_domain",
-    "severity",
-    "steps_to_reproduce",
-    "expected_behavior",
-    "actual_behavior",
-    "environment_info",
-    "labels",
-]
-
 
 async def analyze(state: IssueState) -> dict:
-    """Analyze user messages and extract issue information."""
+    """Analyze user messages and extract issue information.
+
+    With ``settings.analyze_mode == "incremental"`` the prompt carries the fields
+    extracted so far, a rolling summary and only the messages added since the
+    last analysis, so its size does not grow with the conversation. Either way the
+    transcript is rendered by ``build_context`` within
+    ``settings.llm_analyze_context_tokens``.
+    """
     messages = state.get("messages", [])
     if not messages:
         return {}
+    if settings.analyze_mode == "incremental":
+        return await _analyze_incremental(state, messages)
 
-    latest_message = truncate_message(messages[-1]["content"])
-    context = (
-        "\n".join(f"[{m['role']}]: {truncate_message(m['content'])}" for m in messages[:-1])
-        if len(messages) > 1
-        else "없음"
+    latest_message, latest_tokens = clip_tokens(
+        messages[-1]["content"], settings.llm_message_max_tokens
     )
-
-    llm = ChatAnthropic(
-        model=settings.llm_model,
-        max_tokens=settings.llm_max_tokens,
-        api_key=settings.anthropic_api_key,
+    context = (
+        build_context(
+            messages[:-1],
+            max(settings.llm_analyze_context_tokens - latest_tokens, 1),
+            state.get("conversation_summary") or "",
+            settings.llm_message_max_tokens,
+        )
+        or "없음"
     )
 
-    prompt = get_analyze_prompt(latest_message, context)
-    response = await llm.ainvoke(
+    data = await ainvoke_structured(
+        "analyze",
+        "analyze",
+        get_llm_for("analyze"),
         [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+            system_message(SYSTEM_PROMPT),
+            prompt_message(ANALYZE_INSTRUCTIONS, get_analyze_input(latest_message, context)),
+        ],
+        IssueFields,
+        escalate_to=get_escalation_llm("analyze"),
     )
-
-    content = ensure_str_content(response.content)
-    data = parse_json_response(content)
     if data is None:
         return {}
 
     update: dict = {}
-    for key in _FIELD_KEYS:
+    for key in ISSUE_FIELD_KEYS:
         value = data.get(key)
         if value is not None:
             update[key] = value
 
     return update
+
+
+async def _analyze_incremental(state: IssueState, messages: list) -> dict:
+    """Extract a patch to the issue fields from the new messages only."""
+    analyzed = state.get("analyzed_message_count", 0)
+    new_messages = messages[analyzed:] or messages[-1:]
+    current = {key: state[key] for key in ISSUE_FIELD_KEYS if state.get(key)}
+
+    turn_input = get_incremental_analyze_input(
+        current_state=json.dumps(current, ensure_ascii=False, indent=2) if current else "없음",
+        summary=state.get("conversation_summary") or "없음",
+        new_messages=build_context(
+            new_messages, settings.llm_analyze_context_tokens, "", settings.llm_message_max_tokens
+        ),
+    )
+
+    data = await ainvoke_structured(
+        "analyze",
+        "analyze",
+        get_llm_for("analyze"),
+        [
+            system_message(SYSTEM_PROMPT),
+            prompt_message(INCREMENTAL_ANALYZE_INSTRUCTIONS, turn_input),
+        ],
+        IncrementalAnalysis,
+        escalate_to=get_escalation_llm("analyze"),
+    )
+    if data is None:
+        # Leave analyzed_message_count alone so the next turn retries these messages
+        return {}
+
+    patch = data.get("updates") or {}
+    update: dict = {key: patch[key] for key in ISSUE_FIELD_KEYS if patch.get(key) is not None}
+    if data.get("summary"):
+        update["conversation_summary"] = data["summary"]
+    update["analyzed_message_count"] = len(messages)
+    return update
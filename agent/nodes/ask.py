@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import logging
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
+from agent.cache import cached_ainvoke
+from agent.context import build_context
+from agent.llm import get_llm_for, log_usage, system_message
 from agent.prompts.ask import get_ask_prompt
 from agent.prompts.system import SYSTEM_PROMPT
 from agent.state import IssueState
-from agent.utils import ensure_str_content, truncate_message
+from agent.utils import ensure_str_content
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -40,23 +42,29 @@ async def ask_question(state: IssueState) -> dict:
                 missing.append(label)
 
     messages = state.get("messages", [])
-    conversation = "\n".join(f"[{m['role']}]: {truncate_message(m['content'])}" for m in messages)
+    conversation = build_context(
+        messages,
+        settings.llm_ask_context_tokens,
+        state.get("conversation_summary") or "",
+        settings.llm_message_max_tokens,
+    )
     missing_text = "\n".join(f"- {item}" for item in missing) if missing else "- 추가 세부사항"
 
     prompt = get_ask_prompt(conversation, missing_text)
 
-    llm = ChatAnthropic(
-        model=settings.llm_model,
-        max_tokens=settings.llm_max_tokens,
-        api_key=settings.anthropic_api_key,
-    )
+    llm = get_llm_for("ask_question")
 
-    response = await llm.ainvoke(
+    # Not cached unless ask_question is added to settings.llm_cache_nodes; a user
+    # who did not answer should not get the same question word for word
+    response = await cached_ainvoke(
+        "ask_question",
+        llm,
         [
-            SystemMessage(content=SYSTEM_PROMPT),
+            system_message(SYSTEM_PROMPT),
             HumanMessage(content=prompt),
-        ]
+        ],
     )
+    log_usage("ask_question", response)
 
     content = ensure_str_content(response.content)
 
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import re
+
+from agent.nodes.check import _CONFIRMATION_KEYWORDS
+from agent.state import IssueState
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_CANCELLATION_KEYWORDS = frozenset(
+    {
+        "취소",
+        "취소할게요",
+        "취소해줘",
+        "취소해주세요",
+        "그만",
+        "안할래",
+        "안 할래요",
+        "됐어요",
+        "cancel",
+        "stop",
+    }
+)
+
+_ACKNOWLEDGEMENT_KEYWORDS = frozenset(
+    {
+        "감사합니다",
+        "고마워요",
+        "고맙습니다",
+        "알겠습니다",
+        "넵",
+        "ㅋㅋ",
+        "ㅎㅎ",
+        "👍",
+        "thanks",
+        "thx",
+    }
+)
+
+_DUPLICATE_KEYWORDS = frozenset({"중복", "중복이에요", "중복입니다", "같은 이슈", "duplicate"})
+_ISSUE_REFERENCE = re.compile(r"#(\d+)")
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!~?]+$")
+
+CANCELLED_MESSAGE = "이슈 생성을 취소했습니다. 새 이슈는 채널에 다시 메시지를 남겨 주세요."
+DRAFT_PENDING_MESSAGE = "초안을 확인하신 뒤 '확인' 또는 수정할 내용을 알려 주세요."
+
+
+def _normalize(content: str) -> str:
+    return _TRAILING_PUNCTUATION.sub("", content.strip().lower())
+
+
+def _chosen_duplicate(content: str, candidates: list[dict]) -> dict | None:
+    """Return the candidate the user picked with "중복" (the best match), "#<number>" or its URL.
+
+    A bare number is not a pick: it is as likely an answer to a question.
+    """
+    if not candidates:
+        return None
+    if content in _DUPLICATE_KEYWORDS:
+        return candidates[0]
+    reference = _ISSUE_REFERENCE.fullmatch(content)
+    if reference:
+        number = int(reference.group(1))
+        return next((c for c in candidates if c["number"] == number), None)
+    return next((c for c in candidates if c["url"].lower() == content), None)
+
+
+def classify_turn(state: IssueState) -> dict:
+    """Classify the latest user turn without calling the LLM.
+
+    Confirmations, cancellations, picks of a duplicate candidate and bare
+    acknowledgements carry no new issue information, so they are answered or
+    routed here instead of paying for an analyze call. Everything else is a
+    ``content`` turn and goes to analyze.
+    """
+    messages = state.get("messages", [])
+    if not settings.turn_precheck or not messages or messages[-1]["role"] != "user":
+        return {"turn_type": "content"}
+
+    content = _normalize(messages[-1]["content"])
+    has_draft = bool(state.get("draft_title") and state.get("draft_body"))
+
+    if content in _CANCELLATION_KEYWORDS:
+        logger.info("Fast path: cancel (skipped analyze)")
+        return {
+            "turn_type": "cancel",
+            "completeness_status": "cancelled",
+            "messages": [{"role": "assistant", "content": CANCELLED_MESSAGE}],
+        }
+    duplicate = _chosen_duplicate(content, state.get("duplicate_candidates", []))
+    if has_draft and duplicate is not None:
+        logger.info("Fast path: duplicate of #%s (skipped analyze)", duplicate["number"])
+        return {
+            "turn_type": "duplicate",
+            "completeness_status": "duplicate",
+            "messages": [
+                {
+                    "role": "assistant",
+                    "content": (
+                        f"기존 이슈 #{duplicate['number']}로 안내해 드릴게요. "
+                        f"새 이슈는 만들지 않았습니다.\n{duplicate['url']}"
+                    ),
+                }
+            ],
+        }
+    if has_draft and content in _CONFIRMATION_KEYWORDS:
+        logger.info("Fast path: confirm (skipped analyze)")
+        return {"turn_type": "confirm", "completeness_status": "confirmed"}
+    if content in _ACKNOWLEDGEMENT_KEYWORDS:
+        if has_draft:
+            # Re-drafting would cost two LLM calls for no new information
+            logger.info("Fast path: acknowledgement with pending draft (skipped all LLM calls)")
+            return {
+                "turn_type": "ack",
+                "messages": [{"role": "assistant", "content": DRAFT_PENDING_MESSAGE}],
+            }
+        logger.info("Fast path: acknowledgement (skipped analyze)")
+        return {"turn_type": "ack"}
+
+    return {"turn_type": "content"}
@@ -2,21 +2,26 @@ from __future__ import annotations
 
 import logging
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
-
-from agent.prompts.draft import get_draft_prompt
-from agent.prompts.judge import get_judge_prompt
+from agent.llm import get_escalation_llm, get_llm_for, prompt_message, system_message
+from agent.prompts.draft import DRAFT_INSTRUCTIONS, get_draft_input
+from agent.prompts.draft_judge import DRAFT_JUDGE_INSTRUCTIONS
+from agent.prompts.judge import JUDGE_INSTRUCTIONS, get_judge_input
 from agent.prompts.system import SYSTEM_PROMPT
+from agent.schemas import AutoResolveJudgment, DraftWithJudgment, IssueDraft
 from agent.state import IssueState
-from agent.utils import ensure_str_content, parse_json_response
+from agent.structured import ainvoke_structured
 from config import settings
+from github.labels import get_label_catalog
 
 logger = logging.getLogger(__name__)
 
 
 async def generate_draft(state: IssueState) -> dict:
-    """Generate an issue draft and judge auto-resolve feasibility."""
+    """Generate an issue draft and judge auto-resolve feasibility.
+
+    In the default ``two_step`` mode the draft and the judgment are separate LLM
+    calls; with ``settings.draft_mode == "single_call"`` one call returns both.
+    """
     title = state.get("issue_title", "")
     description = state.get("issue_description", "")
     issue_type = state.get("issue_type", "")
@@ -27,16 +32,13 @@ async def generate_draft(state: IssueState) -> dict:
     actual = state.get("actual_behavior", "")
     env_info = state.get("environment_info", "")
     labels = state.get("labels", [])
+    catalog = get_label_catalog()
+    if catalog.loaded:
+        # Show and keep only labels the repository has; no API call involved
+        labels = catalog.resolve(labels)
 
-    llm = ChatAnthropic(
-        model=settings.llm_model,
-        max_tokens=settings.llm_max_tokens,
-        api_key=settings.anthropic_api_key,
-    )
-
-    # --- Step 1: Generate issue draft ---
     labels_text = ", ".join(labels) if labels else "없음"
-    draft_prompt = get_draft_prompt(
+    draft_input = get_draft_input(
         title=title,
         description=description,
         issue_type=issue_type,
@@ -49,35 +51,19 @@ async def generate_draft(state: IssueState) -> dict:
         labels_text=labels_text,
     )
 
-    draft_response = await llm.ainvoke(
-        [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=draft_prompt),
-        ]
-    )
-
-    draft_content = ensure_str_content(draft_response.content)
-    draft_data = parse_json_response(draft_content)
-    if draft_data is None:
-        draft_data = {"draft_title": title, "draft_body": description}
-
-    draft_title = draft_data.get("draft_title", title)
-    draft_body = draft_data.get("draft_body", description)
-
-    # --- Step 2: Judge auto-resolve ---
-    judge_prompt = get_judge_prompt(draft_title, draft_body, issue_type, affected_domain)
-    judge_response = await llm.ainvoke(
-        [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=judge_prompt),
-        ]
-    )
+    if settings.draft_mode == "single_call":
+        draft_data, judge_data = await _draft_and_judge(draft_input)
+        draft_title = (draft_data or {}).get("draft_title", title)
+        draft_body = (draft_data or {}).get("draft_body", description)
+    else:
+        draft_data = await _draft(draft_input)
+        draft_title = (draft_data or {}).get("draft_title", title)
+        draft_body = (draft_data or {}).get("draft_body", description)
+        judge_data = await _judge(draft_title, draft_body, issue_type, affected_domain)
 
     auto_resolve = False
     auto_resolve_reason = ""
     auto_resolve_confidence = "low"
-    judge_content = ensure_str_content(judge_response.content)
-    judge_data = parse_json_response(judge_content)
     if judge_data is not None:
         auto_resolve = judge_data.get("auto_resolve", False)
         auto_resolve_reason = judge_data.get("reason", "")
@@ -94,6 +80,20 @@ async def generate_draft(state: IssueState) -> dict:
     if auto_resolve_confidence == "medium" and auto_resolve:
         auto_resolve_text = "조건부 가능"
 
+    duplicates_text = ""
+    candidates = state.get("duplicate_candidates", [])
+    if candidates:
+        state_labels = {"open": "열림", "closed": "닫힘"}
+        lines = [
+            f"- #{c['number']} {c['title']} ({state_labels.get(c['state'], c['state'])}) {c['url']}"
+            for c in candidates
+        ]
+        duplicates_text = (
+            "**비슷한 기존 이슈가 있습니다.**\n"
+            + "\n".join(lines)
+            + "\n같은 문제라면 '중복' 또는 이슈 번호(예: #12)로 답해 주세요.\n\n"
+        )
+
     preview = (
         f"**이슈 초안이 작성되었습니다.**\n\n"
         f"**제목**: {draft_title}\n\n"
@@ -102,13 +102,70 @@ async def generate_draft(state: IssueState) -> dict:
         f"---\n\n"
         f"**자동 해결 판단**: {auto_resolve_text} (확신도: {confidence_text})\n"
         f"**사유**: {auto_resolve_reason}\n\n"
+        f"{duplicates_text}"
         f"이대로 이슈를 생성할까요? (확인/수정 요청)"
     )
 
     return {
         "draft_title": draft_title,
         "draft_body": draft_body,
+        "labels": labels,
         "auto_resolve": auto_resolve,
         "auto_resolve_reason": auto_resolve_reason,
         "messages": [{"role": "assistant", "content": preview}],
     }
+
+
+async def _draft(draft_input: str) -> dict | None:
+    """Step 1 of the two-step mode: generate the issue draft."""
+    return await ainvoke_structured(
+        "generate_draft",
+        "generate_draft",
+        get_llm_for("generate_draft"),
+        [
+            system_message(SYSTEM_PROMPT),
+            prompt_message(DRAFT_INSTRUCTIONS, draft_input),
+        ],
+        IssueDraft,
+        escalate_to=get_escalation_llm("generate_draft"),
+    )
+
+
+async def _judge(
+    draft_title: str, draft_body: str, issue_type: str, affected_domain: str
+) -> dict | None:
+    """Step 2 of the two-step mode: judge auto-resolve feasibility of the draft."""
+    judge_input = get_judge_input(draft_title, draft_body, issue_type, affected_domain)
+    return await ainvoke_structured(
+        "generate_draft",
+        "judge",
+        get_llm_for("judge"),
+        [
+            system_message(SYSTEM_PROMPT),
+            prompt_message(JUDGE_INSTRUCTIONS, judge_input),
+        ],
+        AutoResolveJudgment,
+        escalate_to=get_escalation_llm("judge"),
+    )
+
+
+async def _draft_and_judge(draft_input: str) -> tuple[dict | None, dict | None]:
+    """Single-call mode: one response carries both the draft and the judgment."""
+    data = await ainvoke_structured(
+        "generate_draft",
+        "draft_and_judge",
+        get_llm_for("generate_draft"),
+        [
+            system_message(SYSTEM_PROMPT),
+            prompt_message(DRAFT_JUDGE_INSTRUCTIONS, draft_input),
+        ],
+        DraftWithJudgment,
+        escalate_to=get_escalation_llm("generate_draft"),
+    )
+    if data is None:
+        return None, None
+    draft_data = {k: data[k] for k in ("draft_title", "draft_body")}
+    judge_data = {
+        k: data[k] for k in ("auto_resolve", "confidence", "reason") if data[k] is not None
+    }
+    return draft_data, judge_data or None
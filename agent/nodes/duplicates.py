@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+
+from agent.state import IssueState
+from config import settings
+from github.index import get_issue_index
+
+logger = logging.getLogger(__name__)
+
+
+def find_duplicates(state: IssueState) -> dict:
+    """Search the local issue index for existing issues matching the collected report.
+
+    Runs before drafting. Candidates are shown in the draft preview so the user
+    can link an existing issue instead of filing a new one. The index is never
+    loaded or synced here; until it is ready the check finds nothing.
+    """
+    index = get_issue_index()
+    if not settings.duplicate_check or not index.loaded:
+        return {"duplicate_candidates": []}
+
+    query = f"{state.get('issue_title', '')}\n{state.get('issue_description', '')}"
+    matches = index.search(
+        query, limit=settings.duplicate_max_results, min_score=settings.duplicate_min_score
+    )
+    if matches:
+        logger.info("Duplicate candidates: %s", [(m.number, m.score) for m in matches])
+    return {"duplicate_candidates": [asdict(m) for m in matches]}
@@ -1,21 +1,29 @@
-def get_analyze_prompt(message: str, context: str) -> str:
-    """Generate a prompt to analyze a user message and extract issue information.
+_CLASSIFICATION_CRITERIA = """\
+## 도메인 판단 기준
 
-    Args:
-        message: The latest user message.
-        context: Previous conversation context (formatted message history).
+- **auth**: 로그인, 회원가입, JWT, OAuth, 토큰, 인증, 인가 관련
+- **member**: 프로필, 회원 정보, 탈퇴, 닉네임 관련
+- **retrospect**: 회고방, 회고, 답변, 댓글, 좋아요, 참고자료, PDF, 초대코드, KPT/4L/5F/PMI/FREE 관련
+- **ai**: AI 분석, 어시스턴트, OpenAI, 프롬프트 관련
+- **webhook**: Discord/GitHub 웹훅, 알림 관련
+- **config**: 환경변수, DB 설정, CORS, 미들웨어 관련
+- **other**: 위 도메인에 해당하지 않는 경우
 
-    Returns:
-        The analysis prompt string.
-    """
-    return f"""\
-아래 사용자의 메시지를 분석하여 GitHub 이슈 정보를 추출하세요.
+## 심각도 판단 기준
 
-## 이전 대화 맥락
-{context}
+- **critical**: 서비스 전체 장애, 데이터 손실, 보안 취약점
+- **major**: 주요 기능 동작 불가, 사용자 경험 심각한 저하
+- **minor**: 사소한 UI 문제, 오타, 개선 사항
 
-## 최신 메시지
-{message}
+## 라벨 자동 부여 규칙
+
+- issue_type에 따라: bug → "bug", feature → "enhancement",
+  improvement → "improvement", question → "question"
+- affected_domain 값을 라벨에 추가 (예: "domain:retrospect")
+- severity가 critical이면 "priority:critical" 추가"""
+
+ANALYZE_INSTRUCTIONS = f"""\
+아래 사용자의 메시지를 분석하여 GitHub 이슈 정보를 추출하세요.
 
 ## 추출할 정보
 
@@ -36,27 +44,96 @@ def get_analyze_prompt(message: str, context: str) -> str:
 }}
 ```
 
-## 도메인 판단 기준
+{_CLASSIFICATION_CRITERIA}
 
-- **auth**: 로그인, 회원가입, JWT, OAuth, 토큰, 인증, 인가 관련
-- **member**: 프로필, 회원 정보, 탈퇴, 닉네임 관련
-- **retrospect**: 회고방, 회고, 답변, 댓글, 좋아요, 참고자료, PDF, 초대코드, KPT/4L/5F/PMI/FREE 관련
-- **ai**: AI 분석, 어시스턴트, OpenAI, 프롬프트 관련
-- **webhook**: Discord/GitHub 웹훅, 알림 관련
-- **config**: 환경변수, DB 설정, CORS, 미들웨어 관련
-- **other**: 위 도메인에 해당하지 않는 경우
+JSON만 출력하세요. 추가 설명은 불필요합니다."""
 
-## 심각도 판단 기준
 
-- **critical**: 서비스 전체 장애, 데이터 손실, 보안 취약점
-- **major**: 주요 기능 동작 불가, 사용자 경험 심각한 저하
-- **minor**: 사소한 UI 문제, 오타, 개선 사항
+INCREMENTAL_ANALYZE_INSTRUCTIONS = f"""\
+지금까지 추출된 이슈 정보와 이전 대화 요약, 그리고 마지막 분석 이후 새로 추가된 메시지가
+주어집니다. 새 메시지를 반영하여 이슈 정보를 갱신하세요.
 
-## 라벨 자동 부여 규칙
+## 출력 형식
 
-- issue_type에 따라: bug → "bug", feature → "enhancement",
-  improvement → "improvement", question → "question"
-- affected_domain 값을 라벨에 추가 (예: "domain:retrospect")
-- severity가 critical이면 "priority:critical" 추가
+```json
+{{
+    "updates": {{
+        "필드명": "새 값"
+    }},
+    "summary": "이전 요약에 새 메시지 내용을 반영한 대화 요약 (5문장 이내)"
+}}
+```
+
+## 갱신 가능한 필드
+
+- issue_title: 이슈 제목 (간결하고 명확하게)
+- issue_description: 이슈 설명 (상세하게)
+- issue_type: bug | feature | improvement | question
+- affected_domain: auth | member | retrospect | ai | webhook | config | other
+- severity: critical | major | minor
+- steps_to_reproduce, expected_behavior, actual_behavior: 버그인 경우
+- environment_info: 환경 정보 (OS, 브라우저 등)
+- labels: 라벨 배열
+
+## 갱신 규칙
+
+- 새 메시지로 새로 알게 되었거나 바뀐 필드만 updates에 포함하세요. 변경이 없는 필드는 생략하세요.
+- 사용자가 기존 값을 수정해 달라고 하면 해당 필드를 새 값으로 바꾸세요.
+- issue_description처럼 내용이 누적되는 필드는 기존 내용과 새 내용을 합친 전체 값을 반환하세요.
+
+{_CLASSIFICATION_CRITERIA}
 
 JSON만 출력하세요. 추가 설명은 불필요합니다."""
+
+
+def get_incremental_analyze_input(current_state: str, summary: str, new_messages: str) -> str:
+    """Render the per-turn part of the incremental analyze prompt.
+
+    Args:
+        current_state: JSON of the issue fields extracted so far.
+        summary: Rolling summary of the turns already analyzed.
+        new_messages: Formatted messages added since the last analysis.
+
+    Returns:
+        The sections that follow ``INCREMENTAL_ANALYZE_INSTRUCTIONS``.
+    """
+    return f"""\
+## 현재 이슈 정보
+{current_state}
+
+## 이전 대화 요약
+{summary}
+
+## 새 메시지
+{new_messages}"""
+
+
+def get_analyze_input(message: str, context: str) -> str:
+    """Render the per-turn part of the analyze prompt.
+
+    Args:
+        message: The latest user message.
+        context: Previous conversation context (formatted message history).
+
+    Returns:
+        The conversation sections that follow ``ANALYZE_INSTRUCTIONS``.
+    """
+    return f"""\
+## 이전 대화 맥락
+{context}
+
+## 최신 메시지
+{message}"""
+
+
+def get_analyze_prompt(message: str, context: str) -> str:
+    """Generate a prompt to analyze a user message and extract issue information.
+
+    Args:
+        message: The latest user message.
+        context: Previous conversation context (formatted message history).
+
+    Returns:
+        The analysis prompt string.
+    """
+    return f"{ANALYZE_INSTRUCTIONS}\n\n{get_analyze_input(message, context)}"
@@ -0,0 +1,30 @@
+from agent.prompts.judge import CONFIDENCE_CRITERIA, JUDGE_CRITERIA
+
+DRAFT_JUDGE_INSTRUCTIONS = f"""\
+아래 수집된 정보를 바탕으로 GitHub 이슈 초안을 작성하고, 작성한 이슈가
+AI(claude-code-action)로 자동 해결 가능한지 함께 판단하세요.
+
+## 초안 작성 규칙
+- 한국어로 작성하세요.
+- 이슈 본문은 마크다운 형식으로 작성하세요.
+- 기술 용어는 원어 그대로 사용하세요.
+- 버그인 경우 재현 단계, 기대 동작, 실제 동작을 포함하세요.
+- feature/improvement인 경우 배경, 제안, 기대 효과를 포함하세요.
+
+{JUDGE_CRITERIA}
+
+## 출력 형식
+
+```json
+{{
+    "draft_title": "이슈 제목",
+    "draft_body": "이슈 본문 (마크다운 형식, 한국어)",
+    "auto_resolve": true | false,
+    "confidence": "high | medium | low",
+    "reason": "판단 근거를 한국어로 1~2문장으로 설명"
+}}
+```
+
+{CONFIDENCE_CRITERIA}
+
+JSON만 출력하세요."""
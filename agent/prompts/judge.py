@@ -1,30 +1,4 @@
-def get_judge_prompt(
-    title: str,
-    description: str,
-    issue_type: str,
-    affected_domain: str,
-) -> str:
-    """Generate a prompt to judge whether an issue can be auto-resolved by AI.
-
-    Args:
-        title: Issue title.
-        description: Issue description.
-        issue_type: Type of issue (bug/feature/improvement/question).
-        affected_domain: Affected domain area.
-
-    Returns:
-        The judgment prompt string.
-    """
-    return f"""\
-아래 GitHub 이슈가 AI(claude-code-action)로 자동 해결 가능한지 판단하세요.
-
-## 이슈 정보
-
-- **제목**: {title}
-- **설명**: {description}
-- **유형**: {issue_type}
-- **도메인**: {affected_domain}
-
+JUDGE_CRITERIA = """\
 ## 판단 기준
 
 ### 자동 해결 가능 (auto_resolve: true)
@@ -57,7 +31,18 @@ def get_judge_prompt(
 - Rust/Axum 프로젝트이므로 타입 시스템이 엄격함
 - SeaORM 엔티티 변경은 마이그레이션 필요
 - handler → service → entity 레이어 구조를 따름
-- 에러는 AppError enum에 변형 추가 필요
+- 에러는 AppError enum에 변형 추가 필요"""
+
+CONFIDENCE_CRITERIA = """\
+- **confidence 기준**:
+  - high: 확실히 자동 해결 가능/불가능한 경우
+  - medium: 조건부로 가능하거나, 상세 스펙에 따라 달라지는 경우
+  - low: 판단이 어렵거나 추가 정보가 필요한 경우"""
+
+JUDGE_INSTRUCTIONS = f"""\
+아래 GitHub 이슈가 AI(claude-code-action)로 자동 해결 가능한지 판단하세요.
+
+{JUDGE_CRITERIA}
 
 ## 출력 형식
 
@@ -69,9 +54,53 @@ def get_judge_prompt(
 }}
 ```
 
-- **confidence 기준**:
-  - high: 확실히 자동 해결 가능/불가능한 경우
-  - medium: 조건부로 가능하거나, 상세 스펙에 따라 달라지는 경우
-  - low: 판단이 어렵거나 추가 정보가 필요한 경우
+{CONFIDENCE_CRITERIA}
 
 JSON만 출력하세요."""
+
+
+def get_judge_input(
+    title: str,
+    description: str,
+    issue_type: str,
+    affected_domain: str,
+) -> str:
+    """Render the per-issue part of the judge prompt.
+
+    Args:
+        title: Issue title.
+        description: Issue description.
+        issue_type: Type of issue (bug/feature/improvement/question).
+        affected_domain: Affected domain area.
+
+    Returns:
+        The issue section that follows ``JUDGE_INSTRUCTIONS``.
+    """
+    return f"""\
+## 이슈 정보
+
+- **제목**: {title}
+- **설명**: {description}
+- **유형**: {issue_type}
+- **도메인**: {affected_domain}"""
+
+
+def get_judge_prompt(
+    title: str,
+    description: str,
+    issue_type: str,
+    affected_domain: str,
+) -> str:
+    """Generate a prompt to judge whether an issue can be auto-resolved by AI.
+
+    Args:
+        title: Issue title.
+        description: Issue description.
+        issue_type: Type of issue (bug/feature/improvement/question).
+        affected_domain: Affected domain area.
+
+    Returns:
+        The judgment prompt string.
+    """
+    judge_input = get_judge_input(title, description, issue_type, affected_domain)
+    return f"{JUDGE_INSTRUCTIONS}\n\n{judge_input}"
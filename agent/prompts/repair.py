@@ -0,0 +1,16 @@
+def get_repair_prompt(errors: str) -> str:
+    """Generate a prompt asking the model to rewrite only the invalid fields of its answer.
+
+    Args:
+        errors: Bulleted list of invalid fields, each with the reason and the value received.
+
+    Returns:
+        The repair prompt string.
+    """
+    return f"""\
+위 응답에서 다음 필드가 형식에 맞지 않습니다.
+
+{errors}
+
+이 필드만 올바른 값으로 다시 작성하세요. 다른 필드는 포함하지 마세요.
+JSON만 출력하세요. 추가 설명은 불필요합니다."""
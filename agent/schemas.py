@@ -0,0 +1,76 @@
+"""Pydantic schemas for the JSON-producing LLM calls.
+
+Field types are taken from ``IssueState`` so the schema sent to the model
+(as a tool definition) and the validation applied to its answer stay in step
+with the graph state: an ``issue_type`` outside the ``Literal`` is rejected
+here instead of leaking into the state.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, get_type_hints
+
+from pydantic import Field, create_model
+
+from agent.state import IssueState
+
+_STATE_TYPES = get_type_hints(IssueState)
+
+Confidence = Literal["high", "medium", "low"]
+
+ISSUE_FIELD_KEYS = [
+    "issue_title",
+    "issue_description",
+    "issue_type",
+    "affected_domain",
+    "severity",
+    "steps_to_reproduce",
+    "expected_behavior",
+    "actual_behavior",
+    "environment_info",
+    "labels",
+]
+
+
+def _state_field(key: str, *, optional: bool = False) -> tuple:
+    annotation = _STATE_TYPES[key]
+    return (annotation | None, None) if optional else (annotation, ...)
+
+
+IssueFields = create_model(
+    "IssueFields",
+    __doc__="Issue information extracted from the conversation; unknown fields are null.",
+    **{key: _state_field(key, optional=True) for key in ISSUE_FIELD_KEYS},
+)
+
+IncrementalAnalysis = create_model(
+    "IncrementalAnalysis",
+    __doc__="Changed issue fields and the updated conversation summary.",
+    updates=(IssueFields, Field(default_factory=IssueFields)),
+    summary=(str | None, None),
+)
+
+IssueDraft = create_model(
+    "IssueDraft",
+    __doc__="GitHub issue draft.",
+    draft_title=_state_field("draft_title"),
+    draft_body=_state_field("draft_body"),
+)
+
+AutoResolveJudgment = create_model(
+    "AutoResolveJudgment",
+    __doc__="Whether the issue can be resolved automatically.",
+    auto_resolve=_state_field("auto_resolve"),
+    confidence=(Confidence, ...),
+    reason=_state_field("auto_resolve_reason"),
+)
+
+DraftWithJudgment = create_model(
+    "DraftWithJudgment",
+    __doc__="GitHub issue draft and its auto-resolve judgment; the judgment may be missing.",
+    draft_title=_state_field("draft_title"),
+    draft_body=_state_field("draft_body"),
+    auto_resolve=_state_field("auto_resolve", optional=True),
+    confidence=(Confidence | None, None),
+    reason=_state_field("auto_resolve_reason", optional=True),
+)
@@ -35,8 +35,18 @@ class IssueState(TypedDict, total=False):
     actual_behavior: str
     environment_info: str
 
+    # Incremental analysis
+    conversation_summary: str
+    analyzed_message_count: int
+
     # Workflow status
-    completeness_status: Literal["insufficient", "sufficient", "confirmed"]
+    turn_type: Literal["content", "confirm", "cancel", "ack", "duplicate"]
+    completeness_status: Literal[
+        "insufficient", "sufficient", "confirmed", "cancelled", "duplicate"
+    ]
+
+    # Existing issues that look like the same report
+    duplicate_candidates: list[dict]
 
     # Draft
     draft_title: str
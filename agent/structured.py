@@ -0,0 +1,228 @@
+"""Schema-validated LLM calls with one targeted repair.
+
+Nodes that expect JSON call ``ainvoke_structured()`` with a schema from
+``agent.schemas``:
+
+- With ``settings.llm_structured_output == "tool"`` the schema is bound as a
+  forced tool, so the model answers with tool arguments instead of free text.
+  Models without tool support (and the ``"json"`` setting) fall back to JSON
+  in the reply text.
+- The answer is validated with the Pydantic schema. If some fields are
+  invalid, the model is asked again for just those fields (at most
+  ``settings.llm_repair_attempts`` times) and the repaired values are merged
+  into the valid part of the first answer.
+- If an ``escalate_to`` model is given (a larger tier, see
+  ``agent.llm.get_escalation_llm()``), an answer still invalid after the
+  repair is asked for again from that model.
+- Otherwise, fields that are still invalid are dropped when the schema
+  allows it, so a mostly good answer is not thrown away.
+
+Every call is counted by outcome (``valid``, ``repaired``, ``escalated``,
+``partial`` or ``wasted``) in ``metrics.LLM_STRUCTURED_OUTPUTS``; an escalated
+call is counted again under the outcome of the larger model's answer. Before
+this module every answer that was not ``valid`` was wasted.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, ValidationError, create_model
+
+from agent.admission import ainvoke_admitted
+from agent.cache import cached_ainvoke, response_text
+from agent.llm import log_usage
+from agent.prompts.repair import get_repair_prompt
+from agent.utils import loads_fenced_json, parse_json_response
+from config import settings
+from metrics import LLM_STRUCTURED_OUTPUTS
+
+logger = logging.getLogger(__name__)
+
+# (path to the field, reason, value received); an empty path means the whole answer
+FieldError = tuple[tuple[str | int, ...], str, Any]
+
+_MAX_SHOWN_CHARS = 4000
+
+
+async def ainvoke_structured(
+    node: str,
+    call: str,
+    llm: BaseChatModel,
+    messages: list[BaseMessage],
+    schema: type[BaseModel],
+    *,
+    escalate_to: BaseChatModel | None = None,
+) -> dict | None:
+    """Call ``llm`` for an answer matching ``schema``, repairing invalid fields once.
+
+    Args:
+        node: Graph node making the call, for the response cache.
+        call: Name of the call in usage logs and metrics (e.g. ``"judge"``).
+        llm: Chat model to call.
+        messages: Request messages.
+        schema: Pydantic model the answer must validate against.
+        escalate_to: Model that answers from scratch if ``llm``'s answer is
+            still invalid after the repair.
+
+    Returns:
+        The validated answer as a dict, possibly without fields that could
+        not be repaired, or ``None`` if nothing usable came back.
+    """
+    response = await cached_ainvoke(
+        node, _bind_schema(llm, schema), messages, cacheable=lambda text: _valid(schema, text)
+    )
+    log_usage(call, response)
+    payload = _payload(response)
+    data, errors = _validate(schema, payload)
+    if not errors:
+        LLM_STRUCTURED_OUTPUTS.inc(call=call, outcome="valid")
+        return data
+
+    shown = response_text(response)[:_MAX_SHOWN_CHARS]
+    for _ in range(settings.llm_repair_attempts):
+        logger.info("%s answer has invalid fields %s; asking again", call, _paths(errors))
+        patch = await _repair(node, call, llm, messages, shown, schema, errors)
+        if payload is None:
+            payload = patch
+        else:
+            payload = _merge(_without(payload, [path for path, _, _ in errors]), patch or {})
+        data, errors = _validate(schema, payload)
+        if not errors:
+            LLM_STRUCTURED_OUTPUTS.inc(call=call, outcome="repaired")
+            return data
+        shown = json.dumps(payload, ensure_ascii=False)[:_MAX_SHOWN_CHARS]
+
+    if escalate_to is not None:
+        logger.warning("%s answer still has invalid fields %s; escalating", call, _paths(errors))
+        LLM_STRUCTURED_OUTPUTS.inc(call=call, outcome="escalated")
+        return await ainvoke_structured(node, call, escalate_to, messages, schema)
+
+    if payload is not None and all(path for path, _, _ in errors):
+        data, remaining = _validate(schema, _without(payload, [path for path, _, _ in errors]))
+        if not remaining:
+            logger.warning("%s answer used without invalid fields %s", call, _paths(errors))
+            LLM_STRUCTURED_OUTPUTS.inc(call=call, outcome="partial")
+            return data
+
+    logger.warning("%s answer discarded; invalid fields %s", call, _paths(errors))
+    LLM_STRUCTURED_OUTPUTS.inc(call=call, outcome="wasted")
+    return None
+
+
+async def _repair(
+    node: str,
+    call: str,
+    llm: BaseChatModel,
+    messages: list[BaseMessage],
+    shown: str,
+    schema: type[BaseModel],
+    errors: list[FieldError],
+) -> dict | None:
+    """Ask for the invalid fields only; the request repeats the cached prompt prefix."""
+    paths = [path for path, _, _ in errors]
+    repair_schema = schema if not all(paths) else _subset(schema, paths)
+    lines = "\n".join(
+        f"- {'.'.join(map(str, path)) or '응답 전체'}: {reason} "
+        f"(받은 값: {json.dumps(value, ensure_ascii=False, default=str)[:200]})"
+        for path, reason, value in errors
+    )
+    repair_messages = [
+        *messages,
+        AIMessage(content=shown or "(빈 응답)"),
+        HumanMessage(content=[{"type": "text", "text": get_repair_prompt(lines)}]),
+    ]
+    response = await ainvoke_admitted(node, _bind_schema(llm, repair_schema), repair_messages)
+    log_usage(f"{call}_repair", response)
+    return _payload(response)
+
+
+def _bind_schema(llm: BaseChatModel, schema: type[BaseModel]) -> Runnable:
+    """Force a tool call with ``schema`` as arguments, if configured and supported."""
+    if settings.llm_structured_output != "tool":
+        return llm
+    try:
+        return llm.bind_tools([schema], tool_choice=schema.__name__)
+    except NotImplementedError:
+        return llm
+
+
+def _payload(response: BaseMessage) -> dict | None:
+    tool_calls = getattr(response, "tool_calls", None)
+    if tool_calls:
+        return tool_calls[0]["args"]
+    data = parse_json_response(response_text(response))
+    return data if isinstance(data, dict) else None
+
+
+def _validate(
+    schema: type[BaseModel], payload: dict | None
+) -> tuple[dict | None, list[FieldError]]:
+    if payload is None:
+        return None, [((), "JSON 객체로 파싱할 수 없습니다", None)]
+    try:
+        return schema.model_validate(payload).model_dump(), []
+    except ValidationError as exc:
+        return None, [(tuple(e["loc"]), e["msg"], e.get("input")) for e in exc.errors()]
+
+
+def _valid(schema: type[BaseModel], text: str) -> bool:
+    try:
+        schema.model_validate(loads_fenced_json(text))
+    except (json.JSONDecodeError, ValidationError):
+        return False
+    return True
+
+
+def _paths(errors: list[FieldError]) -> list[str]:
+    return [".".join(map(str, path)) or "*" for path, _, _ in errors]
+
+
+def _field_path(path: tuple[str | int, ...]) -> tuple[str, ...]:
+    """Cut a path at the first list index: a bad list item invalidates the whole list."""
+    cut: list[str] = []
+    for part in path:
+        if not isinstance(part, str):
+            break
+        cut.append(part)
+    return tuple(cut)
+
+
+def _subset(schema: type[BaseModel], paths: list[tuple[str | int, ...]]) -> type[BaseModel]:
+    """Build a schema holding only the fields at ``paths``, all required."""
+    fields: dict[str, Any] = {}
+    field_paths = [_field_path(path) for path in paths]
+    for name in dict.fromkeys(path[0] for path in field_paths if path):
+        annotation = schema.model_fields[name].annotation
+        nested = [path[1:] for path in field_paths if path[:1] == (name,) and len(path) > 1]
+        if nested and isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            annotation = _subset(annotation, nested)
+        fields[name] = (annotation, ...)
+    return create_model(f"{schema.__name__}Repair", __doc__=schema.__doc__, **fields)
+
+
+def _without(payload: dict, paths: list[tuple[str | int, ...]]) -> dict:
+    result = copy.deepcopy(payload)
+    for path in map(_field_path, paths):
+        node: Any = result
+        for part in path[:-1]:
+            node = node.get(part) if isinstance(node, dict) else None
+        if path and isinstance(node, dict):
+            node.pop(path[-1], None)
+    return result
+
+
+def _merge(base: dict, patch: dict) -> dict:
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
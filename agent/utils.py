@@ -1,9 +1,10 @@
 import json
 import logging
+import math
 
-logger = logging.getLogger(__name__)
+from metrics import JSON_PARSE_FAILURES, current_node
 
-MAX_MESSAGE_LENGTH = 4000
+logger = logging.getLogger(__name__)
 
 
 def parse_json_response(text: str) -> dict | None:
@@ -12,19 +13,37 @@ def parse_json_response(text: str) -> dict | None:
     Args:
         text: Raw LLM response text, possibly wrapped in markdown code fences.
 
+    Failures are logged and counted per graph node in
+    ``metrics.JSON_PARSE_FAILURES``.
+
     Returns:
         Parsed dict, or None if parsing fails.
     """
+    try:
+        return loads_fenced_json(text)
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse LLM response as JSON: %s", text[:200])
+        JSON_PARSE_FAILURES.inc(node=current_node.get())
+        return None
+
+
+def is_json_response(text: str) -> bool:
+    """Return whether ``parse_json_response`` would succeed, without logging or counting."""
+    try:
+        loads_fenced_json(text)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+def loads_fenced_json(text: str) -> dict:
+    """Parse JSON that may be wrapped in code fences; raises ``json.JSONDecodeError``."""
     content = text
     if "```json" in content:
         content = content.split("```json", 1)[1].split("```", 1)[0]
     elif "```" in content:
         content = content.split("```", 1)[1].split("```", 1)[0]
-    try:
-        return json.loads(content.strip())
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse LLM response as JSON: %s", text[:200])
-        return None
+    return json.loads(content.strip())
 
 
 def ensure_str_content(content: str | list) -> str:
@@ -54,16 +73,19 @@ def ensure_str_content(content: str | list) -> str:
     return str(content)
 
 
-def truncate_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> str:
-    """Truncate a message to a maximum length.
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without calling a tokenizer.
 
     Args:
-        text: The text to truncate.
-        max_length: Maximum allowed length.
+        text: The text to measure.
 
     Returns:
-        Truncated text.
+        Approximate number of tokens.
     """
-    if len(text) <= max_length:
-        return text
-    return text[:max_length]
+    if text.isascii():
+        return math.ceil(len(text) / 4)
+    # Hangul, CJK and kana (three UTF-8 bytes each) are close to one token per
+    # character; other text is ~4 chars/token. Counting encoded bytes is far
+    # cheaper than matching the wide ranges with a regex.
+    wide = (len(text.encode()) - len(text)) // 2
+    return wide + math.ceil((len(text) - wide) / 4)
@@ -0,0 +1 @@
+"""Standalone benchmarks. Run with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,100 @@
+"""Prompt size of the analyze node as a conversation grows.
+
+Replays a synthetic conversation turn by turn through ``analyze`` in the
+``full`` and ``incremental`` modes with a stubbed model, and prints the
+estimated prompt tokens (system prompt included) sent on each turn along with
+the cumulative total. The full transcript grows linearly per turn, so the
+cumulative cost grows with the square of the turn count; the incremental
+prompt stays flat.
+
+    python -m benchmarks.analyze_prompt_growth --turns 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Any
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+from langchain_core.messages import BaseMessage  # noqa: E402
+
+from agent.llm import set_llm  # noqa: E402
+from agent.nodes.analyze import analyze  # noqa: E402
+from agent.state import IssueState  # noqa: E402
+from agent.utils import ensure_str_content, estimate_tokens  # noqa: E402
+from config import settings  # noqa: E402
+
+USER_TURN = (
+    "회고방에서 답변을 저장하면 {n}번째 시도에서도 500 에러가 나고, 새로고침하면 입력이 사라집니다."
+)
+ASSISTANT_TURN = (
+    "확인 감사합니다. {n}번째 시도 때 사용하신 브라우저와 회고 방식(KPT, 4L 등)을 알려주시겠어요?"
+)
+SUMMARY = (
+    "사용자가 회고 답변 저장 시 500 에러와 입력 유실을 반복적으로 보고함. 브라우저 정보 확인 중."
+)
+
+
+class MeasuringModel(FakeListChatModel):
+    """Fake model that records the estimated prompt tokens of each call."""
+
+    prompt_tokens: list[int] = []
+
+    def _call(self, messages: list[BaseMessage], *args: Any, **kwargs: Any) -> str:
+        text = "".join(ensure_str_content(m.content) for m in messages)
+        self.prompt_tokens.append(estimate_tokens(text))
+        return super()._call(messages, *args, **kwargs)
+
+
+async def _replay(mode: str, turns: int) -> list[int]:
+    settings.analyze_mode = mode  # type: ignore[assignment]
+    if mode == "incremental":
+        response = json.dumps({"updates": {"issue_type": "bug"}, "summary": SUMMARY})
+    else:
+        response = json.dumps({"issue_type": "bug", "affected_domain": "retrospect"})
+    model = MeasuringModel(responses=[response], prompt_tokens=[])
+    set_llm(model)
+
+    state: IssueState = {"messages": []}
+    for n in range(1, turns + 1):
+        state["messages"] = state["messages"] + [{"role": "user", "content": USER_TURN.format(n=n)}]
+        state = {**state, **await analyze(state)}
+        state["messages"] = state["messages"] + [
+            {"role": "assistant", "content": ASSISTANT_TURN.format(n=n)}
+        ]
+
+    set_llm(None)
+    return model.prompt_tokens
+
+
+async def _run(turns: int) -> None:
+    full = await _replay("full", turns)
+    incremental = await _replay("incremental", turns)
+
+    print(f"{'turn':>4}  {'full':>7}  {'incr':>7}  {'full cum':>9}  {'incr cum':>9}")
+    full_total = incremental_total = 0
+    for turn, (f, i) in enumerate(zip(full, incremental, strict=True), start=1):
+        full_total += f
+        incremental_total += i
+        if turn == 1 or turn % 5 == 0 or turn == turns:
+            print(f"{turn:>4}  {f:>7}  {i:>7}  {full_total:>9}  {incremental_total:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    asyncio.run(_run(parser.parse_args().turns))
+
+
+if __name__ == "__main__":
+    main()
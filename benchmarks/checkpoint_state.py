@@ -0,0 +1,153 @@
+"""Per-turn state copy and persistence cost: whole-state sessions vs checkpoints.
+
+For threads that already hold ``--lengths`` messages, runs turns of a graph
+with the bot's ``IssueState`` schema whose one node appends a reply, so the
+time measured is what the bot spends moving state around a turn rather than
+in the nodes:
+
+- ``session``: the previous approach. The stored state is copied with the new
+  message appended, passed whole to the graph, and the result is written
+  back as JSON to ``SQLiteSessionStore``.
+- ``checkpoint-memory`` / ``checkpoint-sqlite``: the graph runs with one of
+  the checkpointers ``agent.checkpoint`` uses, gets only the new message,
+  writes one checkpoint and prunes the older one. The memory saver writes the
+  changed channels; the SQLite saver writes the whole state.
+
+Reports microseconds per turn and bytes written per turn.
+
+    python -m benchmarks.checkpoint_state --lengths 10 100 1000 --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "1000")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+import aiosqlite  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+from langgraph.graph.state import CompiledStateGraph  # noqa: E402
+
+from agent.checkpoint import Saver, prune, thread_config  # noqa: E402
+from agent.state import IssueState  # noqa: E402
+from bot.store import SQLiteSessionStore  # noqa: E402
+
+_USER = "저장 버튼을 누르면 500 에러가 발생하고, 새로고침해도 같은 화면에서 멈춥니다."
+_REPLY = "어느 화면의 어떤 기능에서 발생하는지, 재현 절차를 알려주실 수 있을까요?"
+
+
+def _reply(state: IssueState) -> IssueState:
+    return {"messages": [{"role": "assistant", "content": _REPLY}]}
+
+
+def _graph(checkpointer: Saver | None) -> CompiledStateGraph:
+    graph = StateGraph(IssueState)
+    graph.add_node("reply", _reply)
+    graph.set_entry_point("reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def _state(length: int) -> IssueState:
+    messages = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": _USER if i % 2 == 0 else _REPLY}
+        for i in range(length)
+    ]
+    return {
+        "messages": messages,
+        "thread_id": "1",
+        "user_id": "2",
+        "issue_title": "회고 저장 시 500 에러",
+        "issue_description": "회고 목록 화면에서 저장 버튼을 누르면 500 에러가 납니다.",
+        "issue_type": "bug",
+        "affected_domain": "retrospect",
+        "labels": ["bug", "domain/retrospect"],
+        "conversation_summary": _USER * 4,
+        "completeness_status": "insufficient",
+    }
+
+
+async def _session_turns(length: int, turns: int, tmp: Path) -> tuple[float, int]:
+    store = SQLiteSessionStore(str(tmp / "sessions.db"))
+    graph = _graph(None)
+    state = _state(length)
+    written = 0
+    start = time.perf_counter()
+    for _ in range(turns):
+        turn_state = {**state, "messages": state["messages"] + [{"role": "user", "content": _USER}]}
+        state = await graph.ainvoke(turn_state)
+        payload = json.dumps(state)
+        written += len(payload.encode())
+        await asyncio.to_thread(store.write, {1: payload}, [])
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed, written
+
+
+async def _checkpoint_turns(saver: Saver, length: int, turns: int) -> tuple[float, int]:
+    graph = _graph(saver)
+    await graph.ainvoke(_state(length), thread_config(1), durability="exit")
+    checkpoint_id = await prune(saver, "1")
+    written = 0
+    dumps_typed = saver.serde.dumps_typed
+
+    def counting_dumps(value: object) -> tuple[str, bytes]:
+        nonlocal written
+        typed = dumps_typed(value)
+        written += len(typed[1])
+        return typed
+
+    saver.serde.dumps_typed = counting_dumps  # type: ignore[method-assign]
+    start = time.perf_counter()
+    for _ in range(turns):
+        turn_input: IssueState = {"messages": [{"role": "user", "content": _USER}]}
+        await graph.ainvoke(turn_input, thread_config(1, checkpoint_id), durability="exit")
+        checkpoint_id = await prune(saver, "1")
+        written += len(json.dumps({"checkpoint_id": checkpoint_id}))
+    elapsed = time.perf_counter() - start
+    saver.serde.dumps_typed = dumps_typed  # type: ignore[method-assign]
+    return elapsed, written
+
+
+async def _run(args: argparse.Namespace) -> None:
+    print(f"{'messages':>8} {'mode':>18} {'us/turn':>10} {'bytes/turn':>11}")
+    for length in args.lengths:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = {
+                "session": await _session_turns(length, args.turns, Path(tmp)),
+                "checkpoint-memory": await _checkpoint_turns(InMemorySaver(), length, args.turns),
+            }
+            async with aiosqlite.connect(str(Path(tmp) / "checkpoints.db")) as conn:
+                results["checkpoint-sqlite"] = await _checkpoint_turns(
+                    AsyncSqliteSaver(conn), length, args.turns
+                )
+        for mode, (elapsed, written) in results.items():
+            print(
+                f"{length:>8} {mode:>18} {elapsed / args.turns * 1e6:>10.0f} "
+                f"{written // args.turns:>11}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
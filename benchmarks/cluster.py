@@ -0,0 +1,309 @@
+"""Turn throughput of cluster mode with 1..N agent worker processes.
+
+Runs a ``ClusterRouter`` in this process and starts each worker as
+``python -m benchmarks.cluster --worker-index I``. Workers run the real
+``bot.worker.create_worker`` handlers, graph and session manager against the
+fakes of ``benchmarks.load``: an in-memory Discord thread per conversation,
+a rules-based LLM with ``--ttft`` latency, and a local GitHub API. Sessions
+are shared through one SQLite file, as in production.
+
+Each conversation opens a thread and answers until the draft is shown (no
+confirmation, so no issues are created). A worker prints ``done <thread id>``
+when a turn's reply has been delivered; the driver sends the next message
+then. For every worker count the benchmark reports turns per second, turn
+latency percentiles and how evenly the hash ring spread the threads.
+
+Throughput only scales with workers while the host has idle cores: the fake
+LLM answers almost at once, so each worker is bound by its own CPU.
+
+    python -m benchmarks.cluster --workers 1 2 4 --threads 200 --turns 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "1000")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+os.environ.setdefault("LLM_CACHE_NODES", "[]")
+os.environ.setdefault("MESSAGE_DEBOUNCE_SECONDS", "0")
+os.environ.setdefault("DUPLICATE_CHECK", "false")
+os.environ.setdefault("METRICS_PORT", "0")
+# The token budget is split between workers; leave it off to measure CPU scaling
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+
+import agent.llm  # noqa: E402
+import bot.events  # noqa: E402
+from benchmarks.load import (  # noqa: E402
+    DEFAULT_OUTPUT_DIR,
+    FakeBot,
+    FakeChatAnthropic,
+    FakeGitHubApi,
+    FakeThread,
+    _git_commit,
+    _percentiles,
+    _script,
+    _start_server,
+)
+from bot.cluster import ClusterRouter, HashRing, worker_name  # noqa: E402
+from bot.outbound import aclose_outbound, get_outbound  # noqa: E402
+from bot.session import session_manager  # noqa: E402
+from bot.worker import apply_worker_settings, create_worker  # noqa: E402
+from config import settings  # noqa: E402
+from github.client import aclose_github  # noqa: E402
+
+_DONE = "done"
+
+
+# ---------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------
+
+
+async def _run_worker(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    apply_worker_settings(args.worker_index)
+    agent.llm.set_llm(
+        FakeChatAnthropic(ttft=args.ttft, per_token=args.per_token, seed=args.worker_index)
+    )
+    runner, settings.github_api_url = await _start_server(FakeGitHubApi(args.discord_latency))
+
+    fake_bot = FakeBot()
+    bot.events.setup_events(fake_bot)  # type: ignore[arg-type]
+    run_agent_and_reply = bot.events._run_agent_and_reply
+
+    async def instrumented(thread: Any, *a: Any, **kw: Any) -> None:
+        try:
+            await run_agent_and_reply(thread, *a, **kw)
+        finally:
+            await get_outbound().flush(thread)
+            print(f"{_DONE} {thread.id}", flush=True)
+
+    bot.events._run_agent_and_reply = instrumented  # type: ignore[assignment]
+
+    def thread(thread_id: int) -> FakeThread:
+        if thread_id not in fake_bot.threads:
+            fake_bot.threads[thread_id] = FakeThread(thread_id, args.discord_latency)
+        return fake_bot.threads[thread_id]
+
+    try:
+        await create_worker(args.worker_index, thread).run("127.0.0.1", args.port)
+    finally:
+        await session_manager.close()
+        await aclose_outbound()
+        await aclose_github()
+        await runner.cleanup()
+
+
+# ---------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------
+
+
+class _Workers:
+    """Worker subprocesses and the turn completions they report."""
+
+    def __init__(self) -> None:
+        self.processes: list[asyncio.subprocess.Process] = []
+        self.done: dict[int, asyncio.Queue[None]] = {}
+        self._readers: list[asyncio.Task] = []
+
+    async def start(self, count: int, port: int, args: argparse.Namespace, tmp: str) -> None:
+        env = {
+            **os.environ,
+            "CLUSTER_WORKERS": str(count),
+            "SESSION_DB_PATH": str(Path(tmp) / "sessions.db"),
+            "LLM_CACHE_DB_PATH": str(Path(tmp) / "llm_cache.db"),
+            "ISSUE_QUEUE_DB_PATH": str(Path(tmp) / "issue_jobs.db"),
+            "ISSUE_INDEX_DB_PATH": str(Path(tmp) / "issue_index.db"),
+        }
+        for index in range(count):
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "benchmarks.cluster",
+                "--worker-index",
+                str(index),
+                "--port",
+                str(port),
+                "--ttft",
+                str(args.ttft),
+                "--per-token",
+                str(args.per_token),
+                "--discord-latency",
+                str(args.discord_latency),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+            )
+            self.processes.append(process)
+            self._readers.append(asyncio.create_task(self._read(process)))
+
+    def queue(self, thread_id: int) -> asyncio.Queue[None]:
+        return self.done.setdefault(thread_id, asyncio.Queue())
+
+    async def _read(self, process: asyncio.subprocess.Process) -> None:
+        assert process.stdout is not None
+        while line := await process.stdout.readline():
+            kind, _, thread_id = line.decode().partition(" ")
+            if kind == _DONE:
+                self.queue(int(thread_id)).put_nowait(None)
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        for process in self.processes:
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+        await asyncio.gather(*self._readers, return_exceptions=True)
+
+
+async def _conversation(
+    n: int,
+    router: ClusterRouter,
+    workers: _Workers,
+    args: argparse.Namespace,
+    turns: list[float],
+    rng: random.Random,
+) -> bool:
+    await asyncio.sleep(args.ramp * n / max(1, args.threads))
+    thread_id = 10_000 + n
+    # Stop before the confirmation so the run never creates issues
+    script = _script(n, args.turns + 1, rng)[:-1]
+    done = workers.queue(thread_id)
+    for i, content in enumerate(script):
+        if i:
+            await asyncio.sleep(args.think * rng.uniform(0.5, 1.5))
+            event = {"type": "message", "thread_id": thread_id, "content": content}
+        else:
+            event = {"type": "open", "thread_id": thread_id, "user_id": 100_000 + n}
+            event["content"] = content
+        start = time.perf_counter()
+        if not await router.route(event):
+            return False
+        try:
+            await asyncio.wait_for(done.get(), args.turn_timeout)
+        except TimeoutError:
+            return False
+        turns.append(time.perf_counter() - start)
+    return True
+
+
+async def _run_cluster(count: int, args: argparse.Namespace) -> dict[str, Any]:
+    router = ClusterRouter()
+    server = await router.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    workers = _Workers()
+    with tempfile.TemporaryDirectory() as tmp:
+        await workers.start(count, port, args, tmp)
+        deadline = time.monotonic() + args.start_timeout
+        while len(router.workers) < count:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"only {len(router.workers)} of {count} workers connected")
+            await asyncio.sleep(0.1)
+
+        turns: list[float] = []
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        completed = await asyncio.gather(
+            *(
+                _conversation(n, router, workers, args, turns, random.Random(rng.random()))
+                for n in range(args.threads)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        ring = HashRing(router.workers)
+        spread = Counter(ring.owner(10_000 + n) for n in range(args.threads))
+
+        await router.close()
+        await workers.stop()
+
+    return {
+        "workers": count,
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(len(turns) / elapsed, 2),
+        "turn_latency": _percentiles(turns),
+        "failed_conversations": completed.count(False),
+        "threads_per_worker": {worker_name(i): spread[worker_name(i)] for i in range(count)},
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    logging.basicConfig(level=logging.ERROR)
+    runs = [await _run_cluster(count, args) for count in args.workers]
+    return {
+        "benchmark": "cluster",
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            **{key: value for key, value in vars(args).items() if key not in ("output",)},
+            "cpu_count": os.cpu_count(),
+        },
+        "results": runs,
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"commit {report['commit']}  cpus={report['config']['cpu_count']}")
+    base = report["results"][0]["turns_per_second"] if report["results"] else 0
+    for run in report["results"]:
+        latency = run["turn_latency"]
+        line = f"{run['turns_per_second']:8.2f} turns/s"
+        if base:
+            line += f"  x{run['turns_per_second'] / base:.2f}"
+        if latency:
+            line += "  " + "  ".join(f"{p}={latency[p]:.3f}s" for p in ("p50", "p95", "p99"))
+        line += f"  failed={run['failed_conversations']}"
+        print(f"{run['workers']:>3} workers: {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to run"
+    )
+    parser.add_argument("--threads", type=int, default=200, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=3, help="user messages per conversation")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between turns")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds to start all threads")
+    parser.add_argument("--ttft", type=float, default=0.05, help="median seconds to first token")
+    parser.add_argument("--per-token", type=float, default=0.0, help="seconds per output token")
+    parser.add_argument("--discord-latency", type=float, default=0.0, help="seconds per call")
+    parser.add_argument("--turn-timeout", type=float, default=120.0)
+    parser.add_argument("--start-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    parser.add_argument("--worker-index", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.turns = max(2, args.turns)
+
+    if args.worker_index is not None:
+        asyncio.run(_run_worker(args))
+        return
+
+    report = asyncio.run(_run(args))
+    _print_report(report)
+    output = args.output or DEFAULT_OUTPUT_DIR / f"cluster-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
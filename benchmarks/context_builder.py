@@ -0,0 +1,79 @@
+"""Prompt transcript size and build time of ``agent.context.build_context``.
+
+For synthetic threads of ``--lengths`` messages, compares the estimated tokens
+of the transcript the nodes used to send (every message joined, each cut at
+4000 characters) with the budgeted one from ``build_context``, and times the
+builder. ``cold`` is the first build of a thread, with empty per-message
+caches (messages arriving from a checkpoint); ``warm`` is a rebuild, as on the
+next turn of the same worker.
+
+    python -m benchmarks.context_builder --lengths 10 100 1000 --budget 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from agent.context import _render, build_context, clip_tokens  # noqa: E402
+from agent.state import Message  # noqa: E402
+from agent.utils import estimate_tokens  # noqa: E402
+from config import settings  # noqa: E402
+
+_USER = (
+    "회고방에서 답변을 저장하면 {n}번째 시도에서도 500 에러가 나고, 새로고침하면 입력이 사라집니다."
+)
+_ASSISTANT = "확인 감사합니다. {n}번째 시도 때 사용하신 브라우저와 회고 방식을 알려주시겠어요?"
+
+
+def _thread(length: int) -> list[Message]:
+    return [
+        {"role": "user", "content": _USER.format(n=i // 2)}
+        if i % 2 == 0
+        else {"role": "assistant", "content": _ASSISTANT.format(n=i // 2)}
+        for i in range(length)
+    ]
+
+
+def _timed(messages: list[Message], budget: int, rounds: int, cold: bool) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        if cold:
+            _render.cache_clear()
+            clip_tokens.cache_clear()
+        start = time.perf_counter()
+        build_context(messages, budget, "", settings.llm_message_max_tokens)
+        elapsed += time.perf_counter() - start
+    return elapsed / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--budget", type=int, default=settings.llm_analyze_context_tokens)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'messages':>8} {'joined tok':>10} {'built tok':>9} {'cold us':>8} {'warm us':>8}")
+    for length in args.lengths:
+        messages = _thread(length)
+        joined = "\n".join(f"[{m['role']}]: {m['content'][:4000]}" for m in messages)
+        built = build_context(messages, args.budget, "", settings.llm_message_max_tokens)
+        cold = _timed(messages, args.budget, args.rounds, cold=True)
+        warm = _timed(messages, args.budget, args.rounds, cold=False)
+        print(
+            f"{length:>8} {estimate_tokens(joined):>10} {estimate_tokens(built):>9} "
+            f"{cold:>8.0f} {warm:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Offline evaluation of the two-step and single-call draft modes.
+
+Runs ``generate_draft`` over a fixed set of issues in both modes against a
+stubbed chat model, then reports per-turn latency, LLM calls per draft and how
+often the two modes agree on the auto-resolve judgment.
+
+The stub answers from keyword rules and simulates latency as time-to-first-token
+plus a per-output-token cost, so the numbers show the structural difference
+between the modes (one round-trip instead of two). ``--judge-noise`` flips a
+fraction of judgments to exercise the agreement metric.
+
+    python -m benchmarks.draft_modes --judge-noise 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from typing import Any
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun  # noqa: E402
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+from agent.llm import set_llm  # noqa: E402
+from agent.nodes.draft import generate_draft  # noqa: E402
+from agent.prompts.draft import DRAFT_INSTRUCTIONS  # noqa: E402
+from agent.prompts.draft_judge import DRAFT_JUDGE_INSTRUCTIONS  # noqa: E402
+from agent.prompts.judge import JUDGE_INSTRUCTIONS  # noqa: E402
+from agent.state import IssueState  # noqa: E402
+from config import settings  # noqa: E402
+
+CASES: list[IssueState] = [
+    {
+        "issue_title": "에러 메시지 오타",
+        "issue_description": "회고방 생성 실패 시 에러 메시지에 오타가 있습니다.",
+        "issue_type": "bug",
+        "affected_domain": "retrospect",
+    },
+    {
+        "issue_title": "CORS 도메인 추가",
+        "issue_description": "스테이징 프론트 도메인을 CORS 허용 목록에 추가해야 합니다.",
+        "issue_type": "improvement",
+        "affected_domain": "config",
+    },
+    {
+        "issue_title": "애플 로그인 지원",
+        "issue_description": "새로운 OAuth 프로바이더로 애플 로그인을 연동하고 싶습니다.",
+        "issue_type": "feature",
+        "affected_domain": "auth",
+    },
+    {
+        "issue_title": "회고 목록 조회 느림",
+        "issue_description": "회고가 많은 회고방에서 목록 조회 쿼리 최적화가 필요합니다.",
+        "issue_type": "improvement",
+        "affected_domain": "retrospect",
+    },
+    {
+        "issue_title": "닉네임 null 체크 누락",
+        "issue_description": "닉네임이 없는 회원 프로필 조회 시 500 에러가 납니다.",
+        "issue_type": "bug",
+        "affected_domain": "member",
+    },
+    {
+        "issue_title": "권한 체계 개편",
+        "issue_description": "회고방 OWNER/MEMBER 권한 체계 수정이 필요합니다.",
+        "issue_type": "feature",
+        "affected_domain": "retrospect",
+    },
+    {
+        "issue_title": "AI 분석 로깅 추가",
+        "issue_description": "OpenAI 호출 실패 시 원인을 알 수 있도록 로깅 추가가 필요합니다.",
+        "issue_type": "improvement",
+        "affected_domain": "ai",
+    },
+    {
+        "issue_title": "웹훅 알림 누락",
+        "issue_description": "Discord 웹훅 알림이 가끔 누락되는데 원인이 모호합니다.",
+        "issue_type": "bug",
+        "affected_domain": "webhook",
+    },
+]
+
+_RESOLVABLE = ("오타", "CORS", "null 체크", "로깅")
+_UNRESOLVABLE = ("OAuth 프로바이더", "최적화", "권한 체계", "모호")
+
+
+class StubDraftModel(BaseChatModel):
+    """Chat model that answers draft/judge prompts from keyword rules."""
+
+    ttft: float = 0.4
+    per_token: float = 0.004
+    judge_noise: float = 0.0
+    seed: int = 0
+    calls: int = 0
+    rng: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-draft"
+
+    def _generate(self, messages: list[BaseMessage], **kwargs: Any) -> ChatResult:
+        raise NotImplementedError("use ainvoke")
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+        self.calls += 1
+        instructions, turn_input = (block["text"] for block in messages[-1].content)
+
+        data: dict[str, Any] = {}
+        if instructions in (DRAFT_INSTRUCTIONS, DRAFT_JUDGE_INSTRUCTIONS):
+            title = turn_input.split("- 제목: ", 1)[1].split("\n", 1)[0]
+            description = turn_input.split("- 설명: ", 1)[1].split("\n", 1)[0]
+            data["draft_title"] = title
+            data["draft_body"] = f"## 설명\n{description}\n\n## 기대 효과\n문제 해결"
+        if instructions in (JUDGE_INSTRUCTIONS, DRAFT_JUDGE_INSTRUCTIONS):
+            data.update(self._judge(turn_input))
+
+        content = json.dumps(data, ensure_ascii=False)
+        # Rough output size: one token per two characters of JSON
+        await asyncio.sleep(self.ttft + self.per_token * len(content) / 2)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _judge(self, text: str) -> dict[str, Any]:
+        if any(k in text for k in _UNRESOLVABLE):
+            auto_resolve, confidence = False, "high"
+        elif any(k in text for k in _RESOLVABLE):
+            auto_resolve, confidence = True, "high"
+        else:
+            auto_resolve, confidence = False, "low"
+        if self.rng.random() < self.judge_noise:
+            auto_resolve = not auto_resolve
+            confidence = "medium"
+        return {"auto_resolve": auto_resolve, "confidence": confidence, "reason": "stub"}
+
+
+async def _evaluate(mode: str, model: StubDraftModel) -> tuple[list[float], list[dict]]:
+    settings.draft_mode = mode  # type: ignore[assignment]
+    set_llm(model)
+    latencies, results = [], []
+    for case in CASES:
+        start = time.perf_counter()
+        results.append(await generate_draft(case))
+        latencies.append(time.perf_counter() - start)
+    set_llm(None)
+    return latencies, results
+
+
+async def _run(args: argparse.Namespace) -> None:
+    runs = {}
+    for offset, mode in enumerate(("two_step", "single_call")):
+        # Independent noise per mode, as two separate model calls would have
+        model = StubDraftModel(
+            ttft=args.ttft,
+            per_token=args.per_token,
+            judge_noise=args.judge_noise,
+            seed=args.seed + offset,
+        )
+        latencies, results = await _evaluate(mode, model)
+        runs[mode] = results
+        print(
+            f"{mode:>11}: mean={statistics.fmean(latencies):.3f}s "
+            f"max={max(latencies):.3f}s llm_calls/draft={model.calls / len(CASES):.1f}"
+        )
+
+    pairs = list(zip(runs["two_step"], runs["single_call"], strict=True))
+    agree = sum(a["auto_resolve"] == b["auto_resolve"] for a, b in pairs)
+    same_title = sum(a["draft_title"] == b["draft_title"] for a, b in pairs)
+    print(f"auto_resolve agreement: {agree}/{len(pairs)} ({agree / len(pairs):.0%})")
+    print(f"draft title agreement:  {same_title}/{len(pairs)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttft", type=float, default=0.4, help="seconds to first token")
+    parser.add_argument("--per-token", type=float, default=0.004, help="seconds per output token")
+    parser.add_argument("--judge-noise", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Lookup latency of the duplicate-issue index.
+
+Builds an ``IssueIndex`` over synthetic Korean/English issues, reloads it from
+disk as the bot does at startup, and times ``search()`` for title-plus-
+description queries drawn from the same vocabulary. The vocabulary is small, so
+common terms appear in far more issues than in a real tracker; treat the
+numbers as an upper bound.
+
+    python -m benchmarks.issue_index --issues 10000 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from github.index import IssueIndex  # noqa: E402
+
+AREAS = (
+    "카카오 애플 구글 회고방 회고 회원 프로필 닉네임 AI 웹훅 CORS JWT OAuth 스테이징 "
+    "초대 알림 권한 Redis S3 이미지 검색 결제 대시보드 관리자 통계 캘린더 댓글 좋아요 태그 팀"
+).split()
+FEATURES = (
+    "로그인 로그아웃 목록 상세 생성 수정 삭제 조회 업로드 다운로드 저장 공유 정렬 필터 "
+    "페이지네이션 토큰 갱신 설정 배포 연동 내보내기 가져오기 초대링크 푸시 메일"
+).split()
+PROBLEMS = (
+    "실패 500에러 느림 누락 중복생성 타임아웃 null체크누락 오타 권한오류 저장안됨 "
+    "무한로딩 잘못된응답 지원필요 개선요청 깨짐 멈춤"
+).split()
+CONTEXTS = (
+    "새로고침하면 입력이 사라집니다|특정 브라우저에서만 발생합니다|로그에 스택트레이스가 남습니다|"
+    "스테이징에서는 재현되지 않습니다|요청이 몰리는 시간대에 발생합니다|iOS 앱에서 재현됩니다|"
+    "쿼리 최적화가 필요해 보입니다|응답 코드가 기대와 다릅니다|안드로이드에서만 간헐적으로 발생|"
+    "배포 직후부터 발생했습니다|관리자 계정에서는 정상입니다|캐시를 비우면 해결됩니다"
+).split("|")
+
+
+def _issue(rng: random.Random, sentences: int) -> tuple[str, str]:
+    area, feature, problem = rng.choice(AREAS), rng.choice(FEATURES), rng.choice(PROBLEMS)
+    title = f"{area} {feature} {problem}"
+    context = " ".join(rng.choice(CONTEXTS) for _ in range(sentences))
+    return title, f"{area} {feature} 시 {problem} 문제가 있습니다. {context}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "index.db")
+        rows = []
+        for number in range(1, args.issues + 1):
+            title, body = _issue(rng, rng.randint(2, 6))
+            rows.append((number, title, body, "open", f"https://github.test/{number}", "2024"))
+        writer = IssueIndex(path)
+        writer._write(rows, "2024-01-01T00:00:00Z")
+        writer.close()
+
+        index = IssueIndex(path)
+        start = time.perf_counter()
+        index.load()
+        load_time = time.perf_counter() - start
+
+        samples = []
+        for _ in range(args.queries):
+            # The duplicate check queries with the extracted title and description
+            query = "\n".join(_issue(rng, 1))
+            start = time.perf_counter()
+            index.search(query, limit=3, min_score=0.4)
+            samples.append((time.perf_counter() - start) * 1000)
+        index.close()
+
+    q = statistics.quantiles(samples, n=100)
+    print(f"issues={args.issues} load={load_time:.2f}s")
+    print(
+        f"search: mean={statistics.fmean(samples):.2f}ms p50={q[49]:.2f}ms "
+        f"p95={q[94]:.2f}ms max={max(samples):.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
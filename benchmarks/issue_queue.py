@@ -0,0 +1,195 @@
+"""Throughput and latency of the issue-creation queue against a local fake API.
+
+Files a burst of issues through a fake GitHub server that adds latency and
+fails a fraction of requests with 502s, some of them after the issue was
+already created (a lost response). For each worker concurrency it reports:
+
+- handler time: how long the Discord handler waits per confirmation
+- throughput: issues created per second while draining the burst
+- latency: p50/p95 from confirmation to the follow-up message
+- duplicates: issues filed more than once for the same thread
+
+``GitHubClient`` serializes POSTs (GitHub's guidance for avoiding secondary
+rate limits), so throughput is bounded by API latency plus ``--interval``;
+extra workers only overlap retries and duplicate lookups.
+
+An ``inline`` row sends each issue directly from the handler, as before the
+queue existed. There, failures surface to the user and the handler blocks for
+the whole request.
+
+    python -m benchmarks.issue_queue --jobs 100 --error-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from aiohttp import web  # noqa: E402
+
+from github.client import GitHubClient, GitHubError  # noqa: E402
+from github.jobs import IssueJob, IssueJobQueue, IssueJobWorker  # noqa: E402
+
+
+class FakeIssuesApi:
+    """Issues endpoint with latency and injected 502s."""
+
+    def __init__(self, latency: float, error_rate: float, seed: int) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.issues: list[dict] = []
+
+    async def list_issues(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        return web.json_response(self.issues[-100:][::-1])
+
+    async def create_issue(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        roll = self.rng.random()
+        if roll < self.error_rate / 2:
+            return web.json_response({"message": "Bad Gateway"}, status=502)
+        payload = await request.json()
+        number = len(self.issues) + 1
+        issue = {"number": number, "html_url": f"https://github.test/{number}", **payload}
+        self.issues.append(issue)
+        if roll < self.error_rate:
+            # Created, but the response never made it back
+            return web.json_response({"message": "Bad Gateway"}, status=502)
+        return web.json_response(issue, status=201)
+
+
+async def _start_server(api: FakeIssuesApi) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/repos/o/r/issues", api.list_issues)
+    app.router.add_post("/repos/o/r/issues", api.create_issue)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def _duplicates(api: FakeIssuesApi) -> int:
+    counts = Counter(issue["title"] for issue in api.issues)
+    return sum(n - 1 for n in counts.values())
+
+
+def _report(
+    name: str,
+    handler: list[float],
+    elapsed: float,
+    done: int,
+    latency: list[float],
+    duplicates: int,
+) -> None:
+    q = statistics.quantiles(latency, n=20) if len(latency) > 1 else latency * 19
+    print(
+        f"{name:>8}  handler={statistics.fmean(handler) * 1000:7.1f}ms  "
+        f"throughput={done / elapsed:6.1f}/s  p50={q[9]:6.2f}s  p95={q[18]:6.2f}s  "
+        f"created={done}  duplicates={duplicates}"
+    )
+
+
+async def _inline(args: argparse.Namespace) -> None:
+    api = FakeIssuesApi(args.latency, args.error_rate, args.seed)
+    runner, base_url = await _start_server(api)
+    client = GitHubClient("bench", "o", "r", base_url=base_url, mutation_interval=args.interval)
+    handler, latency, done = [], [], 0
+    start = time.perf_counter()
+
+    async def confirm(n: int) -> None:
+        nonlocal done
+        t0 = time.perf_counter()
+        try:
+            await client.create_issue(f"issue {n}", "body")
+            done += 1
+            latency.append(time.perf_counter() - t0)
+        except GitHubError:
+            pass  # the user sees an error and has to confirm again
+        handler.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(confirm(n) for n in range(args.jobs)))
+    _report("inline", handler, time.perf_counter() - start, done, latency, _duplicates(api))
+    await client.aclose()
+    await runner.cleanup()
+
+
+async def _queued(args: argparse.Namespace, concurrency: int, db_path: str) -> None:
+    api = FakeIssuesApi(args.latency, args.error_rate, args.seed)
+    runner, base_url = await _start_server(api)
+    client = GitHubClient("bench", "o", "r", base_url=base_url, mutation_interval=args.interval)
+    submitted: dict[int, float] = {}
+    latency: list[float] = []
+    finished = asyncio.Event()
+
+    async def on_result(job: IssueJob) -> None:
+        if job.status == "done":
+            latency.append(time.perf_counter() - submitted[job.thread_id])
+        if len(latency) == args.jobs:
+            finished.set()
+
+    worker = IssueJobWorker(
+        IssueJobQueue(db_path),
+        on_result,
+        client_factory=lambda: client,
+        concurrency=concurrency,
+        base_delay=args.base_delay,
+        rng=random.Random(args.seed),
+    )
+    worker.start()
+    handler = []
+    start = time.perf_counter()
+    for n in range(args.jobs):
+        submitted[n] = t0 = time.perf_counter()
+        await worker.submit(n, f"issue {n}", "body")
+        handler.append(time.perf_counter() - t0)
+    await finished.wait()
+    elapsed = time.perf_counter() - start
+
+    _report(f"queue x{concurrency}", handler, elapsed, len(latency), latency, _duplicates(api))
+    await worker.stop()
+    await client.aclose()
+    await runner.cleanup()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    await _inline(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        for concurrency in args.concurrency:
+            await _queued(args, concurrency, str(Path(tmp) / f"jobs-{concurrency}.db"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per API request")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="fraction of 502s")
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="seconds between POSTs (GitHub asks for 1)"
+    )
+    parser.add_argument("--base-delay", type=float, default=0.1, help="retry backoff base")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
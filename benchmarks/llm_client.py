@@ -0,0 +1,130 @@
+"""Per-call latency of the shared LLM client against a local fake Anthropic API.
+
+Compares three ways of calling the model:
+
+- ``fresh-connection``: a new HTTP client (and TCP connection) for every call,
+  the worst case of per-call client construction.
+- ``per-call-model``: a new ``ChatAnthropic`` for every call, as the nodes did
+  before ``agent.llm`` existed.
+- ``shared-pool``: one ``PooledChatAnthropic`` from ``agent.llm`` reused for
+  every call.
+
+The fake server speaks plain HTTP/1.1, so this measures client construction and
+connection setup, not TLS or HTTP/2 multiplexing; against the real API both of
+those widen the gap further.
+
+    python -m benchmarks.llm_client --calls 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+import anthropic  # noqa: E402
+import httpx  # noqa: E402
+from aiohttp import web  # noqa: E402
+from langchain_anthropic import ChatAnthropic  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from agent.llm import PooledChatAnthropic, aclose_llm  # noqa: E402
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+async def _messages_handler(request: web.Request) -> web.Response:
+    body = await request.json()
+    return web.json_response(
+        {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": "ok"}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 1},
+        }
+    )
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_post("/v1/messages", _messages_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def _measure(calls: int, call: Callable[[], Awaitable[object]]) -> list[float]:
+    await call()  # warm-up
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def _run(calls: int) -> None:
+    runner, base_url = await _start_server()
+    prompt = [HumanMessage(content="ping")]
+
+    async def fresh_connection() -> object:
+        async with httpx.AsyncClient() as http_client:
+            llm = ChatAnthropic(model=MODEL, api_key="bench", base_url=base_url)
+            llm.__dict__["_async_client"] = anthropic.AsyncClient(
+                api_key="bench", base_url=base_url, http_client=http_client
+            )
+            return await llm.ainvoke(prompt)
+
+    async def per_call_model() -> object:
+        llm = ChatAnthropic(model=MODEL, api_key="bench", base_url=base_url)
+        return await llm.ainvoke(prompt)
+
+    shared = PooledChatAnthropic(model=MODEL, api_key="bench", base_url=base_url)
+
+    async def shared_pool() -> object:
+        return await shared.ainvoke(prompt)
+
+    try:
+        print(f"{'mode':>17}  {'mean ms':>8}  {'p50 ms':>8}  {'p95 ms':>8}")
+        for name, call in (
+            ("fresh-connection", fresh_connection),
+            ("per-call-model", per_call_model),
+            ("shared-pool", shared_pool),
+        ):
+            samples = await _measure(calls, call)
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(
+                f"{name:>17}  {statistics.fmean(samples):8.2f}  "
+                f"{statistics.median(samples):8.2f}  {p95:8.2f}"
+            )
+    finally:
+        await aclose_llm()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,718 @@
+"""End-to-end load and latency of the bot under many concurrent issue threads.
+
+Drives ``bot.events.on_message`` with scripted conversations in hundreds of
+threads at once: an opening message in the issue channel, a few follow-up
+answers, the answer that completes the report, and "확인" on the draft. The
+real graph, session manager, outbound scheduler, issue queue and label catalog
+run unchanged; only the edges are faked:
+
+- Discord is an in-memory client whose threads record every send and edit.
+- ``ChatAnthropic`` is replaced by a model that answers each prompt type from
+  rules, streaming its reply after a lognormal time-to-first-token and
+  ``--per-token`` seconds for each of a lognormal number of output tokens.
+  Each configured model tier gets its own fake; Haiku models run
+  ``--fast-speedup`` times faster and put an invalid ``issue_type`` in
+  ``--fast-invalid-rate`` of their analyses (and of their repairs), which
+  exercises the repair and escalation path.
+- GitHub is a local aiohttp server with an empty issue list.
+
+Reported metrics:
+
+- turn latency: p50/p95/p99 from a user message to the last Discord delivery
+  of the reply, including the debounce window and outbound pacing
+- issue latency: from "확인" to the "이슈가 생성되었습니다" message
+- event-loop lag: how late a 50 ms timer fires while the load runs
+- LLM calls per issue, in total, by prompt type and by model
+- LLM cost per issue at list prices, and structured-output outcomes
+- memory per session: RSS growth over the idle bot at peak resident sessions
+
+Results are written to JSON (``benchmarks/results/load-<commit>.json`` by
+default); pass ``--baseline`` with an earlier file to print the differences.
+Settings come from the environment as usual, e.g. ``MESSAGE_DEBOUNCE_SECONDS``
+or ``ANALYZE_MODE``; ``--single-model`` runs every call on ``LLM_MODEL`` to
+compare against per-call model tiers.
+
+    python -m benchmarks.load --threads 200 --turns 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import re
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "1000")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+os.environ.setdefault("LLM_CACHE_NODES", "[]")
+
+import discord  # noqa: E402
+from aiohttp import web  # noqa: E402
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun  # noqa: E402
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # noqa: E402
+
+import agent.llm  # noqa: E402
+import bot.events  # noqa: E402
+from agent.prompts.analyze import ANALYZE_INSTRUCTIONS, INCREMENTAL_ANALYZE_INSTRUCTIONS  # noqa: E402
+from agent.prompts.draft import DRAFT_INSTRUCTIONS  # noqa: E402
+from agent.prompts.draft_judge import DRAFT_JUDGE_INSTRUCTIONS  # noqa: E402
+from agent.prompts.judge import JUDGE_INSTRUCTIONS  # noqa: E402
+from bot.outbound import aclose_outbound, get_outbound  # noqa: E402
+from bot.session import session_manager  # noqa: E402
+from config import settings  # noqa: E402
+from github.client import aclose_github  # noqa: E402
+from metrics import LLM_STRUCTURED_OUTPUTS  # noqa: E402
+
+ISSUE_CHANNEL_ID = int(settings.discord_issue_channel_id)
+ISSUE_CREATED = "이슈가 생성되었습니다"
+DEFAULT_OUTPUT_DIR = Path(__file__).parent / "results"
+
+_THREAD_TAG = re.compile(r"\[#(\d+)\]")
+_FILLERS = [
+    "크롬 최신 버전에서 재현됩니다.",
+    "어제 배포 이후부터 발생했어요.",
+    "매번 재현되고, 새로고침해도 같습니다.",
+    "서버 로그에는 NullPointerException이 찍혀 있습니다.",
+    "모바일 앱에서도 똑같이 실패합니다.",
+]
+_DOMAIN_ANSWER = "로그인 인증 토큰 갱신 쪽 문제 같아요."
+_CONFIRM = "확인"
+_LABELS = ["bug", "enhancement", "question", "domain/auth", "domain/retrospect"]
+# List prices in USD per million input and output tokens, by model family
+_PRICES = {"haiku": (1.0, 5.0), "sonnet": (3.0, 15.0), "opus": (5.0, 25.0)}
+
+
+# ---------------------------------------------------------------------
+# Fake LLM
+# ---------------------------------------------------------------------
+
+
+class FakeChatAnthropic(BaseChatModel):
+    """Chat model that answers each prompt type from rules with simulated latency.
+
+    Latency is ``ttft`` (lognormal, median ``ttft``) plus ``per_token`` for
+    each output token; the token count is lognormal around ``tokens``. A share
+    ``invalid_rate`` of analyses and repairs carries an invalid ``issue_type``.
+    """
+
+    model: str = "fake"
+    invalid_rate: float = 0.0
+    ttft: float = 0.4
+    ttft_jitter: float = 0.3
+    tokens: int = 150
+    tokens_jitter: float = 0.5
+    per_token: float = 0.01
+    chunk_tokens: int = 8
+    seed: int = 0
+    calls: Any = None
+    usage: Any = None
+    rng: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-anthropic"
+
+    def _generate(self, messages: list[BaseMessage], **kwargs: Any) -> ChatResult:
+        raise NotImplementedError("use ainvoke")
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content, first_token, output_tokens = self._answer(messages)
+        await asyncio.sleep(first_token + output_tokens * self.per_token)
+        message = AIMessage(content=content, usage_metadata=_usage(messages, output_tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content, first_token, output_tokens = self._answer(messages)
+        await asyncio.sleep(first_token)
+        pieces = max(1, math.ceil(output_tokens / self.chunk_tokens))
+        size = math.ceil(len(content) / pieces)
+        for start in range(0, len(content), size):
+            await asyncio.sleep(self.per_token * output_tokens / pieces)
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=content[start : start + size])
+            )
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=_usage(messages, output_tokens))
+        )
+
+    def _answer(self, messages: list[BaseMessage]) -> tuple[str, float, int]:
+        """Return the reply text, time to first token and output token count."""
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+            self.calls = Counter()
+            self.usage = Counter()
+        first_token = self.ttft * self.rng.lognormvariate(0, self.ttft_jitter)
+        output_tokens = max(1, round(self.tokens * self.rng.lognormvariate(0, self.tokens_jitter)))
+        self.usage["input"] += _usage(messages, output_tokens)["input_tokens"]
+        self.usage["output"] += output_tokens
+        invalid = self.rng.random() < self.invalid_rate
+
+        content = messages[-1].content
+        if isinstance(content, str):
+            self.calls["ask"] += 1
+            # Roughly two characters per token of Korean text
+            question = "어느 화면의 어떤 기능에서 발생하는지 알려주실 수 있을까요? "
+            text = (question * (output_tokens * 2 // len(question) + 1))[: output_tokens * 2]
+            return text, first_token, output_tokens
+
+        if len(content) == 1:
+            # Repair of the invalid issue_type below
+            self.calls["repair"] += 1
+            fields = {"issue_type": "task" if invalid else "bug"}
+            data = {"updates": fields} if "updates.issue_type" in content[0]["text"] else fields
+            return json.dumps(data), first_token, output_tokens
+
+        instructions, turn_input = (block["text"] for block in content)
+        tag = _THREAD_TAG.search(turn_input)
+        title = f"저장 시 500 에러 [#{tag.group(1)}]" if tag else "저장 시 500 에러"
+        data: dict[str, Any] = {}
+        if instructions in (ANALYZE_INSTRUCTIONS, INCREMENTAL_ANALYZE_INSTRUCTIONS):
+            self.calls["analyze"] += 1
+            fields = {
+                "issue_title": title,
+                "issue_description": "저장 버튼을 누르면 500 에러가 발생합니다.",
+                "issue_type": "task" if invalid else "bug",
+                "labels": ["bug"],
+            }
+            if "인증" in turn_input or '"auth"' in turn_input:
+                fields["affected_domain"] = "auth"
+            if instructions == INCREMENTAL_ANALYZE_INSTRUCTIONS:
+                data = {"updates": fields, "summary": turn_input[-200:]}
+            else:
+                data = fields
+        if instructions in (DRAFT_INSTRUCTIONS, DRAFT_JUDGE_INSTRUCTIONS):
+            self.calls["draft"] += 1
+            data["draft_title"] = title
+            data["draft_body"] = "## 설명\n저장 버튼을 누르면 500 에러가 발생합니다."
+        if instructions in (JUDGE_INSTRUCTIONS, DRAFT_JUDGE_INSTRUCTIONS):
+            self.calls["judge"] += 1
+            data.update({"auto_resolve": False, "confidence": "low", "reason": "stub"})
+        return json.dumps(data, ensure_ascii=False), first_token, output_tokens
+
+
+def _usage(messages: list[BaseMessage], output_tokens: int) -> dict[str, Any]:
+    prompt = sum(len(str(m.content)) for m in messages)
+    input_tokens = prompt // 2
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+# ---------------------------------------------------------------------
+# Fake Discord
+# ---------------------------------------------------------------------
+
+
+class FakeUser:
+    """Message author."""
+
+    def __init__(self, user_id: int, bot: bool = False) -> None:
+        self.id = user_id
+        self.bot = bot
+
+
+class FakeSentMessage:
+    """Message the bot sent; edits and deletes are recorded on its thread."""
+
+    def __init__(self, channel: FakeThread, content: str) -> None:
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, *, content: str) -> FakeSentMessage:
+        await asyncio.sleep(self.channel.latency)
+        self.content = content
+        self.channel.deliveries += 1
+        return self
+
+    async def delete(self) -> None:
+        await asyncio.sleep(self.channel.latency)
+        self.channel.deliveries += 1
+
+
+class FakeThread(discord.Thread):
+    """Issue thread that records deliveries instead of calling Discord."""
+
+    def __init__(self, thread_id: int, latency: float) -> None:
+        self.id = thread_id
+        self.parent_id = ISSUE_CHANNEL_ID
+        self.latency = latency
+        self.deliveries = 0
+        self.turn_done = asyncio.Event()
+        self.issue_created = asyncio.Event()
+
+    async def send(self, content: str, **kwargs: Any) -> FakeSentMessage:  # type: ignore[override]
+        await asyncio.sleep(self.latency)
+        self.deliveries += 1
+        if content.startswith(ISSUE_CREATED):
+            self.issue_created.set()
+        return FakeSentMessage(self, content)
+
+
+class FakeIssueChannel:
+    """The configured issue channel (not a thread)."""
+
+    id = ISSUE_CHANNEL_ID
+
+
+class FakeMessage:
+    """User message; messages in the issue channel can open a thread."""
+
+    _thread_ids = itertools.count(10_000)
+
+    def __init__(self, content: str, author: FakeUser, channel: Any, latency: float = 0.0) -> None:
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = object()
+        self.latency = latency
+        self.thread: FakeThread | None = None
+
+    async def create_thread(self, **kwargs: Any) -> FakeThread:
+        await asyncio.sleep(self.latency)
+        self.thread = FakeThread(next(self._thread_ids), self.latency)
+        return self.thread
+
+    async def reply(self, content: str) -> None:
+        await asyncio.sleep(self.latency)
+
+
+class FakeBot:
+    """Just enough of ``discord.Client`` for ``setup_events``."""
+
+    def __init__(self) -> None:
+        self.user = FakeUser(1, bot=True)
+        self.threads: dict[int, FakeThread] = {}
+
+    def event(self, handler: Any) -> Any:
+        setattr(self, handler.__name__, handler)
+        return handler
+
+    def get_channel(self, channel_id: int) -> FakeThread | None:
+        return self.threads.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int) -> FakeThread:
+        return self.threads[channel_id]
+
+
+# ---------------------------------------------------------------------
+# Fake GitHub
+# ---------------------------------------------------------------------
+
+
+class FakeGitHubApi:
+    """Issues and labels endpoints of an empty repository."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.issues: list[dict] = []
+
+    async def list_issues(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        return web.json_response([])
+
+    async def create_issue(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        payload = await request.json()
+        number = len(self.issues) + 1
+        issue = {"number": number, "html_url": f"https://github.test/{number}", **payload}
+        self.issues.append(issue)
+        return web.json_response(issue, status=201)
+
+    async def list_labels(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        return web.json_response([{"name": name} for name in _LABELS])
+
+
+async def _start_server(api: FakeGitHubApi) -> tuple[web.AppRunner, str]:
+    repo = f"/repos/{settings.github_owner}/{settings.github_repo}"
+    app = web.Application()
+    app.router.add_get(f"{repo}/issues", api.list_issues)
+    app.router.add_post(f"{repo}/issues", api.create_issue)
+    app.router.add_get(f"{repo}/labels", api.list_labels)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+# ---------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoopMonitor:
+    """Samples event-loop lag, RSS and resident sessions while the load runs."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.lags: list[float] = []
+        self.baseline_rss = _rss_bytes()
+        self.peak_sessions = 0
+        self.rss_at_peak = self.baseline_rss
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(loop.time() - start - self.interval)
+            resident = session_manager.stats()["resident"]
+            if resident >= self.peak_sessions:
+                self.peak_sessions = resident
+                self.rss_at_peak = _rss_bytes()
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    if len(values) == 1:
+        values = values * 2
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "p50": round(q[49], 4),
+        "p95": round(q[94], 4),
+        "p99": round(q[98], 4),
+        "max": round(max(values), 4),
+        "count": len(values),
+    }
+
+
+class Results:
+    """Timings collected across all conversations."""
+
+    def __init__(self) -> None:
+        self.turns: list[float] = []
+        self.first_turns: list[float] = []
+        self.issues: list[float] = []
+        self.failed_turns = 0
+        self.confirmed = 0
+
+
+# ---------------------------------------------------------------------
+# Load driver
+# ---------------------------------------------------------------------
+
+
+def _script(n: int, turns: int, rng: random.Random) -> list[str]:
+    fillers = [rng.choice(_FILLERS) for _ in range(max(0, turns - 3))]
+    opening = f"[#{n}] 회고 목록 화면에서 저장 버튼을 누르면 500 에러가 납니다."
+    return [opening, *fillers, _DOMAIN_ANSWER, _CONFIRM]
+
+
+def _instrument_turns() -> None:
+    """Make every agent run set its thread's ``turn_done`` when it ends."""
+    run_agent_and_reply = bot.events._run_agent_and_reply
+
+    async def instrumented(thread: Any, *args: Any, **kwargs: Any) -> None:
+        try:
+            await run_agent_and_reply(thread, *args, **kwargs)
+        finally:
+            thread.turn_done.set()
+
+    bot.events._run_agent_and_reply = instrumented  # type: ignore[assignment]
+
+
+async def _conversation(
+    n: int,
+    fake_bot: FakeBot,
+    args: argparse.Namespace,
+    results: Results,
+    rng: random.Random,
+) -> None:
+    await asyncio.sleep(args.ramp * n / max(1, args.threads))
+    user = FakeUser(100_000 + n)
+    script = _script(n, args.turns, rng)
+
+    opening = FakeMessage(script[0], user, FakeIssueChannel(), args.discord_latency)
+    start = time.perf_counter()
+    await fake_bot.on_message(opening)
+    thread = opening.thread
+    if thread is None:
+        results.failed_turns += 1
+        return
+    fake_bot.threads[thread.id] = thread
+    await get_outbound().flush(thread)
+    results.first_turns.append(time.perf_counter() - start)
+
+    for content in script[1:]:
+        await asyncio.sleep(args.think * rng.uniform(0.5, 1.5))
+        thread.turn_done.clear()
+        start = time.perf_counter()
+        await fake_bot.on_message(FakeMessage(content, user, thread, args.discord_latency))
+        try:
+            await asyncio.wait_for(thread.turn_done.wait(), args.turn_timeout)
+        except TimeoutError:
+            results.failed_turns += 1
+            return
+        await get_outbound().flush(thread)
+        results.turns.append(time.perf_counter() - start)
+
+    results.confirmed += 1
+    try:
+        await asyncio.wait_for(thread.issue_created.wait(), args.issue_timeout)
+        results.issues.append(time.perf_counter() - start)
+    except TimeoutError:
+        pass
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _install_fake_models(args: argparse.Namespace) -> dict[str, FakeChatAnthropic]:
+    """Make ``agent.llm.get_llm()`` build one fake per model name; returns them by name."""
+    models: dict[str, FakeChatAnthropic] = {}
+
+    def build(*, model: str, max_tokens: int, **kwargs: Any) -> FakeChatAnthropic:
+        if model not in models:
+            speedup = args.fast_speedup if "haiku" in model else 1.0
+            models[model] = FakeChatAnthropic(
+                model=model,
+                invalid_rate=args.fast_invalid_rate if "haiku" in model else 0.0,
+                ttft=args.ttft / speedup,
+                ttft_jitter=args.ttft_jitter,
+                tokens=args.tokens,
+                tokens_jitter=args.tokens_jitter,
+                per_token=args.per_token / speedup,
+                seed=args.seed + len(models),
+            )
+        return models[model]
+
+    agent.llm.PooledChatAnthropic = build  # type: ignore[assignment,misc]
+    return models
+
+
+def _cost(model: str, usage: Counter) -> float:
+    family = next((name for name in _PRICES if name in model), "sonnet")
+    input_price, output_price = _PRICES[family]
+    return (usage["input"] * input_price + usage["output"] * output_price) / 1_000_000
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    logging.basicConfig(level=logging.ERROR)
+    # POSTs cancelled at shutdown are expected, not server errors
+    logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+    if args.single_model:
+        for name in ("analyze", "ask", "draft", "judge"):
+            setattr(settings, f"llm_{name}_model", settings.llm_model)
+            setattr(settings, f"llm_{name}_max_tokens", settings.llm_max_tokens)
+    models = _install_fake_models(args)
+    api = FakeGitHubApi(args.github_latency)
+    runner, base_url = await _start_server(api)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.github_api_url = base_url
+        settings.issue_queue_db_path = str(Path(tmp) / "issue_jobs.db")
+        settings.issue_index_db_path = str(Path(tmp) / "issue_index.db")
+        settings.llm_cache_db_path = str(Path(tmp) / "llm_cache.db")
+
+        fake_bot = FakeBot()
+        bot.events.setup_events(fake_bot)  # type: ignore[arg-type]
+        _instrument_turns()
+        await fake_bot.on_ready()  # type: ignore[attr-defined]
+
+        monitor = LoopMonitor()
+        monitor_task = asyncio.create_task(monitor.run())
+        results = Results()
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _conversation(n, fake_bot, args, results, random.Random(rng.random()))
+                for n in range(args.threads)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        monitor_task.cancel()
+        await asyncio.gather(monitor_task, return_exceptions=True)
+
+        await bot.events.stop_background_tasks()
+        await session_manager.close()
+        await aclose_outbound()
+        await aclose_github()
+        await agent.llm.aclose_llm()
+        await runner.cleanup()
+
+    calls: Counter[str] = Counter()
+    for model in models.values():
+        calls.update(model.calls or {})
+    llm_calls = sum(calls.values())
+    cost = sum(_cost(name, model.usage or Counter()) for name, model in models.items())
+    outcomes: Counter[str] = Counter()
+    for (_, outcome), count in LLM_STRUCTURED_OUTPUTS._values.items():
+        outcomes[outcome] += int(count)
+    rss_growth = monitor.rss_at_peak - monitor.baseline_rss
+    return {
+        "benchmark": "load",
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            **{
+                key: value for key, value in vars(args).items() if key not in ("output", "baseline")
+            },
+            "analyze_mode": settings.analyze_mode,
+            "draft_mode": settings.draft_mode,
+            "message_debounce_seconds": settings.message_debounce_seconds,
+            "llm_cache_nodes": settings.llm_cache_nodes,
+            "llm_models": {
+                call: agent.llm.model_for(call)[0]
+                for call in ("analyze", "ask_question", "generate_draft", "judge")
+            },
+        },
+        "results": {
+            "elapsed_seconds": round(elapsed, 3),
+            "turn_latency": _percentiles(results.turns),
+            "first_turn_latency": _percentiles(results.first_turns),
+            "issue_latency": _percentiles(results.issues),
+            "event_loop_lag": _percentiles(monitor.lags),
+            "failed_turns": results.failed_turns,
+            "confirmed": results.confirmed,
+            "issues_created": len(api.issues),
+            "llm_calls": llm_calls,
+            "llm_calls_per_issue": round(llm_calls / max(1, results.confirmed), 2),
+            "llm_calls_by_prompt": dict(calls),
+            "llm_calls_by_model": {
+                name: sum((model.calls or {}).values()) for name, model in models.items()
+            },
+            "llm_cost_per_issue_usd": round(cost / max(1, results.confirmed), 5),
+            "structured_outputs": dict(outcomes),
+            "peak_sessions": monitor.peak_sessions,
+            "rss_per_session_kib": round(rss_growth / max(1, monitor.peak_sessions) / 1024, 1),
+        },
+    }
+
+
+def _print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    results = report["results"]
+    old = baseline["results"] if baseline else {}
+    print(f"commit {report['commit']}  threads={report['config']['threads']}")
+    for name in ("turn_latency", "first_turn_latency", "issue_latency", "event_loop_lag"):
+        row = results[name]
+        if not row:
+            print(f"{name:>22}: no samples")
+            continue
+        line = "  ".join(f"{p}={row[p]:.3f}s" for p in ("p50", "p95", "p99", "max"))
+        if old.get(name):
+            line += "  (p95 was {:.3f}s)".format(old[name]["p95"])
+        print(f"{name:>22}: {line}")
+    for name in (
+        "llm_calls_per_issue",
+        "llm_cost_per_issue_usd",
+        "rss_per_session_kib",
+        "failed_turns",
+        "issues_created",
+    ):
+        line = f"{results[name]}"
+        if name in old:
+            line += f"  (was {old[name]})"
+        print(f"{name:>22}: {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=200, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=5, help="user messages per conversation")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between turns")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds to start all threads")
+    parser.add_argument("--ttft", type=float, default=0.4, help="median seconds to first token")
+    parser.add_argument("--ttft-jitter", type=float, default=0.3, help="lognormal sigma of TTFT")
+    parser.add_argument("--tokens", type=int, default=150, help="median output tokens")
+    parser.add_argument("--tokens-jitter", type=float, default=0.5, help="lognormal sigma")
+    parser.add_argument("--per-token", type=float, default=0.01, help="seconds per output token")
+    parser.add_argument(
+        "--fast-speedup", type=float, default=2.0, help="how much faster Haiku models answer"
+    )
+    parser.add_argument(
+        "--fast-invalid-rate",
+        type=float,
+        default=0.05,
+        help="share of Haiku analyses and repairs with an invalid field",
+    )
+    parser.add_argument(
+        "--single-model", action="store_true", help="run every call on LLM_MODEL (no tiers)"
+    )
+    parser.add_argument("--discord-latency", type=float, default=0.05, help="seconds per call")
+    parser.add_argument("--github-latency", type=float, default=0.05, help="seconds per call")
+    parser.add_argument("--turn-timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--issue-timeout",
+        type=float,
+        default=60.0,
+        help="seconds to wait for each issue after confirming (POSTs go out 1/s)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    parser.add_argument("--baseline", type=Path, help="earlier results to compare against")
+    args = parser.parse_args()
+    args.turns = max(3, args.turns)
+
+    report = asyncio.run(_run(args))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    _print_report(report, baseline)
+
+    output = args.output or DEFAULT_OUTPUT_DIR / f"load-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
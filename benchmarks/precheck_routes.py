@@ -0,0 +1,119 @@
+"""LLM calls and latency saved by the turn pre-check fast path.
+
+Runs one turn of each fast-path kind through the compiled graph with
+``turn_precheck`` off and on, against a stubbed chat model that sleeps for a
+fixed time per call, and prints the LLM calls and wall time of each route.
+
+    python -m benchmarks.precheck_routes --latency 1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+os.environ.setdefault("DISCORD_ISSUE_CHANNEL_ID", "0")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+os.environ.setdefault("GITHUB_TOKEN", "bench")
+os.environ.setdefault("GITHUB_OWNER", "bench")
+os.environ.setdefault("GITHUB_REPO", "bench")
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun  # noqa: E402
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+from agent.graph import create_graph  # noqa: E402
+from agent.llm import set_llm  # noqa: E402
+from agent.state import IssueState  # noqa: E402
+from config import settings  # noqa: E402
+
+ISSUE_FIELDS: IssueState = {
+    "issue_title": "로그인 실패",
+    "issue_description": "카카오 로그인 시 500 에러가 발생합니다.",
+    "issue_type": "bug",
+    "affected_domain": "auth",
+}
+DRAFT: IssueState = {"draft_title": "[Bug] 로그인 실패", "draft_body": "## 설명\n500 에러"}
+
+
+def _turn(content: str, *, draft: bool) -> IssueState:
+    state: IssueState = {
+        "messages": [
+            {"role": "user", "content": "카카오 로그인이 안 돼요"},
+            {"role": "assistant", "content": "이슈 초안이 작성되었습니다."},
+            {"role": "user", "content": content},
+        ],
+        **ISSUE_FIELDS,
+    }
+    if draft:
+        state.update(DRAFT)
+    else:
+        state["issue_description"] = ""
+    return state
+
+
+ROUTES: dict[str, IssueState] = {
+    "confirm": _turn("확인", draft=True),
+    "cancel": _turn("취소", draft=False),
+    "ack (draft pending)": _turn("감사합니다", draft=True),
+    "ack (gathering)": _turn("넵", draft=False),
+}
+
+
+class SleepingModel(BaseChatModel):
+    """Chat model that answers ``{}`` after a fixed delay and counts its calls."""
+
+    latency: float = 1.5
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "sleeping"
+
+    def _generate(self, messages: list[BaseMessage], **kwargs: Any) -> ChatResult:
+        raise NotImplementedError("use ainvoke")
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="{}"))])
+
+
+async def _measure(state: IssueState, precheck: bool, latency: float) -> tuple[int, float]:
+    settings.turn_precheck = precheck
+    model = SleepingModel(latency=latency)
+    set_llm(model)
+    start = time.perf_counter()
+    await create_graph().ainvoke(state)
+    elapsed = time.perf_counter() - start
+    set_llm(None)
+    return model.calls, elapsed
+
+
+async def _run(latency: float) -> None:
+    print(f"{'route':<20}  {'calls off':>9}  {'calls on':>8}  {'time off':>8}  {'time on':>8}")
+    for name, state in ROUTES.items():
+        calls_off, time_off = await _measure(state, False, latency)
+        calls_on, time_on = await _measure(state, True, latency)
+        print(f"{name:<20}  {calls_off:>9}  {calls_on:>8}  {time_off:>7.2f}s  {time_on:>7.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.5, help="seconds per LLM call")
+    asyncio.run(_run(parser.parse_args().latency))
+
+
+if __name__ == "__main__":
+    main()
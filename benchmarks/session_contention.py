@@ -0,0 +1,77 @@
+"""Contention benchmark for SessionManager locking.
+
+Simulates N issue threads each running M agent turns concurrently. Every turn
+reads the session, waits ``--turn-latency`` seconds (standing in for the graph
+run) and writes the result back while holding the thread's lock.
+
+The ``global`` mode reproduces the old behaviour of one lock shared by every
+thread; the ``per-thread`` mode uses ``SessionManager.lock``. With independent
+progress the per-thread wall time stays near ``M * turn_latency`` regardless of N.
+
+    python -m benchmarks.session_contention --threads 50 --turns 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from bot.session import SessionManager
+
+
+async def _run(
+    manager: SessionManager, threads: int, turns: int, latency: float, mode: str
+) -> tuple[float, float, float]:
+    global_lock = asyncio.Lock()
+    finished_at: dict[int, float] = {}
+
+    for thread_id in range(threads):
+        await manager.create_session(thread_id, {"messages": []})
+
+    async def conversation(thread_id: int) -> None:
+        for turn in range(turns):
+            lock = global_lock if mode == "global" else manager.lock(thread_id)
+            async with lock:
+                state = await manager.get_session(thread_id)
+                assert state is not None
+                await asyncio.sleep(latency)
+                message = {"role": "user", "content": str(turn)}
+                await manager.update_session(
+                    thread_id, {**state, "messages": state["messages"] + [message]}
+                )
+        finished_at[thread_id] = time.perf_counter()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation(t) for t in range(threads)))
+    elapsed = time.perf_counter() - start
+
+    for thread_id in range(threads):
+        state = await manager.get_session(thread_id)
+        assert state is not None and len(state["messages"]) == turns
+
+    done = sorted(t - start for t in finished_at.values())
+    return elapsed, done[0], done[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--turn-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    ideal = args.turns * args.turn_latency
+    print(f"threads={args.threads} turns={args.turns} ideal per-thread time={ideal:.3f}s")
+    for mode in ("global", "per-thread"):
+        elapsed, first, last = asyncio.run(
+            _run(SessionManager(), args.threads, args.turns, args.turn_latency, mode)
+        )
+        print(
+            f"{mode:>10}: wall={elapsed:.3f}s first thread done={first:.3f}s "
+            f"last thread done={last:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Thread ownership across agent worker processes.
+
+In cluster mode one gateway process holds the Discord connection and forwards
+thread events to ``settings.cluster_workers`` worker processes, which run the
+agent. Each thread is owned by one worker, chosen by consistent hashing on
+its id, so a thread's turns stay ordered without locks shared between
+processes.
+
+- ``HashRing`` maps thread ids to worker names. Adding or removing a worker
+  only moves the threads that hash to it.
+- ``ClusterRouter`` runs in the gateway. Workers connect to it over TCP and
+  events are sent as JSON lines to the owning worker. When a worker
+  disconnects its threads go to the others right away. When one joins, the
+  threads moving to it are held back until their old owners have finished
+  pending turns and written the sessions out (``release``/``ack``).
+- ``ClusterWorker`` runs in a worker. It connects to the router, hands events
+  to ``handle`` and answers ``release`` messages. ``forward()`` sends an event
+  back through the router to the owner of its thread, for work a worker did
+  on a thread it does not own.
+- ``WorkerSupervisor`` starts the worker processes and restarts crashed ones.
+
+Sessions live in the shared SQLite store (``settings.session_db_path``), so a
+worker taking a thread over reads the state its previous owner wrote.
+Changes a crashed worker had not flushed yet (at most
+``settings.session_flush_interval`` seconds of them) are lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Event = dict[str, Any]
+EventHandler = Callable[[Event], Awaitable[None]]
+ReleaseHandler = Callable[[list[int]], Awaitable[None]]
+
+
+def _hash(key: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring of worker names with ``replicas`` virtual nodes each.
+
+    Args:
+        nodes: Initial worker names.
+        replicas: Points per worker on the ring; more spread threads more evenly.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64) -> None:
+        self._replicas = replicas
+        self._points: list[int] = []
+        self._owners: dict[int, str] = {}
+        self.nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self._replicas):
+            point = _hash(f"{node}#{i}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._points = [p for p in self._points if self._owners[p] != node]
+        self._owners = {p: self._owners[p] for p in self._points}
+
+    def owner(self, thread_id: int) -> str | None:
+        """Return the worker owning ``thread_id``, or ``None`` if the ring is empty."""
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, _hash(str(thread_id))) % len(self._points)
+        return self._owners[self._points[i]]
+
+
+def encode(message: Event) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode() + b"\n"
+
+
+async def read_message(reader: asyncio.StreamReader) -> Event | None:
+    """Read the next message, or ``None`` once the peer has closed the connection."""
+    line = await reader.readline()
+    return json.loads(line) if line else None
+
+
+class ClusterRouter:
+    """Gateway side: routes each thread event to the worker that owns the thread.
+
+    Args:
+        replicas: Virtual nodes per worker on the hash ring.
+        release_timeout: Seconds to wait for old owners to release moving
+            threads before routing to the new owner anyway.
+    """
+
+    def __init__(self, replicas: int = 64, release_timeout: float = 30.0) -> None:
+        self._replicas = replicas
+        self._release_timeout = release_timeout
+        self._ring = HashRing(replicas=replicas)
+        self._writers: dict[str, asyncio.StreamWriter] = {}
+        # Ring after a pending join; threads it moves wait for ``_joined``
+        self._next_ring: HashRing | None = None
+        self._joined = asyncio.Event()
+        self._joined.set()
+        self._join_lock = asyncio.Lock()
+        self._acks: dict[tuple[int, str], asyncio.Future] = {}
+        self._epoch = 0
+        self._server: asyncio.Server | None = None
+        self._forwards: set[asyncio.Task] = set()
+
+    @property
+    def workers(self) -> list[str]:
+        return sorted(self._ring.nodes)
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Listen for worker connections."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        for writer in list(self._writers.values()):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def route(self, event: Event) -> bool:
+        """Send ``event`` to the owner of ``event["thread_id"]``.
+
+        Returns:
+            ``False`` if no worker is connected and the event was dropped.
+        """
+        thread_id = event["thread_id"]
+        while self._next_ring is not None and (
+            self._next_ring.owner(thread_id) != self._ring.owner(thread_id)
+        ):
+            await self._joined.wait()
+        owner = self._ring.owner(thread_id)
+        writer = self._writers.get(owner) if owner is not None else None
+        if writer is None:
+            logger.warning("No worker for thread %s; dropping %s event", thread_id, event["type"])
+            return False
+        writer.write(encode(event))
+        await writer.drain()
+        return True
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = await read_message(reader)
+        if hello is None or hello.get("type") != "hello":
+            writer.close()
+            return
+        name = hello["worker"]
+        previous = self._writers.get(name)
+        if previous is not None:
+            previous.close()
+        self._writers[name] = writer
+        await self._join(name)
+        try:
+            while (message := await read_message(reader)) is not None:
+                if message.get("type") == "ack":
+                    self._ack(message["epoch"], name)
+                elif message.get("type") == "forward":
+                    # Routing may wait for a join, whose acks arrive on this loop
+                    task = asyncio.create_task(self.route(message["event"]))
+                    self._forwards.add(task)
+                    task.add_done_callback(self._forwards.discard)
+        except (ConnectionError, json.JSONDecodeError):
+            logger.warning("Connection to %s failed", name, exc_info=True)
+        finally:
+            if self._writers.get(name) is writer:
+                del self._writers[name]
+                self._ring.remove(name)
+                if self._next_ring is not None:
+                    self._next_ring.remove(name)
+                logger.warning("Worker %s left; %d workers remain", name, len(self._writers))
+                # A worker that is gone holds nothing to release
+                for epoch, node in list(self._acks):
+                    if node == name:
+                        self._ack(epoch, name)
+            writer.close()
+
+    def _ack(self, epoch: int, name: str) -> None:
+        future = self._acks.get((epoch, name))
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def _join(self, name: str) -> None:
+        """Add a worker once the current owners of its threads have released them."""
+        async with self._join_lock:
+            if name in self._ring.nodes:
+                return
+            next_ring = HashRing([*self._ring.nodes, name], self._replicas)
+            others = [node for node in self._ring.nodes if node in self._writers]
+            if others:
+                self._next_ring = next_ring
+                self._joined.clear()
+                self._epoch += 1
+                epoch = self._epoch
+                acks = []
+                for node in others:
+                    future = asyncio.get_running_loop().create_future()
+                    self._acks[(epoch, node)] = future
+                    acks.append(future)
+                    self._writers[node].write(
+                        encode(
+                            {"type": "release", "epoch": epoch, "workers": sorted(next_ring.nodes)}
+                        )
+                    )
+                try:
+                    await asyncio.wait_for(asyncio.gather(*acks), self._release_timeout)
+                except TimeoutError:
+                    logger.warning("Workers did not release threads for %s in time", name)
+                finally:
+                    for node in others:
+                        self._acks.pop((epoch, node), None)
+            if name in self._writers:
+                self._ring.add(name)
+            self._next_ring = None
+            self._joined.set()
+            logger.info("Worker %s joined; %d workers", name, len(self._ring.nodes))
+
+
+class ClusterWorker:
+    """Worker side: receives the events of the threads this worker owns.
+
+    Events are handed to ``handle`` as tasks, in arrival order. On a
+    ``release`` message the worker passes the thread ids it holds that the
+    new ring assigns elsewhere to ``release`` and acknowledges once it returns.
+
+    Args:
+        name: Worker name on the hash ring; stable across restarts.
+        handle: Coroutine called with each routed event.
+        release: Coroutine called with thread ids to hand over.
+        held: Returns the thread ids this worker holds state for.
+        replicas: Virtual nodes per worker; must match the router's.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handle: EventHandler,
+        release: ReleaseHandler,
+        held: Callable[[], Iterable[int]],
+        replicas: int = 64,
+    ) -> None:
+        self.name = name
+        self._handle = handle
+        self._release = release
+        self._held = held
+        self._replicas = replicas
+        self._tasks: set[asyncio.Task] = set()
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+
+    async def forward(self, event: Event) -> None:
+        """Have the router send ``event`` to the owner of ``event["thread_id"]``.
+
+        The owner may be this worker. Waits for the connection if the worker
+        has not connected to the router yet.
+        """
+        await self._connected.wait()
+        assert self._writer is not None
+        self._writer.write(encode({"type": "forward", "event": event}))
+        await self._writer.drain()
+
+    async def run(self, host: str, port: int) -> None:
+        """Serve events until the router closes the connection."""
+        reader, writer = await asyncio.open_connection(host, port)
+        self._writer = writer
+        self._connected.set()
+        writer.write(encode({"type": "hello", "worker": self.name}))
+        await writer.drain()
+        logger.info("Worker %s connected to %s:%d", self.name, host, port)
+        try:
+            while (message := await read_message(reader)) is not None:
+                if message["type"] == "release":
+                    ring = HashRing(message["workers"], self._replicas)
+                    moving = [tid for tid in self._held() if ring.owner(tid) != self.name]
+                    self._spawn(self._release_and_ack(writer, message["epoch"], moving))
+                else:
+                    self._spawn(self._handle(message))
+        finally:
+            self._connected.clear()
+            self._writer = None
+            writer.close()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Cluster event failed", exc_info=task.exception())
+
+    async def _release_and_ack(
+        self, writer: asyncio.StreamWriter, epoch: int, thread_ids: list[int]
+    ) -> None:
+        try:
+            await self._release(thread_ids)
+        finally:
+            writer.write(encode({"type": "ack", "epoch": epoch}))
+            await writer.drain()
+        logger.info("Released %d threads", len(thread_ids))
+
+
+class WorkerSupervisor:
+    """Runs one process per worker and restarts any that exit.
+
+    Args:
+        count: Number of workers.
+        command: Returns the command line of worker ``index``.
+        min_backoff: Seconds before restarting a worker that exited.
+        max_backoff: Upper bound of the doubling restart delay.
+        healthy_after: A worker that ran this long restarts after ``min_backoff`` again.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        command: Callable[[int], list[str]],
+        *,
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        healthy_after: float = 60.0,
+    ) -> None:
+        self._count = count
+        self._command = command
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._healthy_after = healthy_after
+        self._processes: dict[int, asyncio.subprocess.Process] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._keep_alive(i)) for i in range(self._count)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop restarting workers and terminate them, killing any that hang."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for process in self._processes.values():
+            if process.returncode is None:
+                process.terminate()
+        for process in self._processes.values():
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+
+    async def _keep_alive(self, index: int) -> None:
+        backoff = self._min_backoff
+        while True:
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(*self._command(index))
+            self._processes[index] = process
+            code = await process.wait()
+            if time.monotonic() - started >= self._healthy_after:
+                backoff = self._min_backoff
+            logger.warning("Worker %d exited with %s; restarting in %.0fs", index, code, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self._max_backoff)
+
+
+def worker_name(index: int) -> str:
+    return f"worker-{index}"
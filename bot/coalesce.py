@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import discord
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingBatch:
+    """User messages from one thread that are run as a single agent turn.
+
+    The handler calls ``mark_committed()`` once the turn's result is final and
+    about to be written back. Until then a newer message may cancel the run and
+    the batch's messages are folded into the next one.
+    """
+
+    contents: list[str] = field(default_factory=list)
+    committed: bool = False
+
+    def mark_committed(self) -> None:
+        self.committed = True
+
+
+BatchHandler = Callable[["discord.Thread", PendingBatch], Awaitable[None]]
+
+
+class MessageCoalescer:
+    """Per-thread debounce that turns bursts of messages into one agent run.
+
+    Each submitted message restarts the thread's ``window`` timer. When the
+    timer fires, every pending message is handed to ``handler`` as one batch.
+    A message arriving while a run is in flight supersedes it: the run is
+    cancelled unless it has already committed, in which case the next run
+    waits for it to finish so replies stay in order.
+    """
+
+    def __init__(self, window: float, handler: BatchHandler) -> None:
+        self._window = window
+        self._handler = handler
+        self._pending: dict[int, list[str]] = {}
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._running: dict[int, tuple[asyncio.Task[None], PendingBatch]] = {}
+
+    def submit(self, thread: discord.Thread, content: str) -> None:
+        """Queue a message and (re)start the thread's debounce timer."""
+        self._pending.setdefault(thread.id, []).append(content)
+
+        previous = self._tasks.get(thread.id)
+        if previous is not None and not previous.done():
+            running = self._running.get(thread.id)
+            committed = running is not None and running[0] is previous and running[1].committed
+            if not committed:
+                previous.cancel()
+        else:
+            previous = None
+
+        self._tasks[thread.id] = asyncio.get_running_loop().create_task(self._run(thread, previous))
+
+    def active(self) -> list[int]:
+        """Return the ids of threads with a pending or running batch."""
+        return [thread_id for thread_id, task in self._tasks.items() if not task.done()]
+
+    async def wait(self, thread_id: int) -> None:
+        """Wait until the thread's pending messages have been handled."""
+        while (task := self._tasks.get(thread_id)) is not None and not task.done():
+            await asyncio.wait({task})
+
+    async def _run(self, thread: discord.Thread, previous: asyncio.Task[None] | None) -> None:
+        try:
+            await asyncio.sleep(self._window)
+        finally:
+            # Even when superseded during the debounce, the successor must not start
+            # before the previous run has handed back its messages or finished replying
+            if previous is not None:
+                await asyncio.wait({previous})
+
+        current = asyncio.current_task()
+        assert current is not None
+        contents = self._pending.pop(thread.id, [])
+        if not contents:
+            if self._tasks.get(thread.id) is current:
+                del self._tasks[thread.id]
+            return
+
+        # Runs are chained through ``previous``, so at most one per thread is here
+        batch = PendingBatch(contents)
+        self._running[thread.id] = (current, batch)
+        try:
+            await self._handler(thread, batch)
+        except asyncio.CancelledError:
+            if not batch.committed:
+                logger.info("Superseded run in thread %s; re-queueing messages", thread.id)
+                self._pending[thread.id] = batch.contents + self._pending.get(thread.id, [])
+            raise
+        finally:
+            del self._running[thread.id]
+            if self._tasks.get(thread.id) is current:
+                del self._tasks[thread.id]
@@ -2,109 +2,294 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Literal
 
 import discord
+import httpx
 
-from agent.state import IssueState
+from agent.admission import queue_notice
+from agent.state import IssueState, Message
+from bot.coalesce import MessageCoalescer, PendingBatch
+from bot.outbound import get_outbound
 from bot.session import session_manager
+from bot.streaming import StreamingReply
 from config import settings
+from github.client import GitHubError, get_github_client
+from github.index import get_issue_index
+from github.jobs import IssueJob, IssueJobQueue, IssueJobWorker
+from github.labels import get_label_catalog
+from metrics import AGENT_READY
 
 if TYPE_CHECKING:
     from langgraph.graph.state import CompiledStateGraph
 
 logger = logging.getLogger(__name__)
 
+# langgraph, langchain and the Anthropic SDK (agent.graph, agent.checkpoint,
+# agent.llm) are imported on first use: warm_up() loads them off the event loop
+# after the bot connects, so importing this module stays cheap.
 _graph: CompiledStateGraph | None = None
+_ready = False
+_warm_up_task: asyncio.Task | None = None
+_issue_worker: IssueJobWorker | None = None
+_index_sync_task: asyncio.Task | None = None
+
+# Nodes whose LLM output is the reply text itself and can be shown while it streams
+_STREAMED_NODES = frozenset({"ask_question"})
 
 
 def _get_graph() -> CompiledStateGraph:
-    """Lazy-load the LangGraph graph to avoid import cycles."""
+    """Build the LangGraph graph on first use; ``warm_up()`` normally does it at startup."""
     global _graph
     if _graph is None:
+        from agent.checkpoint import get_checkpointer
         from agent.graph import create_graph
 
-        _graph = create_graph()
+        _graph = create_graph(get_checkpointer())
     return _graph
 
 
-def setup_events(bot: discord.Client) -> None:
-    """Register Discord event handlers on the bot."""
+async def _agent_graph() -> CompiledStateGraph:
+    """Return the graph, waiting for a running warm-up instead of building it twice."""
+    if _warm_up_task is not None and not _warm_up_task.done():
+        await asyncio.wait([_warm_up_task])
+    return _get_graph()
+
+
+async def warm_up() -> None:
+    """Load the agent ahead of the first conversation.
+
+    Imports the agent modules, compiles the graph and builds the LLM clients in
+    a worker thread, so the event loop keeps serving Discord meanwhile and none
+    of it lands on the first user's turn. Sets ``is_ready()`` when done; if it
+    fails, the first turn builds what is missing.
+    """
+    global _ready
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(_import_agent)
+        # The SQLite checkpointer binds to the running loop, so it is created on it
+        from agent.checkpoint import get_checkpointer
+
+        get_checkpointer()
+        await asyncio.to_thread(_warm_up_agent)
+    except Exception:
+        logger.exception("Agent warm-up failed; it will be loaded on the first turn")
+        return
+    _ready = True
+    AGENT_READY.set(1)
+    logger.info("Agent ready in %.2fs", time.perf_counter() - start)
+
+
+def _import_agent() -> None:
+    import agent.checkpoint  # noqa: F401
+    import agent.graph  # noqa: F401
+    import agent.llm  # noqa: F401
+
+
+def _warm_up_agent() -> None:
+    from agent.llm import warm_llm
+
+    _get_graph()
+    warm_llm()
+
+
+def is_ready() -> bool:
+    """Return whether ``warm_up()`` has loaded the agent."""
+    return _ready
+
+
+def setup_events(
+    bot: discord.Client,
+    report_issue_job: Callable[[IssueJob], Awaitable[None]] | None = None,
+) -> None:
+    """Register Discord event handlers on the bot.
+
+    Args:
+        bot: Client the handlers are registered on and replies are sent with.
+        report_issue_job: Hands a finished issue job to the process that owns
+            its thread, which then calls ``finish_issue_job()``. By default
+            this process finishes it.
+    """
+    global _issue_worker
+
+    async def finish_here(job: IssueJob) -> None:
+        thread = bot.get_channel(job.thread_id) or await bot.fetch_channel(job.thread_id)
+        await finish_issue_job(thread, job)
+
+    _issue_worker = IssueJobWorker(
+        IssueJobQueue(settings.issue_queue_db_path, owner=settings.cluster_worker),
+        report_issue_job or finish_here,
+        label_catalog=get_label_catalog(),
+        concurrency=settings.issue_queue_concurrency,
+        max_attempts=settings.issue_queue_max_attempts,
+    )
+
+    async def end_evicted_session(thread_id: int, persisted: bool) -> None:
+        await _end_evicted_session(bot, thread_id, persisted)
+
+    session_manager.on_evict = end_evicted_session
 
     @bot.event
     async def on_ready() -> None:
         logger.info("Bot is ready as %s (ID: %s)", bot.user, bot.user.id if bot.user else "?")
+        start_background_tasks()
 
     @bot.event
     async def on_message(message: discord.Message) -> None:
-        # Ignore messages from bots (including self)
-        if message.author.bot:
-            return
+        kind = message_kind(message)
+        if kind == "new_issue":
+            await _handle_new_issue(message)
+        elif kind == "thread":
+            await submit_thread_message(message.channel, message.content)
 
-        # Ignore DMs
-        if message.guild is None:
-            return
+    @bot.event
+    async def on_thread_update(before: discord.Thread, after: discord.Thread) -> None:
+        # Archived issue threads are finished conversations; free their sessions
+        if after.archived and not before.archived and is_issue_thread(after):
+            await drop_thread(after.id)
 
-        channel_id = str(message.channel.id)
 
-        # --- Message in the configured issue channel (not a thread) ---
-        if channel_id == settings.discord_issue_channel_id and not isinstance(
-            message.channel, discord.Thread
-        ):
-            await _handle_new_issue(message)
-            return
+def message_kind(message: discord.Message) -> Literal["new_issue", "thread"] | None:
+    """Classify an incoming message.
+
+    Returns:
+        ``"new_issue"`` for a message in the issue channel, ``"thread"`` for
+        one in an issue thread, ``None`` for anything the bot ignores (bots,
+        including itself, DMs and other channels).
+    """
+    if message.author.bot or message.guild is None:
+        return None
+    if isinstance(message.channel, discord.Thread):
+        return "thread" if is_issue_thread(message.channel) else None
+    if str(message.channel.id) == settings.discord_issue_channel_id:
+        return "new_issue"
+    return None
+
 
-        # --- Message in a thread the bot owns ---
-        if isinstance(message.channel, discord.Thread):
-            thread = message.channel
-            if thread.parent_id and str(thread.parent_id) == settings.discord_issue_channel_id:
-                if await session_manager.has_session(thread.id):
-                    await _handle_thread_message(message, thread)
-            return
+def is_issue_thread(thread: discord.Thread) -> bool:
+    """Return whether ``thread`` was opened in the issue channel."""
+    return bool(thread.parent_id) and str(thread.parent_id) == settings.discord_issue_channel_id
 
     # -----------------------------------------------------------------
     # Handlers
     # -----------------------------------------------------------------
 
 
-async def _handle_new_issue(message: discord.Message) -> None:
-    """Create a thread for a new issue conversation and run the agent."""
+def start_background_tasks() -> None:
+    """Start the agent warm-up, the issue worker and the repository sync.
+
+    Does nothing for tasks that are already running; the warm-up runs once.
+    """
+    global _index_sync_task, _warm_up_task
+    assert _issue_worker is not None, "setup_events() must run first"
+    if _warm_up_task is None:
+        _warm_up_task = asyncio.create_task(warm_up())
+    _issue_worker.start()
+    if _index_sync_task is None or _index_sync_task.done():
+        _index_sync_task = asyncio.create_task(_sync_repository())
+
+
+async def create_issue_thread(message: discord.Message) -> discord.Thread | None:
+    """Open the thread for a new issue conversation, replying with an error on failure."""
     try:
-        thread = await message.create_thread(
+        return await message.create_thread(
             name=f"이슈: {message.content[:40]}",
             auto_archive_duration=1440,
         )
-
-        initial_state: IssueState = {
-            "messages": [{"role": "user", "content": message.content}],
-            "thread_id": str(thread.id),
-            "user_id": str(message.author.id),
-        }
-
-        await session_manager.create_session(thread.id, initial_state)
-        await _run_agent_and_reply(thread, initial_state)
-
     except Exception:
         logger.exception("Error creating issue thread")
         try:
             await message.reply("죄송합니다, 이슈 생성 중 오류가 발생했습니다. 다시 시도해 주세요.")
         except Exception:
             logger.exception("Failed to send error reply")
+        return None
+
+
+async def start_conversation(thread: discord.abc.Messageable, user_id: int, content: str) -> None:
+    """Create the session of a new issue thread and run the agent on its opening message.
+
+    The session exists before this coroutine first yields, so follow-up
+    messages handled after it was started always find it.
+    """
+    initial_state: IssueState = {
+        "messages": [{"role": "user", "content": content}],
+        "thread_id": str(thread.id),
+        "user_id": str(user_id),
+    }
+    try:
+        async with session_manager.lock(thread.id):
+            # No committed checkpoint yet: a follow-up after a failed first turn
+            # resumes from whatever it saved, which holds the opening message
+            await session_manager.create_session(thread.id, {"checkpoint_id": None})
+            await _run_agent_and_reply(thread, None, initial_state)
+    except Exception:
+        logger.exception("Error starting issue conversation")
+        try:
+            await thread.send("죄송합니다, 이슈 생성 중 오류가 발생했습니다. 다시 시도해 주세요.")
+        except Exception:
+            logger.exception("Failed to send error reply in thread")
 
 
-async def _handle_thread_message(message: discord.Message, thread: discord.Thread) -> None:
-    """Handle a follow-up message in an existing issue thread."""
+async def submit_thread_message(thread: discord.abc.Messageable, content: str) -> None:
+    """Queue a follow-up message of an issue thread that has a session."""
+    if await session_manager.has_session(thread.id):
+        _coalescer.submit(thread, content)
+
+
+async def drop_thread(thread_id: int) -> None:
+    """Free the session of a finished (archived) issue thread."""
+    async with session_manager.lock(thread_id):
+        await _end_session(thread_id)
+    logger.info("Dropped session for archived thread %s", thread_id)
+
+
+def active_threads() -> list[int]:
+    """Return the threads this process holds a session or pending messages for."""
+    return list(dict.fromkeys([*session_manager.resident(), *_coalescer.active()]))
+
+
+async def release_thread(thread_id: int) -> None:
+    """Finish the thread's pending turns and drop its session from memory.
+
+    Used when another process takes the thread over; the caller flushes the
+    session manager afterwards so the new owner reads the latest state.
+    """
+    await _coalescer.wait(thread_id)
+    async with session_manager.lock(thread_id):
+        session_manager.forget(thread_id)
+
+
+async def _handle_new_issue(message: discord.Message) -> None:
+    """Create a thread for a new issue conversation and run the agent."""
+    thread = await create_issue_thread(message)
+    if thread is not None:
+        await start_conversation(thread, message.author.id, message.content)
+
+
+async def _handle_thread_message(thread: discord.Thread, batch: PendingBatch) -> None:
+    """Handle a debounced batch of follow-up messages in an existing issue thread."""
     try:
-        state = await session_manager.get_session(thread.id)
-        if state is None:
-            return
+        # Hold the thread lock across read, agent run and write-back so a second
+        # message in the same thread cannot start from stale state.
+        async with session_manager.lock(thread.id):
+            session = await session_manager.get_session(thread.id)
+            if session is None:
+                return
+
+            # The burst is one user message; the checkpoint supplies the rest of the state
+            message: Message = {"role": "user", "content": "\n".join(batch.contents)}
+            turn_input: IssueState = {"messages": [message]}
+            if "checkpoint_id" not in session:
+                # Stored before checkpointing: seed the thread's checkpoint with the whole state
+                from agent.checkpoint import get_checkpointer
 
-        # Append user message to state
-        state["messages"] = state.get("messages", []) + [
-            {"role": "user", "content": message.content}
-        ]
+                await get_checkpointer().adelete_thread(str(thread.id))
+                turn_input = {**session, "messages": [*session.get("messages", []), message]}
 
-        await _run_agent_and_reply(thread, state)
+            await _run_agent_and_reply(thread, session.get("checkpoint_id"), turn_input, batch)
 
     except Exception:
         logger.exception("Error handling thread message")
@@ -114,34 +299,209 @@ async def _handle_thread_message(message: discord.Message, thread: discord.Threa
             logger.exception("Failed to send error reply in thread")
 
 
-async def _run_agent_and_reply(thread: discord.Thread, state: IssueState) -> None:
-    """Invoke the LangGraph agent and send responses to the thread."""
-    graph = _get_graph()
-    msg_count_before = len(state.get("messages", []))
-    result = await graph.ainvoke(state)
+_coalescer = MessageCoalescer(settings.message_debounce_seconds, _handle_thread_message)
+
+
+async def _run_agent_and_reply(
+    thread: discord.Thread,
+    checkpoint_id: str | None,
+    turn_input: IssueState,
+    batch: PendingBatch | None = None,
+) -> None:
+    """Invoke the LangGraph agent and send responses to the thread.
+
+    The run forks from ``checkpoint_id`` (the thread's latest checkpoint if
+    ``None``) and writes one checkpoint when it ends. Only a run that gets to
+    commit points the session at its checkpoint; a superseded or failed one
+    is dropped by the next commit.
+
+    Must be called with ``session_manager.lock(thread.id)`` held. When ``batch``
+    is given the graph run may be superseded by a newer message until the
+    result is committed.
+
+    Args:
+        thread: Issue thread to reply in.
+        checkpoint_id: Checkpoint the thread's session committed.
+        turn_input: State update of this turn, usually just the new message.
+        batch: Debounced messages the turn was started for.
+    """
+    from agent.checkpoint import get_checkpointer, prune, thread_config
+
+    graph = await _agent_graph()
+    new_messages: list[Message] = []
+
+    # Post a placeholder right away and fill it in as the reply streams
+    reply = StreamingReply(thread, settings.discord_stream_edit_interval)
+    await reply.start()
+
+    async def show_queue_position(position: int) -> None:
+        await reply.show_status(f"⏳ 요청이 많아 순서를 기다리고 있습니다. (대기 {position}번째)")
 
-    # Update session with new state
-    await session_manager.update_session(thread.id, result)
+    notice_token = queue_notice.set(show_queue_position)
+    try:
+        result: IssueState = {}
+        async for mode, chunk in graph.astream(
+            turn_input,
+            thread_config(thread.id, checkpoint_id),
+            stream_mode=["messages", "updates", "values"],
+            durability="exit",
+        ):
+            if mode == "values":
+                result = chunk
+                continue
+            if mode == "updates":
+                for update in chunk.values():
+                    if isinstance(update, dict):
+                        new_messages.extend(update.get("messages", []))
+                continue
+            message_chunk, metadata = chunk
+            if metadata.get("langgraph_node") in _STREAMED_NODES:
+                await reply.append(_chunk_text(message_chunk.content))
+    except BaseException:
+        # Superseded by a newer message or failed: remove the partial reply
+        await reply.discard()
+        raise
+    finally:
+        queue_notice.reset(notice_token)
+    if batch is not None:
+        batch.mark_committed()
+
+    # Cancelled or deduplicated conversations are finished; keep only in-progress sessions
+    if result.get("completeness_status") in ("cancelled", "duplicate"):
+        await _end_session(thread.id)
+    else:
+        committed = await prune(get_checkpointer(), str(thread.id))
+        await session_manager.update_session(thread.id, {"checkpoint_id": committed})
+
+    if result.get("completeness_status") == "confirmed":
+        await _submit_issue(thread, result, reply)
+        return
 
-    # Extract only NEW messages added by this graph run
-    all_messages = result.get("messages", [])
-    new_messages = all_messages[msg_count_before:]
     assistant_messages = [msg for msg in new_messages if msg["role"] == "assistant"]
 
-    # Handle confirmed status with no new messages (Phase 1: create_issue not yet implemented)
-    if not assistant_messages and result.get("completeness_status") == "confirmed":
-        await thread.send(
-            "이슈 생성이 확인되었습니다. (이슈 생성 기능은 다음 업데이트에서 추가됩니다.)"
-        )
+    if not assistant_messages:
+        await reply.discard()
+        return
+
+    # Send at most the last 2 assistant messages (rate-limit rule); the first one
+    # replaces the streamed reply, long content continues into new messages.
+    # Delivery is queued and paced by the outbound scheduler.
+    first, *rest = assistant_messages[-2:]
+    await reply.finish(first["content"])
+    for msg in rest:
+        get_outbound().send_text(thread, msg["content"])
+
+
+async def _submit_issue(thread: discord.Thread, state: IssueState, reply: StreamingReply) -> None:
+    """Queue the confirmed draft for issue creation; the URL follows when it is ready."""
+    assert _issue_worker is not None, "setup_events() must run before handling messages"
+    job = await _issue_worker.submit(
+        thread.id,
+        state.get("draft_title", ""),
+        state.get("draft_body", ""),
+        state.get("labels", []),
+    )
+    if job.status == "done":
+        await _end_session(thread.id)
+        await reply.finish(f"이미 생성된 이슈입니다: {job.issue_url}")
+        return
+
+    # The session keeps the confirmed draft until the job finishes so a failed job can be retried
+    await reply.finish("이슈 생성을 요청했습니다. 생성되면 이 스레드에 링크를 남겨 드릴게요.")
+
+
+async def _end_session(thread_id: int) -> None:
+    """Delete a finished conversation's session and checkpoints."""
+    from agent.checkpoint import get_checkpointer
+
+    await session_manager.delete_session(thread_id)
+    await get_checkpointer().adelete_thread(str(thread_id))
+
+
+async def _end_evicted_session(bot: discord.Client, thread_id: int, persisted: bool) -> None:
+    """End a conversation whose session was evicted without a stored copy.
+
+    A persisted session is hydrated again on its next message and is left
+    alone. Otherwise its checkpoints are freed and its thread is told the
+    conversation ended.
+    """
+    if persisted:
         return
+    from agent.checkpoint import get_checkpointer
 
-    # Send at most the last 2 assistant messages (rate-limit rule)
-    for i, msg in enumerate(assistant_messages[-2:]):
-        content = msg["content"]
-        # Discord has a 2000 char limit
-        if len(content) > 2000:
-            content = content[:1997] + "..."
-        await thread.send(content)
-        # Small delay between multiple messages to avoid rapid-fire
-        if i < len(assistant_messages[-2:]) - 1:
-            await asyncio.sleep(1.0)
+    await get_checkpointer().adelete_thread(str(thread_id))
+    try:
+        thread = bot.get_channel(thread_id) or await bot.fetch_channel(thread_id)
+    except discord.HTTPException:
+        logger.warning("Could not tell thread %s that its session expired", thread_id)
+        return
+    get_outbound().send(
+        thread,
+        "대화가 오래 멈춰 있어 진행 중이던 이슈 작성이 종료되었습니다. "
+        "이슈를 등록하려면 채널에 새 메시지로 다시 시작해 주세요.",
+    )
+
+
+async def finish_issue_job(thread: discord.abc.Messageable, job: IssueJob) -> None:
+    """End the session of a thread whose issue was created and post the job's outcome.
+
+    Must run in the process that owns the thread, so no stale copy of the
+    session is left resident.
+    """
+    if job.status == "done":
+        async with session_manager.lock(job.thread_id):
+            await _end_session(job.thread_id)
+        get_outbound().send(thread, f"이슈가 생성되었습니다: {job.issue_url}")
+    else:
+        get_outbound().send(
+            thread, "이슈 생성에 실패했습니다. '확인'을 다시 입력하면 재시도합니다."
+        )
+
+
+async def _sync_repository() -> None:
+    """Keep the duplicate-detection index and the label catalog current.
+
+    The index takes a delta sync every round, or with
+    ``settings.issue_index_sync`` off reads what another process synced into
+    its file; the label catalog is only revalidated once its TTL has expired.
+    """
+    index = get_issue_index()
+    labels = get_label_catalog()
+    while True:
+        client = get_github_client()
+        try:
+            await labels.refresh(client)
+        except (GitHubError, httpx.HTTPError):
+            logger.warning("Label catalog refresh failed; retrying later", exc_info=True)
+        try:
+            if settings.issue_index_sync:
+                await index.sync(client)
+            else:
+                await index.refresh()
+        except (GitHubError, httpx.HTTPError):
+            logger.warning("Issue index sync failed; retrying later", exc_info=True)
+        await asyncio.sleep(settings.issue_index_sync_interval)
+
+
+async def stop_background_tasks() -> None:
+    """Stop the issue worker and index sync; unfinished jobs resume on the next start."""
+    if _warm_up_task is not None and not _warm_up_task.done():
+        # Its thread cannot be interrupted; let it finish before clients are closed
+        await asyncio.wait([_warm_up_task])
+    if _index_sync_task is not None:
+        _index_sync_task.cancel()
+        await asyncio.gather(_index_sync_task, return_exceptions=True)
+        await asyncio.to_thread(get_issue_index().close)
+    if _issue_worker is not None:
+        await _issue_worker.stop()
+
+
+def _chunk_text(content: str | list) -> str:
+    """Return the text of a streamed message chunk, ignoring non-text blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "")
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
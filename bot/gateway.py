@@ -0,0 +1,94 @@
+"""Discord gateway process of cluster mode.
+
+Holds the only Discord connection: it opens threads for new issues itself
+and forwards every issue-thread event to the worker that owns the thread
+through ``bot.cluster.ClusterRouter``. The workers are started and restarted
+by a ``WorkerSupervisor`` running ``python -m bot.worker``.
+
+    CLUSTER_WORKERS=4 SESSION_DB_PATH=sessions.db python -m bot.main
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+
+import discord
+
+from bot.cluster import ClusterRouter, WorkerSupervisor
+from bot.events import create_issue_thread, is_issue_thread, message_kind
+from bot.main import intents
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_NO_WORKER_REPLY = "죄송합니다, 지금은 메시지를 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+
+class GatewayBot(discord.Client):
+    """Discord client that forwards issue-thread events to agent workers."""
+
+    def __init__(self, router: ClusterRouter, supervisor: WorkerSupervisor, **options) -> None:
+        super().__init__(**options)
+        self.router = router
+        self.supervisor = supervisor
+
+    async def setup_hook(self) -> None:
+        await self.router.start(settings.cluster_host, settings.cluster_port)
+        self.supervisor.start()
+
+    async def close(self) -> None:
+        await self.supervisor.stop()
+        await self.router.close()
+        await super().close()
+
+
+def setup_gateway_events(bot: GatewayBot) -> None:
+    """Register handlers that forward events instead of running the agent."""
+
+    @bot.event
+    async def on_ready() -> None:
+        logger.info("Gateway is ready as %s with workers %s", bot.user, bot.router.workers)
+
+    @bot.event
+    async def on_message(message: discord.Message) -> None:
+        kind = message_kind(message)
+        if kind == "new_issue":
+            thread = await create_issue_thread(message)
+            if thread is None:
+                return
+            event = {
+                "type": "open",
+                "thread_id": thread.id,
+                "user_id": message.author.id,
+                "content": message.content,
+            }
+            if not await bot.router.route(event):
+                await thread.send(_NO_WORKER_REPLY)
+        elif kind == "thread":
+            event = {"type": "message", "thread_id": message.channel.id, "content": message.content}
+            if not await bot.router.route(event):
+                await message.channel.send(_NO_WORKER_REPLY)
+
+    @bot.event
+    async def on_thread_update(before: discord.Thread, after: discord.Thread) -> None:
+        if after.archived and not before.archived and is_issue_thread(after):
+            await bot.router.route({"type": "archived", "thread_id": after.id})
+
+
+def _worker_command(index: int) -> list[str]:
+    return [sys.executable, "-m", "bot.worker", "--index", str(index)]
+
+
+def run_gateway() -> None:
+    """Run the gateway and ``settings.cluster_workers`` agent workers."""
+    if not settings.session_db_path:
+        raise SystemExit("Cluster mode needs a shared session store; set SESSION_DB_PATH")
+    logger.info("Starting gateway with %d workers...", settings.cluster_workers)
+    bot = GatewayBot(
+        ClusterRouter(),
+        WorkerSupervisor(settings.cluster_workers, _worker_command),
+        intents=intents,
+    )
+    setup_gateway_events(bot)
+    bot.run(settings.discord_bot_token, log_handler=None)
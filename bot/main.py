@@ -1,9 +1,15 @@
+import asyncio
 import logging
 
 import discord
+from aiohttp import web
 
-from bot.events import setup_events
+from bot.events import setup_events, stop_background_tasks
+from bot.outbound import aclose_outbound
+from bot.session import session_manager
 from config import settings
+from github.client import aclose_github
+from metrics import SESSION_EVENTS, SESSIONS, start_metrics_server
 
 logger = logging.getLogger(__name__)
 
@@ -12,18 +18,103 @@ intents.message_content = True
 intents.guilds = True
 intents.guild_messages = True
 
-bot = discord.Client(intents=intents)
 
-setup_events(bot)
+class IssueBot(discord.Client):
+    """Discord client that serves metrics and releases bot resources on shutdown."""
+
+    _metrics_runner: web.AppRunner | None = None
+
+    async def setup_hook(self) -> None:
+        self._metrics_runner = await start_metrics()
+
+    async def close(self) -> None:
+        if self._metrics_runner is not None:
+            await self._metrics_runner.cleanup()
+            self._metrics_runner = None
+        await close_resources()
+        await super().close()
+
+
+async def start_metrics() -> web.AppRunner | None:
+    """Serve session and bot metrics, unless ``settings.metrics_port`` is 0."""
+    if not settings.metrics_port:
+        return None
+    SESSIONS.set_callback(_session_gauges)
+    SESSION_EVENTS.set_callback(_session_events)
+    try:
+        return await start_metrics_server(settings.metrics_host, settings.metrics_port)
+    except OSError:
+        logger.exception("Failed to start metrics endpoint; continuing without it")
+        return None
+
+
+async def close_resources() -> None:
+    """Stop background work, flush sessions and close every shared client.
+
+    Each step runs even if an earlier one failed.
+    """
+    try:
+        await stop_background_tasks()
+    except Exception:
+        logger.exception("Failed to stop background tasks on shutdown")
+    try:
+        await session_manager.close()
+    except Exception:
+        logger.exception("Failed to flush sessions on shutdown")
+    try:
+        from agent.llm import aclose_llm
+
+        await aclose_llm()
+    except Exception:
+        logger.exception("Failed to close LLM client on shutdown")
+    try:
+        from agent.checkpoint import aclose_checkpointer
+
+        await aclose_checkpointer()
+    except Exception:
+        logger.exception("Failed to close checkpointer on shutdown")
+    try:
+        from agent.cache import close_response_cache
+
+        await asyncio.to_thread(close_response_cache)
+    except Exception:
+        logger.exception("Failed to close LLM response cache on shutdown")
+    try:
+        await aclose_github()
+    except Exception:
+        logger.exception("Failed to close GitHub client on shutdown")
+    try:
+        await aclose_outbound()
+    except Exception:
+        logger.exception("Failed to deliver queued Discord messages on shutdown")
+
+
+def _session_gauges() -> dict[tuple[str, ...], float]:
+    stats = session_manager.stats()
+    return {("resident",): stats["resident"], ("pending_writes",): stats["pending_writes"]}
+
+
+def _session_events() -> dict[tuple[str, ...], float]:
+    stats = session_manager.stats()
+    return {
+        (event,): stats[event] for event in ("evicted_lru", "evicted_idle", "deleted", "hydrated")
+    }
 
 
 def run_bot() -> None:
-    """Start the Discord bot."""
+    """Start the Discord bot, or its gateway and workers if ``settings.cluster_workers`` is set."""
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
+    if settings.cluster_workers:
+        from bot.gateway import run_gateway
+
+        run_gateway()
+        return
     logger.info("Starting Discord GitHub Issue Bot...")
+    bot = IssueBot(intents=intents)
+    setup_events(bot)
     bot.run(settings.discord_bot_token, log_handler=None)
 
 
@@ -0,0 +1,378 @@
+"""Paced, queued delivery of bot messages to Discord.
+
+Handlers hand sends, edits and deletes to ``OutboundScheduler`` and carry on;
+a per-channel worker delivers them in order in the background. Every
+operation first takes a token from two buckets:
+
+- the channel's bucket, mirroring Discord's per-channel message limit
+  (about five messages per five seconds), and
+- the route's bucket (``send``, ``edit`` or ``delete``), shared by all
+  channels so a busy server stays under the bot-wide limits.
+
+Queued edits of the same message collapse into the latest one, so a
+streaming reply that outpaces its bucket skips intermediate frames instead of
+falling further behind.
+
+Time spent queued and in the Discord call itself is recorded per route in
+``metrics``.
+
+Long text is split by ``split_message`` on markdown boundaries: between
+paragraphs, code blocks and ``---`` separators first, then between lines.
+A code block longer than one message is closed and reopened across chunks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
+
+from config import settings
+from metrics import DISCORD_FAILURES, DISCORD_QUEUE_DURATION, DISCORD_REQUEST_DURATION
+
+if TYPE_CHECKING:
+    import discord
+
+logger = logging.getLogger(__name__)
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+Route = Literal["send", "edit", "delete"]
+
+# (tokens per second, burst) for each route across all channels; Discord allows
+# about 50 requests per second per bot and is stricter on bulk deletes
+_ROUTE_LIMITS: dict[str, tuple[float, int]] = {
+    "send": (40.0, 40),
+    "edit": (40.0, 40),
+    "delete": (5.0, 5),
+}
+_FENCE = re.compile(r"^\s*(`{3,}|~{3,})")
+_BLOCK_START = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$|^#{1,6}\s")
+
+_outbound: OutboundScheduler | None = None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    Args:
+        rate: Tokens added per second.
+        capacity: Maximum tokens held, i.e. the allowed burst.
+        clock: Monotonic time source.
+    """
+
+    def __init__(
+        self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def delay(self) -> float:
+        """Return how long until a token is available (0 if one is available now)."""
+        self._refill()
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+
+@dataclass
+class _Job:
+    route: Route
+    run: Callable[[str | None], Awaitable[Any]]
+    content: str | None = None
+    target: asyncio.Future | None = None
+    queued_at: float = 0.0
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class OutboundScheduler:
+    """Per-channel delivery queues paced by channel and route token buckets.
+
+    Each call returns a future for the delivered ``discord.Message`` (or
+    ``None`` when delivery failed or nothing was delivered) without waiting for
+    delivery. Failures are logged, never raised into the caller.
+
+    Args:
+        channel_rate: Messages per second allowed in one channel.
+        channel_burst: Messages a quiet channel may send back to back.
+        route_limits: ``(rate, burst)`` per route, shared by all channels.
+        clock: Monotonic time source.
+        sleep: Awaitable used for pacing waits.
+    """
+
+    def __init__(
+        self,
+        channel_rate: float = 1.0,
+        channel_burst: int = 5,
+        route_limits: dict[str, tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self._channel_rate = channel_rate
+        self._channel_burst = channel_burst
+        self._clock = clock
+        self._sleep = sleep
+        self._routes = {
+            route: TokenBucket(rate, burst, clock)
+            for route, (rate, burst) in (route_limits or _ROUTE_LIMITS).items()
+        }
+        self._channel_buckets: dict[int, TokenBucket] = {}
+        self._queues: dict[int, deque[_Job]] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+
+    def send(self, channel: discord.abc.Messageable, content: str) -> asyncio.Future:
+        """Queue a message for ``channel``."""
+
+        async def run(text: str | None) -> Any:
+            return await channel.send(text)
+
+        return self._enqueue(channel, _Job("send", run, content))
+
+    def send_text(self, channel: discord.abc.Messageable, text: str) -> list[asyncio.Future]:
+        """Queue ``text`` as as many messages as it needs, in order."""
+        return [self.send(channel, chunk) for chunk in split_message(text)]
+
+    def edit(
+        self, channel: discord.abc.Messageable, message: asyncio.Future, content: str
+    ) -> asyncio.Future:
+        """Queue an edit of a queued or sent message.
+
+        Args:
+            channel: Channel the message was sent to.
+            message: Future returned by ``send()`` for the message.
+            content: New content; replaces the content of an edit of the same
+                message that is still waiting in the queue.
+        """
+        for job in self._queues.get(channel.id, ()):
+            if job.route == "edit" and job.target is message:
+                job.content = content
+                return job.future
+
+        async def run(text: str | None) -> Any:
+            sent = await message
+            return await sent.edit(content=text) if sent is not None else None
+
+        return self._enqueue(channel, _Job("edit", run, content, message))
+
+    def delete(self, channel: discord.abc.Messageable, message: asyncio.Future) -> asyncio.Future:
+        """Queue deletion of a queued or sent message."""
+
+        async def run(_: str | None) -> Any:
+            sent = await message
+            if sent is not None:
+                await sent.delete()
+
+        return self._enqueue(channel, _Job("delete", run, target=message))
+
+    async def flush(self, channel: discord.abc.Messageable | None = None) -> None:
+        """Wait until every queued operation (or only those for ``channel``) is delivered."""
+        if channel is not None:
+            while (worker := self._workers.get(channel.id)) is not None:
+                await asyncio.gather(worker, return_exceptions=True)
+            return
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """Deliver what is queued for up to ``timeout`` seconds, then drop the rest."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except TimeoutError:
+            logger.warning("Dropping undelivered Discord messages on shutdown")
+        for task in list(self._workers.values()):
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        for queue in self._queues.values():
+            for job in queue:
+                if not job.future.done():
+                    job.future.set_result(None)
+        self._queues.clear()
+        self._workers.clear()
+
+    def _enqueue(self, channel: discord.abc.Messageable, job: _Job) -> asyncio.Future:
+        channel_id = channel.id
+        job.queued_at = self._clock()
+        queue = self._queues.setdefault(channel_id, deque())
+        queue.append(job)
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id, queue))
+        return job.future
+
+    async def _drain(self, channel_id: int, queue: deque[_Job]) -> None:
+        bucket = self._channel_buckets.get(channel_id)
+        if bucket is None:
+            bucket = TokenBucket(self._channel_rate, self._channel_burst, self._clock)
+            self._channel_buckets[channel_id] = bucket
+        job: _Job | None = None
+        try:
+            while queue:
+                job = queue[0]
+                route = self._routes.get(job.route)
+                buckets = (bucket, route) if route is not None else (bucket,)
+                # Leave the job queued while waiting so later edits can still update it
+                while (wait := max(b.delay() for b in buckets)) > 0:
+                    await self._sleep(wait)
+                for b in buckets:
+                    b.take()
+                queue.popleft()
+                DISCORD_QUEUE_DURATION.observe(self._clock() - job.queued_at, route=job.route)
+                result = None
+                start = time.perf_counter()
+                try:
+                    result = await job.run(job.content)
+                except Exception:
+                    DISCORD_FAILURES.inc(route=job.route)
+                    logger.warning(
+                        "Discord %s in channel %s failed", job.route, channel_id, exc_info=True
+                    )
+                DISCORD_REQUEST_DURATION.observe(time.perf_counter() - start, route=job.route)
+                if not job.future.done():
+                    job.future.set_result(result)
+        finally:
+            # A job cancelled mid-delivery must not leave later edits waiting on it
+            if job is not None and not job.future.done():
+                job.future.set_result(None)
+            del self._workers[channel_id]
+            if not queue:
+                del self._queues[channel_id]
+
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """Split text into Discord-sized chunks on markdown-aware boundaries.
+
+    Chunks break between blocks (paragraphs, headings, fenced code, ``---``
+    separators) where possible, then between lines, and only then inside a
+    line, at whitespace if there is some. A code block longer than one chunk
+    is closed at the end of each chunk and reopened with the same fence (and
+    language) at the start of the next, so every chunk renders on its own.
+    """
+    if len(text) <= limit:
+        return [text]
+    chunks: list[str] = []
+    current: str | None = None
+    for lines, is_code in _blocks(text):
+        pieces = _split_code(lines, limit) if is_code else _fit_lines(lines, limit)
+        for piece in pieces:
+            if current is None:
+                current = piece
+            elif len(current) + 1 + len(piece) <= limit:
+                current += "\n" + piece
+            else:
+                chunks.append(current)
+                current = piece
+    if current is not None:
+        chunks.append(current)
+    # Blank lines stay with the block above; drop them where a chunk ends
+    return [chunk.rstrip("\n") for chunk in chunks if chunk.strip()] or [text[:limit]]
+
+
+def _blocks(text: str) -> Iterator[tuple[list[str], bool]]:
+    """Yield ``(lines, is_code)`` blocks; blank lines stay with the block above."""
+    block: list[str] = []
+    fence: str | None = None
+    ended = False
+    for line in text.split("\n"):
+        if fence is not None:
+            block.append(line)
+            stripped = line.strip()
+            if stripped and set(stripped) == {fence[0]} and len(stripped) >= len(fence):
+                yield block, True
+                block, fence = [], None
+            continue
+        if not line.strip():
+            block.append(line)
+            ended = True
+            continue
+        opener = _FENCE.match(line)
+        if opener or ended or _BLOCK_START.match(line):
+            if block:
+                yield block, False
+            block, ended = [], False
+            if opener:
+                fence = opener.group(1)
+        block.append(line)
+    if block:
+        yield block, fence is not None
+
+
+def _fit_lines(lines: list[str], limit: int) -> list[str]:
+    text = "\n".join(lines)
+    if len(text) <= limit:
+        return [text]
+    pieces: list[str] = []
+    for line in lines:
+        pieces.extend(_split_line(line, limit))
+    return pieces
+
+
+def _split_code(lines: list[str], limit: int) -> list[str]:
+    text = "\n".join(lines)
+    if len(text) <= limit:
+        return [text]
+    opener, body = lines[0], lines[1:]
+    fence = _FENCE.match(opener).group(1)  # type: ignore[union-attr]
+    if body and body[-1].strip().startswith(fence[0] * 3):
+        body = body[:-1]
+    budget = limit - len(opener) - len(fence) - 2
+    if budget <= 0:
+        return _fit_lines(lines, limit)
+
+    pieces: list[str] = []
+    group: list[str] = []
+    size = -1
+    for line in (part for raw in body for part in _split_line(raw, budget)):
+        if group and size + 1 + len(line) > budget:
+            pieces.append("\n".join([opener, *group, fence]))
+            group, size = [], -1
+        group.append(line)
+        size += 1 + len(line)
+    pieces.append("\n".join([opener, *group, fence]))
+    return pieces
+
+
+def _split_line(line: str, limit: int) -> list[str]:
+    parts: list[str] = []
+    while len(line) > limit:
+        cut = line.rfind(" ", limit // 2, limit)
+        if cut <= 0:
+            parts.append(line[:limit])
+            line = line[limit:]
+        else:
+            parts.append(line[:cut])
+            line = line[cut + 1 :]
+    parts.append(line)
+    return parts
+
+
+def get_outbound() -> OutboundScheduler:
+    """Return the shared scheduler, creating it on first use."""
+    global _outbound
+    if _outbound is None:
+        _outbound = OutboundScheduler(settings.discord_channel_rate, settings.discord_channel_burst)
+    return _outbound
+
+
+async def aclose_outbound() -> None:
+    """Deliver or drop what the shared scheduler still has queued."""
+    global _outbound
+    if _outbound is not None:
+        outbound, _outbound = _outbound, None
+        await outbound.aclose()
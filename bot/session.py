@@ -1,43 +1,326 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypedDict
 
 if TYPE_CHECKING:
-    from agent.state import IssueState
+    from bot.store import SessionStore
 
+logger = logging.getLogger(__name__)
+
+# Marks a pending deletion in the write-behind buffer
+_DELETED = None
+
+
+class Session(TypedDict, total=False):
+    """What SessionManager keeps for a thread.
+
+    The conversation state itself lives in the graph's checkpointer
+    (``agent.checkpoint``); a session points at the checkpoint its last
+    committed turn produced, ``None`` until the first turn commits. Sessions
+    stored before checkpointing hold a whole ``IssueState`` and no
+    ``checkpoint_id`` key.
+    """
+
+    checkpoint_id: str | None
 
-class SessionManager:
-    """In-memory session manager mapping thread_id to IssueState."""
 
-    def __init__(self) -> None:
-        self._sessions: dict[int, IssueState] = {}
+class ThreadLock:
+    """A thread's lock, dropped from its table once nobody holds or awaits it.
+
+    Use it as ``async with``; the entry stays in the table only while a turn
+    holds it or waits for it, so ending a session under the lock frees it.
+    """
+
+    def __init__(self, table: dict[int, ThreadLock], thread_id: int) -> None:
+        self._table = table
+        self._thread_id = thread_id
         self._lock = asyncio.Lock()
+        self._users = 0
+
+    @property
+    def busy(self) -> bool:
+        """Whether a turn holds the lock or waits for it."""
+        return self._users > 0
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    async def __aenter__(self) -> None:
+        self._users += 1
+        try:
+            await self._lock.acquire()
+        except BaseException:
+            self._leave()
+            raise
 
-    async def get_session(self, thread_id: int) -> IssueState | None:
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._lock.release()
+        self._leave()
+
+    def _leave(self) -> None:
+        self._users -= 1
+        if self._users == 0 and self._table.get(self._thread_id) is self:
+            del self._table[self._thread_id]
+
+
+class SessionManager:
+    """Session manager mapping thread_id to Session.
+
+    All access happens on the event loop thread, so single dict operations are
+    already atomic and the CRUD methods take no lock. Callers that read a
+    session, run the agent and write the result back hold ``lock(thread_id)``
+    for the whole cycle, which serializes turns within a thread without making
+    unrelated threads wait on each other.
+
+    When a ``store`` is given, sessions are persisted write-behind: updates only
+    touch memory and mark the thread dirty, and a background task writes all
+    dirty threads every ``flush_interval`` seconds, so several updates to one
+    thread cost a single write. Nothing is loaded at startup; a session is read
+    from the store on its first access.
+
+    Resident sessions are bounded: ones idle for longer than ``idle_ttl``
+    seconds expire, and once more than ``max_sessions`` are resident the least
+    recently used one is evicted. Sessions of threads whose lock is held or
+    awaited are in the middle of a turn and are never picked for eviction.
+    With a store, evicted sessions stay on disk
+    and are hydrated again on their next access. Without one they are gone.
+    ``on_evict`` is run as a task with the thread id and whether the session
+    is persisted, so it can free what belongs to a lost conversation and tell
+    its thread it has ended.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore | None = None,
+        flush_interval: float = 0.5,
+        max_sessions: int | None = None,
+        idle_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Callable[[int, bool], Awaitable[None]] | None = None,
+    ) -> None:
+        # Ordered from least to most recently used
+        self._sessions: OrderedDict[int, Session] = OrderedDict()
+        self._last_access: dict[int, float] = {}
+        self._locks: dict[int, ThreadLock] = {}
+        self._store = store
+        self._flush_interval = flush_interval
+        self._dirty: dict[int, Session | None] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._max_sessions = max_sessions
+        self._idle_ttl = idle_ttl
+        self._clock = clock
+        self.on_evict = on_evict
+        self._evict_tasks: set[asyncio.Task[None]] = set()
+        self._counters = {"evicted_lru": 0, "evicted_idle": 0, "deleted": 0, "hydrated": 0}
+
+    def lock(self, thread_id: int) -> ThreadLock:
+        """Return the lock guarding a thread's read-modify-write cycle."""
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = self._locks[thread_id] = ThreadLock(self._locks, thread_id)
+        return lock
+
+    async def get_session(self, thread_id: int) -> Session | None:
         """Retrieve session state for a thread. Returns None if not found."""
-        async with self._lock:
-            return self._sessions.get(thread_id)
+        self._expire_idle()
+        state = self._sessions.get(thread_id)
+        if state is not None:
+            self._touch(thread_id)
+            return state
+        if self._store is None:
+            return None
+        if thread_id in self._dirty:
+            # Evicted or deleted before the pending write reached the store
+            state = self._dirty[thread_id]
+            if state is not None:
+                self._put(thread_id, state)
+            return state
+
+        loaded = await asyncio.to_thread(self._store.load, thread_id)
+        if loaded is None:
+            return None
+        # Another coroutine may have changed the session while we were loading
+        if thread_id in self._sessions:
+            return self._sessions[thread_id]
+        if thread_id in self._dirty:
+            return self._dirty[thread_id]
+        self._counters["hydrated"] += 1
+        self._put(thread_id, loaded)
+        return loaded
 
-    async def create_session(self, thread_id: int, state: IssueState) -> None:
+    async def create_session(self, thread_id: int, state: Session) -> None:
         """Create a new session for a thread."""
-        async with self._lock:
-            self._sessions[thread_id] = state
+        self._put(thread_id, state)
+        self._mark_dirty(thread_id, state)
 
-    async def update_session(self, thread_id: int, state: IssueState) -> None:
+    async def update_session(self, thread_id: int, state: Session) -> None:
         """Update the session state for a thread."""
-        async with self._lock:
-            self._sessions[thread_id] = state
+        self._put(thread_id, state)
+        self._mark_dirty(thread_id, state)
 
     async def delete_session(self, thread_id: int) -> None:
-        """Remove a session for a thread."""
-        async with self._lock:
-            self._sessions.pop(thread_id, None)
+        """Remove a session for a thread, including its persisted copy."""
+        if self._sessions.pop(thread_id, None) is not None:
+            self._counters["deleted"] += 1
+        self._last_access.pop(thread_id, None)
+        self._mark_dirty(thread_id, _DELETED)
 
     async def has_session(self, thread_id: int) -> bool:
         """Check if a session exists for a thread."""
-        async with self._lock:
-            return thread_id in self._sessions
+        self._expire_idle()
+        if thread_id in self._sessions:
+            return True
+        if self._store is None:
+            return False
+        return await self.get_session(thread_id) is not None
+
+    def resident(self) -> list[int]:
+        """Return the thread ids of sessions held in memory."""
+        return list(self._sessions)
+
+    def forget(self, thread_id: int) -> None:
+        """Drop a thread's in-memory copy so its next access reads the store.
+
+        Unlike eviction this also applies to sessions without a store behind
+        them. A pending write is kept and goes out with the next ``flush()``;
+        call it with ``lock(thread_id)`` held so no turn is in progress.
+        """
+        if self._sessions.pop(thread_id, None) is not None:
+            del self._last_access[thread_id]
+
+    def stats(self) -> dict[str, int]:
+        """Return resident session count and eviction counters."""
+        self._expire_idle()
+        return {
+            "resident": len(self._sessions),
+            "pending_writes": len(self._dirty),
+            **self._counters,
+        }
+
+    # -----------------------------------------------------------------
+    # Residency bookkeeping
+    # -----------------------------------------------------------------
+
+    def _touch(self, thread_id: int) -> None:
+        self._sessions.move_to_end(thread_id)
+        self._last_access[thread_id] = self._clock()
+
+    def _put(self, thread_id: int, state: Session) -> None:
+        self._sessions[thread_id] = state
+        self._touch(thread_id)
+        self._expire_idle()
+        if self._max_sessions is not None:
+            while len(self._sessions) > self._max_sessions:
+                victim = next((tid for tid in self._sessions if not self._in_turn(tid)), None)
+                if victim is None:
+                    break
+                self._evict(victim, "evicted_lru")
+
+    def _expire_idle(self) -> None:
+        if self._idle_ttl is None:
+            return
+        deadline = self._clock() - self._idle_ttl
+        expired = []
+        # LRU order is also last-access order, so only the expired prefix is visited
+        for thread_id in self._sessions:
+            if self._last_access[thread_id] > deadline:
+                break
+            if not self._in_turn(thread_id):
+                expired.append(thread_id)
+        for thread_id in expired:
+            self._evict(thread_id, "evicted_idle")
+
+    def _in_turn(self, thread_id: int) -> bool:
+        lock = self._locks.get(thread_id)
+        return lock is not None and lock.busy
+
+    def _evict(self, thread_id: int, reason: str) -> None:
+        del self._sessions[thread_id]
+        del self._last_access[thread_id]
+        self._counters[reason] += 1
+        if self.on_evict is not None:
+            task = asyncio.get_running_loop().create_task(self._run_on_evict(thread_id))
+            self._evict_tasks.add(task)
+            task.add_done_callback(self._evict_tasks.discard)
+
+    async def _run_on_evict(self, thread_id: int) -> None:
+        assert self.on_evict is not None
+        try:
+            await self.on_evict(thread_id, self._store is not None)
+        except Exception:
+            logger.exception("on_evict failed for thread %s", thread_id)
+
+    # -----------------------------------------------------------------
+    # Write-behind persistence
+    # -----------------------------------------------------------------
+
+    def _mark_dirty(self, thread_id: int, state: Session | None) -> None:
+        if self._store is None:
+            return
+        self._dirty[thread_id] = state
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to persist sessions; will retry")
+
+    async def flush(self) -> None:
+        """Write all pending session changes to the store."""
+        if self._store is None or not self._dirty:
+            return
+
+        pending, self._dirty = self._dirty, {}
+        # Serialize on the loop so the worker thread never sees a dict mid-mutation
+        upserts = {tid: json.dumps(state) for tid, state in pending.items() if state is not None}
+        deletes = [tid for tid, state in pending.items() if state is None]
+        try:
+            await asyncio.to_thread(self._store.write, upserts, deletes)
+        except BaseException:
+            # Keep newer changes made during the write, re-queue the rest
+            for thread_id, state in pending.items():
+                self._dirty.setdefault(thread_id, state)
+            raise
+
+    async def close(self) -> None:
+        """Finish eviction callbacks, flush pending changes and close the store."""
+        if self._evict_tasks:
+            await asyncio.gather(*self._evict_tasks, return_exceptions=True)
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._store is not None:
+            await self.flush()
+            await asyncio.to_thread(self._store.close)
+
+
+def _create_session_manager() -> SessionManager:
+    from config import settings
+
+    if not settings.session_db_path:
+        return SessionManager(
+            max_sessions=settings.session_max_resident,
+            idle_ttl=settings.session_idle_ttl,
+        )
+
+    from bot.store import SQLiteSessionStore
+
+    return SessionManager(
+        store=SQLiteSessionStore(settings.session_db_path),
+        flush_interval=settings.session_flush_interval,
+        max_sessions=settings.session_max_resident,
+        idle_ttl=settings.session_idle_ttl,
+    )
 
 
-session_manager = SessionManager()
+session_manager = _create_session_manager()
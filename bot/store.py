@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from bot.session import Session
+
+
+class SessionStore(Protocol):
+    """Persistent backend for SessionManager.
+
+    Methods are synchronous and may block; SessionManager calls them from a
+    worker thread via ``asyncio.to_thread`` so the event loop never waits on I/O.
+    """
+
+    def load(self, thread_id: int) -> Session | None:
+        """Load one session, or None if it was never stored."""
+        ...
+
+    def write(self, upserts: dict[int, str], deletes: list[int]) -> None:
+        """Apply a batch of serialized upserts and deletions atomically."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        ...
+
+
+class SQLiteSessionStore:
+    """SQLite session store in WAL mode.
+
+    The connection is opened lazily on first use, so constructing the store
+    (and therefore starting the bot) costs nothing regardless of database size.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "thread_id INTEGER PRIMARY KEY, "
+                "state TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def load(self, thread_id: int) -> Session | None:
+        """Load one session, or None if it was never stored."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT state FROM sessions WHERE thread_id = ?", (thread_id,))
+                .fetchone()
+            )
+        return json.loads(row[0]) if row else None
+
+    def write(self, upserts: dict[int, str], deletes: list[int]) -> None:
+        """Apply a batch of serialized upserts and deletions in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if upserts:
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT INTO sessions (thread_id, state, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(thread_id) DO UPDATE SET "
+                        "state = excluded.state, updated_at = excluded.updated_at",
+                        [(thread_id, state, now) for thread_id, state in upserts.items()],
+                    )
+                if deletes:
+                    conn.executemany(
+                        "DELETE FROM sessions WHERE thread_id = ?",
+                        [(thread_id,) for thread_id in deletes],
+                    )
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
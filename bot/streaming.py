@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from bot.outbound import OutboundScheduler, get_outbound, split_message
+
+if TYPE_CHECKING:
+    import discord
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = "💭 답변을 준비하고 있습니다..."
+
+
+class StreamingReply:
+    """A reply that is posted immediately and filled in as tokens arrive.
+
+    ``start()`` posts a placeholder, ``append()`` adds streamed text and edits
+    the visible message at most once every ``edit_interval`` seconds, and
+    ``finish()`` replaces everything with the final text. Text longer than one
+    Discord message continues into follow-up messages.
+
+    Every send, edit and delete is queued on ``outbound`` and delivered in the
+    background, so none of these methods waits for Discord.
+    """
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        edit_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        outbound: OutboundScheduler | None = None,
+    ) -> None:
+        self._channel = channel
+        self._edit_interval = edit_interval
+        self._clock = clock
+        self._outbound = outbound or get_outbound()
+        self._messages: list[asyncio.Future] = []
+        self._shown: list[str] = []
+        self._text = ""
+        self._last_edit = 0.0
+
+    async def start(self) -> None:
+        """Post the placeholder message."""
+        self._messages.append(self._outbound.send(self._channel, PLACEHOLDER))
+        self._shown.append(PLACEHOLDER)
+        self._last_edit = self._clock()
+
+    async def show_status(self, text: str) -> None:
+        """Replace the placeholder with a status line, unless streamed text is showing."""
+        if not self._text:
+            self._render(text)
+
+    async def append(self, text: str) -> None:
+        """Add streamed text, editing the visible message if the interval has passed."""
+        self._text += text
+        if self._clock() - self._last_edit >= self._edit_interval:
+            self._render(self._text)
+
+    async def finish(self, text: str) -> None:
+        """Show the final text, dropping any streamed partial output."""
+        self._text = text
+        self._render(text)
+        # Final text may need fewer messages than the streamed output did
+        keep = len(split_message(text))
+        for message in self._messages[keep:]:
+            self._outbound.delete(self._channel, message)
+        del self._messages[keep:]
+        del self._shown[keep:]
+
+    async def discard(self) -> None:
+        """Delete every message posted for this reply (e.g. the run was superseded)."""
+        for message in self._messages:
+            self._outbound.delete(self._channel, message)
+        self._messages.clear()
+        self._shown.clear()
+
+    def _render(self, text: str) -> None:
+        if not text.strip():
+            return
+        for i, chunk in enumerate(split_message(text)):
+            if i < len(self._messages):
+                if self._shown[i] != chunk:
+                    self._outbound.edit(self._channel, self._messages[i], chunk)
+                    self._shown[i] = chunk
+            else:
+                self._messages.append(self._outbound.send(self._channel, chunk))
+                self._shown.append(chunk)
+        self._last_edit = self._clock()
@@ -0,0 +1,131 @@
+"""Agent worker process of cluster mode.
+
+Connects to the gateway's ``ClusterRouter`` and runs the agent for the threads
+it owns, with the same handlers as the single-process bot. It talks to
+Discord over HTTP only; the gateway holds the event connection. Started by
+the gateway's supervisor as ``python -m bot.worker --index N``.
+
+Sessions, the LLM response cache, the issue-creation queue and the issue
+index are shared through their SQLite files, so a thread's issue job is the
+same whichever worker owns the thread. Any worker may send a job to GitHub;
+its outcome is forwarded through the gateway to the thread's owner, which
+ends the session. Only worker 0 syncs the issue index
+from GitHub; the others reload it from the shared file. The metrics endpoint
+listens on ``settings.metrics_port + N + 1``, and each worker admits its
+share of the LLM concurrency and token budgets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import logging
+from collections.abc import Callable
+
+import discord
+
+from bot.cluster import ClusterWorker, Event, worker_name
+from bot.events import (
+    active_threads,
+    drop_thread,
+    finish_issue_job,
+    release_thread,
+    setup_events,
+    start_background_tasks,
+    start_conversation,
+    submit_thread_message,
+)
+from bot.main import close_resources, start_metrics
+from bot.session import session_manager
+from config import settings
+from github.jobs import IssueJob
+
+logger = logging.getLogger(__name__)
+
+
+def create_worker(index: int, thread: Callable[[int], discord.abc.Messageable]) -> ClusterWorker:
+    """Build worker ``index`` running the ``bot.events`` handlers.
+
+    Args:
+        index: Worker number; names the worker on the hash ring.
+        thread: Returns the channel object replies to a thread are sent to.
+    """
+
+    async def handle(event: Event) -> None:
+        if event["type"] == "open":
+            await start_conversation(thread(event["thread_id"]), event["user_id"], event["content"])
+        elif event["type"] == "message":
+            await submit_thread_message(thread(event["thread_id"]), event["content"])
+        elif event["type"] == "archived":
+            await drop_thread(event["thread_id"])
+        elif event["type"] == "issue_job":
+            await finish_issue_job(thread(event["thread_id"]), IssueJob(**event["job"]))
+
+    async def release(thread_ids: list[int]) -> None:
+        await asyncio.gather(*(release_thread(thread_id) for thread_id in thread_ids))
+        await session_manager.flush()
+
+    return ClusterWorker(worker_name(index), handle, release, active_threads)
+
+
+def apply_worker_settings(index: int) -> None:
+    """Adjust settings for worker ``index`` of ``settings.cluster_workers``.
+
+    The worker is named for the issue jobs it claims, only worker 0 syncs the
+    issue index, the metrics port gets a worker-specific value, and the LLM
+    concurrency and token budgets are split between the workers so the
+    cluster as a whole stays within them.
+    """
+    settings.cluster_worker = worker_name(index)
+    settings.issue_index_sync = index == 0
+    if settings.metrics_port:
+        settings.metrics_port += index + 1
+    workers = max(1, settings.cluster_workers)
+    settings.llm_max_concurrency = max(1, settings.llm_max_concurrency // workers)
+    settings.llm_tokens_per_minute //= workers
+
+
+async def run_worker(index: int) -> None:
+    """Serve the gateway's events for worker ``index`` until the gateway goes away."""
+    apply_worker_settings(index)
+
+    client = discord.Client(intents=discord.Intents.none())
+    await client.login(settings.discord_bot_token)
+
+    def thread(thread_id: int) -> discord.PartialMessageable:
+        return client.get_partial_messageable(thread_id, type=discord.ChannelType.public_thread)
+
+    worker = create_worker(index, thread)
+
+    async def report_issue_job(job: IssueJob) -> None:
+        # The job may belong to a thread another worker owns
+        await worker.forward(
+            {"type": "issue_job", "thread_id": job.thread_id, "job": dataclasses.asdict(job)}
+        )
+
+    setup_events(client, report_issue_job)
+    start_background_tasks()
+    metrics_runner = await start_metrics()
+    try:
+        await worker.run(settings.cluster_host, settings.cluster_port)
+    finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await close_resources()
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", type=int, required=True, help="worker number from 0")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s [%(levelname)s] {worker_name(args.index)} %(name)s: %(message)s",
+    )
+    asyncio.run(run_worker(args.index))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -19,11 +21,199 @@ class Settings(BaseSettings):
     github_token: str = Field(description="GitHub personal access token")
     github_owner: str = Field(description="GitHub repository owner")
     github_repo: str = Field(description="GitHub repository name")
+    github_api_url: str = Field(
+        default="https://api.github.com", description="GitHub REST API root URL"
+    )
+    github_rate_limit_reserve: int = Field(
+        default=50, description="Pace GitHub requests once this few remain in the rate limit"
+    )
+
+    label_cache_ttl: float = Field(
+        default=600.0, description="Seconds before the cached repository label list is revalidated"
+    )
+
+    issue_queue_db_path: str = Field(
+        default="issue_jobs.db", description="SQLite file for the durable issue-creation queue"
+    )
+    issue_queue_concurrency: int = Field(
+        default=2, description="Issue-creation jobs sent to GitHub at the same time"
+    )
+    issue_queue_max_attempts: int = Field(
+        default=6, description="Attempts before an issue-creation job is marked failed"
+    )
+
+    issue_index_db_path: str = Field(
+        default="issue_index.db", description="SQLite mirror of repository issues for dedup"
+    )
+    issue_index_sync_interval: float = Field(
+        default=300.0, description="Seconds between delta syncs of the issue index"
+    )
+    issue_index_sync: bool = Field(
+        default=True,
+        description="Sync the issue index from GitHub (off: reload it from a file another "
+        "process syncs)",
+    )
+    duplicate_check: bool = Field(
+        default=True, description="Search existing issues for duplicates before drafting"
+    )
+    duplicate_min_score: float = Field(
+        default=0.4, description="Minimum normalized BM25 score for a duplicate candidate"
+    )
+    duplicate_max_results: int = Field(default=3, description="Duplicate candidates to show")
 
     # LLM settings
     llm_model: str = Field(default="claude-sonnet-4-5-20250929", description="Claude model to use")
     llm_max_tokens: int = Field(default=4096, description="Maximum tokens for LLM response")
 
+    # Per-call model tiers; an empty model or 0 tokens falls back to llm_model/llm_max_tokens
+    llm_analyze_model: str = Field(
+        default="claude-haiku-4-5-20251001", description="Model extracting issue fields"
+    )
+    llm_analyze_max_tokens: int = Field(
+        default=1024, description="Maximum tokens for an analyze response"
+    )
+    llm_ask_model: str = Field(
+        default="claude-haiku-4-5-20251001", description="Model writing follow-up questions"
+    )
+    llm_ask_max_tokens: int = Field(default=512, description="Maximum tokens for a question")
+    llm_draft_model: str = Field(default="", description="Model writing the issue draft")
+    llm_draft_max_tokens: int = Field(default=0, description="Maximum tokens for a draft")
+    llm_judge_model: str = Field(default="", description="Model judging auto-resolve feasibility")
+    llm_judge_max_tokens: int = Field(
+        default=1024, description="Maximum tokens for an auto-resolve judgment"
+    )
+    llm_escalation_model: str = Field(
+        default="",
+        description="Model that retries a call whose answer stayed invalid after repair "
+        "(empty uses llm_model; escalation is skipped for calls already on this model)",
+    )
+    llm_escalate: bool = Field(
+        default=True, description="Retry invalid answers of smaller models on the escalation model"
+    )
+
+    turn_precheck: bool = Field(
+        default=True,
+        description="Route confirmations, cancellations and acknowledgements without the LLM",
+    )
+    analyze_mode: Literal["full", "incremental"] = Field(
+        default="full",
+        description="Analyze the whole transcript, or extracted fields plus new messages",
+    )
+    draft_mode: Literal["two_step", "single_call"] = Field(
+        default="two_step",
+        description="Draft then judge in two LLM calls, or both in a single call",
+    )
+    llm_structured_output: Literal["tool", "json"] = Field(
+        default="tool",
+        description="Get analyze/draft/judge answers as forced tool calls, or as JSON text",
+    )
+    llm_repair_attempts: int = Field(
+        default=1, description="Follow-up calls asking only for the invalid fields of an answer"
+    )
+    llm_timeout: float = Field(default=120.0, description="Seconds before an LLM request times out")
+
+    # Conversation context per prompt, in locally estimated tokens
+    llm_analyze_context_tokens: int = Field(
+        default=4000, description="Token budget of the conversation in an analyze prompt"
+    )
+    llm_ask_context_tokens: int = Field(
+        default=3000, description="Token budget of the conversation in a follow-up question prompt"
+    )
+    llm_message_max_tokens: int = Field(
+        default=1000, description="Tokens one message may take in a prompt before it is clipped"
+    )
+
+    # LLM admission control (shared by all agent nodes)
+    llm_max_concurrency: int = Field(default=16, description="LLM requests in flight at once")
+    llm_tokens_per_minute: int = Field(
+        default=400_000, description="Token budget per minute across LLM requests (0 disables)"
+    )
+    llm_queue_notice_after: float = Field(
+        default=3.0, description="Seconds an LLM request waits before the user sees its position"
+    )
+
+    # LLM HTTP connection pool (shared by all agent nodes)
+    llm_http2: bool = Field(default=True, description="Use HTTP/2 for LLM API connections")
+    llm_max_connections: int = Field(default=20, description="Maximum open LLM connections")
+    llm_max_keepalive_connections: int = Field(
+        default=10, description="Maximum idle LLM connections kept alive"
+    )
+    llm_keepalive_expiry: float = Field(
+        default=60.0, description="Seconds an idle LLM connection is kept alive"
+    )
+
+    # Conversation pacing
+    message_debounce_seconds: float = Field(
+        default=1.5, description="Quiet period before a burst of thread messages is processed"
+    )
+
+    discord_stream_edit_interval: float = Field(
+        default=1.0, description="Minimum seconds between edits of a streaming reply"
+    )
+    discord_channel_rate: float = Field(
+        default=1.0, description="Messages per second the bot sends to one Discord channel"
+    )
+    discord_channel_burst: int = Field(
+        default=5, description="Messages a quiet channel may receive back to back"
+    )
+
+    # LLM response cache
+    llm_cache_nodes: list[str] = Field(
+        default=["analyze", "generate_draft"],
+        description="Graph nodes whose LLM responses are cached (empty disables the cache)",
+    )
+    llm_cache_db_path: str = Field(
+        default="llm_cache.db",
+        description="SQLite file for cached LLM responses (empty keeps them in memory)",
+    )
+    llm_cache_memory_entries: int = Field(
+        default=256, description="LLM responses kept in the in-memory LRU"
+    )
+    llm_cache_max_bytes: int = Field(
+        default=50_000_000, description="Size cap of cached LLM response text on disk"
+    )
+    llm_cache_ttl: float = Field(
+        default=24 * 3600, description="Seconds a cached LLM response stays valid"
+    )
+
+    # Session persistence
+    session_db_path: str = Field(
+        default="",
+        description="SQLite file for durable sessions and their checkpoints (empty keeps them in "
+        "memory). Each turn writes the whole conversation state, so a turn's write grows with "
+        "the thread's length",
+    )
+    session_flush_interval: float = Field(
+        default=0.5, description="Seconds between write-behind flushes of dirty sessions"
+    )
+    session_max_resident: int = Field(
+        default=2000, description="Maximum sessions kept in memory before LRU eviction"
+    )
+    session_idle_ttl: float = Field(
+        default=3 * 24 * 3600, description="Seconds a session may sit idle before it is evicted"
+    )
+
+    # Cluster mode
+    cluster_workers: int = Field(
+        default=0,
+        description="Agent worker processes behind one Discord gateway (0 runs a single process)",
+    )
+    cluster_host: str = Field(
+        default="127.0.0.1", description="Interface the gateway listens on for workers"
+    )
+    cluster_port: int = Field(default=8790, description="Port the gateway listens on for workers")
+    cluster_worker: str = Field(
+        default="", description="Name of this worker process (set by bot.worker; empty otherwise)"
+    )
+
+    # Metrics
+    metrics_host: str = Field(
+        default="127.0.0.1", description="Interface the Prometheus metrics endpoint listens on"
+    )
+    metrics_port: int = Field(
+        default=9108, description="Port of the Prometheus metrics endpoint (0 disables it)"
+    )
+
     @property
     def github_repo_full(self) -> str:
         """Full repository name in owner/repo format."""
@@ -0,0 +1,312 @@
+"""Asyncio GitHub REST client sharing one pooled HTTP session.
+
+All requests go through a single ``httpx.AsyncClient`` so connections to the
+API stay alive between calls and nothing blocks the Discord event loop.
+
+- ``GET`` responses with an ``ETag`` are cached and revalidated with
+  ``If-None-Match``; a ``304 Not Modified`` answer is served from the cache and
+  does not count against the primary rate limit.
+- ``X-RateLimit-*`` headers are tracked per resource. When few requests remain
+  before the reset, calls are spaced out over the rest of the window instead of
+  running into a hard 403.
+- Secondary rate limits are avoided by serializing mutating requests at least
+  ``mutation_interval`` seconds apart, and handled by honoring ``Retry-After``
+  (or waiting a minute, doubling per attempt) before retrying.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+_MUTATING_METHODS = frozenset({"POST", "PATCH", "PUT", "DELETE"})
+_SECONDARY_LIMIT_WAIT = 60.0
+_ETAG_CACHE_SIZE = 256
+
+_client: GitHubClient | None = None
+
+
+class GitHubError(Exception):
+    """A GitHub API request failed.
+
+    Attributes:
+        status: HTTP status of the response.
+        message: Error message from the response body.
+        retry_after: Seconds to wait before retrying if the request was rate
+            limited (primary or secondary limit), else ``None``. A 403 for a
+            missing permission or an archived repository is not rate limited.
+    """
+
+    def __init__(self, status: int, message: str, retry_after: float | None = None) -> None:
+        super().__init__(f"GitHub API error {status}: {message}")
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.retry_after is not None
+
+
+@dataclass
+class RateLimit:
+    """Primary rate-limit state of one API resource (``core``, ``search``, ...)."""
+
+    limit: int
+    remaining: int
+    reset: float
+    resource: str = "core"
+
+    @classmethod
+    def from_headers(cls, headers: httpx.Headers) -> RateLimit | None:
+        """Parse the ``X-RateLimit-*`` headers, or return ``None`` if absent."""
+        try:
+            return cls(
+                limit=int(headers["x-ratelimit-limit"]),
+                remaining=int(headers["x-ratelimit-remaining"]),
+                reset=float(headers["x-ratelimit-reset"]),
+                resource=headers.get("x-ratelimit-resource", "core"),
+            )
+        except (KeyError, ValueError):
+            return None
+
+
+def _resource_for(path: str) -> str:
+    return "search" if path.startswith("/search/") else "core"
+
+
+class GitHubClient:
+    """GitHub REST client for one repository.
+
+    Args:
+        token: Personal access token.
+        owner: Repository owner.
+        repo: Repository name.
+        base_url: API root, overridable for tests and GitHub Enterprise.
+        reserve: Start pacing requests once this few remain in the window.
+        mutation_interval: Minimum seconds between mutating requests.
+        max_retries: Retries after a rate-limit response before giving up.
+        timeout: Request timeout in seconds.
+        clock: Wall-clock time source, compared against ``X-RateLimit-Reset``.
+        sleep: Awaitable used for backoff waits.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        *,
+        base_url: str = GITHUB_API_URL,
+        reserve: int = 50,
+        mutation_interval: float = 1.0,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.owner = owner
+        self.repo = repo
+        self._reserve = reserve
+        self._mutation_interval = mutation_interval
+        self._max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        self._etags: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+        self._rate_limits: dict[str, RateLimit] = {}
+        self._mutation_lock = asyncio.Lock()
+        self._last_mutation = float("-inf")
+
+    @property
+    def repo_path(self) -> str:
+        return f"/repos/{self.owner}/{self.repo}"
+
+    def rate_limit(self, resource: str = "core") -> RateLimit | None:
+        """Return the last seen rate-limit state of ``resource``."""
+        return self._rate_limits.get(resource)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def create_issue(self, title: str, body: str, labels: list[str] | None = None) -> dict:
+        """Create an issue in the repository and return it."""
+        payload: dict[str, Any] = {"title": title, "body": body}
+        if labels:
+            payload["labels"] = labels
+        return await self.request("POST", f"{self.repo_path}/issues", json=payload)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> Any:
+        """Send a request and return the decoded JSON body.
+
+        Args:
+            method: HTTP method.
+            path: Path below the API root, e.g. ``/repos/o/r/issues``.
+            params: Query parameters.
+            json: JSON request body.
+
+        Returns:
+            The decoded response body, or ``None`` for an empty response.
+
+        Raises:
+            GitHubError: The API answered with an error, or rate limiting
+                persisted through every retry.
+        """
+        method = method.upper()
+        if method in _MUTATING_METHODS:
+            async with self._mutation_lock:
+                wait = self._last_mutation + self._mutation_interval - time.monotonic()
+                if wait > 0:
+                    await self._sleep(wait)
+                try:
+                    return await self._send(method, path, params, json)
+                finally:
+                    self._last_mutation = time.monotonic()
+        return await self._send(method, path, params, json)
+
+    async def _send(self, method: str, path: str, params: dict[str, Any] | None, json: Any) -> Any:
+        cache_key = str(self._http.build_request(method, path, params=params).url)
+        cached = self._etags.get(cache_key) if method == "GET" else None
+
+        attempt = 0
+        while True:
+            await self._pace(_resource_for(path))
+            headers = {"If-None-Match": cached[0]} if cached else None
+            response = await self._http.request(
+                method, path, params=params, json=json, headers=headers
+            )
+            self._record_rate_limit(response)
+
+            if response.status_code == 304 and cached:
+                self._etags.move_to_end(cache_key)
+                return cached[1]
+            if response.is_success:
+                data = response.json() if response.content else None
+                etag = response.headers.get("etag")
+                if method == "GET" and etag:
+                    self._remember(cache_key, etag, data)
+                return data
+
+            wait = self._retry_after(response, attempt)
+            if wait is None or attempt == self._max_retries:
+                raise GitHubError(response.status_code, _error_message(response), wait)
+            logger.warning(
+                "GitHub rate limited %s %s (%d); retrying in %.1fs",
+                method,
+                path,
+                response.status_code,
+                wait,
+            )
+            await self._sleep(wait)
+            attempt += 1
+
+    async def _pace(self, resource: str) -> None:
+        """Wait before a request when the primary rate limit is nearly exhausted."""
+        limit = self._rate_limits.get(resource)
+        if limit is None or limit.remaining >= self._reserve:
+            return
+        until_reset = limit.reset - self._clock()
+        if until_reset <= 0:
+            return
+        # Spread what is left evenly over the rest of the window
+        wait = until_reset if limit.remaining <= 0 else until_reset / (limit.remaining + 1)
+        logger.info(
+            "GitHub %s rate limit low (%d left); waiting %.1fs", resource, limit.remaining, wait
+        )
+        await self._sleep(wait)
+        limit.remaining -= 1
+
+    def _record_rate_limit(self, response: httpx.Response) -> None:
+        limit = RateLimit.from_headers(response.headers)
+        if limit is not None:
+            self._rate_limits[limit.resource] = limit
+
+    def _retry_after(self, response: httpx.Response, attempt: int) -> float | None:
+        """Return how long to wait before retrying, or ``None`` if not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        if response.headers.get("x-ratelimit-remaining") == "0":
+            reset = float(response.headers.get("x-ratelimit-reset", self._clock()))
+            return max(reset - self._clock(), 0.0) + 1.0
+        if (
+            response.status_code == 429
+            or "secondary rate limit" in _error_message(response).lower()
+        ):
+            return _SECONDARY_LIMIT_WAIT * 2**attempt
+        return None
+
+    def _remember(self, key: str, etag: str, data: Any) -> None:
+        self._etags[key] = (etag, data)
+        self._etags.move_to_end(key)
+        while len(self._etags) > _ETAG_CACHE_SIZE:
+            self._etags.popitem(last=False)
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        data = response.json()
+    except ValueError:
+        return response.text
+    return str(data.get("message", response.text)) if isinstance(data, dict) else response.text
+
+
+def get_github_client() -> GitHubClient:
+    """Return the shared client for the configured repository, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = GitHubClient(
+            settings.github_token,
+            settings.github_owner,
+            settings.github_repo,
+            base_url=settings.github_api_url,
+            reserve=settings.github_rate_limit_reserve,
+        )
+    return _client
+
+
+async def aclose_github() -> None:
+    """Close the shared client's HTTP pool."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        logger.info("Closed shared GitHub HTTP client")
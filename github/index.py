@@ -0,0 +1,410 @@
+"""Local full-text index of repository issues for duplicate detection.
+
+Issues are mirrored into a SQLite file and kept current with ``since=`` delta
+syncs, so only issues updated after the last sync are downloaded. Processes
+sharing the file without syncing themselves pick up the new rows with
+``refresh()``. On load the
+rows are tokenized into an in-memory inverted index scored with BM25; a lookup
+touches only the postings of the query's terms and takes a few milliseconds
+even with 10k+ issues.
+
+Hangul has no reliable word boundaries without a morphological analyzer
+(particles attach to nouns: "로그인이", "로그인을"), so Hangul runs are indexed
+as overlapping character bigrams. Latin words and numbers are indexed whole.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from config import settings
+
+if TYPE_CHECKING:
+    from github.client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+")
+_TITLE_WEIGHT = 2
+_MAX_BODY_CHARS = 4000
+_PAGE_SIZE = 100
+# Like Lucene's MoreLikeThis, long queries keep only their most selective terms
+_MAX_QUERY_TERMS = 24
+# Terms in more than this fraction of issues (and 100 issues) only score
+# candidates, never add them
+_CANDIDATE_MAX_DF = 0.02
+
+_index: IssueIndex | None = None
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into index terms: Hangul character bigrams and Latin/number words."""
+    tokens: list[str] = []
+    for run in _TOKEN.findall(text.lower()):
+        if "가" <= run[0] <= "힣":
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1 or run.isdigit():
+            tokens.append(run)
+    return tokens
+
+
+class BM25Index:
+    """In-memory inverted index with BM25 scoring.
+
+    Args:
+        k1: Term-frequency saturation.
+        b: Document-length normalization.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, Counter[str]] = {}
+        self._doc_len: dict[int, int] = {}
+        self._total_len = 0
+        # Per-document length normalization, recomputed lazily after updates
+        self._norm: dict[int, float] | None = None
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def copy(self) -> BM25Index:
+        """Return an independent copy that can be updated while this one serves searches."""
+        clone = BM25Index(self._k1, self._b)
+        clone._postings = {term: postings.copy() for term, postings in self._postings.items()}
+        # Term counters are replaced on update, never mutated, so they can be shared
+        clone._doc_terms = dict(self._doc_terms)
+        clone._doc_len = dict(self._doc_len)
+        clone._total_len = self._total_len
+        clone._norm = self._norm
+        return clone
+
+    def add(self, doc_id: int, tokens: list[str]) -> None:
+        """Index a document, replacing any earlier version of it."""
+        self.remove(doc_id)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._doc_terms[doc_id] = counts
+        self._doc_len[doc_id] = len(tokens)
+        self._total_len += len(tokens)
+        self._norm = None
+
+    def remove(self, doc_id: int) -> None:
+        counts = self._doc_terms.pop(doc_id, None)
+        if counts is None:
+            return
+        for term in counts:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id)
+        self._norm = None
+
+    def search(
+        self, tokens: list[str], limit: int, min_score: float = 0.0
+    ) -> list[tuple[int, float]]:
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first.
+
+        Scores are divided by the best score any document could reach for this
+        query, so they fall in ``[0, 1)`` and are comparable across queries.
+
+        Only the ``_MAX_QUERY_TERMS`` rarest query terms are used. Candidates
+        are gathered MaxScore-style: the commonest query terms, whose combined
+        upper bound stays below ``min_score``, cannot lift a document over it
+        on their own, so their long posting lists only score documents already
+        found through rarer terms. Terms found in more than
+        ``_CANDIDATE_MAX_DF`` of all issues are treated the same way; they
+        carry too little signal to nominate a duplicate by themselves.
+        """
+        n = len(self._doc_len)
+        if n == 0 or not tokens:
+            return []
+        norm = self._norm if self._norm is not None else self._compute_norm()
+        k1 = self._k1
+
+        terms: list[tuple[float, dict[int, int]]] = []
+        for term in set(tokens):
+            postings = self._postings.get(term)
+            if postings:
+                df = len(postings)
+                terms.append((math.log(1 + (n - df + 0.5) / (df + 0.5)), postings))
+        if not terms:
+            return []
+        if len(terms) > _MAX_QUERY_TERMS:
+            terms = heapq.nlargest(_MAX_QUERY_TERMS, terms, key=lambda term: term[0])
+        # Each term adds at most idf * (k1 + 1) to a document's score
+        ceiling = sum(idf for idf, _ in terms) * (k1 + 1)
+        threshold = min_score * ceiling
+
+        max_df = max(n * _CANDIDATE_MAX_DF, 100)
+        terms.sort(key=lambda term: term[0])
+        bound = 0.0
+        split = 0
+        for idf, postings in terms:
+            if bound + idf * (k1 + 1) >= threshold and len(postings) <= max_df:
+                break
+            bound += idf * (k1 + 1)
+            split += 1
+        # A query made only of very common terms still searches its rarest one
+        split = min(split, len(terms) - 1)
+
+        scores: dict[int, float] = {}
+        for idf, postings in terms[split:]:
+            weight = idf * (k1 + 1)
+            for doc_id, tf in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norm[doc_id])
+        for idf, postings in terms[:split]:
+            weight = idf * (k1 + 1)
+            for doc_id in scores:
+                tf = postings.get(doc_id)
+                if tf:
+                    scores[doc_id] += weight * tf / (tf + norm[doc_id])
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score / ceiling) for doc_id, score in best if score >= threshold]
+
+    def _compute_norm(self) -> dict[int, float]:
+        avg_len = self._total_len / len(self._doc_len) or 1.0
+        k1, b = self._k1, self._b
+        self._norm = {
+            doc_id: k1 * (1 - b + b * length / avg_len) for doc_id, length in self._doc_len.items()
+        }
+        return self._norm
+
+
+@dataclass
+class IssueMatch:
+    """An existing issue that resembles a query."""
+
+    number: int
+    title: str
+    url: str
+    state: str
+    score: float
+
+
+class IssueIndex:
+    """Issues of one repository, mirrored to SQLite and searchable with BM25.
+
+    ``load()``, the SQLite writes and the indexing of synced issues are blocking
+    and run in a worker thread; ``search()`` is pure in-memory work and is safe
+    to call on the event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._bm25 = BM25Index()
+        self._issues: dict[int, tuple[str, str, str]] = {}
+        self._since: str | None = None
+        self._loaded = False
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._issues)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS issues ("
+                "number INTEGER PRIMARY KEY, "
+                "title TEXT NOT NULL, "
+                "body TEXT NOT NULL, "
+                "state TEXT NOT NULL, "
+                "html_url TEXT NOT NULL, "
+                "updated_at TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn = conn
+        return self._conn
+
+    def load(self) -> int:
+        """Build the in-memory index from the SQLite mirror and return its size."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT number, title, body, state, html_url FROM issues"
+            ).fetchall()
+            since = conn.execute("SELECT value FROM meta WHERE key = 'since'").fetchone()
+
+        bm25 = BM25Index()
+        issues = {}
+        for number, title, body, state, url in rows:
+            bm25.add(number, _document_tokens(title, body))
+            issues[number] = (title, url, state)
+        # Swap in one step so searches never see a half-built index
+        self._bm25, self._issues = bm25, issues
+        self._since = since[0] if since else None
+        self._loaded = True
+        logger.info("Loaded issue index with %d issues (since=%s)", len(issues), self._since)
+        return len(issues)
+
+    async def sync(self, client: GitHubClient) -> int:
+        """Fetch issues updated since the last sync and index them.
+
+        Returns:
+            Number of issues added or updated.
+        """
+        async with self._sync_lock:
+            if not self._loaded:
+                await asyncio.to_thread(self.load)
+            since = self._since
+            rows: list[tuple[int, str, str, str, str, str]] = []
+            page = 1
+            while True:
+                params: dict[str, str | int] = {
+                    "state": "all",
+                    "sort": "updated",
+                    "direction": "asc",
+                    "per_page": _PAGE_SIZE,
+                    "page": page,
+                }
+                if self._since:
+                    params["since"] = self._since
+                batch = await client.request("GET", f"{client.repo_path}/issues", params=params)
+                for issue in batch or []:
+                    since = max(since or "", issue["updated_at"])
+                    if "pull_request" in issue:
+                        continue
+                    rows.append(
+                        (
+                            issue["number"],
+                            issue["title"],
+                            (issue.get("body") or "")[:_MAX_BODY_CHARS],
+                            issue["state"],
+                            issue["html_url"],
+                            issue["updated_at"],
+                        )
+                    )
+                if not batch or len(batch) < _PAGE_SIZE:
+                    break
+                page += 1
+
+            if rows or since != self._since:
+                await asyncio.to_thread(self._write, rows, since)
+            if rows:
+                # Tokenizing a first sync of 10k issues takes seconds; build the
+                # updated index off the event loop and swap it in when done
+                self._bm25, self._issues = await asyncio.to_thread(self._updated, rows)
+            self._since = since
+            if rows:
+                logger.info("Synced %d issues into the index (since=%s)", len(rows), since)
+            return len(rows)
+
+    async def refresh(self) -> int:
+        """Index the issues another process has synced into the SQLite mirror.
+
+        Returns:
+            Number of issues added or updated.
+        """
+        async with self._sync_lock:
+            if not self._loaded:
+                await asyncio.to_thread(self.load)
+                return 0
+            rows, since = await asyncio.to_thread(self._read_since, self._since)
+            if rows:
+                self._bm25, self._issues = await asyncio.to_thread(self._updated, rows)
+            self._since = since
+            return len(rows)
+
+    def search(self, text: str, limit: int = 3, min_score: float = 0.0) -> list[IssueMatch]:
+        """Return the issues most similar to ``text``.
+
+        Args:
+            text: Query text, typically the draft title and description.
+            limit: Maximum number of matches.
+            min_score: Drop matches scoring below this (scores are in ``[0, 1)``).
+
+        Returns:
+            Matches ordered by descending score.
+        """
+        matches = []
+        for number, score in self._bm25.search(tokenize(text), limit, min_score):
+            title, url, state = self._issues[number]
+            matches.append(IssueMatch(number, title, url, state, round(score, 3)))
+        return matches
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _updated(self, rows: list[tuple]) -> tuple[BM25Index, dict[int, tuple[str, str, str]]]:
+        """Return copies of the index and issue table with ``rows`` applied."""
+        bm25 = self._bm25.copy()
+        issues = dict(self._issues)
+        for number, title, body, state, url, _ in rows:
+            bm25.add(number, _document_tokens(title, body))
+            issues[number] = (title, url, state)
+        bm25._compute_norm()
+        return bm25, issues
+
+    def _read_since(self, since: str | None) -> tuple[list[tuple], str | None]:
+        """Return the rows updated at or after ``since`` and the mirror's current ``since``."""
+        with self._lock:
+            conn = self._connect()
+            # Same-second updates share a timestamp; re-indexing a row is harmless
+            rows = conn.execute(
+                "SELECT number, title, body, state, html_url, updated_at FROM issues "
+                "WHERE updated_at >= ?",
+                (since or "",),
+            ).fetchall()
+            latest = conn.execute("SELECT value FROM meta WHERE key = 'since'").fetchone()
+        return rows, latest[0] if latest else since
+
+    def _write(self, rows: list[tuple], since: str | None) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO issues (number, title, body, state, html_url, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(number) DO UPDATE SET title = excluded.title, "
+                    "body = excluded.body, state = excluded.state, "
+                    "html_url = excluded.html_url, updated_at = excluded.updated_at",
+                    rows,
+                )
+                if since is not None:
+                    conn.execute(
+                        "INSERT INTO meta (key, value) VALUES ('since', ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                        (since,),
+                    )
+
+
+def _document_tokens(title: str, body: str) -> list[str]:
+    # Titles are short and carry the most signal; count their terms more
+    return tokenize(title) * _TITLE_WEIGHT + tokenize(body)
+
+
+def get_issue_index() -> IssueIndex:
+    """Return the shared index for the configured repository, creating it on first use."""
+    global _index
+    if _index is None:
+        _index = IssueIndex(settings.issue_index_db_path)
+    return _index
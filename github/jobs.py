@@ -0,0 +1,471 @@
+"""Durable issue-creation queue and its worker pool.
+
+Confirmed drafts are written to a SQLite job table instead of being sent to
+GitHub inside the Discord handler. ``IssueJobWorker`` claims due jobs in
+batches, creates the issues through ``GitHubClient`` with a bounded number of
+jobs in flight, and reports each finished job through a callback.
+
+- Each job has an idempotency key (one per Discord thread). Submitting the same
+  key again returns the existing job instead of queueing a second issue.
+- The key is embedded in the issue body as an HTML comment. Before retrying a
+  job whose earlier attempt may have reached GitHub, the worker looks for an
+  issue carrying the key, so a lost response never files a duplicate.
+- Transient failures (5xx, network errors, rate limits) are retried with
+  exponential backoff and full jitter. A rate-limited job also pauses claiming
+  of the other jobs until the limit resets.
+- Jobs left ``running`` by a crash are picked up again on the next start.
+- Cluster workers share one queue file, so a thread's job is found by
+  whichever worker owns the thread. Claims are atomic, and each worker
+  recovers only the jobs it claimed itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Literal
+
+import httpx
+
+from github.client import GitHubClient, GitHubError, get_github_client
+from github.labels import LabelCatalog
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["pending", "running", "done", "failed"]
+
+_MARKER = "<!-- discord-issue-bot:{key} -->"
+_COLUMNS = (
+    "id, idempotency_key, thread_id, title, body, labels, status, attempts, "
+    "next_attempt_at, created_at, issue_url, error, attempted"
+)
+# Columns added after the table was first created, and their definitions
+_ADDED_COLUMNS = {
+    "owner": "TEXT NOT NULL DEFAULT ''",
+    "attempted": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+@dataclass
+class IssueJob:
+    """One queued issue creation."""
+
+    id: int
+    key: str
+    thread_id: int
+    title: str
+    body: str
+    labels: list[str] = field(default_factory=list)
+    status: JobStatus = "pending"
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    created_at: float = 0.0
+    issue_url: str | None = None
+    error: str | None = None
+    # An earlier attempt may have reached GitHub and created the issue
+    attempted: bool = False
+
+    @property
+    def marker(self) -> str:
+        return _MARKER.format(key=self.key)
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> IssueJob:
+        return cls(
+            id=row[0],
+            key=row[1],
+            thread_id=row[2],
+            title=row[3],
+            body=row[4],
+            labels=json.loads(row[5]),
+            status=row[6],
+            attempts=row[7],
+            next_attempt_at=row[8],
+            created_at=row[9],
+            issue_url=row[10],
+            error=row[11],
+            attempted=bool(row[12]),
+        )
+
+
+class IssueJobQueue:
+    """SQLite-backed job table in WAL mode.
+
+    Methods are synchronous and may block; ``IssueJobWorker`` calls them via
+    ``asyncio.to_thread``. The connection is opened lazily on first use.
+
+    Args:
+        path: SQLite file, which several processes may share.
+        owner: Name of this process; jobs it claims are marked with it, so
+            ``recover()`` leaves the jobs other processes are running alone.
+    """
+
+    def __init__(self, path: str, owner: str = "") -> None:
+        self._path = path
+        self._owner = owner
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS issue_jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "idempotency_key TEXT NOT NULL UNIQUE, "
+                "thread_id INTEGER NOT NULL, "
+                "title TEXT NOT NULL, "
+                "body TEXT NOT NULL, "
+                "labels TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "issue_url TEXT, "
+                "error TEXT, "
+                "owner TEXT NOT NULL DEFAULT '', "
+                "attempted INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(issue_jobs)")}
+            with conn:
+                for name, definition in _ADDED_COLUMNS.items():
+                    if name not in columns:
+                        conn.execute(f"ALTER TABLE issue_jobs ADD COLUMN {name} {definition}")
+                if "attempted" not in columns:
+                    conn.execute("UPDATE issue_jobs SET attempted = 1 WHERE attempts > 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS issue_jobs_due ON issue_jobs (status, next_attempt_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def enqueue(
+        self, key: str, thread_id: int, title: str, body: str, labels: list[str], now: float
+    ) -> IssueJob:
+        """Queue a job, or return the existing job with the same key.
+
+        A job that has not been sent yet takes the new content, so a draft
+        edited and confirmed again is filed as edited. A previously failed job
+        is also reset to pending with a fresh retry budget, so confirming
+        again after a failure retries it; it keeps ``attempted``, so the
+        retry still looks for an issue an earlier attempt created. Running
+        and done jobs are left as they are.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO issue_jobs (idempotency_key, thread_id, title, body, labels, "
+                    "status, next_attempt_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?) "
+                    "ON CONFLICT(idempotency_key) DO UPDATE SET "
+                    "title = excluded.title, body = excluded.body, labels = excluded.labels, "
+                    # A pending job keeps its backoff; a failed one is due again now
+                    "next_attempt_at = CASE issue_jobs.status WHEN 'failed' "
+                    "THEN excluded.next_attempt_at ELSE issue_jobs.next_attempt_at END, "
+                    "error = CASE issue_jobs.status WHEN 'failed' "
+                    "THEN NULL ELSE issue_jobs.error END, "
+                    "attempts = CASE issue_jobs.status WHEN 'failed' "
+                    "THEN 0 ELSE issue_jobs.attempts END, "
+                    "status = 'pending' "
+                    "WHERE issue_jobs.status IN ('pending', 'failed')",
+                    (key, thread_id, title, body, json.dumps(labels), now, now),
+                )
+                row = conn.execute(
+                    f"SELECT {_COLUMNS} FROM issue_jobs WHERE idempotency_key = ?", (key,)
+                ).fetchone()
+        return IssueJob._from_row(row)
+
+    def claim(self, now: float, limit: int) -> list[IssueJob]:
+        """Mark up to ``limit`` due pending jobs as running and return them.
+
+        The jobs are picked and marked in one statement, so processes sharing
+        the file never claim the same job.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                rows = conn.execute(
+                    "UPDATE issue_jobs SET status = 'running', attempts = attempts + 1, "
+                    "owner = ? WHERE id IN (SELECT id FROM issue_jobs "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? "
+                    f"ORDER BY next_attempt_at, id LIMIT ?) RETURNING {_COLUMNS}",
+                    (self._owner, now, limit),
+                ).fetchall()
+        jobs = [IssueJob._from_row(row) for row in rows]
+        # RETURNING gives no order
+        jobs.sort(key=lambda job: (job.next_attempt_at, job.id))
+        return jobs
+
+    def complete(self, job_id: int, issue_url: str) -> None:
+        self._update(
+            "UPDATE issue_jobs SET status = 'done', issue_url = ?, error = NULL WHERE id = ?",
+            (issue_url, job_id),
+        )
+
+    def retry(self, job_id: int, next_attempt_at: float, error: str) -> None:
+        self._update(
+            "UPDATE issue_jobs SET status = 'pending', next_attempt_at = ?, error = ?, "
+            "attempted = 1 WHERE id = ?",
+            (next_attempt_at, error, job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        self._update(
+            "UPDATE issue_jobs SET status = 'failed', error = ?, attempted = 1 WHERE id = ?",
+            (error, job_id),
+        )
+
+    def recover(self) -> int:
+        """Return jobs this owner left running to the pending state."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "UPDATE issue_jobs SET status = 'pending', attempted = 1 "
+                    "WHERE status = 'running' AND owner = ?",
+                    (self._owner,),
+                ).rowcount
+
+    def next_due(self) -> float | None:
+        """Return the earliest ``next_attempt_at`` among pending jobs."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT MIN(next_attempt_at) FROM issue_jobs WHERE status = 'pending'")
+                .fetchone()
+            )
+        return row[0]
+
+    def get(self, job_id: int) -> IssueJob | None:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(f"SELECT {_COLUMNS} FROM issue_jobs WHERE id = ?", (job_id,))
+                .fetchone()
+            )
+        return IssueJob._from_row(row) if row else None
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _update(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(sql, params)
+
+
+class IssueJobWorker:
+    """Worker pool that drains an ``IssueJobQueue`` into GitHub.
+
+    Args:
+        queue: Job table to drain.
+        on_result: Awaited with each job once it is done or has failed for good.
+        client_factory: Returns the GitHub client to send through.
+        label_catalog: Maps job labels onto the repository's labels before
+            sending; without one, or until it has loaded, labels are sent as
+            queued.
+        concurrency: Maximum jobs in flight.
+        max_attempts: Attempts before a job is marked failed.
+        base_delay: Backoff base in seconds; attempt ``n`` waits up to
+            ``base_delay * 2**(n-1)``.
+        max_delay: Upper bound of a single backoff.
+        clock: Wall-clock time source.
+        rng: Random source for jitter.
+    """
+
+    def __init__(
+        self,
+        queue: IssueJobQueue,
+        on_result: Callable[[IssueJob], Awaitable[None]],
+        *,
+        client_factory: Callable[[], GitHubClient] = get_github_client,
+        label_catalog: LabelCatalog | None = None,
+        concurrency: int = 2,
+        max_attempts: int = 6,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._queue = queue
+        self._on_result = on_result
+        self._client_factory = client_factory
+        self._label_catalog = label_catalog
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._wake = asyncio.Event()
+        self._active: set[asyncio.Task] = set()
+        self._dispatcher: asyncio.Task | None = None
+        self._paused_until = 0.0
+
+    async def submit(
+        self, thread_id: int, title: str, body: str, labels: list[str] | None = None
+    ) -> IssueJob:
+        """Queue an issue for ``thread_id``, or return the job already queued for it."""
+        job = await asyncio.to_thread(
+            self._queue.enqueue,
+            f"thread-{thread_id}",
+            thread_id,
+            title,
+            body,
+            labels or [],
+            self._clock(),
+        )
+        self._wake.set()
+        return job
+
+    def start(self) -> None:
+        """Start the dispatcher; calling it again while running does nothing."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop dispatching, cancel jobs in flight and close the queue.
+
+        Cancelled jobs go back to pending and resume on the next start.
+        """
+        tasks = [t for t in (self._dispatcher, *self._active) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+        await asyncio.to_thread(self._queue.recover)
+        await asyncio.to_thread(self._queue.close)
+
+    async def _run(self) -> None:
+        recovered = await asyncio.to_thread(self._queue.recover)
+        if recovered:
+            logger.info("Recovered %d interrupted issue jobs", recovered)
+        while True:
+            self._wake.clear()
+            now = self._clock()
+            free = self._concurrency - len(self._active)
+            if free > 0 and now >= self._paused_until:
+                jobs = await asyncio.to_thread(self._queue.claim, now, free)
+                for job in jobs:
+                    task = asyncio.create_task(self._process(job))
+                    self._active.add(task)
+                    task.add_done_callback(self._on_task_done)
+                if jobs:
+                    continue
+
+            timeout: float | None = None
+            if free > 0:
+                next_due = await asyncio.to_thread(self._queue.next_due)
+                if next_due is not None:
+                    timeout = max(next_due, self._paused_until) - self._clock()
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except TimeoutError:
+                    pass
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._active.discard(task)
+        self._wake.set()
+
+    async def _process(self, job: IssueJob) -> None:
+        client = self._client_factory()
+        try:
+            issue = None
+            if job.attempted:
+                # An earlier attempt may have created the issue before failing
+                issue = await self._find_existing(client, job)
+            if issue is None:
+                labels = job.labels
+                if self._label_catalog is not None and self._label_catalog.loaded:
+                    # Labels deleted since the draft was written are dropped, not sent;
+                    # before the first refresh the draft's labels pass through as queued
+                    labels = self._label_catalog.resolve(labels)
+                issue = await client.create_issue(job.title, f"{job.body}\n\n{job.marker}", labels)
+        except (GitHubError, httpx.HTTPError) as exc:
+            await self._handle_failure(job, exc)
+            return
+        except Exception as exc:
+            logger.exception("Issue job %d crashed", job.id)
+            await self._finish_failed(job, repr(exc))
+            return
+
+        job.status = "done"
+        job.issue_url = issue["html_url"]
+        await asyncio.to_thread(self._queue.complete, job.id, job.issue_url)
+        logger.info("Issue job %d created %s (attempt %d)", job.id, job.issue_url, job.attempts)
+        await self._report(job)
+
+    async def _find_existing(self, client: GitHubClient, job: IssueJob) -> dict | None:
+        since = datetime.fromtimestamp(job.created_at - 60, tz=UTC)
+        issues = await client.request(
+            "GET",
+            f"{client.repo_path}/issues",
+            params={
+                "state": "all",
+                "sort": "created",
+                "direction": "desc",
+                "since": since.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "per_page": 100,
+            },
+        )
+        for issue in issues or []:
+            if job.marker in (issue.get("body") or ""):
+                logger.info("Issue job %d already created %s", job.id, issue["html_url"])
+                return issue
+        return None
+
+    async def _handle_failure(self, job: IssueJob, exc: Exception) -> None:
+        rate_limited = isinstance(exc, GitHubError) and exc.rate_limited
+        retryable = (
+            rate_limited
+            or isinstance(exc, httpx.TransportError)
+            or (isinstance(exc, GitHubError) and exc.status >= 500)
+        )
+        if not retryable or job.attempts >= self._max_attempts:
+            logger.error("Issue job %d failed after %d attempts: %s", job.id, job.attempts, exc)
+            await self._finish_failed(job, str(exc))
+            return
+
+        # Full jitter keeps a burst of failed jobs from retrying in lockstep
+        cap = min(self._max_delay, self._base_delay * 2 ** (job.attempts - 1))
+        retry_at = self._clock() + self._rng.uniform(0, cap)
+        if isinstance(exc, GitHubError) and exc.retry_after is not None:
+            retry_at = max(retry_at, self._clock() + exc.retry_after)
+            self._paused_until = max(self._paused_until, retry_at)
+        logger.warning(
+            "Issue job %d attempt %d failed (%s); retrying in %.1fs",
+            job.id,
+            job.attempts,
+            exc,
+            retry_at - self._clock(),
+        )
+        await asyncio.to_thread(self._queue.retry, job.id, retry_at, str(exc))
+
+    async def _finish_failed(self, job: IssueJob, error: str) -> None:
+        job.status = "failed"
+        job.error = error
+        await asyncio.to_thread(self._queue.fail, job.id, error)
+        await self._report(job)
+
+    async def _report(self, job: IssueJob) -> None:
+        try:
+            await self._on_result(job)
+        except Exception:
+            logger.exception("Failed to report issue job %d", job.id)
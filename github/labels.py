@@ -0,0 +1,163 @@
+"""Cached label catalog of the configured repository.
+
+The analyze step lets the model propose labels freely ("Bug", "type: bug",
+"domain:auth", "개선"). Passing those straight to GitHub either fails
+validation or silently creates stray labels. The catalog keeps the
+repository's real label names in memory and maps proposals onto them
+locally, so checking a label never costs a request:
+
+- Labels are fetched once and revalidated after ``ttl`` seconds. The refresh
+  goes through ``GitHubClient``'s ETag cache, so an unchanged catalog costs a
+  free ``304 Not Modified``.
+- A stale catalog keeps answering from memory until the bot's background
+  sync refreshes it; lookups never wait on the network.
+- Matching ignores case, spacing, punctuation and emoji, accepts a bare name
+  for a prefixed label ("bug" for "type: bug"), a few common synonyms, and
+  finally close spellings. Proposals that match nothing are dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import difflib
+import logging
+import re
+import time
+import unicodedata
+from collections.abc import Callable
+
+from config import settings
+from github.client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = 100
+_FUZZY_CUTOFF = 0.85
+# "type: bug" -> "bug", "domain/auth" -> "auth"
+_PREFIX = re.compile(r"^[^:/]+[:/]\s*")
+_SYNONYMS = (
+    ("bug", "버그", "defect"),
+    ("enhancement", "feature", "기능", "기능요청", "featurerequest"),
+    ("improvement", "개선", "refactor", "refactoring"),
+    ("question", "질문"),
+    ("documentation", "docs", "문서"),
+)
+_SYNONYM_GROUPS = {name: group for group in _SYNONYMS for name in group}
+
+_catalog: LabelCatalog | None = None
+
+
+def normalize_label(name: str) -> str:
+    """Reduce a label name to lowercase letters and digits (Hangul included)."""
+    return "".join(ch for ch in unicodedata.normalize("NFKC", name).casefold() if ch.isalnum())
+
+
+class LabelCatalog:
+    """In-memory catalog of one repository's labels.
+
+    Args:
+        ttl: Seconds after the last refresh before the catalog is revalidated.
+        clock: Monotonic time source.
+    """
+
+    def __init__(self, ttl: float = 600.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttl = ttl
+        self._clock = clock
+        self._names: list[str] = []
+        # Normalized full names first, then the unprefixed tails that do not collide
+        self._keys: dict[str, str] = {}
+        self._checked_at: float | None = None
+        self._loaded = False
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._names)
+
+    @property
+    def is_stale(self) -> bool:
+        return self._checked_at is None or self._clock() - self._checked_at >= self._ttl
+
+    async def refresh(self, client: GitHubClient, *, force: bool = False) -> bool:
+        """Fetch the label list if the catalog is stale.
+
+        Args:
+            client: Client for the repository.
+            force: Revalidate even if the TTL has not expired.
+
+        Returns:
+            Whether a fetch was made.
+        """
+        async with self._refresh_lock:
+            if not force and not self.is_stale:
+                return False
+            try:
+                names: list[str] = []
+                page = 1
+                while True:
+                    batch = await client.request(
+                        "GET",
+                        f"{client.repo_path}/labels",
+                        params={"per_page": _PAGE_SIZE, "page": page},
+                    )
+                    names.extend(label["name"] for label in batch or [])
+                    if not batch or len(batch) < _PAGE_SIZE:
+                        break
+                    page += 1
+            finally:
+                # A failed refresh also waits out the TTL instead of retrying on every lookup
+                self._checked_at = self._clock()
+            self._set_names(names)
+            return True
+
+    def match(self, label: str) -> str | None:
+        """Return the repository label ``label`` refers to, or ``None``."""
+        key = normalize_label(label)
+        if not key:
+            return None
+        tail = normalize_label(_PREFIX.sub("", label))
+        for candidate in (key, tail):
+            for alias in _SYNONYM_GROUPS.get(candidate, (candidate,)):
+                name = self._keys.get(alias)
+                if name is not None:
+                    return name
+        close = difflib.get_close_matches(key, self._keys, n=1, cutoff=_FUZZY_CUTOFF)
+        return self._keys[close[0]] if close else None
+
+    def resolve(self, labels: list[str]) -> list[str]:
+        """Map proposed labels onto repository labels, dropping any without a match.
+
+        Pure in-memory work. An unloaded catalog matches nothing, so the result
+        is always safe to send with a new issue.
+        """
+        resolved: list[str] = []
+        for label in labels:
+            name = self.match(label) if isinstance(label, str) else None
+            if name is None:
+                logger.info("Dropping label %r: no matching repository label", label)
+            elif name not in resolved:
+                resolved.append(name)
+        return resolved
+
+    def _set_names(self, names: list[str]) -> None:
+        keys: dict[str, str] = {}
+        for name in names:
+            keys.setdefault(normalize_label(name), name)
+        for name in names:
+            keys.setdefault(normalize_label(_PREFIX.sub("", name)), name)
+        keys.pop("", None)
+        self._names, self._keys = names, keys
+        self._loaded = True
+        logger.info("Loaded %d repository labels", len(names))
+
+
+def get_label_catalog() -> LabelCatalog:
+    """Return the shared catalog for the configured repository, creating it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = LabelCatalog(settings.label_cache_ttl)
+    return _catalog
@@ -0,0 +1,288 @@
+"""Process metrics in the Prometheus text format.
+
+A small dependency-free registry of counters, gauges and histograms. Code
+that wants to be measured updates the module-level metrics below; the bot
+serves ``render()`` at ``/metrics`` on ``settings.metrics_host`` and
+``settings.metrics_port``.
+
+- Graph nodes are timed by ``timed_node()`` (wrapped in ``agent.graph``),
+  which also sets ``current_node`` so nested code can attribute what it
+  records, e.g. JSON parse failures.
+- Token usage per LLM call is recorded by ``agent.llm.log_usage``, and the
+  LLM admission queue by ``agent.admission``.
+- Discord deliveries are timed by ``bot.outbound``, both the time spent
+  queued behind the rate limits and the request itself.
+- Values that already exist elsewhere, like session counts, are read at
+  scrape time through ``set_callback()``.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import math
+import time
+from collections.abc import Callable, Mapping, Sequence
+from contextvars import ContextVar
+from typing import Any
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (10, 50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+current_node: ContextVar[str] = ContextVar("current_node", default="none")
+
+_registry: list[_Metric] = []
+
+
+class _Metric:
+    """A named metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._callback: Callable[[], Mapping[tuple[str, ...], float]] | None = None
+        _registry.append(self)
+
+    def set_callback(self, callback: Callable[[], Mapping[tuple[str, ...], float]] | None) -> None:
+        """Read the metric's values from ``callback`` (label values -> value) at scrape time.
+
+        ``None`` goes back to the values recorded on the metric itself.
+        """
+        self._callback = callback
+
+    def _key(self, labels: Mapping[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[tuple[str, dict[str, str], float]]:
+        values = self._callback() if self._callback is not None else self._values
+        return [
+            (self.name, dict(zip(self.labelnames, key)), value) for key, value in values.items()
+        ]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            # Per-bucket counts (plus +Inf), sum, count
+            series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        counts = series[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._values.get(self._key(labels))
+        return series[2] if series is not None else 0
+
+    def _samples(self) -> list[tuple[str, dict[str, str], float]]:
+        samples: list[tuple[str, dict[str, str], float]] = []
+        for key, (counts, total, count) in self._values.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative)
+                )
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render() -> str:
+    """Return every registered metric in the Prometheus text format."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# ---------------------------------------------------------------------
+# Bot metrics
+# ---------------------------------------------------------------------
+
+NODE_DURATION = Histogram(
+    "issue_bot_node_duration_seconds", "Time spent in each graph node", ["node"]
+)
+NODE_ERRORS = Counter("issue_bot_node_errors_total", "Graph node runs that raised", ["node"])
+LLM_TOKENS = Histogram(
+    "issue_bot_llm_tokens",
+    "Tokens per LLM call by call and kind (input, output, cache_read, cache_creation)",
+    ["call", "kind"],
+    buckets=TOKEN_BUCKETS,
+)
+LLM_CACHE_LOOKUPS = Counter(
+    "issue_bot_llm_cache_lookups_total",
+    "Response cache lookups by node and result",
+    ["node", "result"],
+)
+LLM_STRUCTURED_OUTPUTS = Counter(
+    "issue_bot_llm_structured_outputs_total",
+    "Schema-validated LLM answers by outcome (valid, repaired, escalated, partial, wasted)",
+    ["call", "outcome"],
+)
+LLM_QUEUE_DEPTH = Gauge("issue_bot_llm_queue_depth", "LLM requests waiting for admission")
+LLM_IN_FLIGHT = Gauge("issue_bot_llm_in_flight", "LLM requests admitted and not yet answered")
+LLM_QUEUE_DURATION = Histogram(
+    "issue_bot_llm_queue_seconds", "Time an LLM request waited for admission", ["node"]
+)
+JSON_PARSE_FAILURES = Counter(
+    "issue_bot_json_parse_failures_total", "LLM responses that were not valid JSON", ["node"]
+)
+DISCORD_QUEUE_DURATION = Histogram(
+    "issue_bot_discord_queue_seconds",
+    "Time a Discord operation waited in the outbound queue",
+    ["route"],
+)
+DISCORD_REQUEST_DURATION = Histogram(
+    "issue_bot_discord_request_duration_seconds", "Latency of Discord API calls", ["route"]
+)
+DISCORD_FAILURES = Counter(
+    "issue_bot_discord_failures_total", "Discord API calls that failed", ["route"]
+)
+AGENT_READY = Gauge("issue_bot_agent_ready", "1 once the agent graph and LLM clients are loaded")
+SESSIONS = Gauge("issue_bot_sessions", "Sessions held in memory and awaiting a write", ["state"])
+SESSION_EVENTS = Counter(
+    "issue_bot_session_events_total", "Session evictions, deletions and reloads", ["event"]
+)
+
+
+def timed_node(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a graph node so its runs are timed, counted and logged.
+
+    The wrapper keeps ``func``'s signature and sync/async kind, and sets
+    ``current_node`` to ``name`` while the node runs.
+    """
+
+    def finish(start: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - start
+        NODE_DURATION.observe(elapsed, node=name)
+        if failed:
+            NODE_ERRORS.inc(node=name)
+        logger.info(
+            "node=%s duration_ms=%.1f status=%s", name, elapsed * 1000, "error" if failed else "ok"
+        )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = current_node.set(name)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                finish(start, failed)
+                current_node.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_node.set(name)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            finish(start, failed)
+            current_node.reset(token)
+
+    return wrapper
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Serve ``render()`` at ``http://host:port/metrics`` until the runner is cleaned up."""
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, port)
+    return runner
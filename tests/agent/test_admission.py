@@ -0,0 +1,160 @@
+"""Tests for agent.admission module."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent.admission import (
+    AdmissionController,
+    ainvoke_admitted,
+    prompt_tokens,
+    queue_notice,
+    set_admission,
+    used_tokens,
+)
+
+
+async def _hold(controller: AdmissionController, priority: int, release: asyncio.Event) -> None:
+    async with controller.admit(priority, 1):
+        await release.wait()
+
+
+async def _until_queued(controller: AdmissionController, depth: int) -> None:
+    while controller.depth < depth:
+        await asyncio.sleep(0)
+
+
+class TestAdmissionController:
+    """Tests for the concurrency cap, priorities and the token budget."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self) -> None:
+        controller = AdmissionController(2)
+        running = peak = 0
+
+        async def call() -> None:
+            nonlocal running, peak
+            async with controller.admit(0, 1):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_admitted_by_priority(self) -> None:
+        controller = AdmissionController(1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, 0, release))
+        await asyncio.sleep(0)
+        order: list[int] = []
+
+        async def call(priority: int) -> None:
+            async with controller.admit(priority, 1):
+                order.append(priority)
+
+        tasks = [asyncio.create_task(call(p)) for p in (2, 0, 1, 0)]
+        await _until_queued(controller, 4)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert order == [0, 0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_token_budget_delays_requests(self) -> None:
+        # 600 tokens per minute refill at 10 tokens per second
+        controller = AdmissionController(10, 600)
+        async with controller.admit(0, 600):
+            pass
+        start = time.monotonic()
+        async with controller.admit(0, 3):
+            pass
+        assert time.monotonic() - start >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_settled_usage_returns_unused_budget(self) -> None:
+        controller = AdmissionController(10, 600)
+        async with controller.admit(0, 600) as ticket:
+            ticket.settle(10)
+        start = time.monotonic()
+        async with controller.admit(0, 500):
+            pass
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_long_waits_report_queue_position(self) -> None:
+        controller = AdmissionController(1, notice_after=0.01)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, 0, release))
+        await asyncio.sleep(0)
+        positions: list[int] = []
+
+        async def notify(position: int) -> None:
+            positions.append(position)
+
+        async def call(priority: int) -> None:
+            token = queue_notice.set(notify)
+            try:
+                async with controller.admit(priority, 1):
+                    pass
+            finally:
+                queue_notice.reset(token)
+
+        tasks = [asyncio.create_task(call(p)) for p in (1, 0)]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert sorted(positions) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_gives_up_its_place(self) -> None:
+        controller = AdmissionController(1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, 0, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(controller, 0, asyncio.Event()))
+        await _until_queued(controller, 1)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.depth == 0
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+
+class TestAinvokeAdmitted:
+    """Tests for admitted model calls."""
+
+    @pytest.mark.asyncio
+    async def test_invokes_through_the_shared_controller(self) -> None:
+        controller = AdmissionController(1)
+        set_admission(controller)
+        try:
+            llm = FakeListChatModel(responses=["안녕하세요"])
+            response = await ainvoke_admitted("ask_question", llm, [HumanMessage(content="hi")])
+        finally:
+            set_admission(None)
+        assert response.content == "안녕하세요"
+        assert controller.in_flight == 0
+
+    def test_estimates_and_usage(self) -> None:
+        message = HumanMessage(content=[{"type": "text", "text": "가" * 100}])
+        assert prompt_tokens([message]) == 100
+        response = AIMessage(
+            content="",
+            usage_metadata={
+                "input_tokens": 1200,
+                "output_tokens": 80,
+                "total_tokens": 1280,
+                "input_token_details": {"cache_read": 1000},
+            },
+        )
+        assert used_tokens(response) == 280
+        assert used_tokens(AIMessage(content="")) is None
@@ -0,0 +1,118 @@
+"""Tests for agent.nodes.analyze module."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import BaseMessage
+
+from agent.llm import set_llm
+from agent.nodes.analyze import analyze
+from agent.state import IssueState
+from config import settings
+
+
+class RecordingChatModel(FakeListChatModel):
+    """FakeListChatModel that keeps the prompt text of every call."""
+
+    prompts: list[str] = []
+
+    def _call(self, messages: list[BaseMessage], *args: Any, **kwargs: Any) -> str:
+        self.prompts.append("".join(block["text"] for block in messages[-1].content))
+        return super()._call(messages, *args, **kwargs)
+
+
+@pytest.fixture
+def install() -> Iterator[Any]:
+    """Return a function that installs a recording model with the given responses."""
+
+    def _install(*responses: str) -> RecordingChatModel:
+        model = RecordingChatModel(responses=list(responses), prompts=[])
+        set_llm(model)
+        return model
+
+    yield _install
+    set_llm(None)
+
+
+@pytest.fixture
+def conversation() -> IssueState:
+    """State after one analyzed turn and a follow-up question."""
+    return {
+        "messages": [
+            {"role": "user", "content": "로그인이 안 돼요"},
+            {"role": "assistant", "content": "어떤 로그인 방식인가요?"},
+            {"role": "user", "content": "카카오 로그인입니다"},
+        ],
+        "issue_title": "로그인 실패",
+        "issue_type": "bug",
+        "conversation_summary": "사용자가 로그인 실패를 보고함",
+        "analyzed_message_count": 1,
+    }
+
+
+class TestAnalyzeFull:
+    """Tests for the default full-transcript mode."""
+
+    @pytest.mark.asyncio
+    async def test_extracts_non_null_fields(
+        self, install: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "analyze_mode", "full")
+        install(json.dumps({"issue_title": "로그인 실패", "severity": None}))
+
+        result = await analyze({"messages": [{"role": "user", "content": "로그인이 안 돼요"}]})
+
+        assert result == {"issue_title": "로그인 실패"}
+
+
+class TestAnalyzeIncremental:
+    """Tests for the incremental extraction mode."""
+
+    @pytest.mark.asyncio
+    async def test_prompt_has_state_summary_and_only_new_messages(
+        self, install: Any, conversation: IssueState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "analyze_mode", "incremental")
+        model = install(json.dumps({"updates": {}, "summary": "s"}))
+
+        await analyze(conversation)
+
+        prompt = model.prompts[0]
+        assert '"issue_title": "로그인 실패"' in prompt
+        assert "사용자가 로그인 실패를 보고함" in prompt
+        assert "카카오 로그인입니다" in prompt
+        assert "로그인이 안 돼요" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_applies_patch_and_advances_cursor(
+        self, install: Any, conversation: IssueState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "analyze_mode", "incremental")
+        install(
+            json.dumps(
+                {
+                    "updates": {"affected_domain": "auth", "severity": None},
+                    "summary": "카카오 로그인 실패",
+                }
+            )
+        )
+
+        result = await analyze(conversation)
+
+        assert result == {
+            "affected_domain": "auth",
+            "conversation_summary": "카카오 로그인 실패",
+            "analyzed_message_count": 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_keeps_cursor(
+        self, install: Any, conversation: IssueState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "analyze_mode", "incremental")
+        install("not json")
+
+        assert await analyze(conversation) == {}
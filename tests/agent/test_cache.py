@@ -0,0 +1,184 @@
+"""Tests for agent.cache module."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from agent.cache import (
+    ResponseCache,
+    cached_ainvoke,
+    parses_as_json,
+    request_key,
+    set_response_cache,
+)
+from agent.llm import prompt_message, set_llm, system_message
+from agent.nodes.draft import generate_draft
+from agent.state import IssueState
+from config import settings
+
+
+class CountingChatModel(FakeListChatModel):
+    """FakeListChatModel that counts its calls."""
+
+    calls: int = 0
+
+    def _call(self, messages: list[BaseMessage], *args: Any, **kwargs: Any) -> str:
+        self.calls += 1
+        return super()._call(messages, *args, **kwargs)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[ResponseCache]:
+    """Memory-only cache enabled for every node."""
+    monkeypatch.setattr(settings, "llm_cache_nodes", ["analyze", "generate_draft"])
+    cache = ResponseCache()
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+def _messages(prompt: str = "로그인 버그") -> list[BaseMessage]:
+    return [system_message("system"), prompt_message("instructions", prompt)]
+
+
+class TestRequestKey:
+    """Tests for cache keys."""
+
+    def test_same_request_same_key(self) -> None:
+        llm = FakeListChatModel(responses=["x"])
+        assert request_key(llm, _messages()) == request_key(llm, _messages())
+
+    def test_prompt_changes_key(self) -> None:
+        llm = FakeListChatModel(responses=["x"])
+        assert request_key(llm, _messages("a")) != request_key(llm, _messages("b"))
+
+    def test_cache_control_markers_do_not_matter(self) -> None:
+        llm = FakeListChatModel(responses=["x"])
+        plain = [system_message("system"), HumanMessage(content="instructionsprompt")]
+        marked = [system_message("system"), prompt_message("instructions", "prompt")]
+        assert request_key(llm, plain) == request_key(llm, marked)
+
+    def test_bound_tools_are_part_of_key(self) -> None:
+        llm = FakeListChatModel(responses=["x"])
+        first = llm.bind(tools=[{"name": "Verdict"}], tool_choice="Verdict")
+        second = llm.bind(tools=[{"name": "Draft"}], tool_choice="Draft")
+        assert request_key(first, _messages()) != request_key(second, _messages())
+        assert request_key(first, _messages()) != request_key(llm, _messages())
+
+    def test_model_and_max_tokens_are_part_of_key(self) -> None:
+        assert ResponseCache.key("m1", 100, "s", "p") != ResponseCache.key("m2", 100, "s", "p")
+        assert ResponseCache.key("m1", 100, "s", "p") != ResponseCache.key("m1", 200, "s", "p")
+
+
+class TestResponseCache:
+    """Tests for the LRU and SQLite layers."""
+
+    def test_memory_lru_evicts_oldest(self) -> None:
+        cache = ResponseCache(memory_entries=2)
+        cache.put("a", "analyze", "A")
+        cache.put("b", "analyze", "B")
+        cache.get("a")
+        cache.put("c", "analyze", "C")
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+
+    def test_entries_expire(self) -> None:
+        clock = FakeClock()
+        cache = ResponseCache(ttl=60, clock=clock)
+        cache.put("a", "analyze", "A")
+        clock.now += 60
+        assert cache.get("a") is None
+
+    def test_disk_survives_restart(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "cache.db")
+        first = ResponseCache(path)
+        first.put("a", "analyze", "A")
+        first.close()
+
+        reopened = ResponseCache(path)
+        assert reopened.get("a") == "A"
+        reopened.close()
+
+    def test_disk_expiry(self, tmp_path: Path) -> None:
+        clock = FakeClock()
+        path = str(tmp_path / "cache.db")
+        ResponseCache(path, clock=clock).put("a", "analyze", "A")
+        clock.now += 120
+        assert ResponseCache(path, ttl=60, clock=clock).get("a") is None
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        clock = FakeClock()
+        path = str(tmp_path / "cache.db")
+        cache = ResponseCache(path, max_bytes=250, clock=clock)
+        for key in "abc":
+            clock.now += 1
+            cache.put(key, "analyze", "x" * 100)
+        cache.close()
+
+        reopened = ResponseCache(path, clock=clock)
+        assert reopened.get("a") is None
+        assert reopened.get("b") == "x" * 100
+        assert reopened.get("c") == "x" * 100
+        reopened.close()
+
+
+class TestCachedAinvoke:
+    """Tests for the node-facing cache wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_second_identical_call_is_served_from_cache(self, cache: ResponseCache) -> None:
+        llm = CountingChatModel(responses=['{"a": 1}', '{"a": 2}'])
+        first = await cached_ainvoke("analyze", llm, _messages())
+        second = await cached_ainvoke("analyze", llm, _messages())
+        assert llm.calls == 1
+        assert first.content == second.content == '{"a": 1}'
+        assert (cache.hits["analyze"], cache.misses["analyze"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_disabled_node_always_calls_model(self, cache: ResponseCache) -> None:
+        llm = CountingChatModel(responses=["어떤 화면인가요?", "어떤 브라우저인가요?"])
+        await cached_ainvoke("ask_question", llm, _messages())
+        second = await cached_ainvoke("ask_question", llm, _messages())
+        assert llm.calls == 2
+        assert second.content == "어떤 브라우저인가요?"
+
+    @pytest.mark.asyncio
+    async def test_rejected_responses_are_not_stored(self, cache: ResponseCache) -> None:
+        llm = CountingChatModel(responses=["not json", '{"a": 1}'])
+        await cached_ainvoke("analyze", llm, _messages(), cacheable=parses_as_json)
+        retried = await cached_ainvoke("analyze", llm, _messages(), cacheable=parses_as_json)
+        assert llm.calls == 2
+        assert retried.content == '{"a": 1}'
+
+    @pytest.mark.asyncio
+    async def test_unchanged_draft_reuses_draft_and_judge(
+        self, cache: ResponseCache, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "two_step")
+        draft = {"draft_title": "로그인 오류", "draft_body": "본문"}
+        judge = {"auto_resolve": False, "confidence": "low", "reason": "복잡함"}
+        llm = CountingChatModel(responses=[json.dumps(draft), json.dumps(judge)])
+        set_llm(llm)
+        state: IssueState = {"issue_title": "로그인 안됨", "issue_description": "500 에러"}
+        try:
+            first = await generate_draft(state)
+            second = await generate_draft(state)
+        finally:
+            set_llm(None)
+        assert llm.calls == 2
+        assert second["draft_title"] == first["draft_title"] == "로그인 오류"
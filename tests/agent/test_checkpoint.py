@@ -0,0 +1,161 @@
+"""Tests for agent.checkpoint module."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aiosqlite
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+
+from agent.checkpoint import Saver, prune, thread_config
+from agent.state import IssueState
+
+
+def _graph(saver: Saver, delay: float = 0.0) -> CompiledStateGraph:
+    async def reply(state: IssueState) -> IssueState:
+        await asyncio.sleep(delay)
+        count = sum(1 for m in state["messages"] if m["role"] == "user")
+        return {"messages": [{"role": "assistant", "content": f"답변 {count}"}]}
+
+    graph = StateGraph(IssueState)
+    graph.add_node("reply", reply)
+    graph.set_entry_point("reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=saver)
+
+
+def _user(content: str) -> IssueState:
+    return {"messages": [{"role": "user", "content": content}]}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def saver(request: pytest.FixtureRequest, tmp_path: Path) -> AsyncIterator[Saver]:
+    """Each test runs against both savers."""
+    if request.param == "memory":
+        yield InMemorySaver()
+        return
+    async with aiosqlite.connect(str(tmp_path / "sessions.db")) as conn:
+        yield AsyncSqliteSaver(conn)
+
+
+async def _checkpoint_count(saver: Saver, thread_id: int) -> int:
+    return len([item async for item in saver.alist(thread_config(thread_id))])
+
+
+class TestCheckpointSavers:
+    """Tests for conversations kept in the checkpointers."""
+
+    @pytest.mark.asyncio
+    async def test_turn_continues_from_committed_checkpoint(self, saver: Saver) -> None:
+        graph = _graph(saver)
+        await graph.ainvoke(
+            {**_user("첫 메시지"), "issue_title": "제목"}, thread_config(1), durability="exit"
+        )
+        committed = await prune(saver, "1")
+
+        result = await graph.ainvoke(
+            _user("두 번째"), thread_config(1, committed), durability="exit"
+        )
+
+        assert [m["content"] for m in result["messages"]] == [
+            "첫 메시지",
+            "답변 1",
+            "두 번째",
+            "답변 2",
+        ]
+        assert result["issue_title"] == "제목"
+
+    @pytest.mark.asyncio
+    async def test_superseded_run_is_dropped(self, saver: Saver) -> None:
+        graph = _graph(saver, delay=0.05)
+        await graph.ainvoke(_user("첫 메시지"), thread_config(1), durability="exit")
+        committed = await prune(saver, "1")
+
+        run = asyncio.create_task(
+            graph.ainvoke(_user("취소될 메시지"), thread_config(1, committed), durability="exit")
+        )
+        await asyncio.sleep(0.01)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        result = await graph.ainvoke(
+            _user("다시 보낸 메시지"), thread_config(1, committed), durability="exit"
+        )
+        await prune(saver, "1")
+
+        assert "취소될 메시지" not in [m["content"] for m in result["messages"]]
+        assert await _checkpoint_count(saver, 1) == 1
+        latest = await saver.aget_tuple(thread_config(1))
+        assert latest is not None
+        assert latest.checkpoint["channel_values"]["messages"] == result["messages"]
+
+    @pytest.mark.asyncio
+    async def test_prune_keeps_other_threads(self, saver: Saver) -> None:
+        graph = _graph(saver)
+        for _ in range(2):
+            await graph.ainvoke(_user("스레드 1"), thread_config(1), durability="exit")
+            await graph.ainvoke(_user("스레드 2"), thread_config(2), durability="exit")
+
+        await prune(saver, "1")
+
+        assert await _checkpoint_count(saver, 1) == 1
+        assert await _checkpoint_count(saver, 2) == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_thread(self, saver: Saver) -> None:
+        graph = _graph(saver)
+        await graph.ainvoke(_user("스레드 1"), thread_config(1), durability="exit")
+        await graph.ainvoke(_user("스레드 2"), thread_config(2), durability="exit")
+
+        await saver.adelete_thread("1")
+
+        assert await saver.aget_tuple(thread_config(1)) is None
+        assert await saver.aget_tuple(thread_config(2)) is not None
+
+    @pytest.mark.asyncio
+    async def test_prune_without_checkpoints(self, saver: Saver) -> None:
+        assert await prune(saver, "1") is None
+
+
+class TestInMemorySaver:
+    """Tests specific to the in-memory saver."""
+
+    @pytest.mark.asyncio
+    async def test_prune_drops_stale_blobs(self) -> None:
+        saver = InMemorySaver()
+        graph = _graph(saver)
+        await graph.ainvoke(
+            {**_user("첫 메시지"), "issue_title": "제목"}, thread_config(1), durability="exit"
+        )
+        committed = await prune(saver, "1")
+        await graph.ainvoke(_user("두 번째"), thread_config(1, committed), durability="exit")
+        await prune(saver, "1")
+
+        latest = await saver.aget_tuple(thread_config(1))
+        assert latest is not None
+        versions = latest.checkpoint["channel_versions"]
+        assert all(versions.get(channel) == version for _, _, channel, version in saver.blobs)
+        assert latest.checkpoint["channel_values"]["issue_title"] == "제목"
+
+
+class TestAsyncSqliteSaver:
+    """Tests specific to the SQLite saver."""
+
+    @pytest.mark.asyncio
+    async def test_persists_across_connections(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        async with aiosqlite.connect(path) as conn:
+            first = AsyncSqliteSaver(conn)
+            await _graph(first).ainvoke(_user("첫 메시지"), thread_config(1), durability="exit")
+            committed = await prune(first, "1")
+
+        async with aiosqlite.connect(path) as conn:
+            result = await _graph(AsyncSqliteSaver(conn)).ainvoke(
+                _user("두 번째"), thread_config(1, committed), durability="exit"
+            )
+
+        assert len(result["messages"]) == 4
@@ -0,0 +1,162 @@
+"""Tests for agent.nodes.classify module."""
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import BaseMessage
+
+from agent.graph import create_graph
+from agent.llm import set_llm
+from agent.nodes.classify import CANCELLED_MESSAGE, DRAFT_PENDING_MESSAGE, classify_turn
+from agent.state import IssueState
+from config import settings
+
+
+class CountingChatModel(FakeListChatModel):
+    """FakeListChatModel that counts its calls."""
+
+    calls: int = 0
+
+    def _call(self, messages: list[BaseMessage], *args: Any, **kwargs: Any) -> str:
+        self.calls += 1
+        return super()._call(messages, *args, **kwargs)
+
+
+@pytest.fixture
+def model() -> Iterator[CountingChatModel]:
+    """Install a counting model that answers every prompt with a plain question."""
+    model = CountingChatModel(responses=["{}", "어떤 화면에서 발생했나요?"])
+    set_llm(model)
+    yield model
+    set_llm(None)
+
+
+CANDIDATE = {
+    "number": 12,
+    "title": "로그인 실패",
+    "url": "https://github.com/o/r/issues/12",
+    "state": "open",
+    "score": 0.8,
+}
+
+
+def _with_draft(content: str) -> IssueState:
+    return {
+        "messages": [
+            {"role": "user", "content": "로그인 버그"},
+            {"role": "assistant", "content": "이슈 초안이 작성되었습니다."},
+            {"role": "user", "content": content},
+        ],
+        "draft_title": "[Bug] 로그인 실패",
+        "draft_body": "## 설명\n로그인 실패",
+    }
+
+
+def _without_draft(content: str) -> IssueState:
+    return {
+        "messages": [
+            {"role": "user", "content": "로그인 버그"},
+            {"role": "assistant", "content": "어떤 로그인 방식인가요?"},
+            {"role": "user", "content": content},
+        ],
+    }
+
+
+class TestClassifyTurn:
+    """Tests for the classify_turn pre-check node."""
+
+    def test_confirmation_with_draft(self) -> None:
+        result = classify_turn(_with_draft("확인"))
+        assert result == {"turn_type": "confirm", "completeness_status": "confirmed"}
+
+    def test_confirmation_ignores_trailing_punctuation(self) -> None:
+        assert classify_turn(_with_draft("네!"))["turn_type"] == "confirm"
+
+    def test_confirmation_without_draft_is_content(self) -> None:
+        assert classify_turn(_without_draft("네"))["turn_type"] == "content"
+
+    def test_cancellation(self) -> None:
+        result = classify_turn(_without_draft("취소"))
+        assert result["turn_type"] == "cancel"
+        assert result["completeness_status"] == "cancelled"
+        assert result["messages"] == [{"role": "assistant", "content": CANCELLED_MESSAGE}]
+
+    def test_duplicate_picks_best_candidate(self) -> None:
+        state = _with_draft("중복")
+        state["duplicate_candidates"] = [CANDIDATE, {**CANDIDATE, "number": 7, "url": "u7"}]
+        result = classify_turn(state)
+        assert result["turn_type"] == "duplicate"
+        assert result["completeness_status"] == "duplicate"
+        assert "#12" in result["messages"][0]["content"]
+
+    def test_duplicate_by_issue_number(self) -> None:
+        state = _with_draft("#7")
+        state["duplicate_candidates"] = [CANDIDATE, {**CANDIDATE, "number": 7, "url": "u7"}]
+        result = classify_turn(state)
+        assert result["turn_type"] == "duplicate"
+        assert "u7" in result["messages"][0]["content"]
+
+    def test_duplicate_by_issue_url(self) -> None:
+        url = "https://github.com/Org/Repo/issues/7"
+        state = _with_draft(url)
+        state["duplicate_candidates"] = [CANDIDATE, {**CANDIDATE, "number": 7, "url": url}]
+        result = classify_turn(state)
+        assert result["turn_type"] == "duplicate"
+        assert url in result["messages"][0]["content"]
+
+    def test_bare_number_is_not_a_duplicate_pick(self) -> None:
+        state = _with_draft("7")
+        state["duplicate_candidates"] = [CANDIDATE, {**CANDIDATE, "number": 7, "url": "u7"}]
+        assert classify_turn(state)["turn_type"] == "content"
+
+    def test_duplicate_without_candidates_is_content(self) -> None:
+        assert classify_turn(_with_draft("중복"))["turn_type"] == "content"
+
+    def test_acknowledgement_with_draft_replies_without_llm(self) -> None:
+        result = classify_turn(_with_draft("감사합니다"))
+        assert result["turn_type"] == "ack"
+        assert result["messages"] == [{"role": "assistant", "content": DRAFT_PENDING_MESSAGE}]
+
+    def test_acknowledgement_without_draft(self) -> None:
+        assert classify_turn(_without_draft("ㅋㅋ")) == {"turn_type": "ack"}
+
+    def test_issue_content_goes_to_analyze(self) -> None:
+        result = classify_turn(_without_draft("카카오 로그인에서 500 에러가 납니다"))
+        assert result == {"turn_type": "content"}
+
+    def test_disabled_precheck_treats_everything_as_content(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "turn_precheck", False)
+        assert classify_turn(_with_draft("확인")) == {"turn_type": "content"}
+
+
+class TestFastPathRoutes:
+    """LLM calls made by the compiled graph on each fast-path route."""
+
+    @pytest.mark.asyncio
+    async def test_confirm_makes_no_llm_call(self, model: CountingChatModel) -> None:
+        result = await create_graph().ainvoke(_with_draft("확인"))
+        assert result["completeness_status"] == "confirmed"
+        assert model.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_makes_no_llm_call(self, model: CountingChatModel) -> None:
+        result = await create_graph().ainvoke(_without_draft("취소"))
+        assert result["completeness_status"] == "cancelled"
+        assert model.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_ack_with_draft_makes_no_llm_call(self, model: CountingChatModel) -> None:
+        result = await create_graph().ainvoke(_with_draft("감사합니다"))
+        assert result["messages"][-1]["content"] == DRAFT_PENDING_MESSAGE
+        assert model.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_ack_without_draft_skips_analyze(self, model: CountingChatModel) -> None:
+        result = await create_graph().ainvoke(_without_draft("넵"))
+        # Only ask_question runs
+        assert model.calls == 1
+        assert result["completeness_status"] == "insufficient"
@@ -0,0 +1,79 @@
+"""Tests for agent.context module."""
+
+import time
+
+from agent.context import CLIP_MARKER, SUMMARY_LABEL, build_context, clip_tokens
+from agent.state import Message
+from agent.utils import estimate_tokens
+
+
+def _thread(turns: int) -> list[Message]:
+    messages: list[Message] = [{"role": "user", "content": "회고 저장 시 500 에러가 납니다."}]
+    for n in range(1, turns):
+        messages.append({"role": "assistant", "content": f"{n}번째 질문: 어떤 브라우저인가요?"})
+        messages.append({"role": "user", "content": f"{n}번째 답변. 크롬에서 재현됩니다."})
+    return messages
+
+
+class TestClipTokens:
+    """Tests for clip_tokens."""
+
+    def test_short_text_is_unchanged(self) -> None:
+        assert clip_tokens("로그인 실패", 100) == ("로그인 실패", 6)
+
+    def test_long_text_is_clipped_to_limit(self) -> None:
+        text, tokens = clip_tokens("에러" * 1000, 50)
+        assert text.endswith(CLIP_MARKER)
+        assert tokens <= 50
+        assert tokens == estimate_tokens(text)
+
+
+class TestBuildContext:
+    """Tests for build_context."""
+
+    def test_empty(self) -> None:
+        assert build_context([], 100) == ""
+
+    def test_short_thread_is_kept_whole(self) -> None:
+        messages = _thread(3)
+        context = build_context(messages, 1000)
+        assert context == "\n".join(f"[{m['role']}]: {m['content']}" for m in messages)
+
+    def test_long_thread_stays_within_budget(self) -> None:
+        for turns in (10, 100, 1000):
+            assert estimate_tokens(build_context(_thread(turns), 300)) <= 300
+
+    def test_keeps_first_report_and_latest_turns(self) -> None:
+        messages = _thread(200)
+        lines = build_context(messages, 300).split("\n")
+        assert lines[0] == "[user]: 회고 저장 시 500 에러가 납니다."
+        assert lines[1].startswith(SUMMARY_LABEL)
+        assert lines[-1] == f"[user]: {messages[-1]['content']}"
+
+    def test_cached_summary_replaces_omitted_turns(self) -> None:
+        context = build_context(_thread(200), 300, summary="크롬에서 저장 시 500 에러 반복")
+        assert f"{SUMMARY_LABEL}: 크롬에서 저장 시 500 에러 반복" in context
+        assert "생략." not in context
+
+    def test_digest_without_summary(self) -> None:
+        summary = build_context(_thread(200), 300).split("\n")[1]
+        assert "중간 대화" in summary
+        assert "번째 답변." in summary
+        assert "질문" not in summary
+
+    def test_oversized_message_is_clipped(self) -> None:
+        messages: list[Message] = [
+            {"role": "user", "content": "로그: " + "x" * 20000},
+            {"role": "user", "content": "추가 정보입니다."},
+        ]
+        context = build_context(messages, 600, message_tokens=100)
+        assert CLIP_MARKER in context
+        assert context.endswith("[user]: 추가 정보입니다.")
+
+    def test_builds_in_under_a_millisecond(self) -> None:
+        messages = _thread(1000)
+        build_context(messages, 4000)
+        start = time.perf_counter()
+        for _ in range(100):
+            build_context(messages, 4000)
+        assert (time.perf_counter() - start) / 100 < 0.001
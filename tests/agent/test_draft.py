@@ -0,0 +1,152 @@
+"""Tests for agent.nodes.draft module."""
+
+import json
+from collections.abc import Callable, Iterator
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agent.llm import set_llm
+from agent.nodes.draft import generate_draft
+from agent.state import IssueState
+from config import settings
+from github.labels import LabelCatalog
+
+DRAFT = {"draft_title": "로그인 오류", "draft_body": "## 설명\n카카오 로그인 실패"}
+JUDGE = {"auto_resolve": True, "confidence": "high", "reason": "단순 설정 오류"}
+
+
+@pytest.fixture
+def state() -> IssueState:
+    """Issue state with all required fields collected."""
+    return {
+        "issue_title": "로그인 안됨",
+        "issue_description": "카카오 로그인 시 500 에러",
+        "issue_type": "bug",
+        "affected_domain": "auth",
+    }
+
+
+@pytest.fixture
+def fake_llm() -> Iterator[Callable[..., FakeListChatModel]]:
+    """Return a function that installs a fake model replying with the given responses."""
+
+    def install(*responses: str) -> FakeListChatModel:
+        model = FakeListChatModel(responses=list(responses))
+        set_llm(model)
+        return model
+
+    yield install
+    set_llm(None)
+
+
+class TestGenerateDraft:
+    """Tests for both draft modes."""
+
+    @pytest.mark.asyncio
+    async def test_two_step_makes_two_calls(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "two_step")
+        model = fake_llm(json.dumps(DRAFT), json.dumps(JUDGE), "unused")
+
+        result = await generate_draft(state)
+
+        assert model.i == 2
+        assert result["draft_title"] == "로그인 오류"
+        assert result["auto_resolve"] is True
+        assert result["auto_resolve_reason"] == "단순 설정 오류"
+
+    @pytest.mark.asyncio
+    async def test_single_call_returns_draft_and_judgment(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "single_call")
+        model = fake_llm(json.dumps(DRAFT | JUDGE), json.dumps({"auto_resolve": False}))
+
+        result = await generate_draft(state)
+
+        assert model.i == 1
+        assert result["draft_title"] == "로그인 오류"
+        assert result["draft_body"] == DRAFT["draft_body"]
+        assert result["auto_resolve"] is True
+        assert "가능" in result["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_single_call_falls_back_to_collected_fields(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "single_call")
+        fake_llm("not json")
+
+        result = await generate_draft(state)
+
+        assert result["draft_title"] == "로그인 안됨"
+        assert result["draft_body"] == "카카오 로그인 시 500 에러"
+        assert result["auto_resolve"] is False
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_downgrades_auto_resolve(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "single_call")
+        fake_llm(json.dumps(DRAFT | JUDGE | {"confidence": "low"}))
+
+        result = await generate_draft(state)
+
+        assert result["auto_resolve"] is False
+
+    @pytest.mark.asyncio
+    async def test_preview_lists_duplicate_candidates(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "two_step")
+        fake_llm(json.dumps(DRAFT), json.dumps(JUDGE), "unused")
+        state["duplicate_candidates"] = [
+            {
+                "number": 12,
+                "title": "카카오 로그인 실패",
+                "url": "https://github.com/o/r/issues/12",
+                "state": "open",
+                "score": 0.8,
+            }
+        ]
+
+        result = await generate_draft(state)
+
+        preview = result["messages"][0]["content"]
+        assert "#12 카카오 로그인 실패 (열림) https://github.com/o/r/issues/12" in preview
+        assert "'중복'" in preview
+
+    @pytest.mark.asyncio
+    async def test_labels_are_mapped_to_repository_labels(
+        self,
+        state: IssueState,
+        fake_llm: Callable[..., FakeListChatModel],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "draft_mode", "two_step")
+        fake_llm(json.dumps(DRAFT), json.dumps(JUDGE), "unused")
+        catalog = LabelCatalog()
+        catalog._set_names(["bug", "domain/auth"])
+        monkeypatch.setattr("agent.nodes.draft.get_label_catalog", lambda: catalog)
+        state["labels"] = ["Bug", "domain:auth", "priority:critical"]
+
+        result = await generate_draft(state)
+
+        assert result["labels"] == ["bug", "domain/auth"]
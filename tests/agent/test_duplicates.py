@@ -0,0 +1,78 @@
+"""Tests for agent.nodes.duplicates module."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from agent.nodes.duplicates import find_duplicates
+from agent.state import IssueState
+from config import settings
+from github import index as index_module
+from github.index import IssueIndex
+
+
+@pytest.fixture
+def issue_index(tmp_path: Path) -> Iterator[IssueIndex]:
+    """Install a loaded index with a few issues as the shared index."""
+    index = IssueIndex(str(tmp_path / "index.db"))
+    index._write(
+        [
+            (
+                1,
+                "카카오 로그인 실패",
+                "카카오 로그인 시 500 에러",
+                "open",
+                "u1",
+                "2024-01-01T00:00:00Z",
+            ),
+            (
+                2,
+                "회고 목록 조회 느림",
+                "회고가 많으면 느림",
+                "closed",
+                "u2",
+                "2024-01-02T00:00:00Z",
+            ),
+        ],
+        "2024-01-02T00:00:00Z",
+    )
+    index.load()
+    previous, index_module._index = index_module._index, index
+    yield index
+    index_module._index = previous
+    index.close()
+
+
+@pytest.fixture
+def state() -> IssueState:
+    """Collected report that matches issue #1."""
+    return {
+        "issue_title": "카카오 로그인 안됨",
+        "issue_description": "카카오 로그인하면 500 에러가 납니다",
+    }
+
+
+class TestFindDuplicates:
+    """Tests for the find_duplicates node."""
+
+    def test_finds_matching_issue(self, issue_index: IssueIndex, state: IssueState) -> None:
+        result = find_duplicates(state)
+        assert [c["number"] for c in result["duplicate_candidates"]] == [1]
+        assert result["duplicate_candidates"][0]["url"] == "u1"
+
+    def test_unrelated_report_has_no_candidates(self, issue_index: IssueIndex) -> None:
+        state: IssueState = {"issue_title": "애플 결제 지원", "issue_description": "결제 연동"}
+        assert find_duplicates(state) == {"duplicate_candidates": []}
+
+    def test_unloaded_index_finds_nothing(
+        self, tmp_path: Path, state: IssueState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(index_module, "_index", IssueIndex(str(tmp_path / "x.db")))
+        assert find_duplicates(state) == {"duplicate_candidates": []}
+
+    def test_disabled(
+        self, issue_index: IssueIndex, state: IssueState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "duplicate_check", False)
+        assert find_duplicates(state) == {"duplicate_candidates": []}
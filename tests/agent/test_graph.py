@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 from langgraph.graph import END
 
-from agent.graph import _route_after_check, create_graph
+from agent.graph import _route_after_check, _route_after_classify, create_graph
 from agent.state import IssueState
 
 
@@ -15,9 +15,9 @@ class TestRouteAfterCheck:
         state: IssueState = {"completeness_status": "insufficient"}
         assert _route_after_check(state) == "ask_question"
 
-    def test_routes_to_generate_draft_when_sufficient(self) -> None:
+    def test_routes_to_find_duplicates_when_sufficient(self) -> None:
         state: IssueState = {"completeness_status": "sufficient"}
-        assert _route_after_check(state) == "generate_draft"
+        assert _route_after_check(state) == "find_duplicates"
 
     def test_routes_to_end_when_confirmed(self) -> None:
         state: IssueState = {"completeness_status": "confirmed"}
@@ -28,6 +28,37 @@ class TestRouteAfterCheck:
         assert _route_after_check(state) == "ask_question"
 
 
+class TestRouteAfterClassify:
+    """Tests for the _route_after_classify routing function."""
+
+    def test_content_routes_to_analyze(self) -> None:
+        state: IssueState = {"turn_type": "content"}
+        assert _route_after_classify(state) == "analyze"
+
+    def test_defaults_to_analyze_when_missing(self) -> None:
+        assert _route_after_classify({}) == "analyze"
+
+    def test_confirm_routes_to_end(self) -> None:
+        state: IssueState = {"turn_type": "confirm"}
+        assert _route_after_classify(state) == END
+
+    def test_duplicate_routes_to_end(self) -> None:
+        state: IssueState = {"turn_type": "duplicate"}
+        assert _route_after_classify(state) == END
+
+    def test_cancel_routes_to_end(self) -> None:
+        state: IssueState = {"turn_type": "cancel"}
+        assert _route_after_classify(state) == END
+
+    def test_ack_without_draft_skips_analyze(self) -> None:
+        state: IssueState = {"turn_type": "ack"}
+        assert _route_after_classify(state) == "check_completeness"
+
+    def test_ack_with_draft_routes_to_end(self) -> None:
+        state: IssueState = {"turn_type": "ack", "draft_title": "제목", "draft_body": "본문"}
+        assert _route_after_classify(state) == END
+
+
 class TestCreateGraph:
     """Tests for graph creation and compilation."""
 
@@ -59,5 +90,12 @@ class TestCreateGraph:
         graph = create_graph()
         # CompiledStateGraph stores node names in its nodes dict
         node_names = set(graph.nodes.keys())
-        expected = {"analyze", "check_completeness", "ask_question", "generate_draft"}
+        expected = {
+            "classify_turn",
+            "analyze",
+            "check_completeness",
+            "ask_question",
+            "find_duplicates",
+            "generate_draft",
+        }
         assert expected.issubset(node_names)
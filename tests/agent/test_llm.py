@@ -0,0 +1,181 @@
+"""Tests for agent.llm module."""
+
+import logging
+from collections.abc import Iterator
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+
+from agent import llm as llm_module
+from agent.llm import (
+    PooledChatAnthropic,
+    aclose_llm,
+    get_escalation_llm,
+    get_llm,
+    get_llm_for,
+    log_usage,
+    model_for,
+    prompt_message,
+    set_llm,
+    system_message,
+    warm_llm,
+)
+from config import settings
+
+
+@pytest.fixture(autouse=True)
+def reset_llm() -> Iterator[None]:
+    """Clear cached models and overrides around each test."""
+    set_llm(None)
+    llm_module._models.clear()
+    yield
+    set_llm(None)
+    llm_module._models.clear()
+
+
+class TestGetLlm:
+    """Tests for the shared LLM factory."""
+
+    def test_returns_same_instance(self) -> None:
+        assert get_llm() is get_llm()
+
+    def test_defaults_to_settings(self) -> None:
+        llm = get_llm()
+        assert isinstance(llm, PooledChatAnthropic)
+        assert llm.model == settings.llm_model
+        assert llm.max_tokens == settings.llm_max_tokens
+
+    def test_distinct_configurations_are_cached_separately(self) -> None:
+        small = get_llm("claude-haiku-4-5", 512)
+        assert small is not get_llm()
+        assert small is get_llm("claude-haiku-4-5", 512)
+
+    def test_models_share_one_http_pool(self) -> None:
+        first = get_llm()
+        second = get_llm("claude-haiku-4-5", 512)
+        assert first._async_client._client is second._async_client._client
+
+    def test_set_llm_overrides_every_configuration(self) -> None:
+        fake = FakeListChatModel(responses=["hi"])
+        set_llm(fake)
+        assert get_llm() is fake
+        assert get_llm("other-model", 10) is fake
+
+
+class TestModelTiers:
+    """Tests for per-call models and escalation."""
+
+    def test_calls_use_their_configured_tier(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_analyze_model", "claude-haiku-4-5")
+        monkeypatch.setattr(settings, "llm_analyze_max_tokens", 1024)
+        assert model_for("analyze") == ("claude-haiku-4-5", 1024)
+        llm = get_llm_for("analyze")
+        assert (llm.model, llm.max_tokens) == ("claude-haiku-4-5", 1024)
+
+    def test_empty_tier_falls_back_to_default_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_draft_model", "")
+        monkeypatch.setattr(settings, "llm_draft_max_tokens", 0)
+        assert model_for("generate_draft") == (settings.llm_model, settings.llm_max_tokens)
+        assert model_for("unknown") == (settings.llm_model, settings.llm_max_tokens)
+
+    def test_small_tiers_escalate_to_default_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_analyze_model", "claude-haiku-4-5")
+        monkeypatch.setattr(settings, "llm_escalation_model", "")
+        monkeypatch.setattr(settings, "llm_escalate", True)
+        llm = get_escalation_llm("analyze")
+        assert llm is not None
+        assert (llm.model, llm.max_tokens) == (settings.llm_model, settings.llm_max_tokens)
+
+    def test_no_escalation_from_the_escalation_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_draft_model", "")
+        assert get_escalation_llm("generate_draft") is None
+
+    def test_no_escalation_when_disabled_or_injected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_analyze_model", "claude-haiku-4-5")
+        monkeypatch.setattr(settings, "llm_escalate", False)
+        assert get_escalation_llm("analyze") is None
+        monkeypatch.setattr(settings, "llm_escalate", True)
+        set_llm(FakeListChatModel(responses=["{}"]))
+        assert get_escalation_llm("analyze") is None
+
+
+class TestWarmLlm:
+    """Tests for building the models ahead of the first request."""
+
+    def test_builds_every_tier_and_its_client(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_analyze_model", "claude-haiku-4-5")
+        monkeypatch.setattr(settings, "llm_escalate", True)
+        warm_llm()
+
+        assert ("claude-haiku-4-5", settings.llm_analyze_max_tokens) in llm_module._models
+        assert (settings.llm_model, settings.llm_max_tokens) in llm_module._models
+        for llm in llm_module._models.values():
+            assert "_async_client" in llm.__dict__
+
+    def test_injected_model_is_left_alone(self) -> None:
+        set_llm(FakeListChatModel(responses=["{}"]))
+        warm_llm()
+        assert llm_module._models == {}
+
+
+class TestAcloseLlm:
+    """Tests for shutting down the shared client."""
+
+    @pytest.mark.asyncio
+    async def test_closes_pool_and_recreates_on_next_use(self) -> None:
+        client = get_llm()._async_client._client
+        await aclose_llm()
+        assert client.is_closed
+        assert get_llm()._async_client._client is not client
+
+    @pytest.mark.asyncio
+    async def test_close_without_client_is_noop(self) -> None:
+        await aclose_llm()
+        await aclose_llm()
+
+
+class TestPromptCaching:
+    """Tests for cacheable message builders and usage logging."""
+
+    def test_system_message_is_cacheable(self) -> None:
+        message = system_message("primer")
+        assert message.content == [
+            {"type": "text", "text": "primer", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_prompt_message_caches_only_instructions(self) -> None:
+        message = prompt_message("static rules", "dynamic input")
+        static, dynamic = message.content
+        assert static["text"] == "static rules"
+        assert static["cache_control"] == {"type": "ephemeral"}
+        assert dynamic == {"type": "text", "text": "dynamic input"}
+
+    def test_request_payload_keeps_cache_control(self) -> None:
+        payload = get_llm()._get_request_payload(
+            [system_message("primer"), prompt_message("rules", "input")]
+        )
+        assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert payload["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in payload["messages"][0]["content"][1]
+
+    def test_log_usage_reports_cache_hit(self, caplog: pytest.LogCaptureFixture) -> None:
+        response = AIMessage(
+            content="ok",
+            usage_metadata={
+                "input_tokens": 1200,
+                "output_tokens": 50,
+                "total_tokens": 1250,
+                "input_token_details": {"cache_read": 1100, "cache_creation": 0},
+            },
+        )
+        with caplog.at_level(logging.INFO, logger="agent.llm"):
+            log_usage("analyze", response)
+        assert "analyze usage" in caplog.text
+        assert "cache_read=1100" in caplog.text
+        assert "cache_hit=True" in caplog.text
+
+    def test_log_usage_without_metadata_is_silent(self, caplog: pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.INFO, logger="agent.llm"):
+            log_usage("analyze", AIMessage(content="ok"))
+        assert caplog.text == ""
@@ -1,9 +1,9 @@
 """Tests for agent.prompts modules."""
 
-from agent.prompts.analyze import get_analyze_prompt
+from agent.prompts.analyze import ANALYZE_INSTRUCTIONS, get_analyze_input, get_analyze_prompt
 from agent.prompts.ask import get_ask_prompt
-from agent.prompts.draft import get_draft_prompt
-from agent.prompts.judge import get_judge_prompt
+from agent.prompts.draft import DRAFT_INSTRUCTIONS, get_draft_input, get_draft_prompt
+from agent.prompts.judge import JUDGE_INSTRUCTIONS, get_judge_input, get_judge_prompt
 from agent.prompts.system import SYSTEM_PROMPT
 
 
@@ -161,3 +161,29 @@ class TestDraftPrompt:
         result = get_draft_prompt("t", "d", "bug", "auth", "minor", "", "", "", "", "없음")
         assert "draft_title" in result
         assert "draft_body" in result
+
+
+class TestCacheablePromptSplit:
+    """Static instructions come first so they can be cached as a prompt prefix."""
+
+    def test_analyze_prompt_starts_with_instructions(self) -> None:
+        result = get_analyze_prompt("로그인이 안됩니다", "없음")
+        assert result.startswith(ANALYZE_INSTRUCTIONS)
+        assert result.endswith(get_analyze_input("로그인이 안됩니다", "없음"))
+
+    def test_analyze_instructions_have_no_turn_data(self) -> None:
+        assert "로그인이 안됩니다" not in ANALYZE_INSTRUCTIONS
+        assert "issue_title" in ANALYZE_INSTRUCTIONS
+
+    def test_draft_prompt_starts_with_instructions(self) -> None:
+        args = ("t", "d", "bug", "auth", "minor", "", "", "", "", "없음")
+        result = get_draft_prompt(*args)
+        assert result.startswith(DRAFT_INSTRUCTIONS)
+        assert result.endswith(get_draft_input(*args))
+        assert "draft_body" in DRAFT_INSTRUCTIONS
+
+    def test_judge_prompt_starts_with_instructions(self) -> None:
+        result = get_judge_prompt("오타 수정", "desc", "bug", "auth")
+        assert result.startswith(JUDGE_INSTRUCTIONS)
+        assert result.endswith(get_judge_input("오타 수정", "desc", "bug", "auth"))
+        assert "오타 수정" not in JUDGE_INSTRUCTIONS.split("## 판단 기준")[0]
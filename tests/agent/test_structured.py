@@ -0,0 +1,204 @@
+"""Tests for agent.structured module."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agent.cache import ResponseCache, set_response_cache
+from agent.llm import prompt_message, system_message
+from agent.schemas import IncrementalAnalysis, IssueDraft, IssueFields
+from agent.structured import ainvoke_structured
+from config import settings
+from metrics import LLM_STRUCTURED_OUTPUTS
+
+
+class ToolChatModel(FakeListChatModel):
+    """FakeListChatModel that answers every call with a forced tool call.
+
+    Each response is the JSON of the tool arguments. The tool chosen and the
+    last prompt text of every call are recorded.
+    """
+
+    tool_choices: list[str] = []
+    prompts: list[str] = []
+
+    def bind_tools(self, tools: Any, *, tool_choice: str | None = None, **kwargs: Any) -> Any:
+        return self.bind(tool_choice=tool_choice)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.tool_choices.append(kwargs["tool_choice"])
+        self.prompts.append("".join(block["text"] for block in messages[-1].content))
+        args = json.loads(self._call(messages, stop, run_manager, **kwargs))
+        call = {"name": kwargs["tool_choice"], "args": args, "id": f"toolu_{len(self.prompts)}"}
+        message = AIMessage(content="", tool_calls=[call])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture(autouse=True)
+def tool_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ask for tool calls and allow one repair."""
+    monkeypatch.setattr(settings, "llm_structured_output", "tool")
+    monkeypatch.setattr(settings, "llm_repair_attempts", 1)
+
+
+def _model(*responses: dict) -> ToolChatModel:
+    return ToolChatModel(
+        responses=[json.dumps(r, ensure_ascii=False) for r in responses],
+        tool_choices=[],
+        prompts=[],
+    )
+
+
+def _messages() -> list[BaseMessage]:
+    return [system_message("system"), prompt_message("instructions", "로그인 버그")]
+
+
+def _outcomes(call: str) -> dict[str, float]:
+    return {
+        outcome: LLM_STRUCTURED_OUTPUTS.value(call=call, outcome=outcome)
+        for outcome in ("valid", "repaired", "escalated", "partial", "wasted")
+    }
+
+
+class TestAinvokeStructured:
+    """Tests for schema-validated calls and the repair retry."""
+
+    @pytest.mark.asyncio
+    async def test_valid_tool_call(self) -> None:
+        llm = _model({"draft_title": "로그인 오류", "draft_body": "본문"})
+        before = _outcomes("valid_test")
+
+        data = await ainvoke_structured("n", "valid_test", llm, _messages(), IssueDraft)
+
+        assert data == {"draft_title": "로그인 오류", "draft_body": "본문"}
+        assert llm.tool_choices == ["IssueDraft"]
+        assert _outcomes("valid_test")["valid"] == before["valid"] + 1
+
+    @pytest.mark.asyncio
+    async def test_repair_asks_only_for_invalid_fields(self) -> None:
+        llm = _model(
+            {"issue_title": "로그인 실패", "issue_type": "task", "affected_domain": "auth"},
+            {"issue_type": "bug"},
+        )
+        before = _outcomes("repair_test")
+
+        data = await ainvoke_structured("n", "repair_test", llm, _messages(), IssueFields)
+
+        assert data is not None
+        assert (data["issue_title"], data["issue_type"], data["affected_domain"]) == (
+            "로그인 실패",
+            "bug",
+            "auth",
+        )
+        assert llm.tool_choices == ["IssueFields", "IssueFieldsRepair"]
+        assert "issue_type" in llm.prompts[1] and "issue_title" not in llm.prompts[1]
+        assert _outcomes("repair_test")["repaired"] == before["repaired"] + 1
+
+    @pytest.mark.asyncio
+    async def test_repairs_nested_fields(self) -> None:
+        llm = _model(
+            {"updates": {"issue_title": "로그인 실패", "affected_domain": "domain:auth"}},
+            {"updates": {"affected_domain": "auth"}},
+        )
+
+        data = await ainvoke_structured("n", "nested_test", llm, _messages(), IncrementalAnalysis)
+
+        assert data is not None
+        assert data["updates"]["issue_title"] == "로그인 실패"
+        assert data["updates"]["affected_domain"] == "auth"
+
+    @pytest.mark.asyncio
+    async def test_unrepaired_optional_field_is_dropped(self) -> None:
+        llm = _model({"issue_title": "로그인 실패", "severity": "urgent"}, {"severity": "urgent"})
+        before = _outcomes("partial_test")
+
+        data = await ainvoke_structured("n", "partial_test", llm, _messages(), IssueFields)
+
+        assert data is not None
+        assert data["issue_title"] == "로그인 실패"
+        assert data["severity"] is None
+        assert _outcomes("partial_test")["partial"] == before["partial"] + 1
+
+    @pytest.mark.asyncio
+    async def test_unrepaired_required_field_wastes_the_call(self) -> None:
+        llm = _model({"draft_title": "로그인 오류"}, {"draft_body": None})
+        before = _outcomes("wasted_test")
+
+        assert await ainvoke_structured("n", "wasted_test", llm, _messages(), IssueDraft) is None
+        assert _outcomes("wasted_test")["wasted"] == before["wasted"] + 1
+
+    @pytest.mark.asyncio
+    async def test_unrepaired_answer_escalates_to_larger_model(self) -> None:
+        small = _model({"issue_title": "로그인 실패", "severity": "urgent"}, {"severity": "urgent"})
+        large = _model({"issue_title": "로그인 실패", "severity": "major"})
+        before = _outcomes("escalate_test")
+
+        data = await ainvoke_structured(
+            "n", "escalate_test", small, _messages(), IssueFields, escalate_to=large
+        )
+
+        assert data is not None
+        assert data["severity"] == "major"
+        assert len(small.tool_choices) == 2
+        assert large.tool_choices == ["IssueFields"]
+        after = _outcomes("escalate_test")
+        assert after["escalated"] == before["escalated"] + 1
+        assert after["valid"] == before["valid"] + 1
+
+    @pytest.mark.asyncio
+    async def test_repair_can_be_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "llm_repair_attempts", 0)
+        llm = _model({"draft_title": "로그인 오류"}, {"draft_body": "본문"})
+
+        assert await ainvoke_structured("n", "off_test", llm, _messages(), IssueDraft) is None
+        assert len(llm.tool_choices) == 1
+
+    @pytest.mark.asyncio
+    async def test_models_without_tools_answer_in_json_text(self) -> None:
+        llm = FakeListChatModel(responses=['```json\n{"draft_title": "t", "draft_body": "b"}\n```'])
+
+        data = await ainvoke_structured("n", "text_test", llm, _messages(), IssueDraft)
+
+        assert data == {"draft_title": "t", "draft_body": "b"}
+
+
+class TestStructuredCache:
+    """Tool-call answers in the response cache."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[ResponseCache]:
+        monkeypatch.setattr(settings, "llm_cache_nodes", ["generate_draft"])
+        cache = ResponseCache()
+        set_response_cache(cache)
+        yield cache
+        set_response_cache(None)
+
+    @pytest.mark.asyncio
+    async def test_valid_answers_are_reused(self, cache: ResponseCache) -> None:
+        llm = _model({"draft_title": "로그인 오류", "draft_body": "본문"})
+
+        first = await ainvoke_structured("generate_draft", "c", llm, _messages(), IssueDraft)
+        second = await ainvoke_structured("generate_draft", "c", llm, _messages(), IssueDraft)
+
+        assert first == second
+        assert len(llm.tool_choices) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_answers_are_not_cached(self, cache: ResponseCache) -> None:
+        llm = _model({"draft_title": "로그인 오류"}, {"draft_body": "본문"})
+
+        await ainvoke_structured("generate_draft", "c", llm, _messages(), IssueDraft)
+
+        assert cache.misses["generate_draft"] == 1
+        assert not cache._memory
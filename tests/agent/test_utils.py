@@ -0,0 +1,32 @@
+"""Tests for agent.utils module."""
+
+from agent.utils import estimate_tokens, parse_json_response
+
+
+class TestParseJsonResponse:
+    """Tests for parse_json_response."""
+
+    def test_plain_json(self) -> None:
+        assert parse_json_response('{"a": 1}') == {"a": 1}
+
+    def test_fenced_json(self) -> None:
+        assert parse_json_response('설명\n```json\n{"a": 1}\n```') == {"a": 1}
+
+    def test_invalid_json_returns_none(self) -> None:
+        assert parse_json_response("not json") is None
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens."""
+
+    def test_empty(self) -> None:
+        assert estimate_tokens("") == 0
+
+    def test_ascii_is_about_four_chars_per_token(self) -> None:
+        assert estimate_tokens("a" * 400) == 100
+
+    def test_hangul_counts_one_token_per_syllable(self) -> None:
+        assert estimate_tokens("로그인") == 3
+
+    def test_mixed_text(self) -> None:
+        assert estimate_tokens("JWT 토큰") == 1 + 2
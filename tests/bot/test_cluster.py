@@ -0,0 +1,194 @@
+"""Tests for bot.cluster module."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+import pytest
+
+from bot.cluster import ClusterRouter, ClusterWorker, Event, HashRing
+
+THREADS = range(1000, 1200)
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+class FakeWorker:
+    """ClusterWorker whose handlers record what they were given."""
+
+    def __init__(self, name: str, release_delay: float = 0.0) -> None:
+        self.events: list[Event] = []
+        self.released: list[int] = []
+        self.release_done = asyncio.Event()
+        self._release_delay = release_delay
+        self.worker = ClusterWorker(name, self._handle, self._release, self._held)
+        self.task: asyncio.Task | None = None
+
+    async def _handle(self, event: Event) -> None:
+        self.events.append(event)
+
+    async def _release(self, thread_ids: list[int]) -> None:
+        await asyncio.sleep(self._release_delay)
+        self.released.extend(thread_ids)
+        self.release_done.set()
+
+    def _held(self) -> list[int]:
+        return [e["thread_id"] for e in self.events if e["thread_id"] not in self.released]
+
+    def start(self, port: int) -> None:
+        self.task = asyncio.create_task(self.worker.run("127.0.0.1", port))
+
+    async def stop(self) -> None:
+        assert self.task is not None
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+@pytest.fixture
+async def router() -> AsyncIterator[tuple[ClusterRouter, int]]:
+    """Router listening on a free local port."""
+    router = ClusterRouter()
+    server = await router.start("127.0.0.1", 0)
+    yield router, server.sockets[0].getsockname()[1]
+    await router.close()
+
+
+class TestHashRing:
+    """Tests for consistent thread assignment."""
+
+    def test_assignment_is_stable_across_instances(self) -> None:
+        first = HashRing(["worker-0", "worker-1", "worker-2"])
+        second = HashRing(["worker-2", "worker-0", "worker-1"])
+        assert all(first.owner(t) == second.owner(t) for t in THREADS)
+
+    def test_threads_spread_over_workers(self) -> None:
+        ring = HashRing(["worker-0", "worker-1", "worker-2"])
+        counts = {node: 0 for node in ring.nodes}
+        for thread_id in range(10_000):
+            counts[ring.owner(thread_id)] += 1
+        assert min(counts.values()) > 2000
+
+    def test_removal_moves_only_the_removed_workers_threads(self) -> None:
+        ring = HashRing(["worker-0", "worker-1", "worker-2"])
+        before = {t: ring.owner(t) for t in THREADS}
+        ring.remove("worker-1")
+        for thread_id, owner in before.items():
+            if owner != "worker-1":
+                assert ring.owner(thread_id) == owner
+            else:
+                assert ring.owner(thread_id) in ("worker-0", "worker-2")
+
+    def test_addition_moves_threads_only_to_the_new_worker(self) -> None:
+        ring = HashRing(["worker-0", "worker-1"])
+        before = {t: ring.owner(t) for t in THREADS}
+        ring.add("worker-2")
+        moved = [t for t in THREADS if ring.owner(t) != before[t]]
+        assert moved
+        assert all(ring.owner(t) == "worker-2" for t in moved)
+
+    def test_empty_ring_has_no_owner(self) -> None:
+        assert HashRing().owner(1) is None
+
+
+class TestClusterRouting:
+    """Tests for routing over real local connections."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_the_owner(self, router: tuple[ClusterRouter, int]) -> None:
+        cluster, port = router
+        workers = {name: FakeWorker(name) for name in ("worker-0", "worker-1")}
+        for worker in workers.values():
+            worker.start(port)
+        await _until(lambda: len(cluster.workers) == 2)
+
+        for thread_id in THREADS:
+            assert await cluster.route({"type": "message", "thread_id": thread_id})
+        await _until(lambda: sum(len(w.events) for w in workers.values()) == len(THREADS))
+
+        ring = HashRing(workers)
+        for name, worker in workers.items():
+            assert worker.events
+            assert all(ring.owner(e["thread_id"]) == name for e in worker.events)
+        for worker in workers.values():
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_events_keep_their_order(self, router: tuple[ClusterRouter, int]) -> None:
+        cluster, port = router
+        worker = FakeWorker("worker-0")
+        worker.start(port)
+        await _until(lambda: cluster.workers == ["worker-0"])
+
+        for n in range(50):
+            await cluster.route({"type": "message", "thread_id": 7, "content": str(n)})
+        await _until(lambda: len(worker.events) == 50)
+        assert [e["content"] for e in worker.events] == [str(n) for n in range(50)]
+        await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_crashed_workers_threads_move(self, router: tuple[ClusterRouter, int]) -> None:
+        cluster, port = router
+        survivor, crashed = FakeWorker("worker-0"), FakeWorker("worker-1")
+        survivor.start(port)
+        crashed.start(port)
+        await _until(lambda: len(cluster.workers) == 2)
+
+        await crashed.stop()
+        await _until(lambda: cluster.workers == ["worker-0"])
+        for thread_id in THREADS:
+            assert await cluster.route({"type": "message", "thread_id": thread_id})
+        await _until(lambda: len(survivor.events) == len(THREADS))
+        await survivor.stop()
+
+    @pytest.mark.asyncio
+    async def test_forwarded_events_reach_the_owner(
+        self, router: tuple[ClusterRouter, int]
+    ) -> None:
+        cluster, port = router
+        workers = {name: FakeWorker(name) for name in ("worker-0", "worker-1")}
+        for worker in workers.values():
+            worker.start(port)
+        await _until(lambda: len(cluster.workers) == 2)
+        ring = HashRing(workers)
+        thread_id = next(t for t in THREADS if ring.owner(t) == "worker-1")
+
+        await workers["worker-0"].worker.forward({"type": "issue_job", "thread_id": thread_id})
+
+        await _until(lambda: len(workers["worker-1"].events) == 1)
+        assert workers["worker-1"].events[0]["type"] == "issue_job"
+        assert workers["worker-0"].events == []
+        for worker in workers.values():
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_no_worker_drops_events(self, router: tuple[ClusterRouter, int]) -> None:
+        cluster, _ = router
+        assert not await cluster.route({"type": "message", "thread_id": 1})
+
+    @pytest.mark.asyncio
+    async def test_join_waits_for_release(self, router: tuple[ClusterRouter, int]) -> None:
+        cluster, port = router
+        old = FakeWorker("worker-0", release_delay=0.2)
+        old.start(port)
+        await _until(lambda: cluster.workers == ["worker-0"])
+        for thread_id in THREADS:
+            await cluster.route({"type": "message", "thread_id": thread_id})
+        await _until(lambda: len(old.events) == len(THREADS))
+
+        new = FakeWorker("worker-1")
+        new.start(port)
+        moving = [t for t in THREADS if HashRing(["worker-0", "worker-1"]).owner(t) == "worker-1"]
+        await _until(lambda: cluster._next_ring is not None)
+        # Routed while the old owner is still releasing it
+        await cluster.route({"type": "message", "thread_id": moving[0], "content": "after"})
+
+        assert old.release_done.is_set()
+        assert sorted(old.released) == moving
+        await _until(lambda: len(new.events) == 1)
+        assert new.events[0]["content"] == "after"
+        assert cluster.workers == ["worker-0", "worker-1"]
+        await old.stop()
+        await new.stop()
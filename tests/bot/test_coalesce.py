@@ -0,0 +1,103 @@
+"""Tests for bot.coalesce module."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.coalesce import MessageCoalescer, PendingBatch
+
+WINDOW = 0.02
+
+
+class RecordingHandler:
+    """Batch handler that records each run and simulates agent latency."""
+
+    def __init__(self, latency: float = 0.0, commit: bool = True) -> None:
+        self.latency = latency
+        self.commit = commit
+        self.started: list[list[str]] = []
+        self.completed: list[list[str]] = []
+
+    async def __call__(self, thread: object, batch: PendingBatch) -> None:
+        self.started.append(list(batch.contents))
+        await asyncio.sleep(self.latency)
+        if self.commit:
+            batch.mark_committed()
+        await asyncio.sleep(self.latency)
+        self.completed.append(list(batch.contents))
+
+
+async def _drain(coalescer: MessageCoalescer) -> None:
+    while coalescer._tasks:
+        await asyncio.gather(*coalescer._tasks.values(), return_exceptions=True)
+
+
+class TestMessageCoalescer:
+    """Tests for MessageCoalescer debounce and supersede behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_batched_into_one_run(self) -> None:
+        handler = RecordingHandler()
+        coalescer = MessageCoalescer(WINDOW, handler)
+        thread = SimpleNamespace(id=1)
+
+        for content in ("로그인이", "안 됩니다", "iOS에서요"):
+            coalescer.submit(thread, content)
+        await _drain(coalescer)
+
+        assert handler.completed == [["로그인이", "안 됩니다", "iOS에서요"]]
+
+    @pytest.mark.asyncio
+    async def test_threads_are_debounced_independently(self) -> None:
+        handler = RecordingHandler()
+        coalescer = MessageCoalescer(WINDOW, handler)
+
+        coalescer.submit(SimpleNamespace(id=1), "a")
+        coalescer.submit(SimpleNamespace(id=2), "b")
+        await _drain(coalescer)
+
+        assert sorted(handler.completed) == [["a"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_new_message_supersedes_uncommitted_run(self) -> None:
+        handler = RecordingHandler(latency=0.05)
+        coalescer = MessageCoalescer(WINDOW, handler)
+        thread = SimpleNamespace(id=1)
+
+        coalescer.submit(thread, "first")
+        await asyncio.sleep(WINDOW + 0.01)
+        assert handler.started == [["first"]]
+
+        coalescer.submit(thread, "second")
+        await _drain(coalescer)
+
+        assert handler.started == [["first"], ["first", "second"]]
+        assert handler.completed == [["first", "second"]]
+
+    @pytest.mark.asyncio
+    async def test_committed_run_finishes_before_next(self) -> None:
+        handler = RecordingHandler(latency=0.05)
+        coalescer = MessageCoalescer(WINDOW, handler)
+        thread = SimpleNamespace(id=1)
+
+        coalescer.submit(thread, "first")
+        # Past the debounce and the graph run, now replying
+        await asyncio.sleep(WINDOW + 0.07)
+        coalescer.submit(thread, "second")
+        await _drain(coalescer)
+
+        assert handler.completed == [["first"], ["second"]]
+
+    @pytest.mark.asyncio
+    async def test_zero_window_keeps_message_order(self) -> None:
+        handler = RecordingHandler(latency=0.01, commit=False)
+        coalescer = MessageCoalescer(0, handler)
+        thread = SimpleNamespace(id=1)
+
+        for content in ("a", "b", "c"):
+            coalescer.submit(thread, content)
+            await asyncio.sleep(0.005)
+        await _drain(coalescer)
+
+        assert handler.completed[-1] == ["a", "b", "c"]
@@ -0,0 +1,113 @@
+"""Tests for bot.events module."""
+
+import asyncio
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+import bot.events as events
+from agent.checkpoint import aclose_checkpointer, get_checkpointer, set_checkpointer
+from agent.llm import set_llm
+from config import settings
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Modules `import bot.main` may load in a fresh interpreter (about 500 here; the
+# agent packages alone add some 1850) and seconds it may take (about 0.6s
+# here, 1.3s when it still pulled in langgraph and langchain). The module
+# count is the strict bound; the time bound only catches gross regressions on
+# a loaded machine.
+IMPORT_MODULE_BUDGET = 800
+IMPORT_TIME_BUDGET = 2.5
+
+# Loaded by warm_up(), never by importing the bot
+AGENT_PACKAGES = ("langgraph", "langchain_core", "langchain_anthropic", "anthropic", "langsmith")
+
+_IMPORT_PROBE = f"""
+import sys, time
+before = len(sys.modules)
+start = time.perf_counter()
+import bot.main
+print(time.perf_counter() - start)
+print(len(sys.modules) - before)
+print(",".join(p for p in {AGENT_PACKAGES!r} if p in sys.modules))
+"""
+
+
+@pytest.fixture
+def cold_agent(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Start from a process that has not built the graph yet."""
+    monkeypatch.setattr(events, "_graph", None)
+    monkeypatch.setattr(events, "_ready", False)
+    monkeypatch.setattr(events, "_warm_up_task", None)
+    set_llm(FakeListChatModel(responses=["{}"]))
+    yield
+    set_llm(None)
+
+
+class TestColdStart:
+    """Tests for the startup sequence."""
+
+    def test_import_is_light_and_within_budget(self) -> None:
+        # Best of two, so a cold disk cache on the first run does not count
+        times = []
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-c", _IMPORT_PROBE],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            elapsed, modules, loaded = result.stdout.split("\n")[:3]
+            times.append(float(elapsed))
+            assert loaded == ""
+            assert int(modules) < IMPORT_MODULE_BUDGET
+        assert min(times) < IMPORT_TIME_BUDGET
+
+    @pytest.mark.asyncio
+    async def test_warm_up_builds_graph_and_sets_ready(self, cold_agent: None) -> None:
+        assert events.is_ready() is False
+        await events.warm_up()
+        assert events.is_ready() is True
+        assert events._graph is not None
+
+    @pytest.mark.asyncio
+    async def test_warm_up_with_session_db(
+        self, cold_agent: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "session_db_path", str(tmp_path / "sessions.db"))
+        set_checkpointer(None)
+        try:
+            await events.warm_up()
+            assert events.is_ready() is True
+            assert isinstance(get_checkpointer(), AsyncSqliteSaver)
+        finally:
+            await aclose_checkpointer()
+            set_checkpointer(None)
+
+    @pytest.mark.asyncio
+    async def test_turn_waits_for_running_warm_up(
+        self, cold_agent: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        built: list[float] = []
+        get_graph = events._get_graph
+
+        def slow_warm_up() -> None:
+            time.sleep(0.05)
+            built.append(time.perf_counter())
+            get_graph()
+
+        monkeypatch.setattr(events, "_warm_up_agent", slow_warm_up)
+        monkeypatch.setattr(events, "_warm_up_task", asyncio.create_task(events.warm_up()))
+
+        graph = await events._agent_graph()
+
+        assert len(built) == 1
+        assert graph is events._graph
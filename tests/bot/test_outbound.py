@@ -0,0 +1,288 @@
+"""Tests for bot.outbound module."""
+
+import asyncio
+
+import pytest
+
+from bot.outbound import OutboundScheduler, TokenBucket, split_message
+
+
+class FakeClock:
+    """Clock advanced by VirtualSleep instead of real time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class VirtualSleep:
+    """Sleep on a FakeClock: time jumps to the earliest deadline once every sleeper waits."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.deadlines: list[float] = []
+
+    async def __call__(self, seconds: float) -> None:
+        deadline = self.clock.now + seconds
+        self.deadlines.append(deadline)
+        try:
+            while self.clock.now < deadline:
+                await asyncio.sleep(0)
+                if deadline == min(self.deadlines):
+                    self.clock.now = deadline
+        finally:
+            self.deadlines.remove(deadline)
+
+
+class FakeMessage:
+    """Minimal stand-in for discord.Message."""
+
+    def __init__(self, channel: "FakeChannel", content: str) -> None:
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, *, content: str) -> "FakeMessage":
+        self.channel.log.append((self.channel.clock(), "edit", content))
+        self.content = content
+        return self
+
+    async def delete(self) -> None:
+        self.channel.log.append((self.channel.clock(), "delete", self.content))
+
+
+class FakeChannel:
+    """Discord channel that records every delivery with its (virtual) time."""
+
+    def __init__(self, channel_id: int, clock: FakeClock, fail: bool = False) -> None:
+        self.id = channel_id
+        self.clock = clock
+        self.fail = fail
+        self.log: list[tuple[float, str, str]] = []
+
+    async def send(self, content: str) -> FakeMessage:
+        if self.fail:
+            raise RuntimeError("503 Service Unavailable")
+        self.log.append((self.clock(), "send", content))
+        return FakeMessage(self, content)
+
+    def sent(self) -> list[str]:
+        return [content for _, action, content in self.log if action == "send"]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Virtual clock shared by the scheduler and the fake channels."""
+    return FakeClock()
+
+
+@pytest.fixture
+def outbound(clock: FakeClock) -> OutboundScheduler:
+    """Scheduler allowing 5 messages per channel at once, then 1 per second."""
+    return OutboundScheduler(
+        channel_rate=1.0,
+        channel_burst=5,
+        route_limits={"send": (10.0, 10), "edit": (10.0, 10), "delete": (10.0, 10)},
+        clock=clock,
+        sleep=VirtualSleep(clock),
+    )
+
+
+class TestSplitMessage:
+    """Tests for split_message."""
+
+    def test_short_text_is_one_chunk(self) -> None:
+        assert split_message("hello") == ["hello"]
+
+    def test_splits_on_newline_within_limit(self) -> None:
+        text = "a" * 15 + "\n" + "b" * 10
+        assert split_message(text, limit=20) == ["a" * 15, "b" * 10]
+
+    def test_hard_splits_without_newline(self) -> None:
+        assert split_message("x" * 45, limit=20) == ["x" * 20, "x" * 20, "x" * 5]
+
+    def test_chunks_respect_limit(self) -> None:
+        text = "\n".join("줄" * 30 for _ in range(200))
+        assert all(len(chunk) <= 2000 for chunk in split_message(text))
+
+    def test_prefers_paragraph_boundaries(self) -> None:
+        text = "첫 문단 첫 줄\n첫 문단 둘째 줄\n\n둘째 문단"
+        assert split_message(text, limit=20) == ["첫 문단 첫 줄\n첫 문단 둘째 줄", "둘째 문단"]
+
+    def test_breaks_before_separator_lines(self) -> None:
+        text = "**제목**: 로그인 오류\n---\n본문 " + "가" * 20 + "\n---\n끝"
+        chunks = split_message(text, limit=30)
+        assert all(len(chunk) <= 30 for chunk in chunks)
+        assert chunks[1].startswith("---\n")
+        assert "\n".join(chunks) == text
+
+    def test_code_block_is_not_split(self) -> None:
+        code = "```python\nprint(1)\nprint(2)\n```"
+        text = "설명 " + "가" * 20 + "\n" + code + "\n끝"
+        assert any(code in chunk for chunk in split_message(text, limit=40))
+
+    def test_long_code_block_is_reopened_in_each_chunk(self) -> None:
+        body = "\n".join(f"line {n}" for n in range(30))
+        chunks = split_message(f"```python\n{body}\n```", limit=60)
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert len(chunk) <= 60
+            assert chunk.startswith("```python\n")
+            assert chunk.endswith("\n```")
+        lines = [line for chunk in chunks for line in chunk.split("\n")[1:-1]]
+        assert "\n".join(lines) == body
+
+    def test_draft_preview_keeps_separators_whole(self) -> None:
+        body = "\n\n".join(f"## 섹션 {n}\n" + "내용 " * 150 for n in range(6))
+        preview = (
+            f"**이슈 초안이 작성되었습니다.**\n\n---\n{body}\n---\n\n이대로 이슈를 생성할까요?"
+        )
+        chunks = split_message(preview)
+        assert all(len(chunk) <= 2000 for chunk in chunks)
+        assert sum(chunk.split("\n").count("---") for chunk in chunks) == 2
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_rate(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+        for _ in range(3):
+            assert bucket.delay() == 0
+            bucket.take()
+        assert bucket.delay() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert bucket.delay() == 0
+
+    def test_refill_is_capped(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+        clock.now += 100
+        bucket.take()
+        bucket.take()
+        assert bucket.delay() == pytest.approx(1.0)
+
+
+class TestOutboundScheduler:
+    """Ordering, pacing and throughput against fake Discord channels."""
+
+    @pytest.mark.asyncio
+    async def test_send_does_not_wait_for_delivery(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        channel = FakeChannel(1, clock)
+        futures = [outbound.send(channel, f"m{n}") for n in range(20)]
+        # Queued, not delivered: the caller never waited on pacing
+        assert channel.log == []
+        assert not any(future.done() for future in futures)
+        await outbound.flush()
+        assert channel.sent() == [f"m{n}" for n in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_channel_throughput_matches_bucket(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        channel = FakeChannel(1, clock)
+        for n in range(20):
+            outbound.send(channel, f"m{n}")
+        await outbound.flush()
+
+        times = [t for t, _, _ in channel.log]
+        # Burst of 5, then one per second
+        assert times[:5] == [0.0] * 5
+        assert times[-1] == pytest.approx(15.0)
+        for start in range(len(times)):
+            in_window = [t for t in times if times[start] <= t < times[start] + 5.0]
+            assert len(in_window) <= 10
+
+    @pytest.mark.asyncio
+    async def test_channels_are_paced_independently_and_keep_order(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        first, second = FakeChannel(1, clock), FakeChannel(2, clock)
+        for n in range(8):
+            outbound.send(first, f"a{n}")
+            outbound.send(second, f"b{n}")
+        await outbound.flush()
+
+        assert first.sent() == [f"a{n}" for n in range(8)]
+        assert second.sent() == [f"b{n}" for n in range(8)]
+        # Each channel gets its own burst; the shared route bucket allows 10 at once
+        assert max(t for t, _, _ in first.log + second.log) == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_flush_one_channel(self, clock: FakeClock, outbound: OutboundScheduler) -> None:
+        quick, busy = FakeChannel(1, clock), FakeChannel(2, clock)
+        outbound.send(quick, "hi")
+        for n in range(20):
+            outbound.send(busy, f"m{n}")
+        await outbound.flush(quick)
+        assert quick.sent() == ["hi"]
+        assert len(busy.sent()) < 20
+        await outbound.flush()
+
+    @pytest.mark.asyncio
+    async def test_route_bucket_is_shared_across_channels(self, clock: FakeClock) -> None:
+        outbound = OutboundScheduler(
+            channel_rate=100.0,
+            channel_burst=100,
+            route_limits={"send": (2.0, 2)},
+            clock=clock,
+            sleep=VirtualSleep(clock),
+        )
+        channels = [FakeChannel(n, clock) for n in range(4)]
+        for channel in channels:
+            outbound.send(channel, "hi")
+        await outbound.flush()
+        times = sorted(t for channel in channels for t, _, _ in channel.log)
+        assert times == pytest.approx([0.0, 0.0, 0.5, 1.0])
+
+    @pytest.mark.asyncio
+    async def test_queued_edits_collapse_to_latest(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        channel = FakeChannel(1, clock)
+        for n in range(5):
+            outbound.send(channel, f"filler {n}")
+        message = outbound.send(channel, "draft")
+        for n in range(10):
+            outbound.edit(channel, message, f"frame {n}")
+        outbound.delete(channel, outbound.send(channel, "temp"))
+        await outbound.flush()
+
+        assert [(action, content) for _, action, content in channel.log[5:]] == [
+            ("send", "draft"),
+            ("edit", "frame 9"),
+            ("send", "temp"),
+            ("delete", "temp"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_send_text_splits_long_content(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        channel = FakeChannel(1, clock)
+        outbound.send_text(channel, "가" * 4500)
+        await outbound.flush()
+        assert [len(content) for content in channel.sent()] == [2000, 2000, 500]
+
+    @pytest.mark.asyncio
+    async def test_failed_send_resolves_to_none(
+        self, clock: FakeClock, outbound: OutboundScheduler
+    ) -> None:
+        channel = FakeChannel(1, clock, fail=True)
+        message = outbound.send(channel, "hi")
+        edit = outbound.edit(channel, message, "hello")
+        await outbound.flush()
+        assert await message is None
+        assert await edit is None
+
+    @pytest.mark.asyncio
+    async def test_aclose_drops_what_cannot_be_delivered_in_time(self) -> None:
+        outbound = OutboundScheduler(channel_rate=0.001, channel_burst=1)
+        channel = FakeChannel(1, FakeClock())
+        first = outbound.send(channel, "now")
+        second = outbound.send(channel, "much later")
+        await outbound.aclose(timeout=0.05)
+        assert channel.sent() == ["now"]
+        assert first.done() and await second is None
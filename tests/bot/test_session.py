@@ -1,9 +1,37 @@
 """Tests for bot.session module."""
 
+import asyncio
+import json
+from pathlib import Path
+
 import pytest
 
 from agent.state import IssueState
 from bot.session import SessionManager
+from bot.store import SQLiteSessionStore
+
+
+class RecordingStore:
+    """In-memory SessionStore that records every write batch."""
+
+    def __init__(self) -> None:
+        self.rows: dict[int, str] = {}
+        self.writes: list[tuple[dict[int, str], list[int]]] = []
+        self.loads = 0
+
+    def load(self, thread_id: int) -> IssueState | None:
+        self.loads += 1
+        row = self.rows.get(thread_id)
+        return json.loads(row) if row else None
+
+    def write(self, upserts: dict[int, str], deletes: list[int]) -> None:
+        self.writes.append((upserts, deletes))
+        self.rows.update(upserts)
+        for thread_id in deletes:
+            self.rows.pop(thread_id, None)
+
+    def close(self) -> None:
+        pass
 
 
 @pytest.fixture
@@ -111,3 +139,266 @@ class TestSessionManager:
         result = await manager.get_session(100)
         assert result is not None
         assert result["thread_id"] == "999"
+
+
+class TestSessionLocks:
+    """Tests for per-thread locking."""
+
+    def test_same_thread_shares_lock(self, manager: SessionManager) -> None:
+        assert manager.lock(1) is manager.lock(1)
+
+    def test_different_threads_get_different_locks(self, manager: SessionManager) -> None:
+        assert manager.lock(1) is not manager.lock(2)
+
+    @pytest.mark.asyncio
+    async def test_locked_thread_does_not_block_other_threads(
+        self, manager: SessionManager, sample_state: IssueState
+    ) -> None:
+        async with manager.lock(1):
+            # Another thread's full cycle completes while thread 1 is held
+            async with manager.lock(2):
+                await manager.create_session(2, sample_state)
+            assert await manager.has_session(2) is True
+
+    @pytest.mark.asyncio
+    async def test_same_thread_cycles_are_serialized(self, manager: SessionManager) -> None:
+        await manager.create_session(1, {"messages": []})
+
+        async def append(content: str) -> None:
+            async with manager.lock(1):
+                state = await manager.get_session(1)
+                assert state is not None
+                await asyncio.sleep(0.01)
+                await manager.update_session(
+                    1, {"messages": state["messages"] + [{"role": "user", "content": content}]}
+                )
+
+        await asyncio.gather(append("a"), append("b"), append("c"))
+
+        result = await manager.get_session(1)
+        assert result is not None
+        assert [m["content"] for m in result["messages"]] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_locks_are_freed_after_sessions_end_under_them(
+        self, manager: SessionManager, sample_state: IssueState
+    ) -> None:
+        for thread_id in range(100):
+            async with manager.lock(thread_id):
+                await manager.create_session(thread_id, sample_state)
+            async with manager.lock(thread_id):
+                await manager.delete_session(thread_id)
+        assert manager._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_waiters_share_the_lock_until_the_last_leaves(
+        self, manager: SessionManager
+    ) -> None:
+        first = manager.lock(1)
+        async with first:
+            waiter = asyncio.create_task(manager.lock(1).__aenter__())
+            await asyncio.sleep(0)
+        await waiter
+        assert manager.lock(1) is first
+        await first.__aexit__(None, None, None)
+        assert manager._locks == {}
+
+
+class TestWriteBehindPersistence:
+    """Tests for SessionManager with a persistent store."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced_into_one_write(self, sample_state: IssueState) -> None:
+        store = RecordingStore()
+        manager = SessionManager(store=store, flush_interval=0.01)
+
+        await manager.create_session(1, sample_state)
+        for i in range(5):
+            await manager.update_session(1, {**sample_state, "issue_title": f"t{i}"})
+        assert store.writes == []
+
+        await asyncio.sleep(0.05)
+        assert len(store.writes) == 1
+        assert json.loads(store.rows[1])["issue_title"] == "t4"
+
+    @pytest.mark.asyncio
+    async def test_lazy_hydration_after_restart(self, sample_state: IssueState) -> None:
+        store = RecordingStore()
+        first = SessionManager(store=store)
+        await first.create_session(1, sample_state)
+        await first.close()
+
+        second = SessionManager(store=store)
+        assert store.loads == 0
+        assert await second.has_session(1) is True
+        assert await second.get_session(1) == sample_state
+        # Cached after the first access
+        assert store.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_is_persisted(self, sample_state: IssueState) -> None:
+        store = RecordingStore()
+        manager = SessionManager(store=store)
+        await manager.create_session(1, sample_state)
+        await manager.flush()
+
+        await manager.delete_session(1)
+        # Pending deletion hides the stored row before it is flushed
+        assert await manager.get_session(1) is None
+        await manager.flush()
+        assert 1 not in store.rows
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried(self, sample_state: IssueState) -> None:
+        store = RecordingStore()
+        original_write = store.write
+        calls = 0
+
+        def flaky_write(upserts: dict[int, str], deletes: list[int]) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise OSError("disk full")
+            original_write(upserts, deletes)
+
+        store.write = flaky_write  # type: ignore[method-assign]
+        manager = SessionManager(store=store)
+        await manager.create_session(1, sample_state)
+
+        with pytest.raises(OSError):
+            await manager.flush()
+        await manager.flush()
+        assert 1 in store.rows
+
+    @pytest.mark.asyncio
+    async def test_sqlite_round_trip(self, tmp_path: Path, sample_state: IssueState) -> None:
+        path = str(tmp_path / "sessions.db")
+        first = SessionManager(store=SQLiteSessionStore(path))
+        await first.create_session(42, sample_state)
+        await first.close()
+
+        second = SessionManager(store=SQLiteSessionStore(path))
+        assert await second.get_session(42) == sample_state
+        assert await second.has_session(43) is False
+        await second.close()
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBoundedResidency:
+    """Tests for LRU and idle-TTL eviction."""
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self, sample_state: IssueState) -> None:
+        manager = SessionManager(max_sessions=2)
+        await manager.create_session(1, sample_state)
+        await manager.create_session(2, sample_state)
+        # Touch 1 so 2 becomes the least recently used
+        await manager.get_session(1)
+        await manager.create_session(3, sample_state)
+
+        assert await manager.has_session(1) is True
+        assert await manager.has_session(2) is False
+        assert await manager.has_session(3) is True
+        assert manager.stats()["evicted_lru"] == 1
+        assert manager.stats()["resident"] == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_expire(self, sample_state: IssueState) -> None:
+        clock = FakeClock()
+        manager = SessionManager(idle_ttl=60, clock=clock)
+        await manager.create_session(1, sample_state)
+        clock.now = 30
+        await manager.create_session(2, sample_state)
+
+        clock.now = 61
+        assert await manager.has_session(1) is False
+        assert await manager.has_session(2) is True
+        assert manager.stats()["evicted_idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_access_refreshes_idle_timer(self, sample_state: IssueState) -> None:
+        clock = FakeClock()
+        manager = SessionManager(idle_ttl=60, clock=clock)
+        await manager.create_session(1, sample_state)
+        clock.now = 50
+        await manager.get_session(1)
+        clock.now = 100
+        assert await manager.has_session(1) is True
+
+    @pytest.mark.asyncio
+    async def test_evicted_session_is_rehydrated_from_store(self, sample_state: IssueState) -> None:
+        store = RecordingStore()
+        manager = SessionManager(store=store, max_sessions=1)
+        await manager.create_session(1, sample_state)
+        await manager.create_session(2, sample_state)
+        assert manager.stats()["resident"] == 1
+
+        # Still pending in the write-behind buffer
+        assert await manager.get_session(1) == sample_state
+        await manager.flush()
+        # Both now live only on disk and evict each other on access
+        assert await manager.get_session(2) == sample_state
+        assert await manager.get_session(1) == sample_state
+        assert manager.stats()["hydrated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_on_evict_says_whether_session_is_persisted(
+        self, sample_state: IssueState
+    ) -> None:
+        evicted: list[tuple[int, bool]] = []
+
+        async def on_evict(thread_id: int, persisted: bool) -> None:
+            evicted.append((thread_id, persisted))
+
+        manager = SessionManager(max_sessions=1, on_evict=on_evict)
+        await manager.create_session(1, sample_state)
+        await manager.create_session(2, sample_state)
+        await manager.close()
+        assert evicted == [(1, False)]
+
+        stored = SessionManager(store=RecordingStore(), max_sessions=1, on_evict=on_evict)
+        await stored.create_session(1, sample_state)
+        await stored.create_session(2, sample_state)
+        await stored.close()
+        assert evicted == [(1, False), (1, True)]
+
+    @pytest.mark.asyncio
+    async def test_session_in_a_turn_is_not_evicted(self, sample_state: IssueState) -> None:
+        clock = FakeClock()
+        manager = SessionManager(max_sessions=1, idle_ttl=60, clock=clock)
+        await manager.create_session(1, sample_state)
+        async with manager.lock(1):
+            clock.now += 120
+            assert await manager.has_session(1) is True
+            await manager.create_session(2, sample_state)
+            assert await manager.has_session(1) is True
+        await manager.create_session(3, sample_state)
+        assert manager.resident() == [3]
+
+    @pytest.mark.asyncio
+    async def test_failing_on_evict_does_not_break_eviction(self, sample_state: IssueState) -> None:
+        async def on_evict(thread_id: int, persisted: bool) -> None:
+            raise RuntimeError("discord is down")
+
+        manager = SessionManager(max_sessions=1, on_evict=on_evict)
+        await manager.create_session(1, sample_state)
+        await manager.create_session(2, sample_state)
+        await manager.close()
+        assert await manager.has_session(1) is False
+
+    @pytest.mark.asyncio
+    async def test_stats_counts_deletions(self, manager: SessionManager) -> None:
+        await manager.create_session(1, {})
+        await manager.delete_session(1)
+        stats = manager.stats()
+        assert stats["deleted"] == 1
+        assert stats["resident"] == 0
@@ -0,0 +1,53 @@
+"""Tests for bot.store module."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from bot.store import SQLiteSessionStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SQLiteSessionStore]:
+    """Create a SQLite store in a temporary directory."""
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    yield store
+    store.close()
+
+
+class TestSQLiteSessionStore:
+    """Tests for SQLiteSessionStore."""
+
+    def test_load_missing_returns_none(self, store: SQLiteSessionStore) -> None:
+        assert store.load(1) is None
+
+    def test_write_and_load(self, store: SQLiteSessionStore) -> None:
+        store.write({1: json.dumps({"thread_id": "1", "issue_title": "버그"})}, [])
+        assert store.load(1) == {"thread_id": "1", "issue_title": "버그"}
+
+    def test_upsert_overwrites(self, store: SQLiteSessionStore) -> None:
+        store.write({1: json.dumps({"issue_title": "old"})}, [])
+        store.write({1: json.dumps({"issue_title": "new"})}, [])
+        assert store.load(1) == {"issue_title": "new"}
+
+    def test_delete(self, store: SQLiteSessionStore) -> None:
+        store.write({1: json.dumps({"issue_title": "t"})}, [])
+        store.write({}, [1])
+        assert store.load(1) is None
+
+    def test_persists_across_connections(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        first = SQLiteSessionStore(path)
+        first.write({7: json.dumps({"thread_id": "7"})}, [])
+        first.close()
+
+        second = SQLiteSessionStore(path)
+        assert second.load(7) == {"thread_id": "7"}
+        second.close()
+
+    def test_uses_wal_journal(self, store: SQLiteSessionStore) -> None:
+        store.write({}, [])
+        mode = store._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
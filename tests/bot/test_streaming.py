@@ -0,0 +1,145 @@
+"""Tests for bot.streaming module."""
+
+import pytest
+
+from bot.outbound import OutboundScheduler
+from bot.streaming import PLACEHOLDER, StreamingReply
+
+
+class FakeMessage:
+    """Minimal stand-in for discord.Message."""
+
+    def __init__(self, channel: "FakeChannel", content: str) -> None:
+        self.channel = channel
+        self.id = len(channel.sent)
+        self.content = content
+        self.deleted = False
+
+    async def edit(self, *, content: str) -> "FakeMessage":
+        self.channel.edits += 1
+        self.content = content
+        return self
+
+    async def delete(self) -> None:
+        self.deleted = True
+
+
+class FakeChannel:
+    """Records sent messages and edit counts."""
+
+    def __init__(self) -> None:
+        self.id = 1
+        self.sent: list[FakeMessage] = []
+        self.edits = 0
+
+    async def send(self, content: str) -> FakeMessage:
+        message = FakeMessage(self, content)
+        self.sent.append(message)
+        return message
+
+    def visible(self) -> list[str]:
+        return [m.content for m in self.sent if not m.deleted]
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def outbound() -> OutboundScheduler:
+    """Scheduler with limits far above what the tests send."""
+    return OutboundScheduler(
+        channel_rate=1000, channel_burst=1000, route_limits={"send": (1000, 1000)}
+    )
+
+
+class TestStreamingReply:
+    """Tests for StreamingReply."""
+
+    @pytest.mark.asyncio
+    async def test_start_posts_placeholder(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, outbound=outbound)
+        await reply.start()
+        await outbound.flush()
+        assert channel.visible() == [PLACEHOLDER]
+
+    @pytest.mark.asyncio
+    async def test_edits_are_rate_limited(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        clock = FakeClock()
+        reply = StreamingReply(channel, edit_interval=1.0, clock=clock, outbound=outbound)
+        await reply.start()
+
+        for token in ("어떤 ", "화면에서 ", "발생하나요?"):
+            clock.now += 0.3
+            await reply.append(token)
+        await outbound.flush()
+        assert channel.edits == 0
+
+        clock.now += 0.3
+        await reply.append(" 재현")
+        await outbound.flush()
+        assert channel.edits == 1
+        assert channel.visible() == ["어떤 화면에서 발생하나요? 재현"]
+
+    @pytest.mark.asyncio
+    async def test_status_shows_until_text_streams(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, edit_interval=0, outbound=outbound)
+        await reply.start()
+        await reply.show_status("대기 3번째")
+        await outbound.flush()
+        assert channel.visible() == ["대기 3번째"]
+
+        await reply.append("어떤 화면인가요?")
+        await reply.show_status("대기 1번째")
+        await outbound.flush()
+        assert channel.visible() == ["어떤 화면인가요?"]
+
+    @pytest.mark.asyncio
+    async def test_finish_replaces_streamed_text(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, edit_interval=0, outbound=outbound)
+        await reply.start()
+        await reply.append("partial")
+        await reply.finish("final answer")
+        await outbound.flush()
+        assert channel.visible() == ["final answer"]
+
+    @pytest.mark.asyncio
+    async def test_long_text_continues_into_new_messages(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, edit_interval=0, outbound=outbound)
+        await reply.start()
+        text = "가" * 2500
+        await reply.finish(text)
+        await outbound.flush()
+        assert "".join(channel.visible()) == text
+        assert len(channel.visible()) == 2
+
+    @pytest.mark.asyncio
+    async def test_finish_drops_surplus_messages(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, edit_interval=0, outbound=outbound)
+        await reply.start()
+        await reply.append("a" * 2500)
+        await reply.finish("short")
+        await outbound.flush()
+        assert channel.visible() == ["short"]
+
+    @pytest.mark.asyncio
+    async def test_discard_deletes_everything(self, outbound: OutboundScheduler) -> None:
+        channel = FakeChannel()
+        reply = StreamingReply(channel, edit_interval=0, outbound=outbound)
+        await reply.start()
+        await reply.append("a" * 2500)
+        await reply.discard()
+        await outbound.flush()
+        assert channel.visible() == []
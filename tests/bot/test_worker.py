@@ -0,0 +1,65 @@
+"""Tests for bot.worker module."""
+
+import dataclasses
+
+import pytest
+
+import bot.worker as worker_module
+from bot.worker import apply_worker_settings, create_worker
+from config import settings
+from github.jobs import IssueJob
+
+
+class TestApplyWorkerSettings:
+    """Tests for the per-worker settings of cluster mode."""
+
+    @pytest.fixture(autouse=True)
+    def cluster(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "cluster_workers", 4)
+        monkeypatch.setattr(settings, "issue_queue_db_path", "data/issue_jobs.db")
+        monkeypatch.setattr(settings, "issue_index_sync", True)
+        monkeypatch.setattr(settings, "cluster_worker", "")
+        monkeypatch.setattr(settings, "metrics_port", 9108)
+        monkeypatch.setattr(settings, "llm_max_concurrency", 6)
+        monkeypatch.setattr(settings, "llm_tokens_per_minute", 400_000)
+
+    def test_shared_files_and_per_process_port(self) -> None:
+        apply_worker_settings(2)
+
+        assert settings.issue_queue_db_path == "data/issue_jobs.db"
+        assert settings.cluster_worker == "worker-2"
+        assert settings.metrics_port == 9111
+
+    def test_only_first_worker_syncs_the_index(self) -> None:
+        apply_worker_settings(0)
+        assert settings.issue_index_sync is True
+
+        apply_worker_settings(1)
+        assert settings.issue_index_sync is False
+
+    def test_llm_budgets_are_split(self) -> None:
+        apply_worker_settings(0)
+
+        assert settings.llm_max_concurrency == 1
+        assert settings.llm_tokens_per_minute == 100_000
+
+
+class TestCreateWorker:
+    """Tests for the events a worker handles."""
+
+    @pytest.mark.asyncio
+    async def test_forwarded_issue_job_is_finished_by_the_owner(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        finished: list[tuple[int, IssueJob]] = []
+
+        async def finish_issue_job(thread: int, job: IssueJob) -> None:
+            finished.append((thread, job))
+
+        monkeypatch.setattr(worker_module, "finish_issue_job", finish_issue_job)
+        job = IssueJob(3, "thread-7", 7, "제목", "본문", ["bug"], "done", 1, issue_url="u")
+        worker = create_worker(1, lambda thread_id: thread_id)  # type: ignore[arg-type,return-value]
+
+        await worker._handle({"type": "issue_job", "thread_id": 7, "job": dataclasses.asdict(job)})
+
+        assert finished == [(7, job)]
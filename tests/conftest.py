@@ -10,3 +10,5 @@ os.environ.setdefault("ANTHROPIC_API_KEY", "test-api-key")
 os.environ.setdefault("GITHUB_TOKEN", "test-github-token")
 os.environ.setdefault("GITHUB_OWNER", "test-owner")
 os.environ.setdefault("GITHUB_REPO", "test-repo")
+# Tests install their own fake models; keep responses from leaking between them
+os.environ.setdefault("LLM_CACHE_NODES", "[]")
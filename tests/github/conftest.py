@@ -0,0 +1,115 @@
+"""Fake GitHub API shared by the github package tests."""
+
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import pytest
+from aiohttp import web
+
+RESET = 1_700_000_600.0
+NOW = 1_700_000_000.0
+
+
+@dataclass
+class FakeGitHub:
+    """In-memory GitHub API: issues for one repository plus scripted failures."""
+
+    issues: list[dict] = field(default_factory=list)
+    labels: list[dict] = field(default_factory=list)
+    remaining: int = 5000
+    failures: list[web.Response] = field(default_factory=list)
+    # Create the issue but answer 502, as when the response is lost in transit
+    lost_responses: int = 0
+    requests: list[tuple[str, str, dict, str]] = field(default_factory=list)
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(RESET)),
+            "X-RateLimit-Resource": "core",
+        }
+
+    async def list_issues(self, request: web.Request) -> web.Response:
+        self.requests.append(("GET", request.path, dict(request.headers), request.query_string))
+        if self.failures:
+            return self.failures.pop(0)
+        issues = self.issues
+        if "since" in request.query:
+            issues = [i for i in issues if i["updated_at"] >= request.query["since"]]
+        if request.query.get("sort") == "updated":
+            issues = sorted(issues, key=lambda i: i["updated_at"])
+        return self._json_page(request, issues)
+
+    async def list_labels(self, request: web.Request) -> web.Response:
+        self.requests.append(("GET", request.path, dict(request.headers), request.query_string))
+        if self.failures:
+            return self.failures.pop(0)
+        return self._json_page(request, self.labels)
+
+    def _json_page(self, request: web.Request, items: list[dict]) -> web.Response:
+        if "per_page" in request.query:
+            per_page = int(request.query["per_page"])
+            start = (int(request.query.get("page", 1)) - 1) * per_page
+            items = items[start : start + per_page]
+        body = json.dumps(items)
+        etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            # Conditional hits are free on GitHub
+            return web.Response(status=304, headers={**self._headers(), "ETag": etag})
+        self.remaining -= 1
+        return web.Response(
+            text=body,
+            content_type="application/json",
+            headers={**self._headers(), "ETag": etag},
+        )
+
+    async def create_issue(self, request: web.Request) -> web.Response:
+        self.requests.append(("POST", request.path, dict(request.headers), request.query_string))
+        if self.failures:
+            return self.failures.pop(0)
+        payload = await request.json()
+        number = len(self.issues) + 1
+        issue = {
+            "number": number,
+            "html_url": f"https://github.com/o/r/issues/{number}",
+            "state": "open",
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            **payload,
+        }
+        self.issues.append(issue)
+        self.remaining -= 1
+        if self.lost_responses:
+            self.lost_responses -= 1
+            return web.json_response({"message": "Bad Gateway"}, status=502)
+        return web.json_response(issue, status=201, headers=self._headers())
+
+
+@pytest.fixture
+async def fake_github() -> AsyncIterator[tuple[FakeGitHub, str]]:
+    """Run a fake GitHub API on a local port and yield it with its base URL."""
+    fake = FakeGitHub()
+    app = web.Application()
+    app.router.add_get("/repos/o/r/issues", fake.list_issues)
+    app.router.add_post("/repos/o/r/issues", fake.create_issue)
+    app.router.add_get("/repos/o/r/labels", fake.list_labels)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    yield fake, f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+class RecordingSleep:
+    """Sleep replacement that records requested waits without waiting."""
+
+    def __init__(self) -> None:
+        self.waits: list[float] = []
+
+    async def __call__(self, seconds: float) -> None:
+        self.waits.append(seconds)
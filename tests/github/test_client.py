@@ -0,0 +1,205 @@
+"""Tests for github.client module."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+from aiohttp import web
+
+from github.client import GitHubClient, GitHubError, RateLimit
+from tests.github.conftest import NOW, RESET, FakeGitHub, RecordingSleep
+
+
+@pytest.fixture
+async def client(fake_github: tuple[FakeGitHub, str]) -> AsyncIterator[Any]:
+    """Return a factory for clients pointed at the fake server."""
+    _, base_url = fake_github
+    clients: list[GitHubClient] = []
+
+    def _create(**kwargs: Any) -> GitHubClient:
+        kwargs.setdefault("mutation_interval", 0.0)
+        kwargs.setdefault("clock", lambda: NOW)
+        instance = GitHubClient("token", "o", "r", base_url=base_url, **kwargs)
+        clients.append(instance)
+        return instance
+
+    yield _create
+    for instance in clients:
+        await instance.aclose()
+
+
+class TestRateLimit:
+    """Tests for parsing rate-limit headers."""
+
+    def test_parses_headers(self) -> None:
+        headers = httpx.Headers(
+            {
+                "x-ratelimit-limit": "30",
+                "x-ratelimit-remaining": "29",
+                "x-ratelimit-reset": "1700000600",
+                "x-ratelimit-resource": "search",
+            }
+        )
+        assert RateLimit.from_headers(headers) == RateLimit(30, 29, RESET, "search")
+
+    def test_missing_headers(self) -> None:
+        assert RateLimit.from_headers(httpx.Headers()) is None
+
+
+class TestGitHubClient:
+    """Tests for GitHubClient against a fake GitHub server."""
+
+    @pytest.mark.asyncio
+    async def test_create_issue(self, fake_github: tuple[FakeGitHub, str], client: Any) -> None:
+        fake, _ = fake_github
+        issue = await client().create_issue("제목", "본문", ["bug"])
+        assert issue["html_url"] == "https://github.com/o/r/issues/1"
+        assert fake.issues[0]["labels"] == ["bug"]
+        headers = fake.requests[0][2]
+        assert headers["Authorization"] == "Bearer token"
+        assert headers["X-GitHub-Api-Version"] == "2022-11-28"
+
+    @pytest.mark.asyncio
+    async def test_conditional_get_serves_cache_on_304(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.issues.append({"number": 1, "title": "a"})
+        github = client()
+
+        first = await github.request("GET", "/repos/o/r/issues")
+        second = await github.request("GET", "/repos/o/r/issues")
+
+        assert first == second == [{"number": 1, "title": "a"}]
+        assert "If-None-Match" not in fake.requests[0][2]
+        assert fake.requests[1][2]["If-None-Match"].startswith('"')
+        # Only the first request was charged
+        assert fake.remaining == 4999
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_when_resource_changes(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        github = client()
+        assert await github.request("GET", "/repos/o/r/issues") == []
+        await github.create_issue("새 이슈", "본문")
+        listed = await github.request("GET", "/repos/o/r/issues")
+        assert [issue["title"] for issue in listed] == ["새 이슈"]
+
+    @pytest.mark.asyncio
+    async def test_tracks_rate_limit(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        github = client()
+        await github.request("GET", "/repos/o/r/issues")
+        assert github.rate_limit() == RateLimit(5000, 4999, RESET, "core")
+
+    @pytest.mark.asyncio
+    async def test_paces_requests_when_remaining_is_low(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.remaining = 10
+        sleep = RecordingSleep()
+        github = client(reserve=50, sleep=sleep)
+
+        await github.request("GET", "/repos/o/r/issues")  # learns remaining=9
+        await github.create_issue("a", "b")
+
+        assert len(sleep.waits) == 1
+        assert sleep.waits[0] == pytest.approx((RESET - NOW) / 10)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_reset_when_exhausted(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.remaining = 1
+        sleep = RecordingSleep()
+        github = client(sleep=sleep)
+
+        await github.request("GET", "/repos/o/r/issues")
+        await github.create_issue("a", "b")
+
+        assert sleep.waits == [RESET - NOW]
+
+    @pytest.mark.asyncio
+    async def test_retries_after_secondary_limit_with_retry_after(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.failures.append(
+            web.json_response(
+                {"message": "You have exceeded a secondary rate limit."},
+                status=403,
+                headers={"Retry-After": "7"},
+            )
+        )
+        sleep = RecordingSleep()
+
+        issue = await client(sleep=sleep).create_issue("a", "b")
+
+        assert issue["number"] == 1
+        assert sleep.waits == [7.0]
+
+    @pytest.mark.asyncio
+    async def test_secondary_limit_without_retry_after_backs_off(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        for _ in range(2):
+            fake.failures.append(
+                web.json_response(
+                    {"message": "You have exceeded a secondary rate limit."}, status=403
+                )
+            )
+        sleep = RecordingSleep()
+
+        await client(sleep=sleep).request("GET", "/repos/o/r/issues")
+
+        assert sleep.waits == [60.0, 120.0]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        for _ in range(3):
+            fake.failures.append(web.json_response({"message": "slow down"}, status=429))
+        sleep = RecordingSleep()
+
+        with pytest.raises(GitHubError) as exc_info:
+            await client(sleep=sleep, max_retries=2).create_issue("a", "b")
+
+        assert exc_info.value.status == 429
+        assert exc_info.value.rate_limited
+        assert len(sleep.waits) == 2
+        assert fake.issues == []
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.failures.append(web.json_response({"message": "Validation Failed"}, status=422))
+        sleep = RecordingSleep()
+
+        with pytest.raises(GitHubError, match="Validation Failed") as exc_info:
+            await client(sleep=sleep).create_issue("", "b")
+        assert not exc_info.value.rate_limited
+        assert sleep.waits == []
+
+    @pytest.mark.asyncio
+    async def test_spaces_out_mutations(
+        self, fake_github: tuple[FakeGitHub, str], client: Any
+    ) -> None:
+        sleep = RecordingSleep()
+        github = client(sleep=sleep, mutation_interval=5.0)
+
+        await github.create_issue("a", "b")
+        await github.create_issue("c", "d")
+
+        assert len(sleep.waits) == 1
+        assert 4.0 < sleep.waits[0] <= 5.0
@@ -0,0 +1,244 @@
+"""Tests for github.index module."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from github.client import GitHubClient
+from github.index import BM25Index, IssueIndex, tokenize
+from tests.github.conftest import FakeGitHub
+
+
+def _issue(
+    number: int, title: str, body: str = "", updated_at: str = "2024-01-01T00:00:00Z"
+) -> dict:
+    return {
+        "number": number,
+        "title": title,
+        "body": body,
+        "state": "open",
+        "html_url": f"https://github.com/o/r/issues/{number}",
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+async def github_client(fake_github: tuple[FakeGitHub, str]) -> AsyncIterator[GitHubClient]:
+    """Client pointed at the fake server."""
+    _, base_url = fake_github
+    client = GitHubClient("token", "o", "r", base_url=base_url)
+    yield client
+    await client.aclose()
+
+
+class StaticIssues:
+    """Stand-in for GitHubClient that pages through a fixed issue list without I/O."""
+
+    repo_path = "/repos/o/r"
+
+    def __init__(self, issues: list[dict]) -> None:
+        self.issues = issues
+
+    async def request(self, method: str, path: str, params: dict) -> list[dict]:
+        start = (params["page"] - 1) * params["per_page"]
+        return self.issues[start : start + params["per_page"]]
+
+
+class TestTokenize:
+    """Tests for the mixed Korean/English tokenizer."""
+
+    def test_hangul_becomes_bigrams(self) -> None:
+        assert tokenize("로그인") == ["로그", "그인"]
+
+    def test_single_hangul_character_is_kept(self) -> None:
+        assert tokenize("및") == ["및"]
+
+    def test_latin_words_are_lowercased(self) -> None:
+        assert tokenize("Kakao OAuth 500") == ["kakao", "oauth", "500"]
+
+    def test_mixed_text_and_particles_share_terms(self) -> None:
+        assert set(tokenize("로그인이")) >= set(tokenize("로그인"))
+
+    def test_drops_single_latin_letters_and_punctuation(self) -> None:
+        assert tokenize("a - b !") == []
+
+
+class TestBM25Index:
+    """Tests for the in-memory BM25 index."""
+
+    def test_ranks_best_match_first(self) -> None:
+        index = BM25Index()
+        index.add(1, tokenize("카카오 로그인 실패"))
+        index.add(2, tokenize("회고 목록 조회 느림"))
+        index.add(3, tokenize("애플 로그인 지원"))
+
+        results = index.search(tokenize("카카오 로그인이 안 돼요"), limit=3)
+
+        assert results[0][0] == 1
+        assert {doc_id for doc_id, _ in results} == {1, 3}
+
+    def test_scores_are_normalized(self) -> None:
+        index = BM25Index()
+        index.add(1, tokenize("카카오 로그인 실패"))
+        index.add(2, tokenize("회고 목록"))
+        [(_, score)] = index.search(tokenize("카카오 로그인 실패"), limit=1)
+        assert 0 < score < 1
+
+    def test_re_adding_replaces_document(self) -> None:
+        index = BM25Index()
+        index.add(1, tokenize("카카오 로그인"))
+        index.add(1, tokenize("회고 목록"))
+        assert index.search(tokenize("카카오"), limit=3) == []
+        assert len(index) == 1
+
+    def test_remove(self) -> None:
+        index = BM25Index()
+        index.add(1, tokenize("카카오 로그인"))
+        index.remove(1)
+        assert index.search(tokenize("카카오"), limit=3) == []
+        assert len(index) == 0
+
+    def test_empty_index(self) -> None:
+        assert BM25Index().search(tokenize("로그인"), limit=3) == []
+
+
+class TestIssueIndex:
+    """Tests for syncing and searching the on-disk issue index."""
+
+    @pytest.mark.asyncio
+    async def test_sync_and_search(
+        self,
+        tmp_path: Path,
+        fake_github: tuple[FakeGitHub, str],
+        github_client: GitHubClient,
+    ) -> None:
+        fake, _ = fake_github
+        fake.issues = [
+            _issue(1, "카카오 로그인 실패", "카카오 로그인 시 500 에러"),
+            _issue(2, "회고 목록 조회 느림", "회고가 많으면 느립니다"),
+        ]
+        index = IssueIndex(str(tmp_path / "index.db"))
+
+        assert await index.sync(github_client) == 2
+        [match] = index.search("카카오 로그인이 안 돼요", min_score=0.3)
+
+        assert match.number == 1
+        assert match.url == "https://github.com/o/r/issues/1"
+        assert match.state == "open"
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_delta_sync_sends_since(
+        self,
+        tmp_path: Path,
+        fake_github: tuple[FakeGitHub, str],
+        github_client: GitHubClient,
+    ) -> None:
+        fake, _ = fake_github
+        fake.issues = [_issue(1, "카카오 로그인 실패", updated_at="2024-01-01T00:00:00Z")]
+        index = IssueIndex(str(tmp_path / "index.db"))
+        await index.sync(github_client)
+
+        fake.issues.append(_issue(2, "애플 로그인 지원", updated_at="2024-02-01T00:00:00Z"))
+        fake.issues[0] = _issue(1, "카카오 로그인 실패 (수정)", updated_at="2024-03-01T00:00:00Z")
+        fake.requests.clear()
+
+        assert await index.sync(github_client) == 2
+        assert len(index) == 2
+        assert [m.title for m in index.search("카카오 로그인 실패", limit=1)] == [
+            "카카오 로그인 실패 (수정)"
+        ]
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_paginates_and_skips_pull_requests(
+        self,
+        tmp_path: Path,
+        fake_github: tuple[FakeGitHub, str],
+        github_client: GitHubClient,
+    ) -> None:
+        fake, _ = fake_github
+        fake.issues = [
+            _issue(n, f"이슈 {n}", updated_at=f"2024-01-01T00:{n // 60:02d}:{n % 60:02d}Z")
+            for n in range(1, 251)
+        ]
+        fake.issues[0]["pull_request"] = {"url": "..."}
+        index = IssueIndex(str(tmp_path / "index.db"))
+
+        assert await index.sync(github_client) == 249
+        assert len([r for r in fake.requests if r[0] == "GET"]) == 3
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_reload_from_disk(
+        self,
+        tmp_path: Path,
+        fake_github: tuple[FakeGitHub, str],
+        github_client: GitHubClient,
+    ) -> None:
+        fake, _ = fake_github
+        fake.issues = [_issue(1, "카카오 로그인 실패", updated_at="2024-01-05T00:00:00Z")]
+        path = str(tmp_path / "index.db")
+        first = IssueIndex(path)
+        await first.sync(github_client)
+        first.close()
+
+        reopened = IssueIndex(path)
+        assert reopened.load() == 1
+        assert reopened.search("카카오 로그인")[0].number == 1
+
+        fake.requests.clear()
+        await reopened.sync(github_client)
+        assert "since=2024-01-05T00:00:00Z" in fake.requests[0][3]
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_large_sync_does_not_block_the_loop(self, tmp_path: Path) -> None:
+        body = "회고 답변을 저장하면 500 에러가 발생하고 새로고침하면 입력이 사라집니다. " * 20
+        client = StaticIssues([_issue(n, f"이슈 {n} 저장 실패", body) for n in range(1, 3001)])
+        index = IssueIndex(str(tmp_path / "index.db"))
+        gaps: list[float] = []
+
+        async def tick() -> None:
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.create_task(tick())
+        synced = await index.sync(client)  # type: ignore[arg-type]
+        # Let the ticker record the gap that ends when sync returns
+        await asyncio.sleep(0.02)
+        ticker.cancel()
+
+        assert synced == 3000
+        assert index.search("이슈 2999 저장 실패", limit=1)[0].number == 2999
+        assert max(gaps) < 0.25
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_picks_up_another_process_sync(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "index.db")
+        syncer = IssueIndex(path)
+        reader = IssueIndex(path)
+        client = StaticIssues([_issue(1, "카카오 로그인 실패", updated_at="2024-01-01T00:00:00Z")])
+        await syncer.sync(client)  # type: ignore[arg-type]
+        await reader.refresh()
+        assert len(reader) == 1
+
+        client.issues = [
+            _issue(1, "카카오 로그인 실패 (수정)", updated_at="2024-03-01T00:00:00Z"),
+            _issue(2, "애플 로그인 지원", updated_at="2024-02-01T00:00:00Z"),
+        ]
+        await syncer.sync(client)  # type: ignore[arg-type]
+
+        assert await reader.refresh() == 2
+        assert len(reader) == 2
+        assert reader.search("카카오 로그인 실패", limit=1)[0].title == "카카오 로그인 실패 (수정)"
+        syncer.close()
+        reader.close()
@@ -0,0 +1,404 @@
+"""Tests for github.jobs module."""
+
+import asyncio
+import random
+import sqlite3
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from github.client import GitHubClient
+from github.jobs import IssueJob, IssueJobQueue, IssueJobWorker
+from github.labels import LabelCatalog
+from tests.github.conftest import FakeGitHub
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> IssueJobQueue:
+    """Job queue backed by a temporary SQLite file."""
+    return IssueJobQueue(str(tmp_path / "jobs.db"))
+
+
+class Results:
+    """Collects reported jobs and lets a test wait for a number of them."""
+
+    def __init__(self) -> None:
+        self.jobs: list[IssueJob] = []
+        self._changed = asyncio.Event()
+
+    async def __call__(self, job: IssueJob) -> None:
+        self.jobs.append(job)
+        self._changed.set()
+
+    async def wait_for(self, count: int, timeout: float = 5.0) -> list[IssueJob]:
+        async with asyncio.timeout(timeout):
+            while len(self.jobs) < count:
+                self._changed.clear()
+                await self._changed.wait()
+        return self.jobs
+
+
+@pytest.fixture
+async def worker(fake_github: tuple[FakeGitHub, str], queue: IssueJobQueue) -> AsyncIterator[Any]:
+    """Return a factory for started workers sending to the fake server."""
+    _, base_url = fake_github
+    client = GitHubClient("token", "o", "r", base_url=base_url, mutation_interval=0.0)
+    workers: list[IssueJobWorker] = []
+
+    def _create(**kwargs: Any) -> tuple[IssueJobWorker, Results]:
+        results = Results()
+        kwargs.setdefault("base_delay", 0.01)
+        kwargs.setdefault("rng", random.Random(0))
+        kwargs.setdefault("client_factory", lambda: client)
+        instance = IssueJobWorker(queue, results, **kwargs)
+        instance.start()
+        workers.append(instance)
+        return instance, results
+
+    yield _create
+    for instance in workers:
+        await instance.stop()
+    await client.aclose()
+
+
+class TestIssueJobQueue:
+    """Tests for the SQLite job table."""
+
+    def test_enqueue_is_idempotent_per_key(self, queue: IssueJobQueue) -> None:
+        first = queue.enqueue("thread-1", 1, "제목", "본문", ["bug"], now=100.0)
+        queue.claim(now=100.0, limit=1)
+        queue.complete(first.id, "https://github.com/o/r/issues/1")
+        second = queue.enqueue("thread-1", 1, "다른 제목", "본문", [], now=200.0)
+        assert second.id == first.id
+        assert second.status == "done"
+        assert second.title == "제목"
+        assert second.labels == ["bug"]
+
+    def test_enqueue_updates_pending_job(self, queue: IssueJobQueue) -> None:
+        job = queue.enqueue("thread-1", 1, "제목", "본문", ["bug"], now=100.0)
+        queue.claim(now=100.0, limit=1)
+        queue.retry(job.id, next_attempt_at=150.0, error="502")
+
+        edited = queue.enqueue("thread-1", 1, "수정된 제목", "수정된 본문", [], now=120.0)
+
+        assert edited.id == job.id
+        assert (edited.title, edited.body, edited.labels) == ("수정된 제목", "수정된 본문", [])
+        # Still backing off from the failed attempt
+        assert edited.next_attempt_at == 150.0
+        assert edited.attempts == 1
+
+    def test_enqueue_resets_failed_job(self, queue: IssueJobQueue) -> None:
+        job = queue.enqueue("thread-1", 1, "제목", "본문", [], now=100.0)
+        queue.claim(now=100.0, limit=1)
+        queue.fail(job.id, "boom")
+        again = queue.enqueue("thread-1", 1, "새 제목", "본문", [], now=200.0)
+        assert again.id == job.id
+        assert again.status == "pending"
+        assert again.title == "새 제목"
+        assert again.error is None
+        # A fresh retry budget, but still checked for an issue the failed attempt created
+        assert again.attempts == 0
+        assert again.next_attempt_at == 200.0
+        assert again.attempted is True
+
+    def test_claim_respects_due_time_and_limit(self, queue: IssueJobQueue) -> None:
+        for i in range(3):
+            queue.enqueue(f"thread-{i}", i, "t", "b", [], now=100.0 + i)
+        queue.enqueue("thread-late", 9, "t", "b", [], now=500.0)
+
+        claimed = queue.claim(now=200.0, limit=2)
+
+        assert [job.thread_id for job in claimed] == [0, 1]
+        assert all(job.status == "running" and job.attempts == 1 for job in claimed)
+        assert [job.thread_id for job in queue.claim(now=200.0, limit=10)] == [2]
+        assert queue.next_due() == 500.0
+
+    def test_retry_reschedules(self, queue: IssueJobQueue) -> None:
+        job = queue.enqueue("thread-1", 1, "t", "b", [], now=100.0)
+        queue.claim(now=100.0, limit=1)
+        queue.retry(job.id, next_attempt_at=150.0, error="502")
+        assert queue.claim(now=120.0, limit=1) == []
+        assert queue.claim(now=150.0, limit=1)[0].attempts == 2
+
+    def test_recover_returns_running_jobs_to_pending(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "jobs.db")
+        queue = IssueJobQueue(path)
+        job = queue.enqueue("thread-1", 1, "t", "b", [], now=100.0)
+        queue.claim(now=100.0, limit=1)
+        queue.close()
+
+        reopened = IssueJobQueue(path)
+        assert reopened.recover() == 1
+        assert reopened.get(job.id).status == "pending"
+        reopened.close()
+
+    def test_recover_leaves_other_owners_jobs_running(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "jobs.db")
+        first = IssueJobQueue(path, owner="worker-0")
+        second = IssueJobQueue(path, owner="worker-1")
+        mine = first.enqueue("thread-1", 1, "t", "b", [], now=100.0)
+        theirs = first.enqueue("thread-2", 2, "t", "b", [], now=101.0)
+        first.claim(now=200.0, limit=1)
+        second.claim(now=200.0, limit=1)
+
+        assert first.recover() == 1
+        assert first.get(mine.id).status == "pending"
+        assert first.get(theirs.id).status == "running"
+        first.close()
+        second.close()
+
+    def test_shared_file_never_claims_a_job_twice(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "jobs.db")
+        queues = [IssueJobQueue(path, owner=f"worker-{i}") for i in range(4)]
+        for i in range(40):
+            queues[0].enqueue(f"thread-{i}", i, "t", "b", [], now=100.0)
+
+        def drain(queue: IssueJobQueue) -> list[int]:
+            claimed: list[int] = []
+            while jobs := queue.claim(now=200.0, limit=3):
+                claimed.extend(job.id for job in jobs)
+            return claimed
+
+        with ThreadPoolExecutor(len(queues)) as pool:
+            claimed = [job_id for ids in pool.map(drain, queues) for job_id in ids]
+        for queue in queues:
+            queue.close()
+
+        assert sorted(claimed) == list(range(1, 41))
+
+    def test_adds_owner_to_an_existing_table(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "jobs.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE issue_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "idempotency_key TEXT NOT NULL UNIQUE, thread_id INTEGER NOT NULL, "
+                "title TEXT NOT NULL, body TEXT NOT NULL, labels TEXT NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, created_at REAL NOT NULL, "
+                "issue_url TEXT, error TEXT)"
+            )
+            conn.execute(
+                "INSERT INTO issue_jobs (idempotency_key, thread_id, title, body, labels, "
+                "status, next_attempt_at, created_at) "
+                "VALUES ('thread-1', 1, 't', 'b', '[]', 'running', 0, 0)"
+            )
+        conn.close()
+
+        queue = IssueJobQueue(path)
+        assert queue.recover() == 1
+        assert [job.thread_id for job in queue.claim(now=100.0, limit=1)] == [1]
+        queue.close()
+
+
+class TestIssueJobWorker:
+    """Tests for the worker pool against a fake GitHub server."""
+
+    @pytest.mark.asyncio
+    async def test_creates_issue_and_reports_url(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        pool, results = worker()
+
+        job = await pool.submit(42, "제목", "본문", ["bug"])
+        [done] = await results.wait_for(1)
+
+        assert done.id == job.id
+        assert done.status == "done"
+        assert done.issue_url == "https://github.com/o/r/issues/1"
+        assert fake.issues[0]["labels"] == ["bug"]
+        assert "<!-- discord-issue-bot:thread-42 -->" in fake.issues[0]["body"]
+
+    @pytest.mark.asyncio
+    async def test_label_catalog_filters_labels(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, base_url = fake_github
+        fake.labels = [{"name": "bug"}, {"name": "domain/auth"}]
+        catalog = LabelCatalog()
+        client = GitHubClient("token", "o", "r", base_url=base_url)
+        await catalog.refresh(client)
+        await client.aclose()
+        pool, results = worker(label_catalog=catalog)
+
+        await pool.submit(42, "제목", "본문", ["Bug", "domain:auth", "made-up"])
+        await results.wait_for(1)
+
+        assert fake.issues[0]["labels"] == ["bug", "domain/auth"]
+
+    @pytest.mark.asyncio
+    async def test_unloaded_label_catalog_keeps_labels(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        pool, results = worker(label_catalog=LabelCatalog())
+
+        await pool.submit(42, "제목", "본문", ["bug", "domain/auth"])
+        await results.wait_for(1)
+
+        assert fake.issues[0]["labels"] == ["bug", "domain/auth"]
+
+    @pytest.mark.asyncio
+    async def test_resubmitting_a_thread_does_not_duplicate(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        pool, results = worker()
+
+        await pool.submit(42, "제목", "본문")
+        await results.wait_for(1)
+        again = await pool.submit(42, "제목", "본문")
+
+        assert again.status == "done"
+        assert again.issue_url == "https://github.com/o/r/issues/1"
+        assert len(fake.issues) == 1
+
+    @pytest.mark.asyncio
+    async def test_lost_response_is_not_filed_twice(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.lost_responses = 1
+        pool, results = worker()
+
+        await pool.submit(42, "제목", "본문")
+        [done] = await results.wait_for(1)
+
+        assert done.status == "done"
+        assert done.attempts == 2
+        assert len(fake.issues) == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        for _ in range(2):
+            fake.failures.append(web.json_response({"message": "unavailable"}, status=503))
+        pool, results = worker()
+
+        await pool.submit(42, "제목", "본문")
+        [done] = await results.wait_for(1)
+
+        assert done.status == "done"
+        assert len(fake.issues) == 1
+
+    @pytest.mark.asyncio
+    async def test_validation_error_fails_without_retry(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.failures.append(web.json_response({"message": "Validation Failed"}, status=422))
+        pool, results = worker()
+
+        await pool.submit(42, "", "본문")
+        [failed] = await results.wait_for(1)
+
+        assert failed.status == "failed"
+        assert failed.attempts == 1
+        assert "Validation Failed" in (failed.error or "")
+
+    @pytest.mark.asyncio
+    async def test_forbidden_fails_without_retry(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        fake.failures.append(
+            web.json_response({"message": "Resource not accessible by integration"}, status=403)
+        )
+        pool, results = worker()
+
+        await pool.submit(42, "제목", "본문")
+        [failed] = await results.wait_for(1)
+
+        assert failed.status == "failed"
+        assert failed.attempts == 1
+        assert pool._paused_until == 0.0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_retried(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, base_url = fake_github
+        fake.failures.append(
+            web.json_response(
+                {"message": "You have exceeded a secondary rate limit."},
+                status=403,
+                headers={"Retry-After": "0"},
+            )
+        )
+        client = GitHubClient("token", "o", "r", base_url=base_url, max_retries=0)
+        pool, results = worker(client_factory=lambda: client)
+
+        await pool.submit(42, "제목", "본문")
+        [done] = await results.wait_for(1)
+        await client.aclose()
+
+        assert done.status == "done"
+        assert done.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        for _ in range(10):
+            fake.failures.append(web.json_response({"message": "unavailable"}, status=503))
+        pool, results = worker(max_attempts=3)
+
+        await pool.submit(42, "제목", "본문")
+        [failed] = await results.wait_for(1)
+
+        assert failed.status == "failed"
+        assert failed.attempts == 3
+        assert fake.issues == []
+
+    @pytest.mark.asyncio
+    async def test_reconfirmed_job_is_retried_again(
+        self, fake_github: tuple[FakeGitHub, str], worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        for _ in range(2):
+            fake.failures.append(web.json_response({"message": "unavailable"}, status=503))
+        pool, results = worker(max_attempts=2)
+        await pool.submit(42, "제목", "본문")
+        [failed] = await results.wait_for(1)
+        assert failed.status == "failed"
+
+        fake.failures.append(web.json_response({"message": "unavailable"}, status=503))
+        await pool.submit(42, "제목", "본문")
+        [_, done] = await results.wait_for(2)
+
+        assert done.status == "done"
+        assert done.attempts == 2
+        assert len(fake.issues) == 1
+
+    @pytest.mark.asyncio
+    async def test_drains_a_burst(self, fake_github: tuple[FakeGitHub, str], worker: Any) -> None:
+        fake, _ = fake_github
+        pool, results = worker(concurrency=4)
+
+        for thread_id in range(20):
+            await pool.submit(thread_id, f"이슈 {thread_id}", "본문")
+        jobs = await results.wait_for(20)
+
+        assert all(job.status == "done" for job in jobs)
+        assert len(fake.issues) == 20
+
+    @pytest.mark.asyncio
+    async def test_resumes_pending_jobs_on_start(
+        self, fake_github: tuple[FakeGitHub, str], queue: IssueJobQueue, worker: Any
+    ) -> None:
+        fake, _ = fake_github
+        queue.enqueue("thread-7", 7, "제목", "본문", [], now=0.0)
+        queue.claim(now=0.0, limit=1)  # left running by a crashed process
+
+        _, results = worker()
+        [done] = await results.wait_for(1)
+
+        assert done.thread_id == 7
+        assert len(fake.issues) == 1
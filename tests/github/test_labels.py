@@ -0,0 +1,121 @@
+"""Tests for github.labels module."""
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from github.client import GitHubClient
+from github.labels import LabelCatalog, normalize_label
+from tests.github.conftest import FakeGitHub
+
+REPO_LABELS = [
+    "bug",
+    "enhancement",
+    "question",
+    "priority: critical",
+    "domain/auth",
+    "domain/retrospect",
+    "📝 documentation",
+]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+async def github_client(fake_github: tuple[FakeGitHub, str]) -> AsyncIterator[GitHubClient]:
+    """Client pointed at the fake server, which serves REPO_LABELS."""
+    fake, base_url = fake_github
+    fake.labels = [{"name": name} for name in REPO_LABELS]
+    client = GitHubClient("token", "o", "r", base_url=base_url)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def catalog(github_client: GitHubClient) -> LabelCatalog:
+    """Catalog loaded with REPO_LABELS."""
+    catalog = LabelCatalog()
+    await catalog.refresh(github_client)
+    return catalog
+
+
+class TestNormalizeLabel:
+    """Tests for label normalization."""
+
+    def test_ignores_case_spacing_and_punctuation(self) -> None:
+        assert normalize_label("Priority: Critical") == normalize_label("priority-critical")
+
+    def test_drops_emoji_and_keeps_hangul(self) -> None:
+        assert normalize_label("🐛 버그") == "버그"
+
+
+class TestLabelCatalog:
+    """Tests for fetching, caching and matching repository labels."""
+
+    @pytest.mark.asyncio
+    async def test_exact_and_normalized_matches(self, catalog: LabelCatalog) -> None:
+        assert catalog.resolve(["Bug", "priority:critical", "documentation"]) == [
+            "bug",
+            "priority: critical",
+            "📝 documentation",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_prefix_synonym_and_typo(self, catalog: LabelCatalog) -> None:
+        assert catalog.match("domain:auth") == "domain/auth"
+        assert catalog.match("type: bug") == "bug"
+        assert catalog.match("feature") == "enhancement"
+        assert catalog.match("enhancment") == "enhancement"
+
+    @pytest.mark.asyncio
+    async def test_unknown_labels_are_dropped_and_duplicates_merged(
+        self, catalog: LabelCatalog
+    ) -> None:
+        assert catalog.resolve(["improvement", "domain:ai", "bug", "버그"]) == ["bug"]
+
+    def test_unloaded_catalog_matches_nothing(self) -> None:
+        catalog = LabelCatalog()
+        assert not catalog.loaded
+        assert catalog.resolve(["bug"]) == []
+
+    @pytest.mark.asyncio
+    async def test_refresh_respects_ttl_and_revalidates(
+        self, fake_github: tuple[FakeGitHub, str], github_client: GitHubClient
+    ) -> None:
+        fake, _ = fake_github
+        clock = FakeClock()
+        catalog = LabelCatalog(ttl=600, clock=clock)
+
+        assert await catalog.refresh(github_client)
+        clock.now = 599
+        assert not await catalog.refresh(github_client)
+        assert len(fake.requests) == 1
+
+        clock.now = 600
+        remaining = fake.remaining
+        assert await catalog.refresh(github_client)
+        # Unchanged labels come back as a free 304
+        assert "If-None-Match" in fake.requests[-1][2]
+        assert fake.remaining == remaining
+        assert catalog.names == REPO_LABELS
+
+    @pytest.mark.asyncio
+    async def test_paginates(
+        self, fake_github: tuple[FakeGitHub, str], github_client: GitHubClient
+    ) -> None:
+        fake, _ = fake_github
+        fake.labels = [{"name": f"label-{n}"} for n in range(150)]
+        catalog = LabelCatalog()
+
+        await catalog.refresh(github_client)
+
+        assert len(catalog.names) == 150
+        assert len(fake.requests) == 2
@@ -0,0 +1,123 @@
+"""Tests for metrics module."""
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+
+from agent.llm import log_usage
+from agent.utils import is_json_response, parse_json_response
+from metrics import (
+    JSON_PARSE_FAILURES,
+    LLM_TOKENS,
+    NODE_DURATION,
+    NODE_ERRORS,
+    SESSIONS,
+    current_node,
+    render,
+    start_metrics_server,
+    timed_node,
+)
+
+
+class TestRender:
+    """Tests for the Prometheus text format."""
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        NODE_DURATION.observe(0.02, node="render_test")
+        NODE_DURATION.observe(3.0, node="render_test")
+        text = render()
+        assert "# TYPE issue_bot_node_duration_seconds histogram" in text
+        assert 'issue_bot_node_duration_seconds_bucket{node="render_test",le="0.01"} 0' in text
+        assert 'issue_bot_node_duration_seconds_bucket{node="render_test",le="0.025"} 1' in text
+        assert 'issue_bot_node_duration_seconds_bucket{node="render_test",le="5"} 2' in text
+        assert 'issue_bot_node_duration_seconds_bucket{node="render_test",le="+Inf"} 2' in text
+        assert 'issue_bot_node_duration_seconds_count{node="render_test"} 2' in text
+
+    def test_callback_values_are_read_at_scrape_time(self) -> None:
+        resident = {"n": 3}
+        SESSIONS.set_callback(lambda: {("resident",): resident["n"]})
+        try:
+            assert 'issue_bot_sessions{state="resident"} 3' in render()
+            resident["n"] = 5
+            assert 'issue_bot_sessions{state="resident"} 5' in render()
+        finally:
+            SESSIONS.set_callback(None)
+
+    def test_wrong_labels_are_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            NODE_ERRORS.inc(route="send")
+
+
+class TestTimedNode:
+    """Tests for graph node instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_async_node_is_timed_and_attributed(self) -> None:
+        async def node(state: dict) -> dict:
+            return {"node": current_node.get()}
+
+        before = NODE_DURATION.count(node="async_test")
+        assert await timed_node("async_test", node)({}) == {"node": "async_test"}
+        assert NODE_DURATION.count(node="async_test") == before + 1
+        assert current_node.get() == "none"
+
+    def test_sync_node_errors_are_counted(self) -> None:
+        def node(state: dict) -> dict:
+            raise RuntimeError("boom")
+
+        before = NODE_ERRORS.value(node="sync_test")
+        with pytest.raises(RuntimeError):
+            timed_node("sync_test", node)({})
+        assert NODE_ERRORS.value(node="sync_test") == before + 1
+        assert NODE_DURATION.count(node="sync_test") >= 1
+
+    @pytest.mark.asyncio
+    async def test_parse_failures_are_counted_per_node(self) -> None:
+        async def node(state: dict) -> dict:
+            return {"data": parse_json_response("not json")}
+
+        before = JSON_PARSE_FAILURES.value(node="parse_test")
+        await timed_node("parse_test", node)({})
+        assert JSON_PARSE_FAILURES.value(node="parse_test") == before + 1
+
+    def test_is_json_response_does_not_count(self) -> None:
+        before = JSON_PARSE_FAILURES.value(node="none")
+        assert not is_json_response("not json")
+        assert is_json_response('```json\n{"a": 1}\n```')
+        assert JSON_PARSE_FAILURES.value(node="none") == before
+
+
+class TestTokenUsage:
+    """Tests for token histograms fed by log_usage."""
+
+    def test_usage_is_recorded_per_call_and_kind(self) -> None:
+        response = AIMessage(
+            content="{}",
+            usage_metadata={
+                "input_tokens": 1200,
+                "output_tokens": 80,
+                "total_tokens": 1280,
+                "input_token_details": {"cache_read": 1000},
+            },
+        )
+        before = LLM_TOKENS.count(call="usage_test", kind="cache_read")
+        log_usage("usage_test", response)
+        assert LLM_TOKENS.count(call="usage_test", kind="cache_read") == before + 1
+        assert 'issue_bot_llm_tokens_sum{call="usage_test",kind="output"} 80' in render()
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics(self) -> None:
+        runner = await start_metrics_server("127.0.0.1", 0)
+        port = runner.addresses[0][1]
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"http://127.0.0.1:{port}/metrics")
+        finally:
+            await runner.cleanup()
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE issue_bot_node_duration_seconds histogram" in response.text